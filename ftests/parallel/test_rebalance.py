@@ -0,0 +1,151 @@
+# -*- coding: UTF-8 -*-
+#
+# Copyright (c) 2014, Yung-Yu Chen <yyc@solvcon.net>
+#
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# - Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+# - Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# - Neither the name of the copyright holder nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+
+"""
+Run the hooks of a parallel gas-dynamics case through the rebalancing of the
+workers.
+"""
+
+
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+
+import solvcon as sc
+from solvcon.anchor import RuntimeSampleAnchor
+from solvcon.io import series
+from solvcon.parcel import gas
+
+
+class StillGasAnchor(sc.MeshAnchor):
+    """
+    Fill uniform and still gas.
+    """
+
+    def provide(self):
+        svr = self.svr
+        svr.soln.fill(0.0)
+        svr.soln[:,0] = 1.0
+        svr.soln[:,svr.ndim+1] = 1.0 / (1.4-1)
+        svr.sol[:] = svr.soln
+
+
+class SampleHook(sc.MeshHook):
+    """
+    Run :py:class:`solvcon.anchor.RuntimeSampleAnchor` in the solvers, and
+    pull the numbers of the flushed samples after the loop.
+    """
+
+    def __init__(self, cse, **kw):
+        self.nflushed = None
+        super(SampleHook, self).__init__(cse, **kw)
+
+    def drop_anchor(self, svr):
+        self._deliver_anchor(svr, RuntimeSampleAnchor,
+                             dict(name='sample', frequency=1000.0))
+
+    def postloop(self):
+        dealer = self.cse.solver.dealer
+        dealer.issue('pullank', 'sample', 'nflushed', with_worker=True)
+        self.nflushed = dealer.gather()
+
+
+class TestRebalance(TestCase):
+    nsteps = 10
+    rebalance = 4
+    npart = 2
+
+    def setUp(self):
+        self.basedir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.basedir)
+
+    def _get_case(self, **kw):
+        bcmap = dict((name, (sc.bctregy.GasWall, {}))
+                     for name in (b'top', b'left', b'bottom', b'right'))
+        cse = gas.GasCase(
+            meshfn=os.path.join(sc.env.datadir, 'gmsh_square.msh.gz'),
+            bcmap=bcmap, basefn='rebalance', basedir=self.basedir,
+            domaintype=sc.Collective, npart=self.npart,
+            time_increment=1.e-3, steps_run=self.nsteps,
+            # rebalance every time it is checked.
+            rebalance=self.rebalance, rebalance_tolerance=-1.0, **kw)
+        cse.defer(gas.FillAnchor, mappers={'soln': gas.GasSolver.ALMOST_ZERO,
+                                           'dsoln': 0.0, 'amsca': 1.4})
+        cse.defer(StillGasAnchor)
+        cse.defer(gas.ProbeHook, name='ppank', coords=[('center', 0.1, 0.1)],
+                  speclst=[0], psteps=1)
+        cse.defer(gas.PMarchSeries, anames=[('soln', False, -4)], psteps=1)
+        cse.defer(SampleHook)
+        return cse
+
+    def test_run(self):
+        self._run()
+
+    def test_fork(self):
+        # the workers build the first solvers on the inherited blocks.
+        cse = self._run(fork=True)
+        self.assertTrue(cse.is_forking)
+
+    def _run(self, **kw):
+        cse = self._get_case(**kw)
+        cse.init()
+        cse.run()
+        # the probe keeps recording.
+        vals = np.load(os.path.join(self.basedir,
+                                    'rebalance_pt_ppank_center.npy'))
+        self.assertEqual(self.nsteps+1, vals.shape[0])
+        self.assertTrue((np.diff(vals[:,0]) > 0).all())
+        self.assertTrue(np.allclose(vals[:,1], 1.0))
+        # the series files have the mesh of every decomposition.
+        nmesh = (self.nsteps-1) // self.rebalance + 1
+        for iblk in range(self.npart):
+            rdr = series.SeriesReader(os.path.join(
+                self.basedir, 'rebalance.p%02d.scts' % iblk))
+            self.assertEqual(list(range(self.nsteps+1)), rdr.steps)
+            self.assertEqual(nmesh, len(rdr.meshes))
+            for istep in rdr.steps:
+                self.assertEqual(rdr.mesh_of(istep)['ncell'],
+                                 rdr.read(istep, 'soln[0]').shape[0])
+        self.assertTrue(os.path.exists(os.path.join(self.basedir,
+                                                    'rebalance.xmf')))
+        # the samplers keep running.
+        nflushed = cse.runhooks[-1].nflushed
+        self.assertEqual(self.npart, len(nflushed))
+        self.assertTrue(all(val > 0 for val in nflushed))
+        return cse
+
+# vim: set ff=unix fenc=utf8 nobomb et sw=4 ts=4 tw=79:
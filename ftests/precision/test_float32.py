@@ -0,0 +1,273 @@
+#!/usr/bin/env python
+# -*- coding: UTF-8 -*-
+#
+# Copyright (c) 2017, Yung-Yu Chen <yyc@solvcon.net>
+#
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# - Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+# - Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# - Neither the name of the copyright holder nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+"""
+Compare the error norms of the solvers storing the solutions in float32 with
+those storing in float64.
+"""
+
+
+import math
+import shutil
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+
+import solvcon as sc
+from solvcon import bench
+from solvcon.parcel import gas
+from solvcon.parcel import linear
+from solvcon.parcel import vewave
+from solvcon.parcel.linear import velstress
+
+
+def sod_density(x, t, xloc=0.5, gamma=1.4,
+                rho1=1.0, p1=1.0, rho2=0.125, p2=0.1):
+    """
+    Exact density of the Sod shock tube, initially at rest with the states
+    (*rho1*, *p1*) and (*rho2*, *p2*) on the two sides of *xloc*.
+    """
+    c1 = math.sqrt(gamma*p1/rho1)
+    c2 = math.sqrt(gamma*p2/rho2)
+    g1 = (gamma-1) / (2*gamma)
+    g2 = (gamma+1) / (2*gamma)
+    def shock(p):
+        # velocity jump and its derivative across the right-going shock.
+        a = 2 / ((gamma+1)*rho2)
+        b = p2 * (gamma-1) / (gamma+1)
+        q = math.sqrt(a/(p+b))
+        return (p-p2)*q, q*(1 - (p-p2)/(2*(p+b)))
+    def rarefaction(p):
+        # velocity jump and its derivative across the left-going rarefaction.
+        return (2*c1/(gamma-1) * ((p/p1)**g1 - 1),
+                (p/p1)**(-g2) / (rho1*c1))
+    # pressure in the star region by Newton's method.
+    pstar = (p1+p2) / 2
+    for it in range(50):
+        fr, dr = rarefaction(pstar)
+        fs, ds = shock(pstar)
+        dp = (fr + fs) / (dr + ds)
+        pstar -= dp
+        if abs(dp) < 1.e-14 * pstar:
+            break
+    ustar = -rarefaction(pstar)[0]
+    rhol = rho1 * (pstar/p1)**(1/gamma)
+    rhor = rho2 * ((pstar/p2 + (gamma-1)/(gamma+1))
+                   / ((gamma-1)/(gamma+1)*pstar/p2 + 1))
+    shockspeed = c2 * math.sqrt(g2*pstar/p2 + g1)
+    cstar = c1 * (pstar/p1)**g1
+    # sample.
+    xi = (np.asarray(x) - xloc) / t
+    rho = np.empty_like(xi)
+    fan = rho1 * (2/(gamma+1) + (gamma-1)/((gamma+1)*c1) * (-xi)
+                  ) ** (2/(gamma-1))
+    rho[:] = rho2
+    rho[xi < shockspeed] = rhor
+    rho[xi < ustar] = rhol
+    slct = xi < ustar - cstar
+    rho[slct] = fan[slct]
+    rho[xi < -c1] = rho1
+    return rho
+
+
+class SodAnchor(sc.MeshAnchor):
+    """
+    Set the states of the Sod shock tube across the diaphragm along the x
+    axis.
+    """
+
+    def __init__(self, svr, xloc=0.5, gamma=1.4,
+                 rho1=1.0, p1=1.0, rho2=0.125, p2=0.1, **kw):
+        self.xloc = xloc
+        self.gamma = gamma
+        self.rho1, self.p1 = rho1, p1
+        self.rho2, self.p2 = rho2, p2
+        super(SodAnchor, self).__init__(svr, **kw)
+
+    def provide(self):
+        soln = self.svr.soln
+        soln.fill(0.0)
+        slct = self.svr.blk.shclcnd[:,0] > self.xloc
+        soln[:,0] = self.rho1
+        soln[:,-1] = self.p1 / (self.gamma-1)
+        soln[slct,0] = self.rho2
+        soln[slct,-1] = self.p2 / (self.gamma-1)
+
+
+class Float32TestCase(TestCase):
+
+    def setUp(self):
+        self.basedir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.basedir)
+
+    def _run(self, create, fpdtype):
+        cse = create(fpdtype)
+        cse.init()
+        cse.run()
+        self.assertEqual(fpdtype, cse.solver.solverobj.sol.dtype.name)
+        return cse
+
+
+class TestSodTube(Float32TestCase):
+    """
+    March the Sod shock tube in the unit square and compare the L1 norm of
+    the density error against the exact solution.
+    """
+
+    nbox = 50
+    steps = 60
+    time_increment = 2.5e-3
+
+    def _create(self, fpdtype):
+        mesher = bench.BoxMesher('tri', 2*self.nbox**2)
+        bcmap = {
+            'left': (gas.GasNonrefl, {}),
+            'right': (gas.GasNonrefl, {}),
+            'lower': (gas.GasWall, {}),
+            'upper': (gas.GasWall, {}),
+        }
+        cse = gas.GasCase(
+            mesher=mesher, bcmap=bcmap, basefn='sod_%s' % fpdtype,
+            basedir=self.basedir, fpdtype=fpdtype,
+            time_increment=self.time_increment, steps_run=self.steps)
+        cse.info.muted = True
+        cse.defer(gas.FillAnchor, mappers={'soln': gas.GasSolver.ALMOST_ZERO,
+                                           'dsoln': 0.0, 'amsca': 1.4})
+        cse.defer(SodAnchor)
+        return cse
+
+    def _norm(self, cse):
+        svr = cse.solver.solverobj
+        blk = svr.blk
+        rho = sod_density(blk.clcnd[:,0], self.steps*self.time_increment)
+        err = np.abs(svr.sol[blk.ngstcell:,0] - rho)
+        return (err * blk.clvol).sum()
+
+    def test_l1(self):
+        norm64 = self._norm(self._run(self._create, 'float64'))
+        norm32 = self._norm(self._run(self._create, 'float32'))
+        # the scheme resolves the waves.
+        self.assertLess(norm64, 2.e-2)
+        # the storage error is orders of magnitude below the truncation one.
+        self.assertLess(abs(norm32 - norm64), 1.e-3 * norm64)
+
+
+class TestLinearPlaneWave(Float32TestCase):
+    """
+    March a plane wave of the velocity-stress equations through one period in
+    the periodic unit square, and compare the Linf and L2 norms of the error
+    against the exact solution.
+    """
+
+    nbox = 20
+    steps = 40
+
+    def _create(self, fpdtype):
+        mesher = bench.BoxMesher('tri', 2*self.nbox**2)
+        mtrl = velstress.mltregy['GaAs'](al=0.0, be=0.0, ga=0.0)
+        pws = [velstress.VslinPWSolution(
+            amp=1.0, ctr=np.zeros(2, dtype='float64'),
+            wvec=np.array([2, 2], dtype='float64')*np.pi, mtrl=mtrl, idx=8)]
+        period = 2*np.pi / pws[0].afreq
+        cse = velstress.VslinCase(
+            mesher=mesher, bcmap={}, mtrldict={None: mtrl},
+            bcmod=lambda blk: bench.couple_periodic(blk,
+                                                    linear.LinearPeriodic),
+            basefn='planewave_%s' % fpdtype, basedir=self.basedir,
+            fpdtype=fpdtype, taylor=0.0,
+            time_increment=period/self.steps, steps_run=self.steps)
+        cse.info.muted = True
+        cse.defer(linear.FillAnchor,
+                  mappers={'soln': sc.MeshSolver.ALMOST_ZERO, 'dsoln': 0.0})
+        cse.defer(linear.PlaneWaveHook, planewaves=pws, psteps=self.steps)
+        return cse
+
+    def _norm(self, cse):
+        hok = [hok for hok in cse.runhooks
+               if isinstance(hok, linear.PlaneWaveHook)]
+        return hok[0].norm
+
+    def test_norms(self):
+        norm64 = self._norm(self._run(self._create, 'float64'))
+        norm32 = self._norm(self._run(self._create, 'float32'))
+        for key in 'Linf', 'L2':
+            # the plane wave of unit amplitude is resolved.
+            self.assertLess(norm64[key].max(), 0.1)
+            np.testing.assert_allclose(norm32[key], norm64[key], rtol=1.e-3,
+                                       atol=1.e-3 * norm64[key].max())
+
+
+class TestVewaveSineX(Float32TestCase):
+    """
+    Drive a longitudinal sine wave into the viscoelastic solver from the left
+    side of the unit square, and compare the L2 norm of the difference
+    between the float32 and float64 solutions with that of the solution.
+    The plane-wave solution is unavailable to the viscoelastic solver.
+    """
+
+    nbox = 20
+    steps = 40
+    freq = 1578.0
+
+    def _create(self, fpdtype):
+        mesher = bench.BoxMesher('tri', 2*self.nbox**2)
+        bcmap = dict((name, (vewave.VewaveNonRefl, {}))
+                     for name in mesher.bcnames)
+        bcmap['left'] = (vewave.VewaveLongSineX, {})
+        cse = vewave.VewaveCase(
+            mesher=mesher, bcmap=bcmap,
+            mtrldict={None: vewave.mltregy['SoftTissue']()},
+            basefn='sinex_%s' % fpdtype, basedir=self.basedir,
+            fpdtype=fpdtype,
+            time_increment=0.5/self.steps/self.freq, steps_run=self.steps)
+        cse.info.muted = True
+        cse.defer(vewave.FillAnchor, mappers={'soln': 0.0, 'dsoln': 0.0})
+        cse.defer(vewave.AmscaAnchor, freq=self.freq)
+        return cse
+
+    def test_l2(self):
+        svr64 = self._run(self._create, 'float64').solver.solverobj
+        svr32 = self._run(self._create, 'float32').solver.solverobj
+        ngstcell = svr64.blk.ngstcell
+        clvol = svr64.blk.clvol[:,np.newaxis]
+        sol64 = svr64.sol[ngstcell:]
+        sol32 = svr32.sol[ngstcell:]
+        norm = np.sqrt((sol64**2 * clvol).sum(axis=0))
+        diff = np.sqrt(((sol32 - sol64)**2 * clvol).sum(axis=0))
+        # the wave has entered the domain.
+        self.assertGreater(norm[0], 0.0)
+        self.assertLess(diff.max(), 1.e-4 * norm.max())
+
+# vim: set ff=unix fenc=utf8 ft=python ai et sw=4 ts=4 tw=79:
@@ -11,5 +11,8 @@
 #include "march/gas/Quantity.hpp"
 #include "march/gas/Trim.hpp"
 #include "march/gas/Anchor.hpp"
+#include "march/gas/Exchange.hpp"
+#include "march/gas/Ensemble.hpp"
+#include "march/gas/MultiRate.hpp"
 
 // vim: set ff=unix fenc=utf8 nobomb et sw=4 ts=4:
@@ -5,7 +5,13 @@
  * BSD 3-Clause License, see COPYING
  */
 
+#include <algorithm>
+#include <cmath>
+#include <cstring>
+#include <limits>
 #include <memory>
+#include <stdexcept>
+#include <string>
 #include <vector>
 #include <map>
 
@@ -19,7 +25,7 @@ namespace march {
 
 namespace gas {
 
-template< size_t NDIM > class Anchor;
+template< size_t NDIM, typename ElemType = real_type > class Anchor;
 
 /**
  * Anchor wrapper for treating both 2- and 3-dimensional anchor.
@@ -44,11 +50,11 @@ protected:
 
 public:
 
-    template <size_t NDIM> CommonAnchor(ctor_passkey const &, Solver<NDIM> & svr)
-      : m_ndim(NDIM), m_solver(&svr) {}
+    template< size_t NDIM, typename ElemType > CommonAnchor(ctor_passkey const &, Solver<NDIM, ElemType> & svr)
+      : m_ndim(NDIM), m_elemtype(type_to<ElemType>::id), m_solver(&svr) {}
 
-    template <size_t NDIM>
-    static std::shared_ptr<CommonAnchor> construct(Solver<NDIM> & svr) {
+    template< size_t NDIM, typename ElemType >
+    static std::shared_ptr<CommonAnchor> construct(Solver<NDIM, ElemType> & svr) {
         return std::make_shared<CommonAnchor>(ctor_passkey(), svr);
     }
 
@@ -71,29 +77,33 @@ public:
     size_t ndim() const { return m_ndim; }
     size_t ndim()       { return m_ndim; }
 
-    template <size_t NDIM> Solver<NDIM> & solver() const {
+    DataTypeId elemtype() const { return m_elemtype; }
+
+    template< size_t NDIM, typename ElemType = real_type > Solver<NDIM, ElemType> & solver() const {
         assert(m_solver);
         if (NDIM != ndim()) { throw std::runtime_error("CommonAnchor::solver dimension mismatch"); }
-        return *reinterpret_cast<Solver<NDIM>*>(m_solver);
+        if (type_to<ElemType>::id != elemtype()) { throw std::runtime_error("CommonAnchor::solver element type mismatch"); }
+        return *reinterpret_cast<Solver<NDIM, ElemType>*>(m_solver);
     }
 
-    template <size_t NDIM> std::shared_ptr<Anchor<NDIM>> make_owner();
+    template< size_t NDIM, typename ElemType = real_type > std::shared_ptr<Anchor<NDIM, ElemType>> make_owner();
 
 private:
 
     size_t m_ndim = 0;
+    DataTypeId m_elemtype = MH_DOUBLE;
     void * m_solver = nullptr;
 
 }; /* end class CommonAnchor */
 
-template< size_t NDIM >
+template< size_t NDIM, typename ElemType >
 class Anchor
-  : public std::enable_shared_from_this<Anchor<NDIM>>
+  : public std::enable_shared_from_this<Anchor<NDIM, ElemType>>
 {
 
 public:
 
-    using solver_type = Solver<NDIM>;
+    using solver_type = Solver<NDIM, ElemType>;
 
     Anchor() = delete;
     Anchor(Anchor const & ) = delete;
@@ -110,11 +120,11 @@ public:
     Anchor(ctor_passkey const &, solver_type & svr, std::shared_ptr<CommonAnchor> const & common)
       : m_solver(svr), m_common(common) {}
 
-    static std::shared_ptr<Anchor<NDIM>> construct(
+    static std::shared_ptr<Anchor<NDIM, ElemType>> construct(
         solver_type & svr
       , std::shared_ptr<CommonAnchor> const & common = std::shared_ptr<CommonAnchor>()
     ) {
-        return std::make_shared<Anchor<NDIM>>(ctor_passkey(), svr, common);
+        return std::make_shared<Anchor<NDIM, ElemType>>(ctor_passkey(), svr, common);
     }
 
     virtual ~Anchor() = default;
@@ -122,6 +132,8 @@ public:
     solver_type const & solver() const { return m_solver; }
     solver_type       & solver()       { return m_solver; }
 
+    std::shared_ptr<CommonAnchor> const & common() const { return m_common; }
+
 #define DECL_MARCH_GAS_ANCHOR_METHOD(NAME) \
     virtual void NAME() { if (m_common) { m_common->NAME(); } }
 
@@ -145,22 +157,22 @@ private:
 
 }; /* end class Anchor */
 
-template <size_t NDIM> std::shared_ptr<Anchor<NDIM>>
+template< size_t NDIM, typename ElemType > std::shared_ptr<Anchor<NDIM, ElemType>>
 CommonAnchor::make_owner() {
-    if (NDIM == ndim()) {
-        return Anchor<NDIM>::construct(solver<NDIM>(), shared_from_this());
+    if (NDIM == ndim() && type_to<ElemType>::id == elemtype()) {
+        return Anchor<NDIM, ElemType>::construct(solver<NDIM, ElemType>(), shared_from_this());
     } else {
-        return std::shared_ptr<Anchor<NDIM>>();
+        return std::shared_ptr<Anchor<NDIM, ElemType>>();
     }
 }
 
-template< size_t NDIM >
+template< size_t NDIM, typename ElemType >
 class AnchorChain
 {
 
 public:
 
-    using anchor_type = Anchor<NDIM>;
+    using anchor_type = Anchor<NDIM, ElemType>;
     using anchor_ptr = std::shared_ptr<anchor_type>;
 
     struct LifeManager { virtual ~LifeManager() {} };
@@ -174,6 +186,16 @@ public:
         m_names.emplace(name, ptr);
     }
 
+    bool has(std::string const & name) const { return m_names.count(name) > 0; }
+
+    anchor_ptr const & operator[](std::string const & name) const {
+        auto it = m_names.find(name);
+        if (it == m_names.end()) {
+            throw std::out_of_range(string::format("AnchorChain: no anchor named \"%s\"", name.c_str()));
+        }
+        return it->second;
+    }
+
 #define DECL_MARCH_GAS_ANCHOR_CALL_FORWARD(NAME) \
     void NAME() { \
         for (auto & anchor : m_anchors) { \
@@ -209,6 +231,411 @@ private:
 
 }; /* end class AnchorChain */
 
+/*
+ * Compiled anchors for the common cases.  They are configured from Python but
+ * run entirely in C++, so that the marching loop never re-enters Python for
+ * them.
+ */
+
+/**
+ * Collect the extrema of the CFL number and the number of adjusted cells into
+ * the solver state every rsteps steps.
+ */
+template< size_t NDIM, typename ElemType = real_type >
+class CflAnchor : public Anchor<NDIM, ElemType>
+{
+
+public:
+
+    using base_type = Anchor<NDIM, ElemType>;
+    using solver_type = typename base_type::solver_type;
+    using int_type = typename solver_type::int_type;
+
+protected:
+
+    using ctor_passkey = typename base_type::ctor_passkey;
+
+public:
+
+    CflAnchor(ctor_passkey const & pk, solver_type & svr, int_type rsteps)
+      : base_type(pk, svr, std::shared_ptr<CommonAnchor>()), m_rsteps(rsteps)
+    {
+        if (m_rsteps <= 0) { throw std::invalid_argument("CflAnchor: rsteps must be positive"); }
+    }
+
+    static std::shared_ptr<CflAnchor<NDIM, ElemType>> construct(solver_type & svr, int_type rsteps) {
+        return std::make_shared<CflAnchor<NDIM, ElemType>>(ctor_passkey(), svr, rsteps);
+    }
+
+    int_type rsteps() const { return m_rsteps; }
+
+    void postmarch() override {
+        auto & state = this->solver().state();
+        const int_type istep = state.step_global;
+        if (istep > 0 && 0 == istep % m_rsteps) {
+            auto & sol = this->solver().sol();
+            const index_type ncell = this->solver().block()->ncell();
+            real_type cflmin = std::numeric_limits<real_type>::infinity();
+            real_type cflmax = -std::numeric_limits<real_type>::infinity();
+            int_type nadj = 0;
+            for (index_type icl=0; icl<ncell; ++icl) {
+                cflmin = std::min(cflmin, sol.cflo(icl));
+                cflmax = std::max(cflmax, sol.cflo(icl));
+                nadj += 1 == sol.cflc(icl) ? 1 : 0;
+            }
+            state.cfl_min = cflmin;
+            state.cfl_max = cflmax;
+            state.cfl_nadjusted = nadj;
+            if (state.cfl_nadjusted_accumulated < 0) {
+                state.cfl_nadjusted_accumulated = nadj;
+            } else {
+                state.cfl_nadjusted_accumulated += nadj;
+            }
+        }
+    }
+
+private:
+
+    int_type m_rsteps;
+
+}; /* end class CflAnchor */
+
+/**
+ * Monitor the convergence to a steady state.  Every rsteps steps, the L2 norm
+ * over the cells of the change of density in the last substep, each divided by
+ * the time increment of the cell, is stored as the residual into the solver
+ * state.
+ */
+template< size_t NDIM, typename ElemType = real_type >
+class ResidualAnchor : public Anchor<NDIM, ElemType>
+{
+
+public:
+
+    using base_type = Anchor<NDIM, ElemType>;
+    using solver_type = typename base_type::solver_type;
+    using int_type = typename solver_type::int_type;
+
+protected:
+
+    using ctor_passkey = typename base_type::ctor_passkey;
+
+public:
+
+    ResidualAnchor(ctor_passkey const & pk, solver_type & svr, int_type rsteps)
+      : base_type(pk, svr, std::shared_ptr<CommonAnchor>()), m_rsteps(rsteps)
+    {
+        if (m_rsteps <= 0) { throw std::invalid_argument("ResidualAnchor: rsteps must be positive"); }
+    }
+
+    static std::shared_ptr<ResidualAnchor<NDIM, ElemType>> construct(solver_type & svr, int_type rsteps) {
+        return std::make_shared<ResidualAnchor<NDIM, ElemType>>(ctor_passkey(), svr, rsteps);
+    }
+
+    int_type rsteps() const { return m_rsteps; }
+    /// The first residual, for the convergence relative to it.
+    real_type residual_initial() const { return m_residual_initial; }
+
+    void postmarch() override {
+        auto & state = this->solver().state();
+        const int_type istep = state.step_global;
+        if (istep > 0 && 0 == istep % m_rsteps) {
+            auto & svr = this->solver();
+            auto & sol = svr.sol();
+            const index_type ncell = svr.block()->ncell();
+            real_type sum = 0;
+            for (index_type icl=0; icl<ncell; ++icl) {
+                const real_type rate = (sol.so0n(icl).density() - sol.so0c(icl).density()) / svr.time_increment(icl);
+                sum += rate * rate;
+            }
+            state.residual = sqrt(sum / ncell);
+            if (std::isnan(m_residual_initial)) { m_residual_initial = state.residual; }
+        }
+    }
+
+private:
+
+    int_type m_rsteps;
+    real_type m_residual_initial = std::numeric_limits<real_type>::quiet_NaN();
+
+}; /* end class ResidualAnchor */
+
+/**
+ * Check the bounds of the solution every rsteps steps, and throw when a cell
+ * has non-finite values, or density or pressure not above the minimum.
+ */
+template< size_t NDIM, typename ElemType = real_type >
+class BoundCheckAnchor : public Anchor<NDIM, ElemType>
+{
+
+public:
+
+    using base_type = Anchor<NDIM, ElemType>;
+    using solver_type = typename base_type::solver_type;
+    using int_type = typename solver_type::int_type;
+
+protected:
+
+    using ctor_passkey = typename base_type::ctor_passkey;
+
+public:
+
+    BoundCheckAnchor(
+        ctor_passkey const & pk, solver_type & svr
+      , int_type rsteps, real_type density_min, real_type pressure_min
+    ) : base_type(pk, svr, std::shared_ptr<CommonAnchor>())
+      , m_rsteps(rsteps), m_density_min(density_min), m_pressure_min(pressure_min)
+    {
+        if (m_rsteps <= 0) { throw std::invalid_argument("BoundCheckAnchor: rsteps must be positive"); }
+    }
+
+    static std::shared_ptr<BoundCheckAnchor<NDIM, ElemType>> construct(
+        solver_type & svr, int_type rsteps, real_type density_min, real_type pressure_min
+    ) {
+        return std::make_shared<BoundCheckAnchor<NDIM, ElemType>>(ctor_passkey(), svr, rsteps, density_min, pressure_min);
+    }
+
+    int_type rsteps() const { return m_rsteps; }
+    real_type density_min() const { return m_density_min; }
+    real_type pressure_min() const { return m_pressure_min; }
+
+    void postfull() override {
+        auto & svr = this->solver();
+        if (0 != svr.state().step_global % m_rsteps) { return; }
+        auto & sol = svr.sol();
+        const index_type ncell = svr.block()->ncell();
+        for (index_type icl=0; icl<ncell; ++icl) {
+            const auto pso0n = sol.so0n(icl);
+            bool finite = true;
+            for (size_t ieq=0; ieq<solver_type::neq; ++ieq) { finite = finite && std::isfinite(pso0n[ieq]); }
+            const real_type pressure = pso0n.pressure(sol.gamma(icl));
+            if (!finite || !(pso0n.density() > m_density_min) || !(pressure > m_pressure_min)) {
+                throw std::runtime_error(string::format(
+                    "solution out of bound\n%s\n" "%s\n" "%s\n"
+                    "density = %g (min %g)\n"
+                    "pressure = %g (min %g)\n"
+                  , svr.block()->info_string().c_str()
+                  , svr.block()->cell_info_string(icl).c_str()
+                  , svr.state().step_info_string().c_str()
+                  , pso0n.density(), m_density_min
+                  , pressure, m_pressure_min
+                ));
+            }
+        }
+    }
+
+private:
+
+    int_type m_rsteps;
+    real_type m_density_min;
+    real_type m_pressure_min;
+
+}; /* end class BoundCheckAnchor */
+
+/**
+ * Copy a solution array into a preallocated ring buffer of nslot snapshots
+ * every psteps steps.  The snapshot of the count-th copy is in slot count %
+ * nslot.
+ */
+template< size_t NDIM, typename ElemType = real_type >
+class SnapshotAnchor : public Anchor<NDIM, ElemType>
+{
+
+public:
+
+    using base_type = Anchor<NDIM, ElemType>;
+    using solver_type = typename base_type::solver_type;
+    using int_type = typename solver_type::int_type;
+
+protected:
+
+    using ctor_passkey = typename base_type::ctor_passkey;
+
+public:
+
+    SnapshotAnchor(
+        ctor_passkey const & pk, solver_type & svr
+      , std::string const & aname, int_type psteps, index_type nslot
+    ) : base_type(pk, svr, std::shared_ptr<CommonAnchor>())
+      , m_aname(aname), m_psteps(psteps)
+    {
+        if (m_psteps <= 0) { throw std::invalid_argument("SnapshotAnchor: psteps must be positive"); }
+        if (nslot <= 0) { throw std::invalid_argument("SnapshotAnchor: nslot must be positive"); }
+        LookupTableCore src = array(svr, m_aname);
+        std::vector<index_type> dims = src.dims();
+        dims[0] = src.nbody();
+        if (src.ncolumn() > 1) { dims[1] /= svr.sol().nmember(); }
+        dims.insert(dims.begin(), nslot);
+        m_data = LookupTableCore(0, nslot, dims, src.datatypeid());
+        m_times = LookupTable<real_type, 0>(0, nslot);
+        m_times.fill(std::numeric_limits<real_type>::quiet_NaN());
+    }
+
+    static std::shared_ptr<SnapshotAnchor<NDIM, ElemType>> construct(
+        solver_type & svr, std::string const & aname, int_type psteps, index_type nslot
+    ) {
+        return std::make_shared<SnapshotAnchor<NDIM, ElemType>>(ctor_passkey(), svr, aname, psteps, nslot);
+    }
+
+    /**
+     * Solution array of the name.  Resolved at every copy, since the solver
+     * swaps the current and next arrays.
+     */
+    static LookupTableCore array(solver_type & svr, std::string const & aname) {
+        auto arrays = svr.sol().arrays();
+        if      ("so0c" == aname) { return arrays.so0c(); }
+        else if ("so0n" == aname) { return arrays.so0n(); }
+        else if ("so1c" == aname) { return arrays.so1c(); }
+        else if ("so1n" == aname) { return arrays.so1n(); }
+        else if ("cflo" == aname) { return arrays.cflo(); }
+        else if ("cflc" == aname) { return arrays.cflc(); }
+        else if ("gamma" == aname) { return arrays.gamma(); }
+        else { throw std::invalid_argument(string::format("SnapshotAnchor: unknown array name \"%s\"", aname.c_str())); }
+    }
+
+    std::string const & aname() const { return m_aname; }
+    int_type psteps() const { return m_psteps; }
+    index_type nslot() const { return m_data.nbody(); }
+    index_type count() const { return m_count; }
+    LookupTableCore const & data() const { return m_data; }
+    LookupTable<real_type, 0> const & times() const { return m_times; }
+
+    void snapshot() {
+        LookupTableCore src = array(this->solver(), m_aname);
+        const index_type islot = m_count % nslot();
+        auto const & sol = this->solver().sol();
+        if (src.ncolumn() > 1 && (Layout::SOA == sol.layout() || sol.nmember() > 1)) {
+            gather(src, sol.layout(), sol.nmember(), sol.imember(), m_data.row(islot));
+        } else {
+            std::memcpy(m_data.row(islot), src.row(0), m_data.ncolumn() * m_data.elsize());
+        }
+        m_times[islot] = this->solver().state().time;
+        ++m_count;
+    }
+
+    void preloop() override { snapshot(); }
+
+    void postfull() override {
+        if (0 == this->solver().state().step_global % m_psteps) { snapshot(); }
+    }
+
+private:
+
+    /**
+     * Copy the body of the solution table of an SOA or ensemble solution in
+     * the AOS order of the member, so that the snapshots do not depend on the
+     * layout.
+     */
+    static void gather(
+        LookupTableCore const & src, Layout layout, index_type nmember, index_type imember, char * dst
+    ) {
+        const index_type neq = solver_type::neq;
+        const size_t itemsize = src.ncolumn() / nmember / neq * src.elsize();
+        char const * base = src.data();
+        for (index_type icl=0; icl<src.nbody(); ++icl) {
+            const index_type iseq = (src.nghost() + icl) * nmember + imember;
+            if (Layout::AOS == layout) {
+                std::memcpy(dst, base + iseq * neq * itemsize, neq * itemsize);
+                dst += neq * itemsize;
+            } else {
+                for (index_type ieq=0; ieq<neq; ++ieq) {
+                    std::memcpy(dst, base + (ieq * src.nfull() * nmember + iseq) * itemsize, itemsize);
+                    dst += itemsize;
+                }
+            }
+        }
+    }
+
+    std::string m_aname;
+    int_type m_psteps;
+    index_type m_count = 0;
+    LookupTableCore m_data;
+    LookupTable<real_type, 0> m_times;
+
+}; /* end class SnapshotAnchor */
+
+/**
+ * Sample the conservation variables of a set of cells into a preallocated
+ * ring buffer every psteps steps.  A row of the buffer holds the time
+ * followed by the neq values of each cell.
+ */
+template< size_t NDIM, typename ElemType = real_type >
+class ProbeAnchor : public Anchor<NDIM, ElemType>
+{
+
+public:
+
+    using base_type = Anchor<NDIM, ElemType>;
+    using solver_type = typename base_type::solver_type;
+    using int_type = typename solver_type::int_type;
+
+protected:
+
+    using ctor_passkey = typename base_type::ctor_passkey;
+
+public:
+
+    ProbeAnchor(
+        ctor_passkey const & pk, solver_type & svr
+      , std::vector<index_type> const & cells, int_type psteps, index_type capacity
+    ) : base_type(pk, svr, std::shared_ptr<CommonAnchor>())
+      , m_cells(cells), m_psteps(psteps)
+    {
+        if (m_psteps <= 0) { throw std::invalid_argument("ProbeAnchor: psteps must be positive"); }
+        if (capacity <= 0) { throw std::invalid_argument("ProbeAnchor: capacity must be positive"); }
+        const index_type ncell = svr.block()->ncell();
+        for (index_type icl : m_cells) {
+            // -1 is for the point not in the block.
+            if (icl < -1 || icl >= ncell) {
+                throw std::out_of_range(string::format("ProbeAnchor: cell %d not in [-1, %d)", icl, ncell));
+            }
+        }
+        const index_type ncolumn = 1 + static_cast<index_type>(m_cells.size() * solver_type::neq);
+        m_data = LookupTableCore(0, capacity, {capacity, ncolumn}, type_to<real_type>::id);
+    }
+
+    static std::shared_ptr<ProbeAnchor<NDIM, ElemType>> construct(
+        solver_type & svr, std::vector<index_type> const & cells, int_type psteps, index_type capacity
+    ) {
+        return std::make_shared<ProbeAnchor<NDIM, ElemType>>(ctor_passkey(), svr, cells, psteps, capacity);
+    }
+
+    std::vector<index_type> const & cells() const { return m_cells; }
+    int_type psteps() const { return m_psteps; }
+    index_type capacity() const { return m_data.nbody(); }
+    index_type count() const { return m_count; }
+    LookupTableCore const & data() const { return m_data; }
+
+    void sample() {
+        auto & svr = this->solver();
+        real_type * row = reinterpret_cast<real_type *>(m_data.row(m_count % capacity()));
+        *row++ = svr.state().time;
+        for (index_type icl : m_cells) {
+            if (icl < 0) {
+                for (size_t ieq=0; ieq<solver_type::neq; ++ieq) { *row++ = std::numeric_limits<real_type>::quiet_NaN(); }
+                continue;
+            }
+            const auto pso0n = svr.sol().so0n(icl);
+            for (size_t ieq=0; ieq<solver_type::neq; ++ieq) { *row++ = pso0n[ieq]; }
+        }
+        ++m_count;
+    }
+
+    void preloop() override { sample(); }
+
+    void postfull() override {
+        if (0 == this->solver().state().step_global % m_psteps) { sample(); }
+    }
+
+private:
+
+    std::vector<index_type> m_cells;
+    int_type m_psteps;
+    index_type m_count = 0;
+    LookupTableCore m_data;
+
+}; /* end class ProbeAnchor */
+
 } /* end namespace gas */
 
 } /* end namespace march */
@@ -0,0 +1,185 @@
+#pragma once
+
+/*
+ * Copyright (c) 2017, Yung-Yu Chen <yyc@solvcon.net>
+ * BSD 3-Clause License, see COPYING
+ */
+
+#include <memory>
+#include <stdexcept>
+#include <vector>
+
+#include "march/core.hpp"
+#include "march/mesh.hpp"
+
+#include "march/gas/Solver.hpp"
+
+namespace march {
+
+namespace gas {
+
+/**
+ * Ensemble of solvers marching variants of a problem, e.g., different Mach
+ * numbers or ratios of specific heat, on one block.
+ *
+ * The members share the block and cecnd, and their solution variables are
+ * interleaved cell by cell in the tables of the leader (the 0-th member), so
+ * that one sweep over the cells calculates all the members with the
+ * conservation element of a cell built once.  Each member has its own trims,
+ * anchors, quantity, parameter, and state, through which the boundary values
+ * and the outputs of the members differ.
+ *
+ * The members march together and must not march individually.  Interface
+ * exchange and multi-rate marching are not supported.
+ */
+template< size_t NDIM, typename ElemType >
+class Ensemble
+  : public InstanceCounter<Ensemble<NDIM, ElemType>>
+  , public std::enable_shared_from_this<Ensemble<NDIM, ElemType>>
+{
+
+public:
+
+    using solver_type = Solver<NDIM, ElemType>;
+    using block_type = typename solver_type::block_type;
+    using int_type = typename solver_type::int_type;
+
+    class ctor_passkey {
+        ctor_passkey() = default;
+        friend Ensemble<NDIM, ElemType>;
+    };
+
+    Ensemble(ctor_passkey const &, std::shared_ptr<block_type> const & block, index_type nmember, Layout layout)
+      : m_members()
+    {
+        m_members.reserve(nmember);
+        m_members.push_back(solver_type::construct(block, layout, nmember));
+        for (index_type imember=1; imember<nmember; ++imember) {
+            m_members.push_back(solver_type::construct(*m_members[0], imember));
+        }
+    }
+
+    Ensemble() = delete;
+    Ensemble(Ensemble const & ) = delete;
+    Ensemble(Ensemble       &&) = delete;
+    Ensemble & operator=(Ensemble const & ) = delete;
+    Ensemble & operator=(Ensemble       &&) = delete;
+
+    static std::shared_ptr<Ensemble<NDIM, ElemType>> construct(
+        std::shared_ptr<block_type> const & block, index_type nmember, Layout layout=Layout::AOS
+    ) {
+        if (nmember <= 0) { throw std::invalid_argument("Ensemble: nmember must be positive"); }
+        return std::make_shared<Ensemble<NDIM, ElemType>>(ctor_passkey(), block, nmember, layout);
+    }
+
+    std::shared_ptr<block_type> const & block() const { return m_members[0]->block(); }
+    index_type nmember() const { return m_members.size(); }
+    std::vector<std::shared_ptr<solver_type>> const & members() const { return m_members; }
+
+    solver_type & member(index_type imember) const {
+        if (imember < 0 || imember >= nmember()) {
+            throw std::out_of_range(string::format("Ensemble: member %d not in [0, %d)", imember, nmember()));
+        }
+        return *m_members[imember];
+    }
+
+    // marching core; each sweeps the cells once for all the members.
+    // @[
+    void calc_so0t() {
+        for (index_type icl=0; icl<block()->ncell(); ++icl) {
+            for (auto & svr : m_members) { svr->calc_so0t_cell(icl); }
+        }
+    }
+
+    void calc_so0n() {
+        for (index_type icl=0; icl<block()->ncell(); ++icl) {
+            const ConservationElement<NDIM> icce(*block(), icl);
+            for (auto & svr : m_members) {
+                const real_type dt = svr->time_increment(icl);
+                svr->calc_so0n_cell(icl, icce, dt * 0.25, dt * 0.5);
+            }
+        }
+    }
+
+    void calc_cfl_so1n() {
+        for (index_type icl=0; icl<block()->ncell(); ++icl) {
+            const ConservationElement<NDIM> icce(*block(), icl);
+            for (auto & svr : m_members) {
+                const real_type hdt = svr->time_increment(icl) * 0.5;
+                svr->calc_cfl_cell(icl, icce, hdt);
+                svr->calc_so1n_cell(icl, hdt);
+            }
+        }
+    }
+    // @]
+
+    /**
+     * March all the members.  The order of calling the anchors, the trims,
+     * and the quantity of each member is the same as Solver::march().
+     */
+    void march(real_type time_current, real_type time_increment, int_type steps_run) {
+        for (auto & svr : m_members) {
+            if (svr->exchange()) { throw std::runtime_error("Ensemble: interface exchange is not supported"); }
+            if (svr->param().multirate_nlevel() > 1) {
+                throw std::runtime_error("Ensemble: multi-rate marching is not supported");
+            }
+        }
+        for (auto & svr : m_members) {
+            svr->state().step_current = 0;
+            svr->anchors().premarch();
+        }
+        for (int_type istep=0; istep<steps_run; ++istep) {
+            for (auto & svr : m_members) {
+                svr->state().substep_current = 0;
+                svr->anchors().prefull();
+                if (svr->qty() && 0 != svr->state().report_interval && 0 == svr->state().step_global) {
+                    svr->qty()->update(svr->qty()->due(svr->state().step_global));
+                }
+            }
+            const int_type substep_run = m_members[0]->state().substep_run;
+            for (int_type isub=0; isub<substep_run; ++isub) {
+                for (auto & svr : m_members) {
+                    svr->state().time = time_current;
+                    svr->state().time_increment = time_increment;
+                    svr->anchors().presub();
+                    svr->update(svr->state().time, svr->state().time_increment);
+                    svr->calc_ldt();
+                }
+                calc_so0t();
+                calc_so0n();
+                for (auto & svr : m_members) { svr->trim_do0(); }
+                calc_cfl_so1n();
+                for (auto & svr : m_members) { svr->trim_do1(); }
+                time_current += time_increment / substep_run;
+                for (auto & svr : m_members) {
+                    svr->state().time = time_current;
+                    svr->state().time_increment = time_increment;
+                    svr->state().substep_current += 1;
+                    svr->anchors().postsub();
+                }
+            }
+            for (auto & svr : m_members) {
+                auto & state = svr->state();
+                if (
+                    svr->qty() && 0 != state.report_interval &&
+                    ((0 != state.step_global) && (0 == state.step_global % state.report_interval))
+                ) { svr->qty()->update(svr->qty()->due(state.step_global)); }
+                state.step_global += 1;
+                state.step_current += 1;
+                svr->anchors().postfull();
+            }
+        }
+        for (auto & svr : m_members) { svr->anchors().postmarch(); }
+    }
+
+private:
+
+    std::vector<std::shared_ptr<solver_type>> m_members;
+
+}; /* end class Ensemble */
+
+} /* end namespace gas */
+
+} /* end namespace march */
+
+// vim: set ff=unix fenc=utf8 nobomb et sw=4 ts=4:
@@ -0,0 +1,261 @@
+#pragma once
+
+/*
+ * Copyright (c) 2017, Yung-Yu Chen <yyc@solvcon.net>
+ * BSD 3-Clause License, see COPYING
+ */
+
+#include <algorithm>
+#include <condition_variable>
+#include <memory>
+#include <mutex>
+#include <stdexcept>
+#include <vector>
+
+#include "march/core.hpp"
+#include "march/mesh.hpp"
+
+#include "march/gas/Solution.hpp"
+#include "march/gas/Solver_decl.hpp"
+
+namespace march {
+
+namespace gas {
+
+/**
+ * Exchange the solution of the interface ghost cells among the solvers of the
+ * blocks of one domain in one process.  The ghost cells read the interior
+ * cells of the related solvers directly from memory.
+ *
+ * Each solver marches in its own thread.  Around an exchange all the solvers
+ * meet at a barrier twice: first to have the solution of all blocks ready,
+ * and then to keep the related solvers from changing it before the copy
+ * finishes.
+ *
+ * The exchange holds raw pointers to the bound solvers; they must outlive it.
+ */
+template< size_t NDIM, typename ElemType >
+class Exchange
+  : public std::enable_shared_from_this<Exchange<NDIM, ElemType>>
+{
+
+public:
+
+    using solver_type = Solver<NDIM, ElemType>;
+
+    class ctor_passkey {
+        ctor_passkey() = default;
+        friend Exchange<NDIM, ElemType>;
+    };
+
+    Exchange(ctor_passkey const &, index_type nblock)
+      : m_solvers(nblock, nullptr), m_links(nblock), m_ghosts(nblock), m_barrier(nblock)
+    {}
+
+    Exchange() = delete;
+    Exchange(Exchange const & ) = delete;
+    Exchange(Exchange       &&) = delete;
+    Exchange & operator=(Exchange const & ) = delete;
+    Exchange & operator=(Exchange       &&) = delete;
+
+    static std::shared_ptr<Exchange<NDIM, ElemType>> construct(index_type nblock) {
+        if (nblock <= 0) { throw std::invalid_argument("Exchange: nblock must be positive"); }
+        return std::make_shared<Exchange<NDIM, ElemType>>(ctor_passkey(), nblock);
+    }
+
+    index_type nblock() const { return m_solvers.size(); }
+
+    /**
+     * Bind the solver of the iblk-th block.
+     */
+    void bind(index_type iblk, solver_type & svr) {
+        check_block(iblk);
+        m_solvers[iblk] = &svr;
+        svr.exchange() = this->shared_from_this();
+    }
+
+    /**
+     * Relate the ghost cells of the iblk-th block to the interior cells of the
+     * jblk-th block.
+     */
+    void add_interface(
+        index_type iblk, index_type jblk
+      , std::vector<index_type> const & ghosts, std::vector<index_type> const & cells
+    ) {
+        check_block(iblk);
+        check_block(jblk);
+        if (ghosts.size() != cells.size()) {
+            throw std::invalid_argument("Exchange: numbers of ghost and interior cells differ");
+        }
+        m_links[iblk].push_back({jblk, ghosts, cells});
+        m_ghosts[iblk].insert(m_ghosts[iblk].end(), ghosts.begin(), ghosts.end());
+    }
+
+    /**
+     * Interface ghost cells of the solver.
+     */
+    std::vector<index_type> const & ghosts(solver_type const & svr) const { return m_ghosts[index_of(svr)]; }
+
+    /**
+     * Copy the geometry and the solution across all interfaces.  Called from
+     * one thread before marching.
+     */
+    void sync() {
+        for (index_type iblk=0; iblk<nblock(); ++iblk) {
+            solver_type & svr = solver(iblk);
+            for (auto const & link : m_links[iblk]) {
+                solver_type & rsvr = solver(link.jblk);
+                for (size_t it=0; it<link.ghosts.size(); ++it) {
+                    const index_type jcl = link.ghosts[it];
+                    const index_type rcl = link.cells[it];
+                    for (size_t idm=0; idm<NDIM; ++idm) { svr.cecnd()[jcl][idm] = rsvr.cecnd()[rcl][idm]; }
+                    svr.sol().gamma(jcl) = rsvr.sol().gamma(rcl);
+                    svr.sol().so0n(jcl) = rsvr.sol().so0n(rcl);
+                    svr.sol().so1n(jcl) = rsvr.sol().so1n(rcl);
+                }
+            }
+        }
+    }
+
+    /// Copy so0n of the related interior cells into the ghost cells.
+    void exchange_so0n(solver_type & svr) {
+        exchange(svr, [](solver_type & dst, index_type jcl, solver_type & src, index_type rcl) {
+            dst.sol().so0n(jcl) = src.sol().so0n(rcl);
+        });
+    }
+
+    /// Copy so1n of the related interior cells into the ghost cells.
+    void exchange_so1n(solver_type & svr) {
+        exchange(svr, [](solver_type & dst, index_type jcl, solver_type & src, index_type rcl) {
+            dst.sol().so1n(jcl) = src.sol().so1n(rcl);
+        });
+    }
+
+    /**
+     * Release the solvers waiting at the barrier.  They throw, so that a
+     * failure of one solver does not hang the others.
+     */
+    void abort() { m_barrier.abort(); }
+
+    /// Make the exchange usable after abort().
+    void reset() { m_barrier.reset(); }
+
+private:
+
+    struct Link {
+        index_type jblk;
+        std::vector<index_type> ghosts;
+        std::vector<index_type> cells;
+    }; /* end struct Link */
+
+    /**
+     * Reusable barrier.  C++14 does not have one.
+     */
+    class Barrier {
+
+    public:
+
+        Barrier(size_t count) : m_count(count) {}
+
+        void wait() {
+            std::unique_lock<std::mutex> lock(m_mutex);
+            if (m_aborted) { throw std::runtime_error("Exchange: aborted"); }
+            const size_t generation = m_generation;
+            if (++m_waiting == m_count) {
+                m_waiting = 0;
+                ++m_generation;
+                m_cond.notify_all();
+            } else {
+                m_cond.wait(lock, [&]{ return generation != m_generation || m_aborted; });
+                if (generation == m_generation) { throw std::runtime_error("Exchange: aborted"); }
+            }
+        }
+
+        void abort() {
+            std::lock_guard<std::mutex> lock(m_mutex);
+            m_aborted = true;
+            m_cond.notify_all();
+        }
+
+        void reset() {
+            std::lock_guard<std::mutex> lock(m_mutex);
+            m_aborted = false;
+            m_waiting = 0;
+        }
+
+    private:
+
+        std::mutex m_mutex;
+        std::condition_variable m_cond;
+        size_t m_count;
+        size_t m_waiting = 0;
+        size_t m_generation = 0;
+        bool m_aborted = false;
+
+    }; /* end class Barrier */
+
+    void check_block(index_type iblk) const {
+        if (iblk < 0 || iblk >= nblock()) {
+            throw std::out_of_range(string::format("Exchange: block %d not in [0, %d)", iblk, nblock()));
+        }
+    }
+
+    solver_type & solver(index_type iblk) const {
+        if (nullptr == m_solvers[iblk]) {
+            throw std::runtime_error(string::format("Exchange: block %d not bound", iblk));
+        }
+        return *m_solvers[iblk];
+    }
+
+    index_type index_of(solver_type const & svr) const {
+        auto it = std::find(m_solvers.begin(), m_solvers.end(), &svr);
+        if (it == m_solvers.end()) { throw std::runtime_error("Exchange: solver not bound"); }
+        return it - m_solvers.begin();
+    }
+
+    template< class CopyType >
+    void exchange(solver_type & svr, CopyType copy) {
+        const index_type iblk = index_of(svr);
+        m_barrier.wait();
+        for (auto const & link : m_links[iblk]) {
+            solver_type & rsvr = solver(link.jblk);
+            for (size_t it=0; it<link.ghosts.size(); ++it) {
+                copy(svr, link.ghosts[it], rsvr, link.cells[it]);
+            }
+        }
+        m_barrier.wait();
+    }
+
+    std::vector<solver_type *> m_solvers;
+    std::vector<std::vector<Link>> m_links;
+    std::vector<std::vector<index_type>> m_ghosts;
+    Barrier m_barrier;
+
+}; /* end class Exchange */
+
+template< size_t NDIM, typename ElemType >
+void Solver<NDIM, ElemType>::ibcsoln() {
+    if (m_exchange) { m_exchange->exchange_so0n(*this); }
+}
+
+template< size_t NDIM, typename ElemType >
+void Solver<NDIM, ElemType>::ibcdsoln() {
+    if (m_exchange) { m_exchange->exchange_so1n(*this); }
+}
+
+/**
+ * so0t of the interface ghost cells, which so0n of the interior cells next to
+ * them needs.
+ */
+template< size_t NDIM, typename ElemType >
+void Solver<NDIM, ElemType>::calc_so0t_interface() {
+    if (m_exchange) {
+        for (index_type jcl : m_exchange->ghosts(*this)) { calc_so0t_cell(jcl); }
+    }
+}
+
+} /* end namespace gas */
+
+} /* end namespace march */
+
+// vim: set ff=unix fenc=utf8 nobomb et sw=4 ts=4:
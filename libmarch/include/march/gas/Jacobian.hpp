@@ -41,16 +41,53 @@ struct Jacobian {
     using vector_type = Vector<NDIM>;
     using matrix_type = vector_type[NEQ][NEQ];
     using flux_type = vector_type[NEQ];
-    using const_solution_reference = const real_type (&)[NEQ];
     static constexpr real_type TINY=1.e-60;
-    void update(real_type gamma, const_solution_reference sol);
+    template< class SolutionType > void update(real_type gamma, SolutionType const & sol);
+    void calc_flux(const real_type (&usfc)[NEQ], flux_type & dfcn) const;
+    template< class DerivativeType, class SolutionType >
+    void calc_solt(DerivativeType const & dsol, SolutionType & solt) const;
     matrix_type jacos;
     flux_type fcn;
 }; /* end struct Jacobian */
 
+/**
+ * Flux at a point displaced by the solution difference usfc: fcn + jacos usfc.
+ * All loop bounds are compile-time constants so that the small dense product
+ * is fully unrolled and kept in registers.
+ */
+template< size_t NEQ, size_t NDIM >
+inline
+void Jacobian<NEQ, NDIM>::calc_flux(const real_type (&usfc)[NEQ], flux_type & dfcn) const {
+    for (size_t ieq=0; ieq<NEQ; ++ieq) {
+        for (size_t idm=0; idm<NDIM; ++idm) {
+            real_type val = fcn[ieq][idm];
+            for (size_t jeq=0; jeq<NEQ; ++jeq) { val += jacos[ieq][jeq][idm] * usfc[jeq]; }
+            dfcn[ieq][idm] = val;
+        }
+    }
+}
+
+/**
+ * Temporal derivative of the solution from its spatial derivative dsol:
+ * -sum(jacos dsol).
+ */
+template< size_t NEQ, size_t NDIM >
+template< class DerivativeType, class SolutionType >
+inline
+void Jacobian<NEQ, NDIM>::calc_solt(DerivativeType const & dsol, SolutionType & solt) const {
+    for (size_t ieq=0; ieq<NEQ; ++ieq) {
+        real_type val = 0.0;
+        for (size_t jeq=0; jeq<NEQ; ++jeq) {
+            for (size_t idm=0; idm<NDIM; ++idm) { val += jacos[ieq][jeq][idm] * dsol[jeq][idm]; }
+        }
+        solt[ieq] = -val;
+    }
+}
+
 template<>
+template< class SolutionType >
 inline
-void Jacobian<4, 2>::update(real_type gamma, const_solution_reference sol) {
+void Jacobian<4, 2>::update(real_type gamma, SolutionType const & sol) {
     // scalars.
     real_type ga, ga1, ga3, ga1h;
     real_type u1, u2, u3, u4;
@@ -115,8 +152,9 @@ void Jacobian<4, 2>::update(real_type gamma, const_solution_reference sol) {
 }
 
 template<>
+template< class SolutionType >
 inline
-void Jacobian<5, 3>::update(real_type gamma, const_solution_reference sol) {
+void Jacobian<5, 3>::update(real_type gamma, SolutionType const & sol) {
     // scalars.
     real_type ga, ga1, ga3, ga1h;
     real_type u1, u2, u3, u4, u5;
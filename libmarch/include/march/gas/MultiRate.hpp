@@ -0,0 +1,283 @@
+#pragma once
+
+/*
+ * Copyright (c) 2017, Yung-Yu Chen <yyc@solvcon.net>
+ * BSD 3-Clause License, see COPYING
+ */
+
+#include <algorithm>
+#include <memory>
+#include <stdexcept>
+#include <utility>
+#include <vector>
+
+#include "march/core.hpp"
+#include "march/mesh.hpp"
+
+#include "march/gas/Solution.hpp"
+#include "march/gas/Solver_decl.hpp"
+
+namespace march {
+
+namespace gas {
+
+/**
+ * Multi-rate marching of a solver.  At the start of each substep, the cells
+ * are binned into time levels by their CFL at the global time increment: a
+ * cell of the l-th level has its CFL no larger than Parameter::multirate_cfl()
+ * with the increment divided by 2^l, and the levels of neighboring cells differ
+ * by at most one.  The substep is then marched in the micro steps of the finest
+ * level, and a cell is updated at the end of each of its own intervals.
+ *
+ * A neighbor in the middle of its interval is moved to the time of the cell
+ * by its time derivative for the temporal flux and the derivative.  For the
+ * spatial flux the cell takes its own solution element on the basic
+ * conservation element shared with such a neighbor, which has no top there.
+ * The flux through the lateral sub-faces is integrated over the intervals of
+ * the finer of the cell and the neighbor owning them, with the solution
+ * element of the neighbor refreshed at each interval.  The conservation
+ * elements sharing a sub-face then take the same flux through it, and the
+ * tops and bottoms of the conservation elements of all levels match, so that
+ * the marching across levels conserves as the single-rate one does.
+ *
+ * Interface exchange and local time stepping are not supported.  The solver
+ * owns the multi-rate marching, which holds a reference of the solver.
+ */
+template< size_t NDIM, typename ElemType >
+class MultiRate {
+
+public:
+
+    using solver_type = Solver<NDIM, ElemType>;
+
+    static constexpr size_t neq = solver_type::neq;
+
+    class ctor_passkey {
+        ctor_passkey() = default;
+        friend MultiRate<NDIM, ElemType>;
+    };
+
+    MultiRate(ctor_passkey const &, solver_type & svr, index_type nlevel)
+      : m_svr(svr)
+      , m_nlevel(nlevel)
+      , m_level(svr.block()->ncell(), 0)
+      , m_time(svr.block()->ncell(), 0)
+      , m_vol(svr.block()->ncell())
+      , m_acc(svr.block()->ncell() * neq)
+      , m_partner(svr.block()->ngstcell())
+      , m_cells(nlevel)
+      , m_deferred(nlevel)
+    {
+        const auto & block = *svr.block();
+        for (index_type icl=0; icl<block.ncell(); ++icl) {
+            m_vol[icl] = ConservationElement<NDIM>(block, icl).vol;
+        }
+        for (index_type ibnd=0; ibnd<block.nbound(); ++ibnd) {
+            const index_type ifc = block.bndfcs()[ibnd][0];
+            m_ghosts.emplace_back(block.fccls()[ifc][1], block.fccls()[ifc][0]);
+            m_partner[block.fccls()[ifc][1] + block.ngstcell()] = block.fccls()[ifc][0];
+        }
+    }
+
+    MultiRate() = delete;
+    MultiRate(MultiRate const & ) = delete;
+    MultiRate(MultiRate       &&) = delete;
+    MultiRate & operator=(MultiRate const & ) = delete;
+    MultiRate & operator=(MultiRate       &&) = delete;
+
+    static std::shared_ptr<MultiRate<NDIM, ElemType>> construct(solver_type & svr, index_type nlevel) {
+        if (nlevel <= 0) { throw std::invalid_argument("MultiRate: nlevel must be positive"); }
+        if (svr.exchange()) { throw std::runtime_error("MultiRate: interface exchange is not supported"); }
+        if (svr.param().local_cfl() > 0) { throw std::runtime_error("MultiRate: local time stepping is not supported"); }
+        return std::make_shared<MultiRate<NDIM, ElemType>>(ctor_passkey(), svr, nlevel);
+    }
+
+    index_type nlevel() const { return m_nlevel; }
+
+    /// Time level of the cell, which is that of the interior cell for a ghost cell.
+    index_type level(index_type icl) const { return m_level[interior(icl)]; }
+
+    /// Cells in the level of the last substep.
+    std::vector<index_type> const & cells(index_type ilevel) const { return m_cells.at(ilevel); }
+
+    /// Number of cell updates; a single-rate substep updates each cell once.
+    size_t nupdate() const { return m_nupdate; }
+
+    /**
+     * Bin the cells into the time levels.  The CFL is calculated with the
+     * increment of the finest level, to which the cells beyond the last level
+     * belong.
+     */
+    void classify() {
+        const auto & block = *m_svr.block();
+        const index_type finest = m_nlevel - 1;
+        const real_type hdt = m_svr.state().time_increment * 0.5 / (1 << finest);
+        for (index_type icl=0; icl<block.ncell(); ++icl) {
+            m_svr.calc_cfl_cell(icl, hdt);
+            real_type cfl = m_svr.sol().cflo(icl) * (1 << finest);
+            index_type ilevel = 0;
+            while (ilevel < finest && cfl > m_svr.param().multirate_cfl()) {
+                cfl *= 0.5;
+                ++ilevel;
+            }
+            m_level[icl] = ilevel;
+        }
+        // a cell is at most one level coarser than its neighbors.
+        bool changed = true;
+        while (changed) {
+            changed = false;
+            for (index_type icl=0; icl<block.ncell(); ++icl) {
+                const auto & tclfcs = block.clfcs()[icl];
+                for (index_type ifl=0; ifl<tclfcs[0]; ++ifl) {
+                    const index_type jcl = block.fcrcl(tclfcs[ifl+1], icl);
+                    if (jcl >= 0 && m_level[icl] < m_level[jcl] - 1) {
+                        m_level[icl] = m_level[jcl] - 1;
+                        changed = true;
+                    }
+                }
+            }
+        }
+        for (auto & cells : m_cells) { cells.clear(); }
+        for (auto & faces : m_deferred) { faces.clear(); }
+        for (index_type icl=0; icl<block.ncell(); ++icl) {
+            m_cells[m_level[icl]].push_back(icl);
+            const auto & tclfcs = block.clfcs()[icl];
+            for (index_type ifl=0; ifl<tclfcs[0]; ++ifl) {
+                const index_type jlevel = level(block.fcrcl(tclfcs[ifl+1], icl));
+                if (jlevel > m_level[icl]) { m_deferred[jlevel].emplace_back(icl, ifl); }
+            }
+        }
+    }
+
+    /**
+     * March a substep of the solver, after Solver::update().  At the end so0n
+     * and so1n hold the solution, as in the single-rate marching.
+     */
+    void march_substep() {
+        auto & sol = m_svr.sol();
+        const auto & block = *m_svr.block();
+        // the cells not updated in a micro step keep so0n the same as so0c.
+        for (index_type icl=-block.ngstcell(); icl<block.ncell(); ++icl) {
+            sol.so0n(icl) = sol.so0c(icl);
+            sol.so1n(icl) = sol.so1c(icl);
+        }
+        classify();
+        std::fill(m_time.begin(), m_time.end(), 0);
+        m_svr.calc_so0t();
+        for (index_type icl=0; icl<block.ncell(); ++icl) { start(icl); }
+        const index_type finest = m_nlevel - 1;
+        const index_type nmicro = 1 << finest;
+        for (index_type imicro=0; imicro<nmicro; ++imicro) {
+            // the neighbors of the finer levels starting an interval.
+            for (index_type jlevel=1; jlevel<=finest; ++jlevel) {
+                if (0 != imicro % period(jlevel)) { continue; }
+                const real_type hdt = increment(jlevel);
+                for (auto const & face : m_deferred[jlevel]) {
+                    const index_type icl = face.first;
+                    const index_type ifl = face.second;
+                    real_type acc[neq];
+                    for (index_type ieq=0; ieq<neq; ++ieq) { acc[ieq] = 0; }
+                    m_svr.calc_so0n_temporal(icl, ifl, BasicCE<NDIM>(block, icl, ifl), hdt * 0.5, hdt, acc);
+                    for (index_type ieq=0; ieq<neq; ++ieq) { m_acc[icl*neq+ieq] += acc[ieq]; }
+                }
+            }
+            // the levels ending an interval.
+            index_type first = finest;
+            while (first > 0 && 0 == (imicro+1) % period(first-1)) { --first; }
+            const real_type time = increment(finest) * (imicro+1);
+            for (index_type ilevel=first; ilevel<=finest; ++ilevel) {
+                for (index_type icl : m_cells[ilevel]) {
+                    auto piso0n = sol.so0n(icl);
+                    for (index_type ieq=0; ieq<neq; ++ieq) { piso0n[ieq] = m_acc[icl*neq+ieq] / m_vol[icl]; }
+                    m_svr.throw_on_negative_density(__FILE__, __LINE__, __func__, icl);
+                    m_svr.throw_on_negative_energy(__FILE__, __LINE__, __func__, icl);
+                }
+            }
+            m_svr.trim_do0();
+            for (index_type ilevel=first; ilevel<=finest; ++ilevel) {
+                const real_type hdt = increment(ilevel);
+                for (index_type icl : m_cells[ilevel]) {
+                    real_type shifts[CellType::CLNFC_MAX];
+                    const auto & tclfcs = block.clfcs()[icl];
+                    for (index_type ifl=0; ifl<tclfcs[0]; ++ifl) {
+                        shifts[ifl] = time - m_time[interior(block.fcrcl(tclfcs[ifl+1], icl))];
+                    }
+                    m_svr.calc_cfl_cell(icl, hdt);
+                    m_svr.calc_so1n_cell(icl, hdt, shifts);
+                }
+                m_nupdate += m_cells[ilevel].size();
+            }
+            m_svr.trim_do1();
+            if (imicro+1 == nmicro) { break; }
+            for (auto const & ghost : m_ghosts) {
+                if (m_level[ghost.second] >= first) {
+                    sol.so0c(ghost.first) = sol.so0n(ghost.first);
+                    sol.so1c(ghost.first) = sol.so1n(ghost.first);
+                }
+            }
+            for (index_type ilevel=first; ilevel<=finest; ++ilevel) {
+                for (index_type icl : m_cells[ilevel]) {
+                    sol.so0c(icl) = sol.so0n(icl);
+                    sol.so1c(icl) = sol.so1n(icl);
+                    m_time[icl] = time;
+                    m_svr.calc_so0t_cell(icl);
+                }
+            }
+            for (index_type ilevel=first; ilevel<=finest; ++ilevel) {
+                for (index_type icl : m_cells[ilevel]) { start(icl); }
+            }
+        }
+    }
+
+private:
+
+    index_type interior(index_type icl) const { return icl >= 0 ? icl : m_partner[icl + m_svr.block()->ngstcell()]; }
+
+    /// Number of micro steps in an interval of the level.
+    index_type period(index_type ilevel) const { return 1 << (m_nlevel - 1 - ilevel); }
+
+    /// Interval of the level, the half time increment of it.
+    real_type increment(index_type ilevel) const { return m_svr.state().time_increment * 0.5 / (1 << ilevel); }
+
+    /**
+     * Start an interval of the cell by accumulating the spatial flux and the
+     * temporal flux from the neighbors not finer than the cell.
+     */
+    void start(index_type icl) {
+        const auto & block = *m_svr.block();
+        const ConservationElement<NDIM> icce(block, icl);
+        const real_type hdt = increment(m_level[icl]);
+        real_type acc[neq];
+        for (index_type ieq=0; ieq<neq; ++ieq) { acc[ieq] = 0; }
+        const auto & tclfcs = block.clfcs()[icl];
+        for (index_type ifl=0; ifl<tclfcs[0]; ++ifl) {
+            const index_type jcl = block.fcrcl(tclfcs[ifl+1], icl);
+            const real_type sdt = m_time[icl] - m_time[interior(jcl)];
+            // a neighbor in the middle of its interval has no top there.
+            m_svr.calc_so0n_spatial(0 == sdt ? jcl : icl, icce.bces[ifl], acc);
+            if (m_level[interior(jcl)] <= m_level[icl]) {
+                m_svr.calc_so0n_temporal(icl, ifl, icce.bces[ifl], sdt + hdt * 0.5, hdt, acc);
+            }
+        }
+        for (index_type ieq=0; ieq<neq; ++ieq) { m_acc[icl*neq+ieq] = acc[ieq]; }
+    }
+
+    solver_type & m_svr;
+    index_type m_nlevel;
+    std::vector<index_type> m_level;
+    std::vector<real_type> m_time;
+    std::vector<real_type> m_vol;
+    std::vector<real_type> m_acc;
+    std::vector<index_type> m_partner;
+    std::vector<std::pair<index_type, index_type>> m_ghosts;
+    std::vector<std::vector<index_type>> m_cells;
+    std::vector<std::vector<std::pair<index_type, index_type>>> m_deferred;
+    size_t m_nupdate = 0;
+
+}; /* end class MultiRate */
+
+} /* end namespace gas */
+
+} /* end namespace march */
+
+// vim: set ff=unix fenc=utf8 nobomb et sw=4 ts=4:
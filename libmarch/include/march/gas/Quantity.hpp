@@ -7,6 +7,10 @@
 
 #include <algorithm>
 #include <cmath>
+#include <stdexcept>
+#include <string>
+#include <utility>
+#include <vector>
 
 #include "march/core.hpp"
 #include "march/mesh.hpp"
@@ -20,18 +24,19 @@ namespace gas {
 /**
  * Passive quantities that may be calculated from solution data.
  */
-template< size_t NDIM >
+template< size_t NDIM, typename ElemType >
 class Quantity
-  : public InstanceCounter<Quantity<NDIM>>
-  , public std::enable_shared_from_this<Quantity<NDIM>>
+  : public InstanceCounter<Quantity<NDIM, ElemType>>
+  , public std::enable_shared_from_this<Quantity<NDIM, ElemType>>
 {
 
 public:
 
-    using solver_type = Solver<NDIM>;
+    using solver_type = Solver<NDIM, ElemType>;
     using solution_type = typename solver_type::solution_type;
     using block_type = UnstructuredBlock<NDIM>;
     using vector_type = Vector<NDIM>;
+    using int_type = typename solver_type::int_type;
 
     using o0hand_type = typename solution_type::o0hand_type;
     using o1hand_type = typename solution_type::o1hand_type;
@@ -40,7 +45,7 @@ public:
 
     class ctor_passkey {
         ctor_passkey() = default;
-        friend Quantity<NDIM>;
+        friend Quantity<NDIM, ElemType>;
     };
 
     Quantity(ctor_passkey const &, solver_type const & solver)
@@ -63,8 +68,8 @@ public:
     Quantity & operator=(Quantity const & ) = delete;
     Quantity & operator=(Quantity       &&) = delete;
 
-    static std::shared_ptr<Quantity<NDIM>> construct(solver_type const & solver) {
-        return std::make_shared<Quantity<NDIM>>(ctor_passkey(), solver);
+    static std::shared_ptr<Quantity<NDIM, ElemType>> construct(solver_type const & solver) {
+        return std::make_shared<Quantity<NDIM, ElemType>>(ctor_passkey(), solver);
     }
 
     real_type const & gasconst() const { return m_gasconst; }
@@ -76,14 +81,83 @@ public:
     real_type const & schlieren_k1() const { return m_schlieren_k1; }
     real_type       & schlieren_k1()       { return m_schlieren_k1; }
 
-    void update() {
-        update_density();
-        update_velocity();
-        update_vorticity();
-        update_misc();
-        update_schlieren();
+    /**
+     * Bit flags for selecting the quantities to update.  A flag only has
+     * prerequisites in lower bits.
+     */
+    using flag_type = uint32_t;
+    enum : flag_type {
+        DENSITY     = 1 << 0
+      , VELOCITY    = 1 << 1
+      , VORTICITY   = 1 << 2 //< and its magnitude
+      , KE          = 1 << 3
+      , PRESSURE    = 1 << 4
+      , TEMPERATURE = 1 << 5
+      , SOUNDSPEED  = 1 << 6
+      , MACH        = 1 << 7
+      , SCHLIEREN   = 1 << 8
+      , ALL         = (1 << 9) - 1
+    };
+
+    /**
+     * Add the prerequisites of the given quantities.
+     */
+    static flag_type closure(flag_type flags) {
+        if (flags & MACH)        { flags |= KE | SOUNDSPEED; }
+        if (flags & SOUNDSPEED)  { flags |= PRESSURE; }
+        if (flags & TEMPERATURE) { flags |= PRESSURE; }
+        if (flags & PRESSURE)    { flags |= KE; }
+        if (flags & KE)          { flags |= VELOCITY; }
+        if (flags & VORTICITY)   { flags |= VELOCITY; }
+        if (flags & VELOCITY)    { flags |= DENSITY; }
+        return flags;
+    }
+
+    /**
+     * Convert the name of a quantity table to its flag.
+     */
+    static flag_type flag_of(std::string const & name) {
+        if      ("density"             == name) { return DENSITY; }
+        else if ("velocity"            == name) { return VELOCITY; }
+        else if ("vorticity"           == name) { return VORTICITY; }
+        else if ("vorticity_magnitude" == name) { return VORTICITY; }
+        else if ("ke"                  == name) { return KE; }
+        else if ("pressure"            == name) { return PRESSURE; }
+        else if ("temperature"         == name) { return TEMPERATURE; }
+        else if ("soundspeed"          == name) { return SOUNDSPEED; }
+        else if ("mach"                == name) { return MACH; }
+        else if ("schlieren"           == name) { return SCHLIEREN; }
+        else { throw std::invalid_argument("unknown quantity: " + name); }
     }
 
+    /**
+     * Declare that the quantities in flags are needed every interval steps.
+     * Zero interval means every time the solver updates.
+     */
+    void demand(flag_type flags, int_type interval=0) {
+        m_demands.push_back(std::make_pair(flags, interval));
+    }
+    void clear_demand() { m_demands.clear(); }
+
+    /**
+     * The quantities demanded at the given step.  Everything is due when
+     * nothing is declared.
+     */
+    flag_type due(int_type step) const {
+        if (m_demands.empty()) { return ALL; }
+        flag_type flags = 0;
+        for (auto const & dmd : m_demands) {
+            if (0 == dmd.second || 0 == step % dmd.second) { flags |= dmd.first; }
+        }
+        return flags;
+    }
+
+    /**
+     * Update the selected quantities and their prerequisites in one pass over
+     * the cells.  Schlieren needs another pass for normalization.
+     */
+    void update(flag_type flags=ALL);
+
 #define MARCH_GAS_QUANTITY_TABLE_DECL_METHODS(NAME, ELEMTYPE, NDIM) \
     LookupTable<ELEMTYPE, NDIM> const & NAME() const { return m_##NAME; } \
     LookupTable<ELEMTYPE, NDIM>       & NAME()       { return m_##NAME; }
@@ -120,13 +194,10 @@ private:
         return m_solver.sol().so1n(icl);
     }
 
-    void update_density();
-    void update_velocity();
-    void update_vorticity();
-    void update_misc();
-    void update_schlieren();
+    void normalize_schlieren(real_type rhogmax);
 
     solver_type const & m_solver;
+    std::vector<std::pair<flag_type, int_type>> m_demands;
     real_type m_gasconst = 1;
     real_type m_schlieren_k = 1;
     real_type m_schlieren_k0 = 0;
@@ -146,19 +217,11 @@ private:
 
 namespace detail {
 
-template< size_t NDIM >
-Vector<NDIM>
-compute_vorticity(
-    typename Solver<NDIM>::solution_type::o1hand_type const deriv
-  , Vector<NDIM> const & vel
-  , real_type const rho
-);
-
-template<>
+template< class HandType >
 inline
 Vector<2>
 compute_vorticity(
-    typename Solver<2>::solution_type::o1hand_type const deriv
+    HandType const & deriv
   , Vector<2> const & vel
   , real_type const rho
 ) {
@@ -169,11 +232,11 @@ compute_vorticity(
     return ret;
 }
 
-template<>
+template< class HandType >
 inline
 Vector<3>
 compute_vorticity(
-    typename Solver<3>::solution_type::o1hand_type const deriv
+    HandType const & deriv
   , Vector<3> const & vel
   , real_type rho
 ) {
@@ -189,104 +252,85 @@ compute_vorticity(
 
 } /* end namespace detail */
 
-template< size_t NDIM >
-void Quantity<NDIM>::update_density() {
-    for (index_type icl=-block().ngstcell(); icl<block().ncell(); ++icl) {
-        m_density[icl] = so0n(icl)[0] + so1n(icl)[0].dot(get_shift(icl));
-    }
-}
-
-template< size_t NDIM >
-void Quantity<NDIM>::update_velocity() {
+template< size_t NDIM, typename ElemType >
+void Quantity<NDIM, ElemType>::update(flag_type flags) {
+    flags = closure(flags);
+    if (!flags) { return; }
+    real_type rhogmax = 0;
     for (index_type icl=-block().ngstcell(); icl<block().ncell(); ++icl) {
         // input
         vector_type const sft = get_shift(icl);
         auto const & soln = so0n(icl);
         auto const & dsoln = so1n(icl);
-        real_type const rho = m_density[icl];
-        // output
+        if (flags & SCHLIEREN) {
+            auto & tsch = m_schlieren[icl];
+            tsch = dsoln[0].square();
+            rhogmax = std::max(rhogmax, tsch);
+        }
+        if (!(flags & DENSITY)) { continue; }
+        // density.
+        real_type const rho = soln[0] + dsoln[0].dot(sft);
+        m_density[icl] = rho;
+        if (!(flags & VELOCITY)) { continue; }
+        // velocity.
         auto & tvel = reinterpret_cast<vector_type &>(m_velocity[icl]);
         for (index_type it=0; it<NDIM; ++it) {
             tvel[it] = (soln[it+1] + dsoln[it+1].dot(sft)) / rho;
         }
-    }
-}
-
-template< size_t NDIM >
-void Quantity<NDIM>::update_vorticity() {
-    for (index_type icl=-block().ngstcell(); icl<block().ncell(); ++icl) {
-        // input
-        auto const & dsoln = so1n(icl);
-        // output
-        auto & tvor = reinterpret_cast<vector_type &>(m_vorticity[icl]);
-        auto & tvorm = m_vorticity_magnitude[icl];
-        tvor = detail::compute_vorticity(
-            dsoln
-          , reinterpret_cast<vector_type &>(m_velocity[icl])
-          , m_density[icl]);
-        if (NDIM == 3) { tvorm = tvor.length(); }
-        else           { tvorm = fabs(tvor[0]); }
-    }
-}
-
-template< size_t NDIM >
-void Quantity<NDIM>::update_schlieren() {
-    real_type rhogmax = 0;
-    for (index_type icl=-block().ngstcell(); icl<block().ncell(); ++icl) {
-        // input
-        auto const & dsoln = so1n(icl);
-        // output
-        auto & tsch = m_schlieren[icl];
-        tsch = dsoln[0].square();
-        rhogmax = std::max(rhogmax, tsch);
-    }
-    real_type const fac0 = schlieren_k0() * rhogmax;
-    real_type const fac1 = -schlieren_k() / ((schlieren_k1()-schlieren_k0()) * rhogmax + ALMOST_ZERO);
-    for (index_type icl=-block().ngstcell(); icl<block().ncell(); ++icl) {
-        auto & tsch = m_schlieren[icl];
-        tsch = std::exp((tsch-fac0)*fac1);
-    }
-}
-
-template< size_t NDIM >
-void Quantity<NDIM>::update_misc() {
-    for (index_type icl=-block().ngstcell(); icl<block().ncell(); ++icl) {
-        // input
-        auto const sft = get_shift(icl);
-        auto const & soln = so0n(icl);
-        auto const & dsoln = so1n(icl);
-        const real_type ga = m_solver.sol().gamma(icl);
-        const real_type ga1 = ga - 1;
-        auto const & tvel = reinterpret_cast<vector_type &>(m_velocity[icl]);
-        auto const rho = m_density[icl];
-        // output
-        auto & tpre = m_pressure[icl];
-        auto & ttem = m_temperature[icl];
-        auto & tke = m_ke[icl];
-        auto & tss = m_soundspeed[icl];
-        auto & tmach = m_mach[icl];
+        // vorticity.
+        if (flags & VORTICITY) {
+            auto & tvor = reinterpret_cast<vector_type &>(m_vorticity[icl]);
+            tvor = detail::compute_vorticity(dsoln, tvel, rho);
+            if (NDIM == 3) { m_vorticity_magnitude[icl] = tvor.length(); }
+            else           { m_vorticity_magnitude[icl] = fabs(tvor[0]); }
+        }
+        if (!(flags & KE)) { continue; }
         // kinetic energy.
+        auto & tke = m_ke[icl];
         tke = tvel.square() * rho / 2;
+        if (!(flags & PRESSURE)) { continue; }
         // pressure.
+        const real_type ga = m_solver.sol().gamma(icl);
+        const real_type ga1 = ga - 1;
+        auto & tpre = m_pressure[icl];
         tpre = soln[NDIM+1] + dsoln[NDIM+1].dot(sft);
         tpre = (tpre - tke) * ga1;
         tpre = (tpre + fabs(tpre)) / 2; // make sure it's positive.
         // temperature.
-        ttem = tpre / (rho*gasconst());
+        if (flags & TEMPERATURE) {
+            m_temperature[icl] = tpre / (rho*gasconst());
+        }
         // speed of sound.
-        tss = sqrt(ga*tpre/rho);
-        // Mach number.
-        tmach = sqrt(tke/rho*2);
-        tmach *= tss / (tss*tss + ALMOST_ZERO); // prevent nan/inf.
+        if (flags & SOUNDSPEED) {
+            auto & tss = m_soundspeed[icl];
+            tss = sqrt(ga*tpre/rho);
+            // Mach number.
+            if (flags & MACH) {
+                auto & tmach = m_mach[icl];
+                tmach = sqrt(tke/rho*2);
+                tmach *= tss / (tss*tss + ALMOST_ZERO); // prevent nan/inf.
+            }
+        }
+    }
+    if (flags & SCHLIEREN) { normalize_schlieren(rhogmax); }
+}
+
+template< size_t NDIM, typename ElemType >
+void Quantity<NDIM, ElemType>::normalize_schlieren(real_type const rhogmax) {
+    real_type const fac0 = schlieren_k0() * rhogmax;
+    real_type const fac1 = -schlieren_k() / ((schlieren_k1()-schlieren_k0()) * rhogmax + ALMOST_ZERO);
+    for (index_type icl=-block().ngstcell(); icl<block().ncell(); ++icl) {
+        auto & tsch = m_schlieren[icl];
+        tsch = std::exp((tsch-fac0)*fac1);
     }
 }
 
-template< size_t NDIM >
-std::shared_ptr<Quantity<NDIM>> const & Solver<NDIM>::make_qty(bool throw_on_exist) {
+template< size_t NDIM, typename ElemType >
+std::shared_ptr<Quantity<NDIM, ElemType>> const & Solver<NDIM, ElemType>::make_qty(bool throw_on_exist) {
     if (m_qty) {
         if (throw_on_exist) { throw std::runtime_error("Quantity already exists"); }
     } else {
-        m_qty = Quantity<NDIM>::construct(*this);
+        m_qty = Quantity<NDIM, ElemType>::construct(*this);
     }
     return m_qty;
 }
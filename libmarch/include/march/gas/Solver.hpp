@@ -5,30 +5,36 @@
  * BSD 3-Clause License, see COPYING
  */
 
+#include <algorithm>
 #include <cstdint>
 #include <limits>
 #include <memory>
+#include <vector>
 
 #include "march/core.hpp"
 #include "march/mesh.hpp"
 
 #include "march/gas/Solver_decl.hpp"
 #include "march/gas/Anchor.hpp"
+#include "march/gas/Exchange.hpp"
+#include "march/gas/MultiRate.hpp"
 #include "march/gas/Quantity.hpp"
 
 namespace march {
 
 namespace gas {
 
-template< size_t NDIM >
-Solver<NDIM>::Solver(
-    const Solver<NDIM>::ctor_passkey &
-  , const std::shared_ptr<Solver<NDIM>::block_type> & block
+template< size_t NDIM, typename ElemType >
+Solver<NDIM, ElemType>::Solver(
+    const Solver<NDIM, ElemType>::ctor_passkey &
+  , const std::shared_ptr<Solver<NDIM, ElemType>::block_type> & block
+  , Layout layout
+  , index_type nmember
 )
-  : InstanceCounter<Solver<NDIM>>()
+  : InstanceCounter<Solver<NDIM, ElemType>>()
   , m_block(block)
   , m_cecnd(block->ngstcell(), block->ncell())
-  , m_sol(block->ngstcell(), block->ncell())
+  , m_sol(block->ngstcell(), block->ncell(), layout, nmember)
 {
     for (index_type icl=0; icl<block->ncell(); ++icl) {
         reinterpret_cast<Vector<NDIM> &>(m_cecnd[icl]) = ConservationElement<NDIM>(*block, icl).cnd;
@@ -46,150 +52,295 @@ Solver<NDIM>::Solver(
     }
 }
 
-template< size_t NDIM >
-void Solver<NDIM>::update(real_type time , real_type time_increment)
+template< size_t NDIM, typename ElemType >
+Solver<NDIM, ElemType>::Solver(
+    const Solver<NDIM, ElemType>::ctor_passkey &
+  , Solver<NDIM, ElemType> const & leader
+  , index_type imember
+)
+  : InstanceCounter<Solver<NDIM, ElemType>>()
+  , m_block(leader.m_block)
+  , m_cecnd(leader.m_cecnd)
+  , m_param(leader.m_param)
+  , m_sol(leader.m_sol, imember)
+{}
+
+template< size_t NDIM, typename ElemType >
+void Solver<NDIM, ElemType>::update(real_type time , real_type time_increment)
 {
     m_state.time = time;
     m_state.time_increment = time_increment;
     m_sol.update();
 }
 
-template< size_t NDIM >
-void Solver<NDIM>::calc_so0t() {
-    // references.
-    auto & block = *m_block;
-    // jacobian matrix.
-    Jacobian<neq, ndim> jaco;
+template< size_t NDIM, typename ElemType >
+void Solver<NDIM, ElemType>::calc_so0t() {
+    for (index_type icl=0; icl<m_block->ncell(); ++icl) {
+        calc_so0t_cell(icl);
+    }
+}
+
+template< size_t NDIM, typename ElemType >
+void Solver<NDIM, ElemType>::calc_so0n() {
+    for (index_type icl=0; icl<m_block->ncell(); ++icl) {
+        const real_type dt = time_increment(icl);
+        calc_so0n_cell(icl, dt * 0.25, dt * 0.5);
+    }
+}
+
+template< size_t NDIM, typename ElemType >
+void Solver<NDIM, ElemType>::calc_cfl() {
+    for (index_type icl=0; icl<m_block->ncell(); ++icl) {
+        calc_cfl_cell(icl, time_increment(icl) / 2.0);
+    }
+}
+
+/**
+ * Scale the local time increment of each cell by the CFL of the previous
+ * substep for it to approach Parameter::local_cfl().  The increment grows at
+ * most twice a substep, starts from the global one, and does not exceed those
+ * of the neighbors, into which the conservation element of the cell reaches.
+ * Does nothing without the local time stepping.
+ */
+template< size_t NDIM, typename ElemType >
+void Solver<NDIM, ElemType>::calc_ldt() {
+    const real_type local_cfl = m_param.local_cfl();
+    if (local_cfl <= 0) { return; }
+    const auto & block = *m_block;
+    std::vector<real_type> target(block.ncell());
+    for (index_type icl=0; icl<block.ncell(); ++icl) {
+        const real_type ratio = local_cfl / std::max(m_sol.cflo(icl), real_type(TINY));
+        // the CFL is unknown before the first substep.
+        target[icl] = m_sol.ldt(icl) > 0 ? m_sol.ldt(icl) * std::min(ratio, 2.0) : m_state.time_increment;
+    }
     for (index_type icl=0; icl<block.ncell(); ++icl) {
-        auto piso0t = m_sol.so0t(icl);
-        auto piso1c = m_sol.so1c(icl);
-        jaco.update(m_sol.gamma(icl), *m_sol.so0c(icl));
-        for (index_type ieq=0; ieq<neq; ieq++) {
-            piso0t[ieq] = 0.0;
-            for (index_type idm=0; idm<NDIM; idm++) {
-                real_type val = 0.0;
-                for (index_type jeq=0; jeq<neq; jeq++) {
-                    val += jaco.jacos[ieq][jeq][idm]*piso1c[jeq][idm];
+        real_type ldt = target[icl];
+        const auto & tclfcs = block.clfcs()[icl];
+        for (index_type ifl=0; ifl<tclfcs[0]; ++ifl) {
+            const index_type jcl = block.fcrcl(tclfcs[ifl+1], icl);
+            if (jcl >= 0) { ldt = std::min(ldt, target[jcl]); }
+        }
+        m_sol.ldt(icl) = ldt;
+    }
+}
+
+/**
+ * Calculate so0t and so0n tile by tile, so that the rows of a tile stay in
+ * cache between the two.  so0n of a cell needs so0t of its neighbors, so the
+ * neighbors beyond the tile (the halo) get their so0t calculated ahead and
+ * marked to be skipped by their own tiles.
+ */
+template< size_t NDIM, typename ElemType >
+void Solver<NDIM, ElemType>::calc_so0t_so0n_tiled() {
+    // references.
+    const auto & block = *m_block;
+    const index_type ncell = block.ncell();
+    const index_type ntile = m_param.tile_size() > 0 ? m_param.tile_size() : ncell;
+    std::vector<bool> ahead(ncell, false);
+    for (index_type ist=0; ist<ncell; ist+=ntile) {
+        const index_type ied = std::min(ist+ntile, ncell);
+        for (index_type icl=ist; icl<ied; ++icl) {
+            if (!ahead[icl]) { calc_so0t_cell(icl); }
+            const auto & tclfcs = block.clfcs()[icl];
+            for (index_type ifl=0; ifl<tclfcs[0]; ++ifl) {
+                const index_type jcl = block.fcrcl(tclfcs[ifl+1], icl);
+                if (jcl >= ied && !ahead[jcl]) {
+                    calc_so0t_cell(jcl);
+                    ahead[jcl] = true;
                 }
-                piso0t[ieq] -= val;
             }
         }
+        for (index_type icl=ist; icl<ied; ++icl) {
+            const real_type dt = time_increment(icl);
+            calc_so0n_cell(icl, dt * 0.25, dt * 0.5);
+        }
     }
 }
 
-template< size_t NDIM >
-void Solver<NDIM>::calc_so0n() {
+/**
+ * Calculate CFL and so1n in one sweep.  so1n of a cell needs only so0n and
+ * CFL of itself, so no halo is needed.
+ */
+template< size_t NDIM, typename ElemType >
+void Solver<NDIM, ElemType>::calc_cfl_so1n() {
+    for (index_type icl=0; icl<m_block->ncell(); ++icl) {
+        const real_type hdt = time_increment(icl) * 0.5;
+        calc_cfl_cell(icl, hdt);
+        calc_so1n_cell(icl, hdt);
+    }
+}
+
+template< size_t NDIM, typename ElemType >
+void Solver<NDIM, ElemType>::calc_so0t_cell(index_type icl) {
+    // jacobian matrix.
+    Jacobian<neq, ndim> jaco;
+    auto piso0t = m_sol.so0t(icl);
+    jaco.update(m_sol.gamma(icl), m_sol.so0c(icl));
+    jaco.calc_solt(m_sol.so1c(icl), piso0t);
+}
+
+template< size_t NDIM, typename ElemType >
+void Solver<NDIM, ElemType>::calc_so0n_cell(
+    index_type icl, ConservationElement<NDIM> const & icce, real_type qdt, real_type hdt
+) {
     // references.
     const auto & block = *m_block;
     // buffers.
     Jacobian<neq, ndim> jaco;
 
-    const real_type qdt = m_state.time_increment * 0.25;
-    const real_type hdt = m_state.time_increment * 0.5;
-    for (index_type icl=0; icl<block.ncell(); ++icl) {
-        const ConservationElement<NDIM> icce(block, icl);
-        auto piso0n = m_sol.so0n(icl);
-        piso0n = 0.0; // initialize fluxes.
+    real_type so0n[neq]; // accumulate fluxes in real_type.
+    for (index_type ieq=0; ieq<neq; ++ieq) { so0n[ieq] = 0.0; }
 
-        const auto & tclfcs = block.clfcs()[icl];
-        for (index_type ifl=0; ifl<tclfcs[0]; ++ifl) {
-            const BasicCE<NDIM> & ibce = icce.bces[ifl];
-            const index_type ifc = tclfcs[ifl+1];
-            const auto & tfcnds = block.fcnds()[ifc];
-            const index_type jcl = block.fcrcl(ifc, icl); // neighboring cell.
-            const auto & jcecnd = reinterpret_cast<const Vector<NDIM> &>(m_cecnd[jcl]);
-            const auto pjso0c = m_sol.so0c(jcl);
-            const auto pjso0t = m_sol.so0t(jcl);
-            const auto pjso1c = m_sol.so1c(jcl);
-
-            // spatial flux (given time).
+    const auto & tclfcs = block.clfcs()[icl];
+    for (index_type ifl=0; ifl<tclfcs[0]; ++ifl) {
+        const BasicCE<NDIM> & ibce = icce.bces[ifl];
+        const index_type ifc = tclfcs[ifl+1];
+        const auto & tfcnds = block.fcnds()[ifc];
+        const index_type jcl = block.fcrcl(ifc, icl); // neighboring cell.
+        const auto & jcecnd = reinterpret_cast<const Vector<NDIM> &>(m_cecnd[jcl]);
+        const auto pjso0c = m_sol.so0c(jcl);
+        const auto pjso0t = m_sol.so0t(jcl);
+        const auto pjso1c = m_sol.so1c(jcl);
+
+        // spatial flux (given time).
+        for (index_type ieq=0; ieq<neq; ++ieq) {
+            real_type fusp = pjso0c[ieq];
+            fusp += (ibce.cnd - jcecnd).dot(pjso1c[ieq]);
+            so0n[ieq] += fusp * ibce.vol;
+        }
+
+        // temporal flux (given space).
+        jaco.update(m_sol.gamma(icl), pjso0c);
+        for (index_type inf=0; inf<tfcnds[0]; ++inf) {
+            real_type usfc[neq];
+            vector_type dfcn[neq];
+            // solution at sub-face center.
             for (index_type ieq=0; ieq<neq; ++ieq) {
-                real_type fusp = pjso0c[ieq];
-                fusp += (ibce.cnd - jcecnd).dot(pjso1c[ieq]);
-                piso0n[ieq] += fusp * ibce.vol;
+                usfc[ieq] = qdt * pjso0t[ieq];
+                usfc[ieq] += (ibce.sfcnd[inf] - jcecnd).dot(pjso1c[ieq]);
             }
-
-            // temporal flux (given space).
-            jaco.update(m_sol.gamma(icl), *pjso0c);
-            for (index_type inf=0; inf<tfcnds[0]; ++inf) {
-                real_type usfc[neq];
-                vector_type dfcn[neq];
-                // solution at sub-face center.
-                for (index_type ieq=0; ieq<neq; ++ieq) {
-                    usfc[ieq] = qdt * pjso0t[ieq];
-                    usfc[ieq] += (ibce.sfcnd[inf] - jcecnd).dot(pjso1c[ieq]);
-                }
-                // spatial derivatives.
-                for (index_type ieq=0; ieq<neq; ++ieq) {
-                    dfcn[ieq] = jaco.fcn[ieq];
-                    for (index_type jeq=0; jeq<neq; ++jeq) {
-                        dfcn[ieq] += jaco.jacos[ieq][jeq] * usfc[jeq];
-                    }
-                }
-                // temporal flux.
-                for (index_type ieq=0; ieq<neq; ++ieq) {
-                    piso0n[ieq] -= hdt * dfcn[ieq].dot(ibce.sfnml[inf]);
-                }
+            // spatial derivatives.
+            jaco.calc_flux(usfc, dfcn);
+            // temporal flux.
+            for (index_type ieq=0; ieq<neq; ++ieq) {
+                so0n[ieq] -= hdt * dfcn[ieq].dot(ibce.sfnml[inf]);
             }
         }
+    }
+
+    // update solutions.
+    auto piso0n = m_sol.so0n(icl);
+    for (index_type ieq=0; ieq<neq; ++ieq) {
+        piso0n[ieq] = so0n[ieq] / icce.vol;
+    }
 
-        // update solutions.
+    throw_on_negative_density(__FILE__, __LINE__, __func__, icl);
+    throw_on_negative_energy(__FILE__, __LINE__, __func__, icl);
+}
+
+/**
+ * Add the spatial flux of ibce, a basic conservation element of the cell, to
+ * so0n, with the solution element of jcl, the neighbor across the face or the
+ * cell itself.  This and calc_so0n_temporal() split calc_so0n_cell(), which
+ * keeps the fused loop for speed, face by face for MultiRate.
+ */
+template< size_t NDIM, typename ElemType >
+void Solver<NDIM, ElemType>::calc_so0n_spatial(
+    index_type jcl, BasicCE<NDIM> const & ibce, real_type (& so0n)[neq]
+) const {
+    const auto & jcecnd = reinterpret_cast<const Vector<NDIM> &>(m_cecnd[jcl]);
+    const auto pjso0c = m_sol.so0c(jcl);
+    const auto pjso1c = m_sol.so1c(jcl);
+    for (index_type ieq=0; ieq<neq; ++ieq) {
+        real_type fusp = pjso0c[ieq];
+        fusp += (ibce.cnd - jcecnd).dot(pjso1c[ieq]);
+        so0n[ieq] += fusp * ibce.vol;
+    }
+}
+
+/**
+ * Add the temporal flux through the lateral sub-faces of ibce, the ifl-th
+ * basic conservation element of the cell, to so0n, over the interval of hdt
+ * whose middle is qdt after the solution element of the neighbor.
+ */
+template< size_t NDIM, typename ElemType >
+void Solver<NDIM, ElemType>::calc_so0n_temporal(
+    index_type icl, index_type ifl, BasicCE<NDIM> const & ibce, real_type qdt, real_type hdt, real_type (& so0n)[neq]
+) const {
+    const index_type ifc = m_block->clfcs()[icl][ifl+1];
+    const auto & tfcnds = m_block->fcnds()[ifc];
+    const index_type jcl = m_block->fcrcl(ifc, icl); // neighboring cell.
+    const auto & jcecnd = reinterpret_cast<const Vector<NDIM> &>(m_cecnd[jcl]);
+    const auto pjso0c = m_sol.so0c(jcl);
+    const auto pjso0t = m_sol.so0t(jcl);
+    const auto pjso1c = m_sol.so1c(jcl);
+    Jacobian<neq, ndim> jaco;
+    jaco.update(m_sol.gamma(icl), pjso0c);
+    for (index_type inf=0; inf<tfcnds[0]; ++inf) {
+        real_type usfc[neq];
+        vector_type dfcn[neq];
+        // solution at sub-face center.
         for (index_type ieq=0; ieq<neq; ++ieq) {
-            piso0n[ieq] /= icce.vol;
+            usfc[ieq] = qdt * pjso0t[ieq];
+            usfc[ieq] += (ibce.sfcnd[inf] - jcecnd).dot(pjso1c[ieq]);
+        }
+        // spatial derivatives.
+        jaco.calc_flux(usfc, dfcn);
+        // temporal flux.
+        for (index_type ieq=0; ieq<neq; ++ieq) {
+            so0n[ieq] -= hdt * dfcn[ieq].dot(ibce.sfnml[inf]);
         }
-
-        throw_on_negative_density(__FILE__, __LINE__, __func__, icl);
-        throw_on_negative_energy(__FILE__, __LINE__, __func__, icl);
     }
 }
 
-template< size_t NDIM >
-void Solver<NDIM>::calc_cfl() {
+template< size_t NDIM, typename ElemType >
+void Solver<NDIM, ElemType>::calc_cfl_cell(index_type icl, ConservationElement<NDIM> const & cce, real_type hdt) {
     // references.
     auto & block = *m_block;
-    const real_type hdt = m_state.time_increment / 2.0;
-    for (index_type icl=0; icl<block.ncell(); ++icl) {
-        auto & cflc = m_sol.cflc(icl);
-        auto & cflo = m_sol.cflo(icl);
-        auto piso0n = m_sol.so0n(icl);
-        const ConservationElement<NDIM> cce(block, icl);
-        const auto & tclfcs = block.clfcs()[icl];
-        // estimate distance.
-        real_type dist = std::numeric_limits<real_type>::max();
-        for (index_type ifl=0; ifl<tclfcs[0]; ++ifl) {
-            // distance.
-            const auto vec = cce.bces[ifl].cnd - cce.cnd;
-            // minimal value.
-            dist = fmin(vec.length(), dist);
-        };
-        // wave speed.
-        const real_type ga = m_sol.gamma(icl);
-        const real_type ga1 = ga - 1.0;
-        real_type wspd = piso0n.momentum().square();
-        const real_type ke = wspd/(2.0*piso0n.density());
-        const real_type pr = ga1 * (piso0n.energy() - ke);
-        const real_type pr_adj = (pr+fabs(pr))/2.0;
-        wspd = sqrt(ga*pr_adj/piso0n.density()) + sqrt(wspd)/piso0n.density();
-        // CFL.
-        cflo = hdt*wspd/dist;
-        // if pressure is null, make CFL to be 1.
-        cflc = (cflo-1.0) * pr_adj/(pr_adj+TINY) + 1.0;
-        throw_on_cfl_adjustment(__FILE__, __LINE__, __func__, icl);
-        throw_on_cfl_overflow(__FILE__, __LINE__, __func__, icl);
-        // correct negative pressure.
-        piso0n.energy() = pr_adj/ga1 + ke + TINY;
-    }
+    auto & cflc = m_sol.cflc(icl);
+    auto & cflo = m_sol.cflo(icl);
+    auto piso0n = m_sol.so0n(icl);
+    const auto & tclfcs = block.clfcs()[icl];
+    // estimate distance.
+    real_type dist = std::numeric_limits<real_type>::max();
+    for (index_type ifl=0; ifl<tclfcs[0]; ++ifl) {
+        // distance.
+        const auto vec = cce.bces[ifl].cnd - cce.cnd;
+        // minimal value.
+        dist = fmin(vec.length(), dist);
+    };
+    // wave speed.
+    const real_type ga = m_sol.gamma(icl);
+    const real_type ga1 = ga - 1.0;
+    real_type wspd = piso0n.momentum().square();
+    const real_type ke = wspd/(2.0*piso0n.density());
+    const real_type pr = ga1 * (piso0n.energy() - ke);
+    const real_type pr_adj = (pr+fabs(pr))/2.0;
+    wspd = sqrt(ga*pr_adj/piso0n.density()) + sqrt(wspd)/piso0n.density();
+    // CFL.
+    cflo = hdt*wspd/dist;
+    // if pressure is null, make CFL to be 1.
+    cflc = (cflo-1.0) * pr_adj/(pr_adj+TINY) + 1.0;
+    throw_on_cfl_adjustment(__FILE__, __LINE__, __func__, icl);
+    throw_on_cfl_overflow(__FILE__, __LINE__, __func__, icl);
+    // correct negative pressure.
+    piso0n.energy() = pr_adj/ga1 + ke + TINY;
 }
 
-template< size_t NDIM >
-void Solver<NDIM>::march(real_type time_current, real_type time_increment, Solver<NDIM>::int_type steps_run)
+template< size_t NDIM, typename ElemType >
+void Solver<NDIM, ElemType>::march(real_type time_current, real_type time_increment, Solver<NDIM, ElemType>::int_type steps_run)
 {
+    const index_type nlevel = param().multirate_nlevel();
+    if (nlevel <= 1) { m_multirate.reset(); }
+    else if (!m_multirate || m_multirate->nlevel() != nlevel) {
+        m_multirate = MultiRate<NDIM, ElemType>::construct(*this, nlevel);
+    }
     state().step_current = 0;
     anchors().premarch();
     while (state().step_current < steps_run) {
         state().substep_current = 0;
         anchors().prefull();
-        if (qty() && 0 != state().report_interval && 0 == state().step_global) { qty()->update(); }
+        if (qty() && 0 != state().report_interval && 0 == state().step_global) { qty()->update(qty()->due(state().step_global)); }
         while (state().substep_current < state().substep_run) {
             // set up time
             state().time = time_current;
@@ -197,14 +348,27 @@ void Solver<NDIM>::march(real_type time_current, real_type time_increment, Solve
             anchors().presub();
             // marching methods
             update(state().time, state().time_increment);
-            calc_so0t();
-            calc_so0n();
-            //ibcsoln(); // to be implemented
-            trim_do0();
-            calc_cfl();
-            calc_so1n();
-            //ibcdsoln(); // to be implemented
-            trim_do1();
+            if (m_multirate) {
+                m_multirate->march_substep();
+            } else {
+                calc_ldt();
+                calc_so0t_interface();
+                if (param().tile_size() > 0) {
+                    calc_so0t_so0n_tiled();
+                    ibcsoln();
+                    trim_do0();
+                    calc_cfl_so1n();
+                } else {
+                    calc_so0t();
+                    calc_so0n();
+                    ibcsoln();
+                    trim_do0();
+                    calc_cfl();
+                    calc_so1n();
+                }
+                ibcdsoln();
+                trim_do1();
+            }
             // increment time
             time_current += state().time_increment / state().substep_run;
             state().time = time_current;
@@ -215,7 +379,7 @@ void Solver<NDIM>::march(real_type time_current, real_type time_increment, Solve
         if (
             qty() && 0 != state().report_interval &&
             ((0 != state().step_global) && (0 == state().step_global % state().report_interval))
-        ) { qty()->update(); }
+        ) { qty()->update(qty()->due(state().step_global)); }
         state().step_global += 1;
         state().step_current += 1;
         anchors().postfull();
@@ -223,8 +387,8 @@ void Solver<NDIM>::march(real_type time_current, real_type time_increment, Solve
     anchors().postmarch();
 }
 
-template< size_t NDIM >
-void Solver<NDIM>::init_solution(
+template< size_t NDIM, typename ElemType >
+void Solver<NDIM, ElemType>::init_solution(
     real_type gas_constant
   , real_type gamma
   , real_type density
@@ -235,8 +399,8 @@ void Solver<NDIM>::init_solution(
     }
 }
 
-template< size_t NDIM >
-void Solver<NDIM>::throw_on_negative_density(const char * filename, int lineno, const char * funcname, index_type icl) const {
+template< size_t NDIM, typename ElemType >
+void Solver<NDIM, ElemType>::throw_on_negative_density(const char * filename, int lineno, const char * funcname, index_type icl) const {
     auto pso0n = m_sol.so0n(icl);
     if (m_param.stop_on_negative_density() != 0
      && pso0n.density() < 0
@@ -255,8 +419,8 @@ void Solver<NDIM>::throw_on_negative_density(const char * filename, int lineno,
     }
 }
 
-template< size_t NDIM >
-void Solver<NDIM>::throw_on_negative_energy(const char * filename, int lineno, const char * funcname, index_type icl) const {
+template< size_t NDIM, typename ElemType >
+void Solver<NDIM, ElemType>::throw_on_negative_energy(const char * filename, int lineno, const char * funcname, index_type icl) const {
     auto pso0n = m_sol.so0n(icl);
     if (m_param.stop_on_negative_energy() != 0
      && pso0n.energy() < 0
@@ -275,8 +439,8 @@ void Solver<NDIM>::throw_on_negative_energy(const char * filename, int lineno, c
     }
 }
 
-template< size_t NDIM >
-void Solver<NDIM>::throw_on_cfl_adjustment(const char * filename, int lineno, const char * funcname, index_type icl) const {
+template< size_t NDIM, typename ElemType >
+void Solver<NDIM, ElemType>::throw_on_cfl_adjustment(const char * filename, int lineno, const char * funcname, index_type icl) const {
     if (m_param.stop_on_cfl_adjustment() != 0 && m_sol.cflc(icl) == 1) {
         throw std::runtime_error(string::format(
             "cfl adjusted\n%s\n" "%s\n" "%s\n" "%s\n"
@@ -300,8 +464,8 @@ void Solver<NDIM>::throw_on_cfl_adjustment(const char * filename, int lineno, co
     }
 }
 
-template< size_t NDIM >
-void Solver<NDIM>::throw_on_cfl_overflow(const char * filename, int lineno, const char * funcname, index_type icl) const {
+template< size_t NDIM, typename ElemType >
+void Solver<NDIM, ElemType>::throw_on_cfl_overflow(const char * filename, int lineno, const char * funcname, index_type icl) const {
     if (m_param.stop_on_cfl_adjustment() != 0 && m_sol.cflc(icl) > 1) {
         throw std::runtime_error(string::format(
             "cfl overflow\n%s\n" "%s\n" "%s\n" "%s\n"
@@ -40,12 +40,37 @@ public:
     real_type & taumin()       { return m_taumin; }
     real_type   tauscale() const { return m_tauscale; }
     real_type & tauscale()       { return m_tauscale; }
+    /// Number of cells in a tile for the fused marching; 0 disables fusion.
+    int_type   tile_size() const { return m_tile_size; }
+    int_type & tile_size()       { return m_tile_size; }
+    /**
+     * Target CFL of the local time stepping, in which each cell marches with
+     * its own time increment for converging to a steady state; 0 disables it.
+     * A target around 0.5 is advised; cells of high aspect ratio, for which
+     * the CFL estimated by the shortest distance is optimistic, need less.
+     */
+    real_type   local_cfl() const { return m_local_cfl; }
+    real_type & local_cfl()       { return m_local_cfl; }
+    /**
+     * Number of time levels of the multi-rate marching, in which a cell of the
+     * l-th level marches with the time increment divided by 2^l; 0 and 1
+     * disable it.  See MultiRate.
+     */
+    int_type   multirate_nlevel() const { return m_multirate_nlevel; }
+    int_type & multirate_nlevel()       { return m_multirate_nlevel; }
+    /// Largest CFL with which a cell stays in a time level.
+    real_type   multirate_cfl() const { return m_multirate_cfl; }
+    real_type & multirate_cfl()       { return m_multirate_cfl; }
 
 private:
 
     real_type m_sigma0=3;
     real_type m_taumin=0.0;
     real_type m_tauscale=1.0;
+    int_type m_tile_size=0;
+    real_type m_local_cfl=0.0;
+    int_type m_multirate_nlevel=0;
+    real_type m_multirate_cfl=0.9;
 
 #define DECL_MARCH_DEBUG(TYPE, NAME, DEFAULT) \
 public: \
@@ -79,30 +104,41 @@ struct State {
     int_type cfl_nadjusted=-1;
     int_type cfl_nadjusted_accumulated=-1;
 
+    /// L2 norm of the time rate of density; see ResidualAnchor.
+    real_type residual=std::numeric_limits<real_type>::quiet_NaN();
+
+    /// Serial number of the solver in the split domain and the number of the
+    /// solvers; -1 and 0 for the solver of the whole domain.
+    int_type svrn=-1;
+    int_type nsvr=0;
+
     std::string step_info_string() const {
         return string::format("global=%d step=%d substep=%d", step_global, step_current, substep_current);
     }
 }; /* end struct State */
 
-template< size_t NDIM > class Quantity;
+template< size_t NDIM, typename ElemType = real_type > class Quantity;
 
-template< size_t NDIM > class TrimBase;
+template< size_t NDIM, typename ElemType = real_type > class TrimBase;
 
-template< size_t NDIM > class AnchorChain;
+template< size_t NDIM, typename ElemType = real_type > class AnchorChain;
+template< size_t NDIM, typename ElemType = real_type > class Exchange;
+template< size_t NDIM, typename ElemType = real_type > class Ensemble;
+template< size_t NDIM, typename ElemType = real_type > class MultiRate;
 
-template< size_t NDIM >
+template< size_t NDIM, typename ElemType = real_type >
 class Solver
-  : public InstanceCounter<Solver<NDIM>>
-  , public std::enable_shared_from_this<Solver<NDIM>>
+  : public InstanceCounter<Solver<NDIM, ElemType>>
+  , public std::enable_shared_from_this<Solver<NDIM, ElemType>>
 {
 
 public:
 
     using int_type = State::int_type;
     using block_type = UnstructuredBlock<NDIM>;
-    using anchor_chain_type = AnchorChain<NDIM>;
+    using anchor_chain_type = AnchorChain<NDIM, ElemType>;
     using vector_type = Vector<NDIM>;
-    using solution_type = Solution<NDIM>;
+    using solution_type = Solution<NDIM, ElemType>;
 
     static constexpr size_t ndim = solution_type::ndim;
     static constexpr size_t neq = solution_type::neq;
@@ -118,10 +154,11 @@ public:
 
     class ctor_passkey {
         ctor_passkey() = default;
-        friend Solver<NDIM>;
+        friend Solver<NDIM, ElemType>;
     };
 
-    Solver(const ctor_passkey &, const std::shared_ptr<block_type> & block);
+    Solver(const ctor_passkey &, const std::shared_ptr<block_type> & block, Layout layout=Layout::AOS, index_type nmember=1);
+    Solver(const ctor_passkey &, Solver const & leader, index_type imember);
 
     Solver() = delete;
     Solver(Solver const & ) = delete;
@@ -129,26 +166,46 @@ public:
     Solver & operator=(Solver const & ) = delete;
     Solver & operator=(Solver       &&) = delete;
 
-    static std::shared_ptr<Solver<NDIM>> construct(const std::shared_ptr<block_type> & block) {
-        return std::make_shared<Solver<NDIM>>(ctor_passkey(), block);
+    /**
+     * With nmember > 1 the solver is the leader (the 0-th member) of an
+     * ensemble; see Ensemble.
+     */
+    static std::shared_ptr<Solver<NDIM, ElemType>> construct(
+        const std::shared_ptr<block_type> & block, Layout layout=Layout::AOS, index_type nmember=1
+    ) {
+        return std::make_shared<Solver<NDIM, ElemType>>(ctor_passkey(), block, layout, nmember);
+    }
+
+    /**
+     * Construct the imember-th member of the ensemble of the leader.  The
+     * member shares the block, cecnd, and the solution tables of the leader,
+     * and copies its parameters.
+     */
+    static std::shared_ptr<Solver<NDIM, ElemType>> construct(Solver const & leader, index_type imember) {
+        return std::make_shared<Solver<NDIM, ElemType>>(ctor_passkey(), leader, imember);
     }
 
     std::shared_ptr<block_type> const & block() const { return m_block; }
-    std::vector<std::unique_ptr<TrimBase<NDIM>>> const & trims() const { return m_trims; }
-    std::vector<std::unique_ptr<TrimBase<NDIM>>>       & trims()       { return m_trims; }
-    AnchorChain<NDIM> const & anchors() const { return m_anchors; }
-    AnchorChain<NDIM>       & anchors()       { return m_anchors; }
+    std::vector<std::unique_ptr<TrimBase<NDIM, ElemType>>> const & trims() const { return m_trims; }
+    std::vector<std::unique_ptr<TrimBase<NDIM, ElemType>>>       & trims()       { return m_trims; }
+    AnchorChain<NDIM, ElemType> const & anchors() const { return m_anchors; }
+    AnchorChain<NDIM, ElemType>       & anchors()       { return m_anchors; }
 
     LookupTable<real_type, NDIM> const & cecnd() const { return m_cecnd; }
+    LookupTable<real_type, NDIM>       & cecnd()       { return m_cecnd; }
+    std::shared_ptr<Exchange<NDIM, ElemType>> const & exchange() const { return m_exchange; }
+    std::shared_ptr<Exchange<NDIM, ElemType>>       & exchange()       { return m_exchange; }
+    /// Set up by march() with Parameter::multirate_nlevel() > 1.
+    std::shared_ptr<MultiRate<NDIM, ElemType>> const & multirate() const { return m_multirate; }
     Parameter const & param() const { return m_param; }
     Parameter       & param()       { return m_param; }
     State const & state() const { return m_state; }
     State       & state()       { return m_state; } 
     solution_type const & sol() const { return m_sol; }
     solution_type       & sol()       { return m_sol; }
-    std::shared_ptr<Quantity<NDIM>> const & qty() const { return m_qty; }
+    std::shared_ptr<Quantity<NDIM, ElemType>> const & qty() const { return m_qty; }
     /* no setter for m_qty */
-    std::shared_ptr<Quantity<NDIM>> const & make_qty(bool throw_on_exist=false);
+    std::shared_ptr<Quantity<NDIM, ElemType>> const & make_qty(bool throw_on_exist=false);
 
     // TODO: move to UnstructuredBlock.
     // @[
@@ -167,6 +224,23 @@ public:
     void calc_cfl();
     void trim_do1();
     void calc_so1n();
+    void ibcsoln();
+    void ibcdsoln();
+    void calc_ldt();
+    // @]
+
+    /**
+     * Time increment of the cell: the local one with the local time stepping
+     * or the global one otherwise.
+     */
+    real_type time_increment(index_type icl) const {
+        return m_param.local_cfl() > 0 && m_sol.ldt(icl) > 0 ? m_sol.ldt(icl) : m_state.time_increment;
+    }
+
+    // fused marching core; see Parameter::tile_size().
+    // @[
+    void calc_so0t_so0n_tiled();
+    void calc_cfl_so1n();
     // @]
 
     void march(real_type time_current, real_type time_increment, int_type steps_run);
@@ -180,6 +254,25 @@ public:
 
 private:
 
+    friend Ensemble<NDIM, ElemType>;
+    friend MultiRate<NDIM, ElemType>;
+
+    void calc_so0t_interface();
+    void calc_so0t_cell(index_type icl);
+    void calc_so0n_cell(index_type icl, real_type qdt, real_type hdt) {
+        calc_so0n_cell(icl, ConservationElement<NDIM>(*m_block, icl), qdt, hdt);
+    }
+    void calc_so0n_cell(index_type icl, ConservationElement<NDIM> const & icce, real_type qdt, real_type hdt);
+    void calc_so0n_spatial(index_type jcl, BasicCE<NDIM> const & ibce, real_type (& so0n)[neq]) const;
+    void calc_so0n_temporal(
+        index_type icl, index_type ifl, BasicCE<NDIM> const & ibce, real_type qdt, real_type hdt, real_type (& so0n)[neq]
+    ) const;
+    void calc_cfl_cell(index_type icl, real_type hdt) {
+        calc_cfl_cell(icl, ConservationElement<NDIM>(*m_block, icl), hdt);
+    }
+    void calc_cfl_cell(index_type icl, ConservationElement<NDIM> const & cce, real_type hdt);
+    void calc_so1n_cell(index_type icl, real_type hdt, real_type const * shifts=nullptr);
+
     void throw_on_negative_density(const char * filename, int lineno, const char * funcname, index_type icl) const;
     void throw_on_negative_energy(const char * filename, int lineno, const char * funcname, index_type icl) const;
     void throw_on_cfl_adjustment(const char * filename, int lineno, const char * funcname, index_type icl) const;
@@ -188,13 +281,15 @@ private:
 private:
 
     std::shared_ptr<block_type> m_block;
-    std::vector<std::unique_ptr<TrimBase<NDIM>>> m_trims;
-    AnchorChain<NDIM> m_anchors;
+    std::vector<std::unique_ptr<TrimBase<NDIM, ElemType>>> m_trims;
+    AnchorChain<NDIM, ElemType> m_anchors;
     LookupTable<real_type, NDIM> m_cecnd;
     Parameter m_param;
     State m_state;
     solution_type m_sol;
-    std::shared_ptr<Quantity<NDIM>> m_qty;
+    std::shared_ptr<Quantity<NDIM, ElemType>> m_qty;
+    std::shared_ptr<Exchange<NDIM, ElemType>> m_exchange;
+    std::shared_ptr<MultiRate<NDIM, ElemType>> m_multirate;
 
 }; /* end class Solver */
 
@@ -18,15 +18,15 @@ namespace march {
 
 namespace gas {
 
-template< size_t NDIM >
+template< size_t NDIM, typename ElemType = real_type >
 class TrimInternal {
 
 public:
 
-    using solver_type = Solver<NDIM>;
+    using solver_type = Solver<NDIM, ElemType>;
     using block_type = typename solver_type::block_type;
-    using o0hand_type = typename Solution<NDIM>::o0hand_type;
-    using o1hand_type = typename Solution<NDIM>::o1hand_type;
+    using o0hand_type = typename Solution<NDIM, ElemType>::o0hand_type;
+    using o1hand_type = typename Solution<NDIM, ElemType>::o1hand_type;
 
     constexpr static index_type FCNCL = block_type::FCNCL;
 
@@ -65,14 +65,14 @@ private:
 /**
  * Boundary-condition treatment.
  */
-template< size_t NDIM >
+template< size_t NDIM, typename ElemType >
 class TrimBase {
 
 public:
 
-    using pointer = std::unique_ptr<TrimBase<NDIM>>;
+    using pointer = std::unique_ptr<TrimBase<NDIM, ElemType>>;
 
-    using internal_type = TrimInternal<NDIM>;
+    using internal_type = TrimInternal<NDIM, ElemType>;
     using solver_type = typename internal_type::solver_type;
     using block_type = typename internal_type::block_type;
 
@@ -104,23 +104,23 @@ public:
 
 private:
 
-    TrimInternal<NDIM> m_internal;
+    TrimInternal<NDIM, ElemType> m_internal;
 
 }; /* end class TrimBase */
 
 
-template< size_t NDIM >
-class TrimNoOp : public TrimBase<NDIM> {
+template< size_t NDIM, typename ElemType = real_type >
+class TrimNoOp : public TrimBase<NDIM, ElemType> {
 
 public:
 
-    using base_type = TrimBase<NDIM>;
+    using base_type = TrimBase<NDIM, ElemType>;
     using solver_type = typename base_type::solver_type;
     using block_type = typename base_type::block_type;
     using pointer = typename base_type::pointer;
 
     TrimNoOp(solver_type & solver, BoundaryData & boundary): base_type(solver, boundary) {
-        static_assert(sizeof(TrimNoOp<NDIM>) == sizeof(base_type), "TrimNoOp size mismatch");
+        static_assert(sizeof(TrimNoOp<NDIM, ElemType>) == sizeof(base_type), "TrimNoOp size mismatch");
     }
     ~TrimNoOp() override {}
     std::string type_name() override { return string::get_type_name(*this); }
@@ -130,18 +130,18 @@ public:
 }; /* end class TrimNoOp */
 
 
-template< size_t NDIM >
-class TrimInterface : public TrimBase<NDIM> {
+template< size_t NDIM, typename ElemType = real_type >
+class TrimInterface : public TrimBase<NDIM, ElemType> {
 
 public:
 
-    using base_type = TrimBase<NDIM>;
+    using base_type = TrimBase<NDIM, ElemType>;
     using solver_type = typename base_type::solver_type;
     using block_type = typename base_type::block_type;
     using pointer = typename base_type::pointer;
 
     TrimInterface(solver_type & solver, BoundaryData & boundary): base_type(solver, boundary) {
-        static_assert(sizeof(TrimInterface<NDIM>) == sizeof(base_type), "TrimInterface size mismatch");
+        static_assert(sizeof(TrimInterface<NDIM, ElemType>) == sizeof(base_type), "TrimInterface size mismatch");
     }
     ~TrimInterface() override {}
     std::string type_name() override { return string::get_type_name(*this); }
@@ -151,18 +151,18 @@ public:
 }; /* end class TrimInterface */
 
 
-template< size_t NDIM >
-class TrimNonRefl : public TrimBase<NDIM> {
+template< size_t NDIM, typename ElemType = real_type >
+class TrimNonRefl : public TrimBase<NDIM, ElemType> {
 
 public:
 
-    using base_type = TrimBase<NDIM>;
+    using base_type = TrimBase<NDIM, ElemType>;
     using pointer = typename base_type::pointer;
     using solver_type = typename base_type::solver_type;
     using block_type = typename base_type::block_type;
 
     TrimNonRefl(solver_type & solver, BoundaryData & boundary): base_type(solver, boundary) {
-        static_assert(sizeof(TrimNonRefl<NDIM>) == sizeof(base_type), "TrimNonRefl size mismatch");
+        static_assert(sizeof(TrimNonRefl<NDIM, ElemType>) == sizeof(base_type), "TrimNonRefl size mismatch");
     }
 
     ~TrimNonRefl() override {}
@@ -172,8 +172,8 @@ public:
 
 }; /* end class TrimNonRefl */
 
-template< size_t NDIM >
-void TrimNonRefl<NDIM>::apply_do0() {
+template< size_t NDIM, typename ElemType >
+void TrimNonRefl<NDIM, ElemType>::apply_do0() {
     auto & impl = this->internal();
     index_type const nbnd = impl.nbound();
     for (index_type ibnd=0; ibnd<nbnd; ++ibnd) {
@@ -182,9 +182,8 @@ void TrimNonRefl<NDIM>::apply_do0() {
     }
 }
 
-template< size_t NDIM >
-void TrimNonRefl<NDIM>::apply_do1() {
-    using row_type = typename base_type::internal_type::o1hand_type::row_type;
+template< size_t NDIM, typename ElemType >
+void TrimNonRefl<NDIM, ElemType>::apply_do1() {
     auto & impl = this->internal();
     index_type const nbnd = impl.nbound();
     for (index_type ibnd=0; ibnd<nbnd; ++ibnd) {
@@ -194,7 +193,7 @@ void TrimNonRefl<NDIM>::apply_do1() {
         auto       pjso1n = impl.so1n(tfccls[1]);
         // set perpendicular gradient to zero.
         Matrix<NDIM> const mat = impl.get_normal_matrix(ifc);
-        row_type vec;
+        Vector<NDIM> vec[solver_type::neq];
         for (index_type ieq=0; ieq<solver_type::neq; ++ieq) {
             vec[ieq][0] = 0.0;
             Vector<NDIM> dif = tiso1c[ieq];
@@ -210,18 +209,18 @@ void TrimNonRefl<NDIM>::apply_do1() {
     }
 }
 
-template< size_t NDIM >
-class TrimSlipWall : public TrimBase<NDIM> {
+template< size_t NDIM, typename ElemType = real_type >
+class TrimSlipWall : public TrimBase<NDIM, ElemType> {
 
 public:
 
-    using base_type = TrimBase<NDIM>;
+    using base_type = TrimBase<NDIM, ElemType>;
     using solver_type = typename base_type::solver_type;
     using block_type = typename base_type::block_type;
     using pointer = typename base_type::pointer;
 
     TrimSlipWall(solver_type & solver, BoundaryData & boundary): base_type(solver, boundary) {
-        static_assert(sizeof(TrimSlipWall<NDIM>) == sizeof(base_type), "TrimSlipWall size mismatch");
+        static_assert(sizeof(TrimSlipWall<NDIM, ElemType>) == sizeof(base_type), "TrimSlipWall size mismatch");
     }
 
     ~TrimSlipWall() override {}
@@ -231,8 +230,8 @@ public:
 
 }; /* end class TrimSlipWall */
 
-template< size_t NDIM >
-void TrimSlipWall<NDIM>::apply_do0() {
+template< size_t NDIM, typename ElemType >
+void TrimSlipWall<NDIM, ElemType>::apply_do0() {
     auto & impl = this->internal();
     index_type const nbnd = impl.nbound();
     for (index_type ibnd=0; ibnd<nbnd; ++ibnd) {
@@ -240,8 +239,7 @@ void TrimSlipWall<NDIM>::apply_do0() {
         auto const & tfccls = impl.tfccls(ifc);
         auto const piso0n = impl.so0n(tfccls[0]);
         auto       pjso0n = impl.so0n(tfccls[1]);
-        auto const & momi = piso0n.momentum();
-        auto       & momj = pjso0n.momentum();
+        auto const momi = piso0n.momentum();
         pjso0n[0] = piso0n[0];
         pjso0n[NDIM+1] = piso0n[NDIM+1];
         // get rotation matrix.
@@ -251,12 +249,12 @@ void TrimSlipWall<NDIM>::apply_do0() {
         // negate the normal component of the momentum vector.
         mom[0] = -mom[0];
         // rotate and set back to the outside momentum vector.
-        momj = product(mat.transpose(), mom);
+        pjso0n.set_momentum(product(mat.transpose(), mom));
     }
 }
 
-template< size_t NDIM >
-void TrimSlipWall<NDIM>::apply_do1() {
+template< size_t NDIM, typename ElemType >
+void TrimSlipWall<NDIM, ElemType>::apply_do1() {
     auto & impl = this->internal();
     index_type const nbnd = impl.nbound();
     for (index_type ibnd=0; ibnd<nbnd; ++ibnd) {
@@ -267,8 +265,8 @@ void TrimSlipWall<NDIM>::apply_do1() {
         Matrix<NDIM> const mat = impl.get_normal_matrix(ifc);
         Matrix<NDIM> const matinv = mat.transpose();
         // rotate the derivatives to the normal coordinate system.
-        Vector<NDIM> u1 = product(mat, piso1n.density());
-        Vector<NDIM> um = product(mat, piso1n.energy());
+        Vector<NDIM> u1 = product(mat, Vector<NDIM>(piso1n.density()));
+        Vector<NDIM> um = product(mat, Vector<NDIM>(piso1n.energy()));
         Matrix<NDIM> uv = product(product(mat, piso1n.momentum()), matinv);
         // set wall condition in the rotated coordinate;
         u1[0] = -u1[0];
@@ -280,24 +278,24 @@ void TrimSlipWall<NDIM>::apply_do1() {
         // rotate the derivatives back to the original coordinate system.
         pjso1n.density() = product(matinv, u1);
         pjso1n.energy() = product(matinv, um);
-        pjso1n.momentum() = product(product(matinv, uv), mat);
+        pjso1n.set_momentum(product(product(matinv, uv), mat));
     }
 }
 
-template< size_t NDIM >
-class TrimInlet : public TrimBase<NDIM> {
+template< size_t NDIM, typename ElemType = real_type >
+class TrimInlet : public TrimBase<NDIM, ElemType> {
 
 public:
 
     constexpr static size_t NVALUE = 6;
 
-    using base_type = TrimBase<NDIM>;
+    using base_type = TrimBase<NDIM, ElemType>;
     using solver_type = typename base_type::solver_type;
     using block_type = typename base_type::block_type;
     using pointer = typename base_type::pointer;
 
     TrimInlet(solver_type & solver, BoundaryData & boundary): base_type(solver, boundary) {
-        static_assert(sizeof(TrimInlet<NDIM>) == sizeof(base_type), "TrimInlet size mismatch");
+        static_assert(sizeof(TrimInlet<NDIM, ElemType>) == sizeof(base_type), "TrimInlet size mismatch");
     }
 
     ~TrimInlet() override {}
@@ -307,8 +305,8 @@ public:
 
 }; /* end class TrimInlet */
 
-template< size_t NDIM >
-void TrimInlet<NDIM>::apply_do0() {
+template< size_t NDIM, typename ElemType >
+void TrimInlet<NDIM, ElemType>::apply_do0() {
     using boundary_value_type = typename base_type::internal_type::template boundary_value_type<NVALUE>;
     using vector_type = Vector<NDIM>;
     struct BoundaryValue {
@@ -329,13 +327,13 @@ void TrimInlet<NDIM>::apply_do0() {
         auto pjso0n = impl.so0n(tfccls[1]);
         BoundaryValue const val(impl.template value<NVALUE>(ibnd));
         pjso0n.density() = val.density();
-        pjso0n.momentum() = val.velocity() * val.density();
+        pjso0n.set_momentum(val.velocity() * val.density());
         pjso0n.energy() = val.pressure()/(val.gamma()-1.0) + val.kinetic_energy();
     }
 }
 
-template< size_t NDIM >
-void TrimInlet<NDIM>::apply_do1() {
+template< size_t NDIM, typename ElemType >
+void TrimInlet<NDIM, ElemType>::apply_do1() {
     auto & impl = this->internal();
     index_type const nbnd = impl.nbound();
     for (index_type ibnd=0; ibnd<nbnd; ++ibnd) {
@@ -344,15 +342,15 @@ void TrimInlet<NDIM>::apply_do1() {
     }
 }
 
-template< size_t NDIM >
-void Solver<NDIM>::trim_do0() {
+template< size_t NDIM, typename ElemType >
+void Solver<NDIM, ElemType>::trim_do0() {
     for (auto & trim : m_trims) {
         trim->apply_do0();
     }
 }
 
-template< size_t NDIM >
-void Solver<NDIM>::trim_do1() {
+template< size_t NDIM, typename ElemType >
+void Solver<NDIM, ElemType>::trim_do1() {
     for (auto & trim : m_trims) {
         trim->apply_do1();
     }
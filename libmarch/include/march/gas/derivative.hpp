@@ -9,7 +9,7 @@
  * @file
  *
  * This file includes code that implements the derivative calculation that
- * makes use of gradient element.  Solver<NDIM>::calc_so1n is the solver
+ * makes use of gradient element.  Solver<NDIM, ElemType>::calc_so1n is the solver
  * inteface.
  */
 
@@ -26,14 +26,14 @@ namespace gas {
 /**
  * Calculate the weight of gradient and the derivative.
  */
-template< size_t NDIM, size_t NEQ, int32_t ALPHA=1, bool TAYLOR=true >
+template< size_t NDIM, size_t NEQ, typename ElemType=real_type, int32_t ALPHA=1, bool TAYLOR=true >
 struct GradientWeigh {
 
-    typedef Solution<NDIM> solution_type;
+    typedef Solution<NDIM, ElemType> solution_type;
 
     static constexpr size_t NFGE_MAX = GEType::NFGE_MAX;
 
-    static constexpr real_type ALMOST_ZERO = Solver<NDIM>::ALMOST_ZERO;
+    static constexpr real_type ALMOST_ZERO = Solver<NDIM, ElemType>::ALMOST_ZERO;
 
     const GradientElement<NDIM> & gelem;
     const solution_type & shouse;
@@ -57,12 +57,15 @@ struct GradientWeigh {
      * @param[in] shouse  Container of solution variables and their derivatives.
      * @param[in] hdt     Half increment time (delta t).
      * @param[in] sgm0    Parameter for weighting.
+     * @param[in] shifts  Time from each neighboring solution element to the
+     *                    cell, by the faces; hdt for all when null.
      */
     GradientWeigh(
         const GradientElement<NDIM> & gelem
       , const solution_type & shouse
       , const real_type hdt
       , const real_type sgm0
+      , const real_type * shifts=nullptr
     )
       : gelem(gelem)
       , shouse(shouse)
@@ -78,7 +81,7 @@ struct GradientWeigh {
         for (index_type ieq=0; ieq<NEQ; ++ieq) { wacc[ieq] = 0; }
         for (index_type ifge=0; ifge<gelem.getype.nfge; ++ifge) {
             // interpolated solution
-            const auto udf = interpolate_solution(gelem.getype.faces[ifge], hdt);
+            const auto udf = interpolate_solution(gelem.getype.faces[ifge], hdt, shifts);
             // displacement matrix
             const auto dst = gelem.calc_displacement_matrix(ifge);
             // inverse (unnormalized) displacement matrix
@@ -128,14 +131,17 @@ struct GradientWeigh {
      * @param[out] dsoln  The result derivative.
      */
     void operator() (typename solution_type::o1hand_type pso1n) const {
-        pso1n = 0;
+        // accumulate in real_type and store once.
+        Vector<NDIM> dsoln[NEQ];
+        for (index_type ieq=0; ieq<NEQ; ++ieq) { dsoln[ieq] = 0; }
         const auto ofg1 = gelem.getype.nfge_inverse;
         for (index_type isub=0; isub<gelem.getype.nfge; ++isub) {
             for (index_type ieq=0; ieq<NEQ; ++ieq) {
                 const real_type wgt = ofg1 + sigma_max[ieq] * widv[isub][ieq];
-                pso1n[ieq] += wgt * grad[isub][ieq];
+                dsoln[ieq] += wgt * grad[isub][ieq];
             }
         }
+        for (index_type ieq=0; ieq<NEQ; ++ieq) { pso1n[ieq] = dsoln[ieq]; }
     }
 
 private:
@@ -143,6 +149,7 @@ private:
     std::array<Vector<NDIM>, NEQ> interpolate_solution(
         const GEType::fge_facelist_type & tface
       , const real_type hdt
+      , const real_type * shifts
     ) const {
         std::array<Vector<NDIM>, NEQ> udf;
         const auto piso0n = shouse.so0n(gelem.icl);
@@ -154,8 +161,9 @@ private:
             const auto pjso0n = shouse.so0n(jcl);
             const auto pjso0t = shouse.so0t(jcl);
             const auto pjso1c = shouse.so1c(jcl);
+            const real_type sdt = shifts ? shifts[ifl] : hdt;
             for (index_type ieq=0; ieq<NEQ; ++ieq) {
-                if (TAYLOR) { udf[ieq][ivx] = pjso0c[ieq] + hdt*pjso0t[ieq] - piso0n[ieq]; }
+                if (TAYLOR) { udf[ieq][ivx] = pjso0c[ieq] + sdt*pjso0t[ieq] - piso0n[ieq]; }
                 else        { udf[ieq][ivx] = pjso0n[ieq] - piso0n[ieq]; }
                 udf[ieq][ivx] += gelem.jdis[ifl].dot(pjso1c[ieq]);
             }
@@ -165,23 +173,25 @@ private:
 
 }; /* end struct GradientWeigh */
 
-template< size_t NDIM >
-void Solver<NDIM>::calc_so1n() {
-    // references.
-    const auto & block = *m_block;
-    const real_type hdt = m_state.time_increment * 0.5;
-    for (index_type icl=0; icl<block.ncell(); ++icl) {
-        // determine sigma0 and tau.
-        const real_type cfl = m_sol.cflc(icl);
-        const real_type sgm0 = m_param.sigma0() / fabs(cfl);
-        const real_type tau = m_param.taumin() + fabs(cfl) * m_param.tauscale();
-        // calculate gradient.
-        const GradientElement<ndim> gelem(block, m_cecnd, icl, tau);
-        const GradientWeigh<ndim,neq> gweigh(gelem, m_sol, hdt, sgm0);
-        gweigh(m_sol.so1n(icl));
+template< size_t NDIM, typename ElemType >
+void Solver<NDIM, ElemType>::calc_so1n() {
+    for (index_type icl=0; icl<m_block->ncell(); ++icl) {
+        calc_so1n_cell(icl, time_increment(icl) * 0.5);
     }
 }
 
+template< size_t NDIM, typename ElemType >
+void Solver<NDIM, ElemType>::calc_so1n_cell(index_type icl, real_type hdt, real_type const * shifts) {
+    // determine sigma0 and tau.
+    const real_type cfl = m_sol.cflc(icl);
+    const real_type sgm0 = m_param.sigma0() / fabs(cfl);
+    const real_type tau = m_param.taumin() + fabs(cfl) * m_param.tauscale();
+    // calculate gradient.
+    const GradientElement<ndim> gelem(*m_block, m_cecnd, icl, tau);
+    const GradientWeigh<ndim, neq, ElemType> gweigh(gelem, m_sol, hdt, sgm0, shifts);
+    gweigh(m_sol.so1n(icl));
+}
+
 } /* end namespace gas */
 
 } /* end namespace march */
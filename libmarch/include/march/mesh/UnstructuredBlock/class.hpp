@@ -332,8 +332,12 @@ public:
         fill_ghost();
     }
 
+    /**
+     * Partition the cells into npart parts.  When vwgt isn't null, it points
+     * to ncell weights of the cells to be balanced among the parts.
+     */
     std::tuple<march::depend::scotch::num_type, LookupTable<index_type, 0>>
-    partition(index_type npart) const;
+    partition(index_type npart, index_type const * vwgt=nullptr) const;
 
 /* end data_processors */
 
@@ -441,7 +445,7 @@ void UnstructuredBlock<NDIM>::build_boundary() {
 
 template< size_t NDIM >
 std::tuple<march::depend::scotch::num_type, LookupTable<index_type, 0>>
-UnstructuredBlock<NDIM>::partition(index_type npart) const {
+UnstructuredBlock<NDIM>::partition(index_type npart, index_type const * vwgt) const {
     using num_type = march::depend::scotch::num_type;
 
     LookupTable<index_type, CLMFC> rcells(0, ncell());
@@ -460,9 +464,9 @@ UnstructuredBlock<NDIM>::partition(index_type npart) const {
 
     static_assert(sizeof(index_type) == sizeof(num_type), "index_type differs from num_type");
     num_type nedge = ncell();
-    num_type vwgt = 0;
+    num_type novwgt = 0;
     num_type adjwgt = 0;
-    num_type wgtflag = 0;
+    num_type wgtflag = vwgt ? 2 : 0;
     num_type numflag = 0;
     num_type options[5] = {0, 0, 0, 0, 0};
     num_type edgecut = 0;
@@ -472,7 +476,7 @@ UnstructuredBlock<NDIM>::partition(index_type npart) const {
         &nedge,
         xadj.data(),
         adjncy.data(),
-        &vwgt,
+        vwgt ? const_cast<num_type *>(vwgt) : &novwgt,
         &adjwgt,
         &wgtflag,
         &numflag,
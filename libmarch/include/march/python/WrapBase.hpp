@@ -122,7 +122,24 @@ private:
 
 public:
 
-    Table(LookupTableCore & table) : m_table(table) {}
+    Table(LookupTableCore & table) : m_table(table), m_nitem(0), m_soa(false), m_nmember(1), m_imember(0) {}
+
+    /**
+     * Decorate a table of the structure-of-arrays layout, whose buffer is
+     * (nitem, nfull, ncolumn/nitem).  The arrays are (nfull, nitem) or
+     * (nfull, nitem, ncolumn/nitem) strided views.
+     */
+    Table(LookupTableCore & table, index_type nitem) : Table(table, nitem, true, 1, 0) {}
+
+    /**
+     * Decorate the imember-th member of a table interleaving nmember members
+     * cell by cell, whose buffer is (nfull, nmember, ncolumn/nmember), or
+     * (nitem, nfull, nmember, ncolumn/nmember/nitem) with soa.  The arrays are
+     * strided views of the member like the above.
+     */
+    Table(LookupTableCore & table, index_type nitem, bool soa, index_type nmember, index_type imember)
+      : m_table(table), m_nitem(nitem), m_soa(soa), m_nmember(nmember), m_imember(imember)
+    {}
 
     Table(Table const & ) = delete;
     Table(Table       &&) = delete;
@@ -150,6 +167,8 @@ private:
      * \return       ndarray object as a view to the input table.
      */
     pybind11::array from(array_flavor flavor) {
+        if (m_nitem > 0) { return from_strided(flavor); }
+
         npy_intp shape[m_table.ndim()];
         std::copy(m_table.dims().begin(), m_table.dims().end(), shape);
 
@@ -173,9 +192,45 @@ private:
             pybind11::pybind11_fail("NumPy: invalid array type");
         }
 
+        return view(m_table.ndim(), shape, strides, data);
+    }
+
+    /**
+     * \param flavor The requested type of array.
+     * \return       ndarray object as a strided view to the input SOA or
+     *               member table.
+     */
+    pybind11::array from_strided(array_flavor flavor) {
+        const index_type nitemelem = m_table.ncolumn() / m_nmember / m_nitem;
+        const npy_intp itemsize = nitemelem * m_table.elsize();
+        // distances between the rows, the items of a row, and the members.
+        const npy_intp rowsize = m_nmember * (m_soa ? 1 : m_nitem) * itemsize;
+        const npy_intp itemstride = m_soa ? m_table.nfull() * m_nmember * itemsize : itemsize;
+        const npy_intp membersize = m_soa ? itemsize : m_nitem * itemsize;
+        npy_intp shape[3] = {m_table.nfull(), m_nitem, nitemelem};
+        npy_intp strides[3] = {rowsize, itemstride, m_table.elsize()};
+
+        char * data = m_table.data() + m_imember * membersize;
+        if        (FULL == flavor) {
+            // do nothing
+        } else if (GHOST == flavor) {
+            shape[0] = m_table.nghost();
+            strides[0] = -strides[0];
+            data += (m_table.nghost() > 0 ? m_table.nghost()-1 : 0) * rowsize;
+        } else if (BODY == flavor) {
+            shape[0] = m_table.nbody();
+            data += m_table.nghost() * rowsize;
+        } else {
+            pybind11::pybind11_fail("NumPy: invalid array type");
+        }
+
+        return view(nitemelem > 1 ? 3 : 2, shape, strides, data);
+    }
+
+    pybind11::array view(int ndim, npy_intp * shape, npy_intp * strides, void * data) {
         pybind11::object tmp = pybind11::reinterpret_steal<pybind11::object>(
             PyArray_NewFromDescr(
-                &PyArray_Type, PyArray_DescrFromType(m_table.datatypeid()), m_table.ndim(),
+                &PyArray_Type, PyArray_DescrFromType(m_table.datatypeid()), ndim,
                 shape, strides, data, NPY_ARRAY_WRITEABLE, nullptr));
         if (!tmp) { pybind11::pybind11_fail("NumPy: unable to create array view"); }
 
@@ -188,6 +243,10 @@ private:
     }
 
     LookupTableCore & m_table;
+    index_type m_nitem;
+    bool m_soa;
+    index_type m_nmember;
+    index_type m_imember;
 
 }; /* end class Table */
 
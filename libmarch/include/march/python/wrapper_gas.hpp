@@ -10,6 +10,7 @@
 #include <memory>
 #include <algorithm>
 #include <cstring>
+#include <limits>
 #include <list>
 
 #include "march.hpp"
@@ -20,15 +21,15 @@ namespace march {
 
 namespace python {
 
-template< size_t NDIM >
+template< size_t NDIM, typename ElemType = real_type >
 class
 MARCH_PYTHON_WRAPPER_VISIBILITY
 WrapGasSolver
-  : public WrapBase< WrapGasSolver<NDIM>, gas::Solver<NDIM>, std::shared_ptr<gas::Solver<NDIM>> >
+  : public WrapBase< WrapGasSolver<NDIM, ElemType>, gas::Solver<NDIM, ElemType>, std::shared_ptr<gas::Solver<NDIM, ElemType>> >
 {
 
     /* aliases for dependent type name lookup */
-    using base_type = WrapBase< WrapGasSolver<NDIM>, gas::Solver<NDIM>, std::shared_ptr<gas::Solver<NDIM>> >;
+    using base_type = WrapBase< WrapGasSolver<NDIM, ElemType>, gas::Solver<NDIM, ElemType>, std::shared_ptr<gas::Solver<NDIM, ElemType>> >;
     using wrapper_type = typename base_type::wrapper_type;
     using wrapped_type = typename base_type::wrapped_type;
     using block_type = typename wrapped_type::block_type;
@@ -47,11 +48,91 @@ WrapGasSolver
         ;
     }
 
+public:
+
+    /// Layout of the solution named by the keyword argument "layout".
+    static gas::Layout layout_from(pybind11::kwargs const & kw) {
+        namespace py = pybind11;
+        gas::Layout layout = gas::Layout::AOS;
+        if (kw.contains("layout")) {
+            std::string name = py::str(kw["layout"]);
+            if        ("aos" == name) {
+                layout = gas::Layout::AOS;
+            } else if ("soa" == name) {
+                layout = gas::Layout::SOA;
+            } else {
+                throw py::value_error("layout must be \"aos\" or \"soa\"");
+            }
+        }
+        return layout;
+    }
+
+    /// Create the trims for the boundary conditions in bclist and set up the parameters.
+    static void setup(
+        wrapped_type & svr
+      , pybind11::list bclist
+      , real_type sigma0
+      , real_type time
+      , real_type time_increment
+      , typename wrapped_type::int_type report_interval
+      , pybind11::kwargs const & kw
+    ) {
+        namespace py = pybind11;
+        for (auto bc : bclist) {
+            std::string name = py::str(bc.attr("__class__").attr("__name__").attr("lstrip")("GasPlus"));
+            BoundaryData * data = py::cast<BoundaryData *>(bc.attr("_data"));
+            std::unique_ptr<gas::TrimBase<NDIM, ElemType>> trim;
+            if        ("Interface" == name || "interface" == name) {
+                trim = make_unique<gas::TrimInterface<NDIM, ElemType>>(svr, *data);
+            } else if ("NoOp"      == name) {
+                trim = make_unique<gas::TrimNoOp<NDIM, ElemType>>(svr, *data);
+            } else if ("NonRefl"   == name) {
+                trim = make_unique<gas::TrimNonRefl<NDIM, ElemType>>(svr, *data);
+            } else if ("SlipWall"  == name) {
+                trim = make_unique<gas::TrimSlipWall<NDIM, ElemType>>(svr, *data);
+            } else if ("Inlet"     == name) {
+                trim = make_unique<gas::TrimInlet<NDIM, ElemType>>(svr, *data);
+            } else {
+                /* do nothing for now */ // throw std::runtime_error("BC type unknown");
+            }
+            svr.trims().push_back(std::move(trim));
+        }
+        svr.param().sigma0() = sigma0;
+        svr.state().time = time;
+        svr.state().time_increment = time_increment;
+        svr.state().report_interval = report_interval;
+        if (report_interval) { svr.make_qty(); }
+        if (kw.contains("local_cfl")) { svr.param().local_cfl() = py::cast<real_type>(kw["local_cfl"]); }
+        if (kw.contains("multirate_nlevel")) {
+            svr.param().multirate_nlevel() = py::cast<gas::Parameter::int_type>(kw["multirate_nlevel"]);
+        }
+        if (kw.contains("multirate_cfl")) { svr.param().multirate_cfl() = py::cast<real_type>(kw["multirate_cfl"]); }
+    }
+
+    /// The CFL and the residual of the last march of the solver.
+    static pybind11::dict march_return(wrapped_type const & svr) {
+        namespace py = pybind11;
+        using namespace pybind11::literals;
+        py::list cfl;
+        cfl.append(svr.state().cfl_min);
+        cfl.append(svr.state().cfl_max);
+        cfl.append(svr.state().cfl_nadjusted);
+        cfl.append(svr.state().cfl_nadjusted_accumulated);
+        // the sum of squares and the number of cells, for the global norm
+        // over the workers.
+        const index_type ncell = svr.block()->ncell();
+        py::list residual;
+        residual.append(svr.state().residual * svr.state().residual * ncell);
+        residual.append(ncell);
+        return py::dict("cfl"_a = cfl, "residual"_a = residual);
+    }
+
 private:
 
     wrapper_type & wrap_class_attributes() {
         this->m_cls.attr("ALMOST_ZERO") = double(wrapped_type::ALMOST_ZERO);
         this->m_cls.attr("neq") = NDIM + 2;
+        this->m_cls.attr("fpdtype") = std::is_same<ElemType, float>::value ? "float32" : "float64";
         this->m_cls.attr("_interface_init_") = std::make_tuple("cecnd");
         this->m_cls.attr("_solution_array_") = std::make_tuple();
         return *this;
@@ -66,35 +147,12 @@ private:
               , real_type time
               , real_type time_increment
               , typename wrapped_type::int_type report_interval
-              , py::kwargs
+              , py::kwargs kw
             ) {
                 block_type * block = py::cast<block_type *>(pyblock.attr("_ustblk"));
                 assert(block);
-                std::shared_ptr<wrapped_type> svr = wrapped_type::construct(block->shared_from_this());
-                for (auto bc : py::list(pyblock.attr("bclist"))) {
-                    std::string name = py::str(bc.attr("__class__").attr("__name__").attr("lstrip")("GasPlus"));
-                    BoundaryData * data = py::cast<BoundaryData *>(bc.attr("_data"));
-                    std::unique_ptr<gas::TrimBase<NDIM>> trim;
-                    if        ("Interface" == name) {
-                        trim = make_unique<gas::TrimInterface<NDIM>>(*svr, *data);
-                    } else if ("NoOp"      == name) {
-                        trim = make_unique<gas::TrimNoOp<NDIM>>(*svr, *data);
-                    } else if ("NonRefl"   == name) {
-                        trim = make_unique<gas::TrimNonRefl<NDIM>>(*svr, *data);
-                    } else if ("SlipWall"  == name) {
-                        trim = make_unique<gas::TrimSlipWall<NDIM>>(*svr, *data);
-                    } else if ("Inlet"     == name) {
-                        trim = make_unique<gas::TrimInlet<NDIM>>(*svr, *data);
-                    } else {
-                        /* do nothing for now */ // throw std::runtime_error("BC type unknown");
-                    }
-                    svr->trims().push_back(std::move(trim));
-                }
-                svr->param().sigma0() = sigma0;
-                svr->state().time = time;
-                svr->state().time_increment = time_increment;
-                svr->state().report_interval = report_interval;
-                if (report_interval) { svr->make_qty(); }
+                std::shared_ptr<wrapped_type> svr = wrapped_type::construct(block->shared_from_this(), layout_from(kw));
+                setup(*svr, py::list(pyblock.attr("bclist")), sigma0, time, time_increment, report_interval, kw);
                 return svr;
             }),
             py::arg("block"), py::arg("sigma0"), py::arg("time"), py::arg("time_increment"), py::arg("report_interval")
@@ -107,8 +165,8 @@ private:
             .def_property_readonly("block", &wrapped_type::block)
             .def_property_readonly(
                 "trims"
-              , [](wrapped_type & self) -> std::vector<gas::TrimBase<NDIM>*> {
-                    std::vector<gas::TrimBase<NDIM>*> ret;
+              , [](wrapped_type & self) -> std::vector<gas::TrimBase<NDIM, ElemType>*> {
+                    std::vector<gas::TrimBase<NDIM, ElemType>*> ret;
                     for (auto & trim : self.trims()) {
                         ret.push_back(trim.get());
                     }
@@ -157,12 +215,37 @@ private:
         namespace py = pybind11;
         return (*this)
             .def_property_readonly("runanchors", [](py::object self) { return self.attr("anchors"); }) // compatibility
-            .def_property_readonly("svrn", [](wrapped_type const &) { return py::none(); }) // TO BE UPDATED
-            .def_property_readonly("nsvr", [](wrapped_type const &) { return py::none(); }) // TO BE UPDATED
+            .def_property(
+                "svrn"
+              , [](wrapped_type const & self) -> py::object {
+                    return self.state().svrn < 0 ? py::none() : py::cast(self.state().svrn);
+                }
+              , [](wrapped_type & self, py::object svrn) {
+                    self.state().svrn = svrn.is_none() ? -1 : py::cast<typename wrapped_type::int_type>(svrn);
+                }
+            )
+            .def_property(
+                "nsvr"
+              , [](wrapped_type const & self) -> py::object {
+                    return self.state().nsvr <= 0 ? py::none() : py::cast(self.state().nsvr);
+                }
+              , [](wrapped_type & self, py::object nsvr) {
+                    self.state().nsvr = nsvr.is_none() ? 0 : py::cast<typename wrapped_type::int_type>(nsvr);
+                }
+            )
             .def("provide", [](wrapped_type & self) { self.anchors().provide(); })
             .def("preloop", [](wrapped_type & self) { self.anchors().preloop(); })
             .def("postloop", [](wrapped_type & self) { self.anchors().postloop(); })
             .def("exhaust", [](wrapped_type & self) { self.anchors().exhaust(); })
+            .def(
+                "pullank"
+              , [](py::object self, std::string const & ankname, std::string const & objname, py::object worker) {
+                    // Same as solvcon.solver.MeshSolver.pullank.
+                    py::object obj = self.attr("runanchors")[py::str(ankname)].attr(objname.c_str());
+                    worker.attr("conn").attr("send")(obj);
+                }
+              , py::arg("ankname"), py::arg("objname"), py::arg("worker") = py::none()
+            )
             .def(
                 "march"
               , [](wrapped_type & self
@@ -172,14 +255,20 @@ private:
                  , py::object worker
                 ) {
                     using namespace pybind11::literals;
-                    self.march(time_current, time_increment, steps_run);
-                    py::list cfl;
-                    cfl.append(self.state().cfl_min);
-                    cfl.append(self.state().cfl_max);
-                    cfl.append(self.state().cfl_nadjusted);
-                    cfl.append(self.state().cfl_nadjusted_accumulated);
-                    py::dict marchret = py::dict("cfl"_a = cfl);
-                    if (worker.is(py::none())) { /* FIXME: message-pass marchret */ }
+                    {
+                        // Python anchors re-acquire the GIL in the overloads.
+                        py::gil_scoped_release release;
+                        self.march(time_current, time_increment, steps_run);
+                    }
+                    py::dict marchret = march_return(self);
+                    if (!worker.is_none()) {
+                        // reduce over the workers; only the root reports to the master.
+                        py::dict ops(
+                            "cfl"_a = py::make_tuple("min", "max", "sum", "sum")
+                          , "residual"_a = py::make_tuple("sum", "sum")
+                        );
+                        worker.attr("report")(marchret, ops);
+                    }
                     return marchret;
                 }
               , py::arg("time_current")
@@ -221,11 +310,11 @@ public:
 
     virtual ~PythonAnchor() {}
 
-    template <size_t NDIM> PythonAnchor(ctor_passkey const & pk, gas::Solver<NDIM> & svr)
+    template <size_t NDIM, typename ElemType> PythonAnchor(ctor_passkey const & pk, gas::Solver<NDIM, ElemType> & svr)
       : CommonAnchor(pk, svr) {}
 
-    template <size_t NDIM>
-    static std::shared_ptr<PythonAnchor> construct(gas::Solver<NDIM> & svr) {
+    template <size_t NDIM, typename ElemType>
+    static std::shared_ptr<PythonAnchor> construct(gas::Solver<NDIM, ElemType> & svr) {
         return std::make_shared<PythonAnchor>(ctor_passkey(), svr);
     }
 
@@ -270,13 +359,21 @@ WrapGasCommonAnchor
             .def(py::init(
                 [](gas::Solver<3> & svr) { return wrapped_base_type::construct(svr); }
             ))
+            .def(py::init(
+                [](gas::Solver<2, float> & svr) { return wrapped_base_type::construct(svr); }
+            ))
+            .def(py::init(
+                [](gas::Solver<3, float> & svr) { return wrapped_base_type::construct(svr); }
+            ))
             .def_property_readonly(
                 "solver",
                 [](wrapped_type & self) -> py::object {
+                    // cast through the holder, so that a solver without a live wrapper (a member of an ensemble) is not copied.
+                    const bool single = MH_FLOAT == self.elemtype();
                     if        (2 == self.ndim()) {
-                        return py::cast(self.solver<2>());
+                        return single ? py::cast(self.solver<2, float>().shared_from_this()) : py::cast(self.solver<2>().shared_from_this());
                     } else if (3 == self.ndim()) {
-                        return py::cast(self.solver<3>());
+                        return single ? py::cast(self.solver<3, float>().shared_from_this()) : py::cast(self.solver<3>().shared_from_this());
                     } else {
                         return py::none();
                     }
@@ -285,10 +382,11 @@ WrapGasCommonAnchor
             .def_property_readonly(
                 "make_owner",
                 [](wrapped_type & self) -> py::object {
+                    const bool single = MH_FLOAT == self.elemtype();
                     if        (2 == self.ndim()) {
-                        return py::cast(self.make_owner<2>());
+                        return single ? py::cast(self.make_owner<2, float>()) : py::cast(self.make_owner<2>());
                     } else if (3 == self.ndim()) {
-                        return py::cast(self.make_owner<3>());
+                        return single ? py::cast(self.make_owner<3, float>()) : py::cast(self.make_owner<3>());
                     } else {
                         return py::none();
                     }
@@ -311,15 +409,15 @@ WrapGasCommonAnchor
 
 }; /* end class WrapGasCommonAnchor */
 
-template< size_t NDIM >
+template< size_t NDIM, typename ElemType = real_type >
 class
 MARCH_PYTHON_WRAPPER_VISIBILITY
 WrapGasAnchor
-  : public WrapBase< WrapGasAnchor<NDIM>, gas::Anchor<NDIM>, std::shared_ptr<gas::Anchor<NDIM>> >
+  : public WrapBase< WrapGasAnchor<NDIM, ElemType>, gas::Anchor<NDIM, ElemType>, std::shared_ptr<gas::Anchor<NDIM, ElemType>> >
 {
 
     /* aliases for dependent type name lookup */
-    using base_type = WrapBase< WrapGasAnchor<NDIM>, gas::Anchor<NDIM>, std::shared_ptr<gas::Anchor<NDIM>> >;
+    using base_type = WrapBase< WrapGasAnchor<NDIM, ElemType>, gas::Anchor<NDIM, ElemType>, std::shared_ptr<gas::Anchor<NDIM, ElemType>> >;
     using wrapped_type = typename base_type::wrapped_type;
 
     friend base_type;
@@ -363,10 +461,379 @@ WrapGasAnchor
 
 }; /* end class WrapGasAnchor */
 
+template< size_t NDIM, typename ElemType = real_type >
+class
+MARCH_PYTHON_WRAPPER_VISIBILITY
+WrapGasCflAnchor
+  : public WrapBase< WrapGasCflAnchor<NDIM, ElemType>, gas::CflAnchor<NDIM, ElemType>, std::shared_ptr<gas::CflAnchor<NDIM, ElemType>>, gas::Anchor<NDIM, ElemType> >
+{
+
+    /* aliases for dependent type name lookup */
+    using base_type = WrapBase< WrapGasCflAnchor<NDIM, ElemType>, gas::CflAnchor<NDIM, ElemType>, std::shared_ptr<gas::CflAnchor<NDIM, ElemType>>, gas::Anchor<NDIM, ElemType> >;
+    using wrapped_type = typename base_type::wrapped_type;
+    using solver_type = typename wrapped_type::solver_type;
+    using int_type = typename wrapped_type::int_type;
+
+    friend base_type;
+
+    WrapGasCflAnchor(pybind11::module & mod, const char * pyname, const char * clsdoc)
+      : base_type(mod, pyname, clsdoc)
+    {
+        namespace py = pybind11;
+        (*this)
+            .def(
+                py::init([](solver_type & svr, int_type rsteps) {
+                    return wrapped_type::construct(svr, rsteps);
+                }),
+                py::arg("svr"), py::arg("rsteps") = 1
+            )
+            .def_property_readonly("rsteps", &wrapped_type::rsteps)
+        ;
+    }
+
+}; /* end class WrapGasCflAnchor */
+
+template< size_t NDIM, typename ElemType = real_type >
+class
+MARCH_PYTHON_WRAPPER_VISIBILITY
+WrapGasBoundCheckAnchor
+  : public WrapBase< WrapGasBoundCheckAnchor<NDIM, ElemType>, gas::BoundCheckAnchor<NDIM, ElemType>, std::shared_ptr<gas::BoundCheckAnchor<NDIM, ElemType>>, gas::Anchor<NDIM, ElemType> >
+{
+
+    /* aliases for dependent type name lookup */
+    using base_type = WrapBase< WrapGasBoundCheckAnchor<NDIM, ElemType>, gas::BoundCheckAnchor<NDIM, ElemType>, std::shared_ptr<gas::BoundCheckAnchor<NDIM, ElemType>>, gas::Anchor<NDIM, ElemType> >;
+    using wrapped_type = typename base_type::wrapped_type;
+    using solver_type = typename wrapped_type::solver_type;
+    using int_type = typename wrapped_type::int_type;
+
+    friend base_type;
+
+    WrapGasBoundCheckAnchor(pybind11::module & mod, const char * pyname, const char * clsdoc)
+      : base_type(mod, pyname, clsdoc)
+    {
+        namespace py = pybind11;
+        (*this)
+            .def(
+                py::init([](solver_type & svr, int_type rsteps, real_type density_min, real_type pressure_min) {
+                    return wrapped_type::construct(svr, rsteps, density_min, pressure_min);
+                }),
+                py::arg("svr"), py::arg("rsteps") = 1, py::arg("density_min") = 0.0
+              , py::arg("pressure_min") = -std::numeric_limits<real_type>::infinity()
+            )
+            .def_property_readonly("rsteps", &wrapped_type::rsteps)
+            .def_property_readonly("density_min", &wrapped_type::density_min)
+            .def_property_readonly("pressure_min", &wrapped_type::pressure_min)
+        ;
+    }
+
+}; /* end class WrapGasBoundCheckAnchor */
+
+template< size_t NDIM, typename ElemType = real_type >
+class
+MARCH_PYTHON_WRAPPER_VISIBILITY
+WrapGasResidualAnchor
+  : public WrapBase< WrapGasResidualAnchor<NDIM, ElemType>, gas::ResidualAnchor<NDIM, ElemType>, std::shared_ptr<gas::ResidualAnchor<NDIM, ElemType>>, gas::Anchor<NDIM, ElemType> >
+{
+
+    /* aliases for dependent type name lookup */
+    using base_type = WrapBase< WrapGasResidualAnchor<NDIM, ElemType>, gas::ResidualAnchor<NDIM, ElemType>, std::shared_ptr<gas::ResidualAnchor<NDIM, ElemType>>, gas::Anchor<NDIM, ElemType> >;
+    using wrapped_type = typename base_type::wrapped_type;
+    using solver_type = typename wrapped_type::solver_type;
+    using int_type = typename wrapped_type::int_type;
+
+    friend base_type;
+
+    WrapGasResidualAnchor(pybind11::module & mod, const char * pyname, const char * clsdoc)
+      : base_type(mod, pyname, clsdoc)
+    {
+        namespace py = pybind11;
+        (*this)
+            .def(
+                py::init([](solver_type & svr, int_type rsteps) {
+                    return wrapped_type::construct(svr, rsteps);
+                }),
+                py::arg("svr"), py::arg("rsteps") = 1
+            )
+            .def_property_readonly("rsteps", &wrapped_type::rsteps)
+            .def_property_readonly("residual_initial", &wrapped_type::residual_initial)
+        ;
+    }
+
+}; /* end class WrapGasResidualAnchor */
+
+template< size_t NDIM, typename ElemType = real_type >
+class
+MARCH_PYTHON_WRAPPER_VISIBILITY
+WrapGasSnapshotAnchor
+  : public WrapBase< WrapGasSnapshotAnchor<NDIM, ElemType>, gas::SnapshotAnchor<NDIM, ElemType>, std::shared_ptr<gas::SnapshotAnchor<NDIM, ElemType>>, gas::Anchor<NDIM, ElemType> >
+{
+
+    /* aliases for dependent type name lookup */
+    using base_type = WrapBase< WrapGasSnapshotAnchor<NDIM, ElemType>, gas::SnapshotAnchor<NDIM, ElemType>, std::shared_ptr<gas::SnapshotAnchor<NDIM, ElemType>>, gas::Anchor<NDIM, ElemType> >;
+    using wrapped_type = typename base_type::wrapped_type;
+    using solver_type = typename wrapped_type::solver_type;
+    using int_type = typename wrapped_type::int_type;
+
+    friend base_type;
+
+    WrapGasSnapshotAnchor(pybind11::module & mod, const char * pyname, const char * clsdoc)
+      : base_type(mod, pyname, clsdoc)
+    {
+        namespace py = pybind11;
+        (*this)
+            .def(
+                py::init([](solver_type & svr, std::string const & aname, int_type psteps, index_type nslot) {
+                    return wrapped_type::construct(svr, aname, psteps, nslot);
+                }),
+                py::arg("svr"), py::arg("aname") = "so0c", py::arg("psteps") = 1, py::arg("nslot") = 1
+            )
+            .def_property_readonly("aname", &wrapped_type::aname)
+            .def_property_readonly("psteps", &wrapped_type::psteps)
+            .def_property_readonly("nslot", &wrapped_type::nslot)
+            .def_property_readonly("count", &wrapped_type::count)
+            .def_property_readonly(
+                "data"
+              , [](wrapped_type const & self) { return self.data(); }
+              , "Ring buffer of the snapshots"
+            )
+            .def_property_readonly(
+                "times"
+              , [](wrapped_type const & self) { return static_cast<LookupTableCore>(self.times()); }
+              , "Time of each slot of the ring buffer"
+            )
+            .def_property_readonly(
+                "snapshots"
+              , [](py::object self) {
+                    auto const & ank = py::cast<wrapped_type const &>(self);
+                    const index_type nslot = ank.nslot();
+                    const index_type count = ank.count();
+                    py::list order;
+                    for (index_type it=std::max<index_type>(count-nslot, 0); it<count; ++it) { order.append(it % nslot); }
+                    // fancy indexing makes the copies.
+                    py::object times = self.attr("times").attr("F").attr("__getitem__")(order);
+                    py::object data = self.attr("data").attr("F").attr("__getitem__")(order);
+                    return py::make_tuple(times, data);
+                }
+              , "Tuple of the times and the snapshots in chronological order"
+            )
+            .def("snapshot", &wrapped_type::snapshot)
+        ;
+    }
+
+}; /* end class WrapGasSnapshotAnchor */
+
+template< size_t NDIM, typename ElemType = real_type >
+class
+MARCH_PYTHON_WRAPPER_VISIBILITY
+WrapGasProbeAnchor
+  : public WrapBase< WrapGasProbeAnchor<NDIM, ElemType>, gas::ProbeAnchor<NDIM, ElemType>, std::shared_ptr<gas::ProbeAnchor<NDIM, ElemType>>, gas::Anchor<NDIM, ElemType> >
+{
+
+    /* aliases for dependent type name lookup */
+    using base_type = WrapBase< WrapGasProbeAnchor<NDIM, ElemType>, gas::ProbeAnchor<NDIM, ElemType>, std::shared_ptr<gas::ProbeAnchor<NDIM, ElemType>>, gas::Anchor<NDIM, ElemType> >;
+    using wrapped_type = typename base_type::wrapped_type;
+    using solver_type = typename wrapped_type::solver_type;
+    using int_type = typename wrapped_type::int_type;
+
+    friend base_type;
+
+    WrapGasProbeAnchor(pybind11::module & mod, const char * pyname, const char * clsdoc)
+      : base_type(mod, pyname, clsdoc)
+    {
+        namespace py = pybind11;
+        (*this)
+            .def(
+                py::init([](solver_type & svr, std::vector<index_type> const & cells, int_type psteps, index_type capacity) {
+                    return wrapped_type::construct(svr, cells, psteps, capacity);
+                }),
+                py::arg("svr"), py::arg("cells"), py::arg("psteps") = 1, py::arg("capacity") = 1024
+            )
+            .def_property_readonly("cells", &wrapped_type::cells)
+            .def_property_readonly("psteps", &wrapped_type::psteps)
+            .def_property_readonly("capacity", &wrapped_type::capacity)
+            .def_property_readonly("count", &wrapped_type::count)
+            .def_property_readonly(
+                "data"
+              , [](wrapped_type const & self) { return self.data(); }
+              , "Ring buffer of the samples; time followed by neq values of each cell"
+            )
+            .def_property_readonly(
+                "samples"
+              , [](wrapped_type const & self) {
+                    // The rows in the buffer from the oldest to the newest.
+                    const index_type capacity = self.capacity();
+                    const index_type nrow = std::min(self.count(), capacity);
+                    const index_type ncolumn = self.data().ncolumn();
+                    py::array_t<real_type> ret(std::vector<size_t>{static_cast<size_t>(nrow), static_cast<size_t>(ncolumn)});
+                    real_type * dst = ret.mutable_data();
+                    for (index_type irow=self.count()-nrow; irow<self.count(); ++irow) {
+                        const real_type * src = reinterpret_cast<const real_type *>(self.data().row(irow % capacity));
+                        std::copy(src, src + ncolumn, dst);
+                        dst += ncolumn;
+                    }
+                    return ret;
+                }
+              , "Array of the samples in the buffer, from the oldest to the newest"
+            )
+            .def("sample", &wrapped_type::sample)
+        ;
+    }
+
+}; /* end class WrapGasProbeAnchor */
+
+template< size_t NDIM, typename ElemType = real_type >
+class
+MARCH_PYTHON_WRAPPER_VISIBILITY
+WrapGasExchange
+  : public WrapBase< WrapGasExchange<NDIM, ElemType>, gas::Exchange<NDIM, ElemType>, std::shared_ptr<gas::Exchange<NDIM, ElemType>> >
+{
+
+    /* aliases for dependent type name lookup */
+    using base_type = WrapBase< WrapGasExchange<NDIM, ElemType>, gas::Exchange<NDIM, ElemType>, std::shared_ptr<gas::Exchange<NDIM, ElemType>> >;
+    using wrapped_type = typename base_type::wrapped_type;
+    using solver_type = typename wrapped_type::solver_type;
+
+    friend base_type;
+
+    WrapGasExchange(pybind11::module & mod, const char * pyname, const char * clsdoc)
+      : base_type(mod, pyname, clsdoc)
+    {
+        namespace py = pybind11;
+        (*this)
+            .def(py::init([](index_type nblock) { return wrapped_type::construct(nblock); }), py::arg("nblock"))
+            .def_property_readonly("nblock", &wrapped_type::nblock)
+            .def("bind", &wrapped_type::bind, py::arg("iblk"), py::arg("svr"), py::keep_alive<1, 3>())
+            .def("add_interface", &wrapped_type::add_interface
+               , py::arg("iblk"), py::arg("jblk"), py::arg("ghosts"), py::arg("cells"))
+            .def("ghosts", &wrapped_type::ghosts, py::arg("svr"))
+            .def("sync", &wrapped_type::sync)
+            .def("abort", &wrapped_type::abort)
+            .def("reset", &wrapped_type::reset)
+        ;
+    }
+
+}; /* end class WrapGasExchange */
+
+template< size_t NDIM, typename ElemType = real_type >
+class
+MARCH_PYTHON_WRAPPER_VISIBILITY
+WrapGasEnsemble
+  : public WrapBase< WrapGasEnsemble<NDIM, ElemType>, gas::Ensemble<NDIM, ElemType>, std::shared_ptr<gas::Ensemble<NDIM, ElemType>> >
+{
+
+    /* aliases for dependent type name lookup */
+    using base_type = WrapBase< WrapGasEnsemble<NDIM, ElemType>, gas::Ensemble<NDIM, ElemType>, std::shared_ptr<gas::Ensemble<NDIM, ElemType>> >;
+    using wrapped_type = typename base_type::wrapped_type;
+    using solver_type = typename wrapped_type::solver_type;
+    using block_type = typename wrapped_type::block_type;
+
+    friend base_type;
+
+    WrapGasEnsemble(pybind11::module & mod, const char * pyname, const char * clsdoc)
+      : base_type(mod, pyname, clsdoc)
+    {
+        namespace py = pybind11;
+        using solver_wrapper = WrapGasSolver<NDIM, ElemType>;
+        this->m_cls.attr("neq") = NDIM + 2;
+        this->m_cls.attr("fpdtype") = std::is_same<ElemType, float>::value ? "float32" : "float64";
+        this->m_cls.attr("_interface_init_") = std::make_tuple("cecnd");
+        this->m_cls.attr("_solution_array_") = std::make_tuple();
+        (*this)
+            .def(
+                py::init([](
+                    py::object pyblock
+                  , index_type nmember
+                  , real_type sigma0
+                  , real_type time
+                  , real_type time_increment
+                  , typename solver_type::int_type report_interval
+                  , py::object bclists
+                  , py::kwargs kw
+                ) {
+                    block_type * block = py::cast<block_type *>(pyblock.attr("_ustblk"));
+                    assert(block);
+                    if (!bclists.is_none() && py::len(bclists) != size_t(nmember)) {
+                        throw py::value_error(string::format("Ensemble: %d bclists for %d members", int(py::len(bclists)), int(nmember)));
+                    }
+                    auto ens = wrapped_type::construct(block->shared_from_this(), nmember, solver_wrapper::layout_from(kw));
+                    for (index_type imember=0; imember<nmember; ++imember) {
+                        // the trims of a member refer to the boundary data in its bclist.
+                        py::list bclist(bclists.is_none() ? py::object(pyblock.attr("bclist")) : py::object(bclists[py::int_(imember)]));
+                        solver_wrapper::setup(ens->member(imember), bclist, sigma0, time, time_increment, report_interval, kw);
+                    }
+                    return ens;
+                }),
+                py::arg("block"), py::arg("nmember"), py::arg("sigma0"), py::arg("time"), py::arg("time_increment")
+              , py::arg("report_interval"), py::arg("bclists") = py::none()
+              , py::keep_alive<1, 8>()
+            )
+            .def_property_readonly("block", &wrapped_type::block)
+            .def_property_readonly("nmember", &wrapped_type::nmember)
+            .def_property_readonly("members", &wrapped_type::members)
+            .def(
+                "member"
+              , [](wrapped_type const & self, index_type imember) { return self.member(imember).shared_from_this(); }
+              , py::arg("imember")
+            )
+        ;
+        // the interface of solvcon.MeshCase to a solver, each for all the members.
+#define DECL_MARCH_PYBIND_GAS_ENSEMBLE_EACH(NAME, CALL) \
+            .def(#NAME, [](wrapped_type & self) { for (auto const & svr : self.members()) { CALL; } })
+        (*this)
+            DECL_MARCH_PYBIND_GAS_ENSEMBLE_EACH(provide, svr->anchors().provide())
+            DECL_MARCH_PYBIND_GAS_ENSEMBLE_EACH(preloop, svr->anchors().preloop())
+            DECL_MARCH_PYBIND_GAS_ENSEMBLE_EACH(postloop, svr->anchors().postloop())
+            DECL_MARCH_PYBIND_GAS_ENSEMBLE_EACH(exhaust, svr->anchors().exhaust())
+            DECL_MARCH_PYBIND_GAS_ENSEMBLE_EACH(apply_bc, svr->trim_do0(); svr->trim_do1())
+            .def(
+                "init"
+              , [](wrapped_type & self, py::kwargs const &) {
+                    // the members share the tables.
+                    auto & sol = self.member(0).sol();
+                    sol.arrays().so0c().fill(solver_type::ALMOST_ZERO);
+                    sol.arrays().so0n().fill(solver_type::ALMOST_ZERO);
+                    sol.arrays().so0t().fill(solver_type::ALMOST_ZERO);
+                    sol.arrays().so1c().fill(solver_type::ALMOST_ZERO);
+                    sol.arrays().so1n().fill(solver_type::ALMOST_ZERO);
+                }
+            )
+            .def(
+                "final"
+              , [](wrapped_type &, py::kwargs const &) { /* do nothing */ }
+            )
+            .def(
+                "march"
+              , [](wrapped_type & self
+                 , real_type time_current
+                 , real_type time_increment
+                 , typename solver_type::int_type steps_run
+                 , py::object
+                ) {
+                    {
+                        // Python anchors re-acquire the GIL in the overloads.
+                        py::gil_scoped_release release;
+                        self.march(time_current, time_increment, steps_run);
+                    }
+                    // one return for each member, like those of the workers.
+                    py::list marchret;
+                    for (auto const & svr : self.members()) { marchret.append(solver_wrapper::march_return(*svr)); }
+                    return marchret;
+                }
+              , py::arg("time_current")
+              , py::arg("time_increment")
+              , py::arg("steps_run")
+              , py::arg("worker") = py::none()
+            )
+        ;
+#undef DECL_MARCH_PYBIND_GAS_ENSEMBLE_EACH
+    }
+
+}; /* end class WrapGasEnsemble */
+
 /* This is to workaround https://github.com/pybind/pybind11/issues/1145.  The
  * lifecycle of the derived Python instances is kept in the manager. */
-template< size_t NDIM >
-class PythonAnchorManager : public gas::AnchorChain<NDIM>::LifeManager {
+template< size_t NDIM, typename ElemType = real_type >
+class PythonAnchorManager : public gas::AnchorChain<NDIM, ElemType>::LifeManager {
 
 public:
 
@@ -378,15 +845,15 @@ private:
 
 }; /* class PythonAnchorManager */
 
-template< size_t NDIM >
+template< size_t NDIM, typename ElemType = real_type >
 class
 MARCH_PYTHON_WRAPPER_VISIBILITY
 WrapGasAnchorChain
-  : public WrapBase< WrapGasAnchorChain<NDIM>, gas::AnchorChain<NDIM> >
+  : public WrapBase< WrapGasAnchorChain<NDIM, ElemType>, gas::AnchorChain<NDIM, ElemType> >
 {
 
     /* aliases for dependent type name lookup */
-    using base_type = WrapBase< WrapGasAnchorChain<NDIM>, gas::AnchorChain<NDIM> >;
+    using base_type = WrapBase< WrapGasAnchorChain<NDIM, ElemType>, gas::AnchorChain<NDIM, ElemType> >;
     using wrapped_type = typename base_type::wrapped_type;
 
     friend base_type;
@@ -399,8 +866,8 @@ WrapGasAnchorChain
             .def(
                 "append",
                 [](wrapped_type & self, std::shared_ptr<gas::CommonAnchor> const & ptr, std::string const & name) {
-                    self.append(ptr->make_owner<NDIM>(), name);
-                    using mtype = PythonAnchorManager<NDIM>;
+                    self.append(ptr->make_owner<NDIM, ElemType>(), name);
+                    using mtype = PythonAnchorManager<NDIM, ElemType>;
                     if (!self.life_manager()) {
                         self.life_manager() = make_unique<mtype>();
                     }
@@ -410,6 +877,18 @@ WrapGasAnchorChain
                 py::arg("obj"), py::arg("name") = ""
             )
             .def("append", &wrapped_type::append, py::arg("obj"), py::arg("name") = "")
+            .def("__contains__", &wrapped_type::has, py::arg("name"))
+            .def(
+                "__getitem__",
+                [](wrapped_type const & self, std::string const & name) -> py::object {
+                    if (name.empty() || !self.has(name)) { throw py::key_error(name); }
+                    auto const & ptr = self[name];
+                    // Python anchors are returned as the derived instances.
+                    if (ptr->common()) { return py::cast(ptr->common()); }
+                    return py::cast(ptr);
+                },
+                py::arg("name")
+            )
             .def("provide", &wrapped_type::provide)
             .def("preloop", &wrapped_type::preloop)
             .def("premarch", &wrapped_type::premarch)
@@ -447,6 +926,10 @@ WrapGasParameter
             DECL_MARCH_PYBIND_GAS_PARAMETER(real_type, sigma0)
             DECL_MARCH_PYBIND_GAS_PARAMETER(real_type, taumin)
             DECL_MARCH_PYBIND_GAS_PARAMETER(real_type, tauscale)
+            DECL_MARCH_PYBIND_GAS_PARAMETER(gas::Parameter::int_type, tile_size)
+            DECL_MARCH_PYBIND_GAS_PARAMETER(real_type, local_cfl)
+            DECL_MARCH_PYBIND_GAS_PARAMETER(gas::Parameter::int_type, multirate_nlevel)
+            DECL_MARCH_PYBIND_GAS_PARAMETER(real_type, multirate_cfl)
             DECL_MARCH_PYBIND_GAS_PARAMETER(real_type, stop_on_negative_density)
             DECL_MARCH_PYBIND_GAS_PARAMETER(real_type, stop_on_negative_energy)
         ;
@@ -486,6 +969,9 @@ WrapGasState
             DECL_MARCH_PYBIND_GAS_STATE(real_type, cfl_max)
             DECL_MARCH_PYBIND_GAS_STATE(gas::State::int_type, cfl_nadjusted)
             DECL_MARCH_PYBIND_GAS_STATE(gas::State::int_type, cfl_nadjusted_accumulated)
+            DECL_MARCH_PYBIND_GAS_STATE(real_type, residual)
+            DECL_MARCH_PYBIND_GAS_STATE(gas::State::int_type, svrn)
+            DECL_MARCH_PYBIND_GAS_STATE(gas::State::int_type, nsvr)
         ;
 
 #undef DECL_MARCH_PYBIND_GAS_STATE
@@ -493,15 +979,80 @@ WrapGasState
 
 }; /* end class WrapGasState */
 
-template< size_t NDIM >
+/**
+ * Solution table of the structure-of-arrays layout or of a member of an
+ * ensemble.  The arrays are strided views of (nfull, neq) or (nfull, neq,
+ * NDIM) of the member.
+ */
+struct GasStridedTable {
+    LookupTableCore table;
+    index_type neq;
+    bool soa;
+    index_type nmember;
+    index_type imember;
+    // Table is neither copyable nor movable and can't be returned.
+    pybind11::array full () { return Table(table, neq, soa, nmember, imember).full (); }
+    pybind11::array ghost() { return Table(table, neq, soa, nmember, imember).ghost(); }
+    pybind11::array body () { return Table(table, neq, soa, nmember, imember).body (); }
+}; /* end struct GasStridedTable */
+
+class
+MARCH_PYTHON_WRAPPER_VISIBILITY
+WrapGasStridedTable
+  : public WrapBase< WrapGasStridedTable, GasStridedTable >
+{
+
+    friend base_type;
+
+    WrapGasStridedTable(pybind11::module & mod, const char * pyname, const char * clsdoc)
+      : base_type(mod, pyname, clsdoc)
+    {
+        namespace py = pybind11;
+        (*this)
+            .def_property_readonly("neq", [](wrapped_type const & self) { return self.neq; })
+            .def_property_readonly("nmember", [](wrapped_type const & self) { return self.nmember; })
+            .def_property_readonly("imember", [](wrapped_type const & self) { return self.imember; })
+            .def_property(
+                "F",
+                [](wrapped_type & self) { return self.full(); },
+                [](wrapped_type & self, py::array src) { Table::CopyInto(self.full(), src); },
+                "Full array.")
+            .def_property(
+                "G",
+                [](wrapped_type & self) { return self.ghost(); },
+                [](wrapped_type & self, py::array src) {
+                    if (self.table.nghost()) {
+                        Table::CopyInto(self.ghost(), src);
+                    } else {
+                        throw py::index_error("ghost is zero");
+                    }
+                },
+                "Ghost-part array.")
+            .def_property(
+                "B",
+                [](wrapped_type & self) { return self.body(); },
+                [](wrapped_type & self, py::array src) { Table::CopyInto(self.body(), src); },
+                "Body-part array.")
+            // like LookupTable, so that the ndarray methods (fill() in
+            // particular) write into the strided view of the member.
+            .def("__getattr__", [](wrapped_type & self, py::object key) {
+                return py::object(self.full().attr(key));
+            })
+            .def_property_readonly("_nda", [](wrapped_type & self) { return self.full(); })
+        ;
+    }
+
+}; /* end class WrapGasStridedTable */
+
+template< size_t NDIM, typename ElemType = real_type >
 class
 MARCH_PYTHON_WRAPPER_VISIBILITY
 WrapGasSolution
-  : public WrapBase< WrapGasSolution<NDIM>, gas::Solution<NDIM> >
+  : public WrapBase< WrapGasSolution<NDIM, ElemType>, gas::Solution<NDIM, ElemType> >
 {
 
     /* aliases for dependent type name lookup */
-    using base_type = WrapBase< WrapGasSolution<NDIM>, gas::Solution<NDIM> >;
+    using base_type = WrapBase< WrapGasSolution<NDIM, ElemType>, gas::Solution<NDIM, ElemType> >;
     using wrapped_type = typename base_type::wrapped_type;
 
     friend base_type;
@@ -509,44 +1060,75 @@ WrapGasSolution
     WrapGasSolution(pybind11::module & mod, const char * pyname, const char * clsdoc)
       : base_type(mod, pyname, clsdoc)
     {
+        namespace py = pybind11;
+
 #define DECL_MARCH_PYBIND_GAS_SOLUTION(NAME) \
             .def_property_readonly( \
                 #NAME, \
                 [](wrapped_type & self) { \
                     return static_cast<LookupTableCore>(self.arrays().NAME()); \
                 })
+// tables of the solution variables are strided under the SOA layout or in an ensemble
+#define DECL_MARCH_PYBIND_GAS_SOLUTION_LAYOUT(NAME) \
+            .def_property_readonly( \
+                #NAME, \
+                [](wrapped_type & self) -> py::object { \
+                    LookupTableCore table = static_cast<LookupTableCore>(self.arrays().NAME()); \
+                    const bool soa = gas::Layout::SOA == self.layout(); \
+                    if (soa || self.nmember() > 1) { \
+                        return py::cast(GasStridedTable{table, wrapped_type::neq, soa, self.nmember(), self.imember()}); \
+                    } \
+                    return py::cast(table); \
+                })
 
         (*this)
-            DECL_MARCH_PYBIND_GAS_SOLUTION(so0c)
-            DECL_MARCH_PYBIND_GAS_SOLUTION(so0n)
-            DECL_MARCH_PYBIND_GAS_SOLUTION(so0t)
-            DECL_MARCH_PYBIND_GAS_SOLUTION(so1c)
-            DECL_MARCH_PYBIND_GAS_SOLUTION(so1n)
-            DECL_MARCH_PYBIND_GAS_SOLUTION(stm)
+            .def_property_readonly(
+                "layout",
+                [](wrapped_type const & self) { return gas::Layout::SOA == self.layout() ? "soa" : "aos"; })
+            .def_property_readonly("nmember", &wrapped_type::nmember)
+            .def_property_readonly("imember", &wrapped_type::imember)
+            DECL_MARCH_PYBIND_GAS_SOLUTION_LAYOUT(so0c)
+            DECL_MARCH_PYBIND_GAS_SOLUTION_LAYOUT(so0n)
+            DECL_MARCH_PYBIND_GAS_SOLUTION_LAYOUT(so0t)
+            DECL_MARCH_PYBIND_GAS_SOLUTION_LAYOUT(so1c)
+            DECL_MARCH_PYBIND_GAS_SOLUTION_LAYOUT(so1n)
+            DECL_MARCH_PYBIND_GAS_SOLUTION_LAYOUT(stm)
             DECL_MARCH_PYBIND_GAS_SOLUTION(cflc)
             DECL_MARCH_PYBIND_GAS_SOLUTION(cflo)
             DECL_MARCH_PYBIND_GAS_SOLUTION(gamma)
+            DECL_MARCH_PYBIND_GAS_SOLUTION(ldt)
         ;
 
+#undef DECL_MARCH_PYBIND_GAS_SOLUTION_LAYOUT
 #undef DECL_MARCH_PYBIND_GAS_SOLUTION
     }
 
 }; /* end class WrapGasSolution */
 
-template< size_t NDIM >
+template< size_t NDIM, typename ElemType = real_type >
 class
 MARCH_PYTHON_WRAPPER_VISIBILITY
 WrapGasQuantity
-  : public WrapBase< WrapGasQuantity<NDIM>, gas::Quantity<NDIM>, std::shared_ptr<gas::Quantity<NDIM>> >
+  : public WrapBase< WrapGasQuantity<NDIM, ElemType>, gas::Quantity<NDIM, ElemType>, std::shared_ptr<gas::Quantity<NDIM, ElemType>> >
 {
 
     /* aliases for dependent type name lookup */
-    using base_type = WrapBase< WrapGasQuantity<NDIM>, gas::Quantity<NDIM>, std::shared_ptr<gas::Quantity<NDIM>> >;
+    using base_type = WrapBase< WrapGasQuantity<NDIM, ElemType>, gas::Quantity<NDIM, ElemType>, std::shared_ptr<gas::Quantity<NDIM, ElemType>> >;
     using wrapped_type = typename base_type::wrapped_type;
     using solver_type = typename wrapped_type::solver_type;
+    using flag_type = typename wrapped_type::flag_type;
+    using int_type = typename wrapped_type::int_type;
 
     friend base_type;
 
+    static flag_type flags_of(pybind11::object const & names) {
+        flag_type flags = 0;
+        for (auto const & name : pybind11::cast<std::vector<std::string>>(names)) {
+            flags |= wrapped_type::flag_of(name);
+        }
+        return flags;
+    }
+
     WrapGasQuantity(pybind11::module & mod, const char * pyname, const char * clsdoc)
       : base_type(mod, pyname, clsdoc)
     {
@@ -571,7 +1153,28 @@ WrapGasQuantity
             DECL_MARCH_PYBIND_GAS_QUANTITY_REAL(schlieren_k)
             DECL_MARCH_PYBIND_GAS_QUANTITY_REAL(schlieren_k0)
             DECL_MARCH_PYBIND_GAS_QUANTITY_REAL(schlieren_k1)
-            .def("update", &wrapped_type::update, "Update the physics")
+            .def(
+                "update"
+              , [](wrapped_type & self, py::object names) {
+                    self.update(names.is_none() ? flag_type(wrapped_type::ALL) : flags_of(names));
+                }
+              , py::arg("names") = py::none()
+              , "Update the named quantities (default to all) and their prerequisites")
+            .def(
+                "demand"
+              , [](wrapped_type & self, py::object names, int_type interval) {
+                    self.demand(flags_of(names), interval);
+                }
+              , py::arg("names"), py::arg("interval") = 0
+              , "Declare the quantities needed every interval steps (0 for every update)")
+            .def("clear_demand", &wrapped_type::clear_demand)
+            .def(
+                "due"
+              , [](wrapped_type const & self, int_type step) {
+                    return wrapped_type::closure(self.due(step));
+                }
+              , py::arg("step")
+              , "Flags of the quantities to be updated at the step")
             DECL_MARCH_PYBIND_GAS_QUANTITY_ARRAY(density             , full)
             DECL_MARCH_PYBIND_GAS_QUANTITY_ARRAY(velocity            , full)
             DECL_MARCH_PYBIND_GAS_QUANTITY_ARRAY(vorticity           , full)
@@ -590,15 +1193,15 @@ WrapGasQuantity
 
 }; /* end class WrapGasQuantity */
 
-template< class TrimType, size_t NDIM >
+template< class TrimType, size_t NDIM, typename ElemType = real_type >
 class
 MARCH_PYTHON_WRAPPER_VISIBILITY
 WrapGasTrimBase
-  : public WrapBase< WrapGasTrimBase<TrimType, NDIM>, TrimType, std::unique_ptr<TrimType>, gas::TrimBase<NDIM> >
+  : public WrapBase< WrapGasTrimBase<TrimType, NDIM, ElemType>, TrimType, std::unique_ptr<TrimType>, gas::TrimBase<NDIM, ElemType> >
 {
 
     /* aliases for dependent type name lookup */
-    using base_type = WrapBase< WrapGasTrimBase<TrimType, NDIM>, TrimType, std::unique_ptr<TrimType>, gas::TrimBase<NDIM> >;
+    using base_type = WrapBase< WrapGasTrimBase<TrimType, NDIM, ElemType>, TrimType, std::unique_ptr<TrimType>, gas::TrimBase<NDIM, ElemType> >;
     using wrapped_type = typename base_type::wrapped_type;
     using solver_type = typename wrapped_type::solver_type;
 
@@ -637,11 +1240,11 @@ WrapGasTrimBase
 
 }; /* end class WrapGasTrimBase */
 
-template< size_t NDIM > class MARCH_PYTHON_WRAPPER_VISIBILITY WrapGasTrimNoOp : public WrapGasTrimBase< gas::TrimNoOp<NDIM>, NDIM > {};
-template< size_t NDIM > class MARCH_PYTHON_WRAPPER_VISIBILITY WrapGasTrimInterface : public WrapGasTrimBase< gas::TrimInterface<NDIM>, NDIM > {};
-template< size_t NDIM > class MARCH_PYTHON_WRAPPER_VISIBILITY WrapGasTrimNonRefl : public WrapGasTrimBase< gas::TrimNonRefl<NDIM>, NDIM > {};
-template< size_t NDIM > class MARCH_PYTHON_WRAPPER_VISIBILITY WrapGasTrimSlipWall : public WrapGasTrimBase< gas::TrimSlipWall<NDIM>, NDIM > {};
-template< size_t NDIM > class MARCH_PYTHON_WRAPPER_VISIBILITY WrapGasTrimInlet : public WrapGasTrimBase< gas::TrimInlet<NDIM>, NDIM > {};
+template< size_t NDIM, typename ElemType = real_type > class MARCH_PYTHON_WRAPPER_VISIBILITY WrapGasTrimNoOp : public WrapGasTrimBase< gas::TrimNoOp<NDIM, ElemType>, NDIM, ElemType > {};
+template< size_t NDIM, typename ElemType = real_type > class MARCH_PYTHON_WRAPPER_VISIBILITY WrapGasTrimInterface : public WrapGasTrimBase< gas::TrimInterface<NDIM, ElemType>, NDIM, ElemType > {};
+template< size_t NDIM, typename ElemType = real_type > class MARCH_PYTHON_WRAPPER_VISIBILITY WrapGasTrimNonRefl : public WrapGasTrimBase< gas::TrimNonRefl<NDIM, ElemType>, NDIM, ElemType > {};
+template< size_t NDIM, typename ElemType = real_type > class MARCH_PYTHON_WRAPPER_VISIBILITY WrapGasTrimSlipWall : public WrapGasTrimBase< gas::TrimSlipWall<NDIM, ElemType>, NDIM, ElemType > {};
+template< size_t NDIM, typename ElemType = real_type > class MARCH_PYTHON_WRAPPER_VISIBILITY WrapGasTrimInlet : public WrapGasTrimBase< gas::TrimInlet<NDIM, ElemType>, NDIM, ElemType > {};
 
 } /* end namespace python */
 
@@ -207,13 +207,22 @@ WrapUnstructuredBlock
             .def("build_ghost", &UnstructuredBlock<NDIM>::build_ghost)
             .def(
                 "partition",
-                [](UnstructuredBlock<NDIM> & blk, index_type npart) {
+                [](UnstructuredBlock<NDIM> & blk, index_type npart, py::object vwgt) {
                     int edgecut;
                     LookupTable<index_type, 0> parts;
-                    std::tie(edgecut, parts) = blk.partition(npart);
+                    if (vwgt.is_none()) {
+                        std::tie(edgecut, parts) = blk.partition(npart);
+                    } else {
+                        auto arr = py::array_t<index_type, py::array::c_style | py::array::forcecast>(vwgt);
+                        if (static_cast<index_type>(arr.size()) != blk.ncell()) {
+                            throw py::value_error("vwgt must have ncell elements");
+                        }
+                        std::tie(edgecut, parts) = blk.partition(npart, arr.data());
+                    }
                     LookupTableCore parts_core = static_cast<LookupTableCore>(parts);
                     return py::make_tuple(edgecut, Table(parts_core).full());
                 }
+              , py::arg("npart"), py::arg("vwgt") = py::none()
             )
             .pickle()
             .def_property_readonly_static("FCMND", [](py::object const & /* self */) { return UnstructuredBlock<NDIM>::FCMND; })
@@ -22,10 +22,27 @@ PyObject * ModuleInitializer::initialize_march_gas(pybind11::module & marchmod)
     WrapGasCommonAnchor::commit(gasmod, "CommonAnchor", "Gas-dynamics multi-dimensional anchor.");
     WrapGasAnchor<2>::commit(gasmod, "Anchor2D", "Gas-dynamics anchor (2D).");
     WrapGasAnchor<3>::commit(gasmod, "Anchor3D", "Gas-dynamics anchor (3D).");
+    WrapGasCflAnchor<2>::commit(gasmod, "CflAnchor2D", "Gas-dynamics compiled CFL statistics anchor (2D).");
+    WrapGasCflAnchor<3>::commit(gasmod, "CflAnchor3D", "Gas-dynamics compiled CFL statistics anchor (3D).");
+    WrapGasBoundCheckAnchor<2>::commit(gasmod, "BoundCheckAnchor2D", "Gas-dynamics compiled solution bound check anchor (2D).");
+    WrapGasBoundCheckAnchor<3>::commit(gasmod, "BoundCheckAnchor3D", "Gas-dynamics compiled solution bound check anchor (3D).");
+    WrapGasResidualAnchor<2>::commit(gasmod, "ResidualAnchor2D", "Gas-dynamics compiled residual anchor (2D).");
+    WrapGasResidualAnchor<3>::commit(gasmod, "ResidualAnchor3D", "Gas-dynamics compiled residual anchor (3D).");
+    WrapGasSnapshotAnchor<2>::commit(gasmod, "SnapshotAnchor2D", "Gas-dynamics compiled array snapshot anchor (2D).");
+    WrapGasSnapshotAnchor<3>::commit(gasmod, "SnapshotAnchor3D", "Gas-dynamics compiled array snapshot anchor (3D).");
+    WrapGasProbeAnchor<2>::commit(gasmod, "ProbeAnchor2D", "Gas-dynamics compiled probe anchor (2D).");
+    WrapGasProbeAnchor<3>::commit(gasmod, "ProbeAnchor3D", "Gas-dynamics compiled probe anchor (3D).");
     WrapGasAnchorChain<2>::commit(gasmod, "AnchorChain2D", "Gas-dynamics sequential container for anchors (2D).");
     WrapGasAnchorChain<3>::commit(gasmod, "AnchorChain3D", "Gas-dynamics sequential container for anchors (3D).");
+    WrapGasExchange<2>::commit(gasmod, "Exchange2D", "Gas-dynamics in-process interface exchange (2D).");
+    WrapGasExchange<3>::commit(gasmod, "Exchange3D", "Gas-dynamics in-process interface exchange (3D).");
+    gasmod.attr("Solver2D").attr("Exchange") = gasmod.attr("Exchange2D");
+    gasmod.attr("Solver3D").attr("Exchange") = gasmod.attr("Exchange3D");
+    WrapGasEnsemble<2>::commit(gasmod, "Ensemble2D", "Gas-dynamics ensemble of solvers over one block (2D).");
+    WrapGasEnsemble<3>::commit(gasmod, "Ensemble3D", "Gas-dynamics ensemble of solvers over one block (3D).");
     WrapGasParameter::commit(gasmod, "Parameter", "Gas-dynamics solver parameters.");
     WrapGasState::commit(gasmod, "State", "Gas-dynamics solver states.");
+    WrapGasStridedTable::commit(gasmod, "StridedTable", "Gas-dynamics solution table of the structure-of-arrays layout or an ensemble member.");
     WrapGasSolution<2>::commit(gasmod, "Solution2D", "Gas-dynamics solution data (2D).");
     WrapGasSolution<3>::commit(gasmod, "Solution3D", "Gas-dynamics solution data (3D).");
     WrapGasQuantity<2>::commit(gasmod, "Quantity2D", "Gas-dynamics quantities (2D).");
@@ -45,6 +62,46 @@ PyObject * ModuleInitializer::initialize_march_gas(pybind11::module & marchmod)
     WrapGasTrimInlet<2>::commit(gasmod, "TrimInlet2D", "Gas-dynamics inlet trim (2D).");
     WrapGasTrimInlet<3>::commit(gasmod, "TrimInlet3D", "Gas-dynamics inlet trim (3D).");
 
+    // section: solver and associated data storing the solution in float32
+    WrapGasSolver<2, float>::commit(gasmod, "Solver2DFloat32", "Gas-dynamics solver (2D, float32).");
+    WrapGasSolver<3, float>::commit(gasmod, "Solver3DFloat32", "Gas-dynamics solver (3D, float32).");
+    WrapGasAnchor<2, float>::commit(gasmod, "Anchor2DFloat32", "Gas-dynamics anchor (2D, float32).");
+    WrapGasAnchor<3, float>::commit(gasmod, "Anchor3DFloat32", "Gas-dynamics anchor (3D, float32).");
+    WrapGasCflAnchor<2, float>::commit(gasmod, "CflAnchor2DFloat32", "Gas-dynamics compiled CFL statistics anchor (2D, float32).");
+    WrapGasCflAnchor<3, float>::commit(gasmod, "CflAnchor3DFloat32", "Gas-dynamics compiled CFL statistics anchor (3D, float32).");
+    WrapGasBoundCheckAnchor<2, float>::commit(gasmod, "BoundCheckAnchor2DFloat32", "Gas-dynamics compiled solution bound check anchor (2D, float32).");
+    WrapGasBoundCheckAnchor<3, float>::commit(gasmod, "BoundCheckAnchor3DFloat32", "Gas-dynamics compiled solution bound check anchor (3D, float32).");
+    WrapGasResidualAnchor<2, float>::commit(gasmod, "ResidualAnchor2DFloat32", "Gas-dynamics compiled residual anchor (2D, float32).");
+    WrapGasResidualAnchor<3, float>::commit(gasmod, "ResidualAnchor3DFloat32", "Gas-dynamics compiled residual anchor (3D, float32).");
+    WrapGasSnapshotAnchor<2, float>::commit(gasmod, "SnapshotAnchor2DFloat32", "Gas-dynamics compiled array snapshot anchor (2D, float32).");
+    WrapGasSnapshotAnchor<3, float>::commit(gasmod, "SnapshotAnchor3DFloat32", "Gas-dynamics compiled array snapshot anchor (3D, float32).");
+    WrapGasProbeAnchor<2, float>::commit(gasmod, "ProbeAnchor2DFloat32", "Gas-dynamics compiled probe anchor (2D, float32).");
+    WrapGasProbeAnchor<3, float>::commit(gasmod, "ProbeAnchor3DFloat32", "Gas-dynamics compiled probe anchor (3D, float32).");
+    WrapGasAnchorChain<2, float>::commit(gasmod, "AnchorChain2DFloat32", "Gas-dynamics sequential container for anchors (2D, float32).");
+    WrapGasAnchorChain<3, float>::commit(gasmod, "AnchorChain3DFloat32", "Gas-dynamics sequential container for anchors (3D, float32).");
+    WrapGasExchange<2, float>::commit(gasmod, "Exchange2DFloat32", "Gas-dynamics in-process interface exchange (2D, float32).");
+    WrapGasExchange<3, float>::commit(gasmod, "Exchange3DFloat32", "Gas-dynamics in-process interface exchange (3D, float32).");
+    gasmod.attr("Solver2DFloat32").attr("Exchange") = gasmod.attr("Exchange2DFloat32");
+    gasmod.attr("Solver3DFloat32").attr("Exchange") = gasmod.attr("Exchange3DFloat32");
+    WrapGasEnsemble<2, float>::commit(gasmod, "Ensemble2DFloat32", "Gas-dynamics ensemble of solvers over one block (2D, float32).");
+    WrapGasEnsemble<3, float>::commit(gasmod, "Ensemble3DFloat32", "Gas-dynamics ensemble of solvers over one block (3D, float32).");
+    WrapGasSolution<2, float>::commit(gasmod, "Solution2DFloat32", "Gas-dynamics solution data (2D, float32).");
+    WrapGasSolution<3, float>::commit(gasmod, "Solution3DFloat32", "Gas-dynamics solution data (3D, float32).");
+    WrapGasQuantity<2, float>::commit(gasmod, "Quantity2DFloat32", "Gas-dynamics quantities (2D, float32).");
+    WrapGasQuantity<3, float>::commit(gasmod, "Quantity3DFloat32", "Gas-dynamics quantities (3D, float32).");
+    WrapGasTrimBase<gas::TrimBase<2, float>, 2, float>::commit(gasmod, "TrimBase2DFloat32", "Gas-dynamics trim base type (2D, float32).");
+    WrapGasTrimBase<gas::TrimBase<3, float>, 3, float>::commit(gasmod, "TrimBase3DFloat32", "Gas-dynamics trim base type (3D, float32).");
+    WrapGasTrimInterface<2, float>::commit(gasmod, "TrimInterface2DFloat32", "Gas-dynamics interface trim (2D, float32).");
+    WrapGasTrimInterface<3, float>::commit(gasmod, "TrimInterface3DFloat32", "Gas-dynamics interface trim (3D, float32).");
+    WrapGasTrimNoOp<2, float>::commit(gasmod, "TrimNoOp2DFloat32", "Gas-dynamics no-op trim (2D, float32).");
+    WrapGasTrimNoOp<3, float>::commit(gasmod, "TrimNoOp3DFloat32", "Gas-dynamics no-op trim (3D, float32).");
+    WrapGasTrimNonRefl<2, float>::commit(gasmod, "TrimNonRefl2DFloat32", "Gas-dynamics non-reflective trim (2D, float32).");
+    WrapGasTrimNonRefl<3, float>::commit(gasmod, "TrimNonRefl3DFloat32", "Gas-dynamics non-reflective trim (3D, float32).");
+    WrapGasTrimSlipWall<2, float>::commit(gasmod, "TrimSlipWall2DFloat32", "Gas-dynamics slip wall trim (2D, float32).");
+    WrapGasTrimSlipWall<3, float>::commit(gasmod, "TrimSlipWall3DFloat32", "Gas-dynamics slip wall trim (3D, float32).");
+    WrapGasTrimInlet<2, float>::commit(gasmod, "TrimInlet2DFloat32", "Gas-dynamics inlet trim (2D, float32).");
+    WrapGasTrimInlet<3, float>::commit(gasmod, "TrimInlet3DFloat32", "Gas-dynamics inlet trim (3D, float32).");
+
     return gasmod.ptr();
 }
 
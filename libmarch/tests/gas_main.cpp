@@ -5,6 +5,8 @@
 
 #include <gtest/gtest.h>
 
+#include <thread>
+
 #include "march/gas.hpp"
 
 using namespace march;
@@ -59,7 +61,23 @@ protected:
 
 }; /* end class GasTestBase */
 
-class GasSolverTest : public GasTestBase {};
+class GasSolverTest : public GasTestBase {
+
+protected:
+
+    template< class SolverType >
+    void init(SolverType & svr) {
+        for (index_type icl=-m_triangles->ngstcell(); icl<m_triangles->ncell(); ++icl) {
+            svr.sol().gamma(icl) = 1.4;
+            svr.sol().so0c(icl).set_by(1.0, 1.4, 1.0 + 0.1 * icl, 1.0 + 0.2 * icl);
+            svr.sol().so0c(icl).set_momentum(Vector<2>(0.1 * icl, -0.2));
+            svr.sol().so0n(icl) = svr.sol().so0c(icl);
+            svr.sol().so1c(icl) = Vector<2>(0.01 * icl, 0.02);
+        }
+        svr.state().time_increment = 0.01;
+    }
+
+}; /* end class GasSolverTest */
 
 TEST_F(GasSolverTest, BlockConstructor) {
     Solver<2>::construct(m_triangles); // good as long as it doesn't crash.
@@ -98,6 +116,380 @@ TEST_F(GasSolverTest, CalcDsoln) {
     svr.calc_so1n(); // good as long as it doesn't crash.
 }
 
+TEST_F(GasSolverTest, CalcFused) {
+    auto ref_holder = Solver<2>::construct(m_triangles);
+    auto svr_holder = Solver<2>::construct(m_triangles);
+    auto & ref = *ref_holder;
+    auto & svr = *svr_holder;
+    init(ref);
+    ref.calc_so0t();
+    ref.calc_so0n();
+    ref.calc_cfl();
+    ref.calc_so1n();
+    init(svr);
+    svr.param().tile_size() = 2;
+    svr.calc_so0t_so0n_tiled();
+    svr.calc_cfl_so1n();
+    for (index_type icl=0; icl<m_triangles->ncell(); ++icl) {
+        EXPECT_DOUBLE_EQ(ref.sol().cflo(icl), svr.sol().cflo(icl));
+        EXPECT_DOUBLE_EQ(ref.sol().cflc(icl), svr.sol().cflc(icl));
+        for (index_type ieq=0; ieq<Solver<2>::neq; ++ieq) {
+            EXPECT_DOUBLE_EQ(ref.sol().so0t(icl)[ieq], svr.sol().so0t(icl)[ieq]);
+            EXPECT_DOUBLE_EQ(ref.sol().so0n(icl)[ieq], svr.sol().so0n(icl)[ieq]);
+            EXPECT_DOUBLE_EQ(ref.sol().so1n(icl)[ieq][0], svr.sol().so1n(icl)[ieq][0]);
+            EXPECT_DOUBLE_EQ(ref.sol().so1n(icl)[ieq][1], svr.sol().so1n(icl)[ieq][1]);
+        }
+    }
+}
+
+TEST_F(GasSolverTest, Layout) {
+    auto aos_holder = Solver<2>::construct(m_triangles);
+    auto soa_holder = Solver<2>::construct(m_triangles, Layout::SOA);
+    auto & aos = *aos_holder;
+    auto & soa = *soa_holder;
+    EXPECT_EQ(Layout::AOS, aos.sol().layout());
+    EXPECT_EQ(Layout::SOA, soa.sol().layout());
+    const index_type ngstcell = m_triangles->ngstcell();
+    EXPECT_EQ(1, aos.sol().so0n(0).stride());
+    EXPECT_EQ(ngstcell + m_triangles->ncell(), soa.sol().so0n(0).stride());
+    for (auto * svr : {&aos, &soa}) {
+        for (index_type icl=-ngstcell; icl<m_triangles->ncell(); ++icl) {
+            svr->sol().gamma(icl) = 1.4;
+            svr->sol().so0c(icl).set_by(1.0, 1.4, 1.0 + 0.1 * icl, 1.0 + 0.2 * icl);
+            svr->sol().so0c(icl).set_momentum(Vector<2>(0.1 * icl, -0.2));
+            svr->sol().so1c(icl) = Vector<2>(0.01 * icl, 0.02);
+        }
+        svr->calc_so0t();
+        svr->calc_so0n();
+    }
+    for (index_type icl=0; icl<m_triangles->ncell(); ++icl) {
+        for (index_type ieq=0; ieq<Solver<2>::neq; ++ieq) {
+            EXPECT_DOUBLE_EQ(aos.sol().so0t(icl)[ieq], soa.sol().so0t(icl)[ieq]);
+            EXPECT_DOUBLE_EQ(aos.sol().so0n(icl)[ieq], soa.sol().so0n(icl)[ieq]);
+        }
+    }
+    // snapshots are in the AOS order regardless of the layout.
+    auto anchor = SnapshotAnchor<2>::construct(soa, "so0n", 1, 1);
+    anchor->postfull();
+    auto const * data = reinterpret_cast<real_type const *>(anchor->data().row(0));
+    for (index_type icl=0; icl<m_triangles->ncell(); ++icl) {
+        for (index_type ieq=0; ieq<Solver<2>::neq; ++ieq) {
+            EXPECT_EQ(soa.sol().so0n(icl)[ieq], data[icl*Solver<2>::neq+ieq]);
+        }
+    }
+}
+
+TEST_F(GasSolverTest, Single) {
+    auto dbl_holder = Solver<2>::construct(m_triangles);
+    auto sgl_holder = Solver<2, float>::construct(m_triangles);
+    auto & dbl = *dbl_holder;
+    auto & sgl = *sgl_holder;
+    EXPECT_EQ(MH_FLOAT, sgl.sol().arrays().so0n().datatypeid());
+    EXPECT_EQ(MH_FLOAT, sgl.sol().arrays().so1n().datatypeid());
+    EXPECT_EQ(MH_DOUBLE, sgl.sol().arrays().cflc().datatypeid());
+    init(dbl);
+    init(sgl);
+    dbl.calc_so0t();
+    dbl.calc_so0n();
+    dbl.calc_cfl();
+    dbl.calc_so1n();
+    sgl.calc_so0t();
+    sgl.calc_so0n();
+    sgl.calc_cfl();
+    sgl.calc_so1n();
+    for (index_type icl=0; icl<m_triangles->ncell(); ++icl) {
+        for (index_type ieq=0; ieq<Solver<2>::neq; ++ieq) {
+            const real_type val = dbl.sol().so0n(icl)[ieq];
+            EXPECT_NEAR(val, sgl.sol().so0n(icl)[ieq], 1.e-6 * (1 + fabs(val)));
+            for (index_type idm=0; idm<2; ++idm) {
+                const real_type der = dbl.sol().so1n(icl)[ieq][idm];
+                EXPECT_NEAR(der, sgl.sol().so1n(icl)[ieq][idm], 1.e-6 * (1 + fabs(der)));
+            }
+        }
+    }
+    sgl.make_qty()->update(); // good as long as it doesn't crash.
+    sgl.march(0, 0, 1);
+    auto anchor = SnapshotAnchor<2, float>::construct(sgl, "so0n", 1, 1);
+    anchor->postfull();
+    EXPECT_EQ(MH_FLOAT, anchor->data().datatypeid());
+}
+
+/**
+ * Regression of the error norms of the float storage against the double
+ * storage, on a Sod tube and an acoustic plane wave along a strip of
+ * triangles bounded by slip walls.
+ */
+class GasPrecisionTest : public ::testing::Test {
+
+protected:
+
+    void SetUp() override {
+        const index_type nx = 100, ny = 2;
+        const real_type dx = 1.0 / nx;
+        m_block = UnstructuredBlock<2>::construct((nx+1)*(ny+1), 3*nx*ny+nx+ny, 2*nx*ny, false);
+        auto & blk = *m_block;
+        for (index_type j=0; j<=ny; ++j) {
+            for (index_type i=0; i<=nx; ++i) { blk.ndcrd().set_at(j*(nx+1)+i, i*dx, j*dx); }
+        }
+        blk.cltpn().fill(3);
+        index_type icl = 0;
+        for (index_type j=0; j<ny; ++j) {
+            for (index_type i=0; i<nx; ++i) {
+                const index_type ind = j*(nx+1)+i;
+                blk.clnds().set_at(icl++, 3, ind, ind+1, ind+nx+2);
+                blk.clnds().set_at(icl++, 3, ind, ind+nx+2, ind+nx+1);
+            }
+        }
+        blk.build_interior();
+        blk.build_boundary();
+        blk.build_ghost();
+    }
+
+    /// Density of the exact Sod solution at x and t > 0.
+    static real_type sod_density(real_type x, real_type t) {
+        const real_type ga = 1.4, rl = 1, pl = 1, rr = 0.125, pr = 0.1;
+        const real_type cl = sqrt(ga*pl/rl), cr = sqrt(ga*pr/rr);
+        // pressure function of the Riemann problem.
+        auto func = [&](real_type p, real_type rk, real_type pk, real_type ck) {
+            if (p > pk) {
+                return (p-pk) * sqrt(2/((ga+1)*rk) / (p+(ga-1)/(ga+1)*pk));
+            }
+            return 2*ck/(ga-1) * (pow(p/pk, (ga-1)/(2*ga)) - 1);
+        };
+        real_type lo = 0, hi = pl;
+        for (index_type it=0; it<100; ++it) {
+            const real_type mid = (lo + hi) / 2;
+            if (func(mid, rl, pl, cl) + func(mid, rr, pr, cr) > 0) { hi = mid; } else { lo = mid; }
+        }
+        const real_type ps = (lo + hi) / 2;
+        const real_type us = (func(ps, rr, pr, cr) - func(ps, rl, pl, cl)) / 2;
+        const real_type rsr = rr * (ps/pr + (ga-1)/(ga+1)) / ((ga-1)/(ga+1)*ps/pr + 1);
+        const real_type csl = cl * pow(ps/pl, (ga-1)/(2*ga));
+        const real_type xi = (x - 0.5) / t;
+        if (xi < -cl) { return rl; }
+        if (xi < us-csl) {
+            // inside the rarefaction fan.
+            const real_type cfan = cl - (ga-1)/(ga+1) * (cl + xi);
+            return rl * pow(cfan/cl, 2/(ga-1));
+        }
+        if (xi < us) { return rl * pow(ps/pl, 1/ga); }
+        if (xi < rsr*us/(rsr-rr)) { return rsr; }
+        return rr;
+    }
+
+    /// Initial density and pressure of the acoustic wave.
+    static real_type pulse(real_type x) { return 1.e-3 * exp(-(x-0.3)*(x-0.3)/0.01); }
+
+    /// Mean L1 error of density at t = 0.2.
+    template< typename ElemType >
+    real_type sod_error() const {
+        auto svr = Solver<2, ElemType>::construct(m_block);
+        svr->trims().push_back(std::unique_ptr<TrimBase<2, ElemType>>(new TrimSlipWall<2, ElemType>(*svr, m_block->bndvec().at(0))));
+        for (index_type icl=-m_block->ngstcell(); icl<m_block->ncell(); ++icl) {
+            const bool left = svr->cecnd()[icl][0] < 0.5;
+            svr->sol().gamma(icl) = 1.4;
+            svr->sol().so0n(icl).set_by(1.0, 1.4, left ? 1.0 : 0.125, left ? 1.0 : 0.1);
+            svr->sol().so0n(icl).set_momentum(Vector<2>(0, 0));
+            svr->sol().so1n(icl) = 0.0;
+        }
+        svr->march(0, 1.e-3, 200);
+        real_type err = 0, vol = 0;
+        for (index_type icl=0; icl<m_block->ncell(); ++icl) {
+            const real_type rho = sod_density(m_block->clcnd()[icl][0], 0.2);
+            err += fabs(svr->sol().so0n(icl).density() - rho) * m_block->clvol()[icl];
+            vol += m_block->clvol()[icl];
+        }
+        return err / vol;
+    }
+
+    /// Mean L1 error of density at t = 0.2 against the linear solution.
+    template< typename ElemType >
+    real_type planewave_error() const {
+        auto svr = Solver<2, ElemType>::construct(m_block);
+        svr->trims().push_back(std::unique_ptr<TrimBase<2, ElemType>>(new TrimSlipWall<2, ElemType>(*svr, m_block->bndvec().at(0))));
+        // the sound speed is 1.
+        for (index_type icl=-m_block->ngstcell(); icl<m_block->ncell(); ++icl) {
+            const real_type drho = pulse(svr->cecnd()[icl][0]);
+            svr->sol().gamma(icl) = 1.4;
+            svr->sol().so0n(icl).set_by(1.0, 1.4, 1.0 + drho, 1.0/1.4 + drho);
+            svr->sol().so0n(icl).set_momentum(Vector<2>(drho, 0));
+            svr->sol().so1n(icl) = 0.0;
+        }
+        svr->march(0, 1.e-3, 200);
+        real_type err = 0, vol = 0;
+        for (index_type icl=0; icl<m_block->ncell(); ++icl) {
+            const real_type rho = 1.0 + pulse(m_block->clcnd()[icl][0] - 0.2);
+            err += fabs(svr->sol().so0n(icl).density() - rho) * m_block->clvol()[icl];
+            vol += m_block->clvol()[icl];
+        }
+        return err / vol;
+    }
+
+    std::shared_ptr<UnstructuredBlock<2>> m_block;
+
+}; /* end class GasPrecisionTest */
+
+TEST_F(GasPrecisionTest, Sod) {
+    const real_type dbl = sod_error<real_type>();
+    const real_type sgl = sod_error<float>();
+    EXPECT_LT(dbl, 0.05);
+    EXPECT_NEAR(dbl, sgl, 0.01 * dbl);
+}
+
+TEST_F(GasPrecisionTest, PlaneWave) {
+    const real_type dbl = planewave_error<real_type>();
+    const real_type sgl = planewave_error<float>();
+    // within a quarter of the amplitude.
+    EXPECT_LT(dbl, 0.25e-3);
+    EXPECT_NEAR(dbl, sgl, 0.01 * dbl);
+}
+
+class GasEnsembleTest : public GasTestBase {
+
+protected:
+
+    template< class SolverType >
+    void init(SolverType & svr, index_type imember) {
+        for (index_type icl=-m_triangles->ngstcell(); icl<m_triangles->ncell(); ++icl) {
+            svr.sol().gamma(icl) = 1.4 - 0.1 * imember;
+            svr.sol().so0c(icl).set_by(1.0, 1.4, 1.0 + 0.1 * icl + 0.2 * imember, 1.0 + 0.2 * icl);
+            svr.sol().so0c(icl).set_momentum(Vector<2>(0.1 * icl, -0.2 * imember));
+            svr.sol().so0n(icl) = svr.sol().so0c(icl);
+            svr.sol().so1c(icl) = Vector<2>(0.01 * icl, 0.02 * imember);
+        }
+        svr.state().time_increment = 0.01;
+    }
+
+    void compare(Layout layout) {
+        const index_type nmember = 3;
+        auto ens_holder = Ensemble<2>::construct(m_triangles, nmember, layout);
+        auto & ens = *ens_holder;
+        EXPECT_EQ(nmember, ens.nmember());
+        EXPECT_THROW(ens.member(nmember), std::out_of_range);
+        for (index_type imember=0; imember<nmember; ++imember) {
+            EXPECT_EQ(imember, ens.member(imember).sol().imember());
+            EXPECT_EQ(ens.member(0).cecnd().data(), ens.member(imember).cecnd().data());
+            init(ens.member(imember), imember);
+        }
+        ens.calc_so0t();
+        ens.calc_so0n();
+        ens.calc_cfl_so1n();
+        for (index_type imember=0; imember<nmember; ++imember) {
+            auto svr_holder = Solver<2>::construct(m_triangles, layout);
+            auto & svr = *svr_holder;
+            auto & mem = ens.member(imember);
+            init(svr, imember);
+            svr.calc_so0t();
+            svr.calc_so0n();
+            svr.calc_cfl();
+            svr.calc_so1n();
+            for (index_type icl=0; icl<m_triangles->ncell(); ++icl) {
+                EXPECT_DOUBLE_EQ(svr.sol().cflo(icl), mem.sol().cflo(icl));
+                for (index_type ieq=0; ieq<Solver<2>::neq; ++ieq) {
+                    EXPECT_DOUBLE_EQ(svr.sol().so0n(icl)[ieq], mem.sol().so0n(icl)[ieq]);
+                    EXPECT_DOUBLE_EQ(svr.sol().so1n(icl)[ieq][0], mem.sol().so1n(icl)[ieq][0]);
+                    EXPECT_DOUBLE_EQ(svr.sol().so1n(icl)[ieq][1], mem.sol().so1n(icl)[ieq][1]);
+                }
+            }
+            // snapshots have the array of the member only.
+            auto anchor = SnapshotAnchor<2>::construct(mem, "so0n", 1, 1);
+            anchor->postfull();
+            auto const * data = reinterpret_cast<real_type const *>(anchor->data().row(0));
+            for (index_type icl=0; icl<m_triangles->ncell(); ++icl) {
+                for (index_type ieq=0; ieq<Solver<2>::neq; ++ieq) {
+                    EXPECT_EQ(mem.sol().so0n(icl)[ieq], data[icl*Solver<2>::neq+ieq]);
+                }
+            }
+        }
+    }
+
+}; /* end class GasEnsembleTest */
+
+TEST_F(GasEnsembleTest, Aos) { compare(Layout::AOS); }
+
+TEST_F(GasEnsembleTest, Soa) { compare(Layout::SOA); }
+
+TEST_F(GasEnsembleTest, March) {
+    const index_type nmember = 2;
+    auto ens_holder = Ensemble<2>::construct(m_triangles, nmember);
+    auto & ens = *ens_holder;
+    for (index_type imember=0; imember<nmember; ++imember) { init(ens.member(imember), imember); }
+    ens.march(0, 0.01, 2);
+    for (index_type imember=0; imember<nmember; ++imember) {
+        // each member ends where it would when marching alone.
+        auto svr_holder = Solver<2>::construct(m_triangles);
+        auto & svr = *svr_holder;
+        auto & mem = ens.member(imember);
+        init(svr, imember);
+        svr.march(0, 0.01, 2);
+        EXPECT_EQ(2, mem.state().step_global);
+        EXPECT_DOUBLE_EQ(0.02, mem.state().time);
+        for (index_type icl=0; icl<m_triangles->ncell(); ++icl) {
+            for (index_type ieq=0; ieq<Solver<2>::neq; ++ieq) {
+                EXPECT_DOUBLE_EQ(svr.sol().so0n(icl)[ieq], mem.sol().so0n(icl)[ieq]);
+                EXPECT_DOUBLE_EQ(svr.sol().so1n(icl)[ieq][0], mem.sol().so1n(icl)[ieq][0]);
+                EXPECT_DOUBLE_EQ(svr.sol().so1n(icl)[ieq][1], mem.sol().so1n(icl)[ieq][1]);
+            }
+        }
+    }
+    // the members differ in gamma and the initial condition.
+    EXPECT_NE(ens.member(0).sol().so0n(0).energy(), ens.member(1).sol().so0n(0).energy());
+    EXPECT_THROW(Ensemble<2>::construct(m_triangles, 0), std::invalid_argument);
+}
+
+TEST_F(GasSolverTest, LocalTimeStep) {
+    auto svr_holder = Solver<2>::construct(m_triangles);
+    auto & svr = *svr_holder;
+    for (index_type icl=-m_triangles->ngstcell(); icl<m_triangles->ncell(); ++icl) {
+        svr.sol().gamma(icl) = 1.4;
+        svr.sol().so0n(icl).set_by(1.0, 1.4, 1.0, 1.0 + 0.2 * icl);
+        svr.sol().so0n(icl).set_momentum(Vector<2>(0.1 * icl, -0.2));
+    }
+    svr.state().time_increment = 0.1;
+    svr.calc_cfl();
+    svr.calc_ldt(); // no-op without the local time stepping.
+    EXPECT_EQ(0, svr.sol().ldt(0));
+    EXPECT_EQ(0.1, svr.time_increment(0));
+    svr.param().local_cfl() = 0.9;
+    svr.calc_ldt(); // the first one starts from the global increment.
+    EXPECT_EQ(0.1, svr.sol().ldt(0));
+    std::vector<real_type> target;
+    for (index_type icl=0; icl<m_triangles->ncell(); ++icl) {
+        // the CFL reaches the target unless the increment is limited to grow twice.
+        target.push_back(0.1 * std::min(0.9 / svr.sol().cflo(icl), 2.0));
+    }
+    svr.calc_ldt();
+    for (index_type icl=0; icl<m_triangles->ncell(); ++icl) {
+        EXPECT_EQ(svr.sol().ldt(icl), svr.time_increment(icl));
+        real_type expected = target[icl];
+        const auto & tclfcs = m_triangles->clfcs()[icl];
+        for (index_type ifl=0; ifl<tclfcs[0]; ++ifl) {
+            const index_type jcl = m_triangles->fcrcl(tclfcs[ifl+1], icl);
+            if (jcl >= 0) { expected = std::min(expected, target[jcl]); }
+        }
+        EXPECT_DOUBLE_EQ(expected, svr.sol().ldt(icl));
+    }
+}
+
+TEST(GasJacobianTest, Product) {
+    Jacobian<4, 2> jaco;
+    const real_type sol[4] = {1.2, 0.3, -0.1, 2.5};
+    jaco.update(1.4, sol);
+    const real_type usfc[4] = {0, 1, 0, 0};
+    Jacobian<4, 2>::flux_type dfcn;
+    jaco.calc_flux(usfc, dfcn);
+    Jacobian<4, 2>::flux_type dsol;
+    for (index_type ieq=0; ieq<4; ++ieq) { dsol[ieq] = Vector<2>(usfc[ieq], 0); }
+    real_type solt[4];
+    jaco.calc_solt(dsol, solt);
+    for (index_type ieq=0; ieq<4; ++ieq) {
+        for (index_type idm=0; idm<2; ++idm) {
+            EXPECT_DOUBLE_EQ(jaco.fcn[ieq][idm] + jaco.jacos[ieq][1][idm], dfcn[ieq][idm]);
+        }
+        EXPECT_DOUBLE_EQ(-jaco.jacos[ieq][1][0], solt[ieq]);
+    }
+}
+
 class GasQuantityTest : public GasTestBase {};
 
 TEST_F(GasQuantityTest, Update) {
@@ -111,6 +503,380 @@ TEST_F(GasQuantityTest, Update) {
     qty->update(); // good as long as it doesn't crash.
 }
 
+TEST_F(GasQuantityTest, Closure) {
+    using qty_type = Quantity<2>;
+    EXPECT_EQ(qty_type::DENSITY, qty_type::closure(qty_type::DENSITY));
+    EXPECT_EQ(qty_type::DENSITY | qty_type::VELOCITY | qty_type::KE | qty_type::PRESSURE,
+              qty_type::closure(qty_type::PRESSURE));
+    EXPECT_EQ(qty_type::ALL & ~(qty_type::VORTICITY | qty_type::TEMPERATURE | qty_type::SCHLIEREN),
+              qty_type::closure(qty_type::MACH));
+    EXPECT_EQ(qty_type::SCHLIEREN, qty_type::closure(qty_type::SCHLIEREN));
+    EXPECT_THROW(qty_type::flag_of("nothing"), std::invalid_argument);
+}
+
+TEST_F(GasQuantityTest, Demand) {
+    using qty_type = Quantity<2>;
+    auto svr_holder = Solver<2>::construct(m_triangles);
+    auto & svr = *svr_holder;
+    auto & qty = svr.make_qty();
+    EXPECT_EQ(qty_type::ALL, qty->due(0));
+    qty->demand(qty_type::PRESSURE);
+    qty->demand(qty_type::SCHLIEREN, 10);
+    EXPECT_EQ(qty_type::PRESSURE, qty->due(5));
+    EXPECT_EQ(qty_type::PRESSURE | qty_type::SCHLIEREN, qty->due(20));
+    qty->clear_demand();
+    EXPECT_EQ(qty_type::ALL, qty->due(5));
+}
+
+class GasAnchorTest : public GasTestBase {
+
+protected:
+
+    void SetUp() override {
+        GasTestBase::SetUp();
+        m_solver = Solver<2>::construct(m_triangles);
+        auto & svr = *m_solver;
+        for (index_type icl=-svr.block()->ngstcell(); icl<svr.block()->ncell(); ++icl) {
+            svr.sol().gamma(icl) = 1.4;
+            svr.sol().so0n(icl).set_by(1.0, 1.4, 1.0, 1.0);
+            svr.sol().cflo(icl) = 0.1 * (icl + 1);
+            svr.sol().cflc(icl) = icl == 1 ? 1 : 0;
+        }
+    }
+
+    std::shared_ptr<Solver<2>> m_solver;
+
+}; /* end class GasAnchorTest */
+
+TEST_F(GasAnchorTest, Cfl) {
+    auto & svr = *m_solver;
+    auto anchor = CflAnchor<2>::construct(svr, 2);
+    svr.state().step_global = 1;
+    anchor->postmarch();
+    EXPECT_EQ(-1, svr.state().cfl_nadjusted);
+    svr.state().step_global = 2;
+    anchor->postmarch();
+    EXPECT_DOUBLE_EQ(0.1, svr.state().cfl_min);
+    EXPECT_DOUBLE_EQ(0.3, svr.state().cfl_max);
+    EXPECT_EQ(1, svr.state().cfl_nadjusted);
+    EXPECT_EQ(1, svr.state().cfl_nadjusted_accumulated);
+    anchor->postmarch();
+    EXPECT_EQ(2, svr.state().cfl_nadjusted_accumulated);
+    EXPECT_THROW(CflAnchor<2>::construct(svr, 0), std::invalid_argument);
+}
+
+TEST_F(GasAnchorTest, Residual) {
+    auto & svr = *m_solver;
+    auto anchor = ResidualAnchor<2>::construct(svr, 2);
+    EXPECT_THROW(ResidualAnchor<2>::construct(svr, 0), std::invalid_argument);
+    for (index_type icl=0; icl<m_triangles->ncell(); ++icl) {
+        svr.sol().so0c(icl).density() = 1.0;
+        svr.sol().so0n(icl).density() = 1.0 + 0.3 * icl;
+    }
+    svr.state().time_increment = 0.5;
+    svr.state().step_global = 1;
+    anchor->postmarch(); // not due.
+    EXPECT_TRUE(std::isnan(svr.state().residual));
+    svr.state().step_global = 2;
+    anchor->postmarch();
+    // sqrt((0 + 0.09 + 0.36) / 3) / 0.5.
+    EXPECT_DOUBLE_EQ(sqrt(0.15) / 0.5, svr.state().residual);
+    EXPECT_DOUBLE_EQ(svr.state().residual, anchor->residual_initial());
+}
+
+TEST_F(GasAnchorTest, BoundCheck) {
+    auto & svr = *m_solver;
+    auto anchor = BoundCheckAnchor<2>::construct(svr, 1, 0.0, 0.0);
+    anchor->postfull(); // good as long as it doesn't throw.
+    svr.sol().so0n(2).density() = -1;
+    EXPECT_THROW(anchor->postfull(), std::runtime_error);
+    svr.sol().so0n(2).density() = 1;
+    svr.sol().so0n(0).energy() = std::numeric_limits<real_type>::quiet_NaN();
+    EXPECT_THROW(anchor->postfull(), std::runtime_error);
+}
+
+TEST_F(GasAnchorTest, Snapshot) {
+    auto & svr = *m_solver;
+    auto anchor = SnapshotAnchor<2>::construct(svr, "so0n", 1, 2);
+    EXPECT_EQ(2, anchor->nslot());
+    EXPECT_EQ(std::vector<index_type>({2, 3, 4}), anchor->data().dims());
+    for (int it=0; it<3; ++it) {
+        svr.state().time = it;
+        svr.sol().so0n(0).density() = 10 + it;
+        anchor->postfull();
+    }
+    EXPECT_EQ(3, anchor->count());
+    // the third copy overwrites the first slot.
+    auto const * data = reinterpret_cast<real_type const *>(anchor->data().row(0));
+    EXPECT_EQ(12, data[0]);
+    EXPECT_EQ(2, anchor->times()[0]);
+    EXPECT_EQ(1, anchor->times()[1]);
+    EXPECT_THROW(SnapshotAnchor<2>::construct(svr, "nothing", 1, 2), std::invalid_argument);
+}
+
+TEST_F(GasAnchorTest, Probe) {
+    auto & svr = *m_solver;
+    auto anchor = ProbeAnchor<2>::construct(svr, {2, 0}, 2, 4);
+    EXPECT_EQ(1 + 2*4, anchor->data().ncolumn());
+    svr.state().time = 0.5;
+    svr.sol().so0n(2).density() = 3;
+    anchor->preloop();
+    svr.state().step_global = 1;
+    anchor->postfull();
+    EXPECT_EQ(1, anchor->count());
+    auto const * data = reinterpret_cast<real_type const *>(anchor->data().row(0));
+    EXPECT_EQ(0.5, data[0]);
+    EXPECT_EQ(3, data[1]);
+    EXPECT_EQ(1, data[5]);
+    EXPECT_THROW(ProbeAnchor<2>::construct(svr, {3}, 1, 4), std::out_of_range);
+    EXPECT_THROW(ProbeAnchor<2>::construct(svr, {-2}, 1, 4), std::out_of_range);
+}
+
+TEST_F(GasAnchorTest, ProbeOutside) {
+    auto & svr = *m_solver;
+    // the point not in the block is sampled as NaN.
+    auto anchor = ProbeAnchor<2>::construct(svr, {-1, 1}, 1, 4);
+    svr.sol().so0n(1).density() = 2;
+    anchor->sample();
+    auto const * data = reinterpret_cast<real_type const *>(anchor->data().row(0));
+    for (size_t ieq=0; ieq<4; ++ieq) { EXPECT_TRUE(std::isnan(data[1+ieq])); }
+    EXPECT_EQ(2, data[5]);
+}
+
+TEST_F(GasAnchorTest, Chain) {
+    auto & svr = *m_solver;
+    auto snapshot = SnapshotAnchor<2>::construct(svr, "cflo", 1, 1);
+    svr.anchors().append(CflAnchor<2>::construct(svr, 1), "cfl");
+    svr.anchors().append(snapshot, "snapshot");
+    svr.anchors().preloop();
+    svr.anchors().postfull();
+    EXPECT_EQ(2, snapshot->count());
+    EXPECT_TRUE(svr.anchors().has("snapshot"));
+    EXPECT_FALSE(svr.anchors().has("nothing"));
+    EXPECT_EQ(snapshot, svr.anchors()["snapshot"]);
+    EXPECT_FALSE(svr.anchors()["cfl"]->common());
+    EXPECT_THROW(svr.anchors()["nothing"], std::out_of_range);
+}
+
+class GasExchangeTest : public GasTestBase {
+
+protected:
+
+    void SetUp() override {
+        GasTestBase::SetUp();
+        m_exchange = Exchange<2>::construct(2);
+        for (index_type iblk=0; iblk<2; ++iblk) {
+            m_solvers[iblk] = Solver<2>::construct(m_triangles);
+            auto & svr = *m_solvers[iblk];
+            for (index_type icl=-svr.block()->ngstcell(); icl<svr.block()->ncell(); ++icl) {
+                svr.sol().gamma(icl) = 1.4;
+                svr.sol().so0n(icl).set_by(1.0, 1.4, 1.0 + iblk, 1.0);
+            }
+            m_exchange->bind(iblk, svr);
+        }
+        // the ghost cells of one block relate to the interior cells of the other.
+        m_exchange->add_interface(0, 1, {-1, -2}, {1, 2});
+        m_exchange->add_interface(1, 0, {-1}, {0});
+    }
+
+    std::shared_ptr<Exchange<2>> m_exchange;
+    std::shared_ptr<Solver<2>> m_solvers[2];
+
+}; /* end class GasExchangeTest */
+
+TEST_F(GasExchangeTest, Bind) {
+    EXPECT_EQ(2, m_exchange->nblock());
+    EXPECT_EQ(m_exchange, m_solvers[0]->exchange());
+    EXPECT_EQ(std::vector<index_type>({-1, -2}), m_exchange->ghosts(*m_solvers[0]));
+    EXPECT_THROW(m_exchange->add_interface(0, 2, {-1}, {0}), std::out_of_range);
+    EXPECT_THROW(m_exchange->add_interface(0, 1, {-1}, {0, 1}), std::invalid_argument);
+    EXPECT_THROW(Exchange<2>::construct(0), std::invalid_argument);
+}
+
+TEST_F(GasExchangeTest, Sync) {
+    auto & svr0 = *m_solvers[0];
+    auto & svr1 = *m_solvers[1];
+    m_exchange->sync();
+    EXPECT_EQ(2, svr0.sol().so0n(-1).density());
+    EXPECT_EQ(2, svr0.sol().so0n(-2).density());
+    EXPECT_EQ(1, svr0.sol().so0n(-3).density());
+    EXPECT_EQ(1, svr1.sol().so0n(-1).density());
+    EXPECT_EQ(svr1.cecnd()[2][0], svr0.cecnd()[-2][0]);
+}
+
+TEST_F(GasExchangeTest, Threaded) {
+    auto & svr0 = *m_solvers[0];
+    auto & svr1 = *m_solvers[1];
+    std::thread thread([&]{ svr1.ibcsoln(); });
+    svr0.ibcsoln();
+    thread.join();
+    EXPECT_EQ(2, svr0.sol().so0n(-1).density());
+    EXPECT_EQ(1, svr1.sol().so0n(-1).density());
+}
+
+TEST_F(GasExchangeTest, March) {
+    std::thread thread([&]{ m_solvers[1]->march(0, 0, 2); });
+    m_solvers[0]->march(0, 0, 2); // good as long as it doesn't hang.
+    thread.join();
+}
+
+TEST_F(GasExchangeTest, Abort) {
+    std::thread thread([&]{ EXPECT_THROW(m_solvers[1]->ibcsoln(), std::runtime_error); });
+    m_exchange->abort();
+    thread.join();
+    EXPECT_THROW(m_solvers[0]->ibcsoln(), std::runtime_error);
+    m_exchange->reset();
+    thread = std::thread([&]{ m_solvers[1]->ibcdsoln(); });
+    m_solvers[0]->ibcdsoln();
+    thread.join();
+}
+
+class GasMultiRateTest : public ::testing::Test {
+
+protected:
+
+    /**
+     * A square of triangles whose spacing narrows to a fourth toward the
+     * center, with slip walls around and a density bump at the center.
+     */
+    void SetUp() override {
+        std::vector<real_type> crds{0};
+        while (crds.back() < 1) {
+            crds.push_back(crds.back() + 0.025 * (1 + 3 * std::min(fabs(crds.back() - 0.5) / 0.3, 1.0)));
+        }
+        for (auto & crd : crds) { crd /= crds.back(); }
+        const index_type n = crds.size() - 1;
+        m_block = UnstructuredBlock<2>::construct((n+1)*(n+1), 3*n*n+2*n, 2*n*n, false);
+        auto & blk = *m_block;
+        for (index_type j=0; j<=n; ++j) {
+            for (index_type i=0; i<=n; ++i) { blk.ndcrd().set_at(j*(n+1)+i, crds[i], crds[j]); }
+        }
+        blk.cltpn().fill(3);
+        index_type icl = 0;
+        for (index_type j=0; j<n; ++j) {
+            for (index_type i=0; i<n; ++i) {
+                const index_type ind = j*(n+1)+i;
+                blk.clnds().set_at(icl++, 3, ind, ind+1, ind+n+2);
+                blk.clnds().set_at(icl++, 3, ind, ind+n+2, ind+n+1);
+            }
+        }
+        blk.build_interior();
+        blk.build_boundary();
+        blk.build_ghost();
+    }
+
+    std::shared_ptr<Solver<2>> make_solver(index_type nlevel) const {
+        auto svr_holder = Solver<2>::construct(m_block);
+        auto & svr = *svr_holder;
+        svr.param().multirate_nlevel() = nlevel;
+        svr.trims().push_back(std::unique_ptr<TrimBase<2>>(new TrimSlipWall<2>(svr, m_block->bndvec().at(0))));
+        for (index_type icl=-m_block->ngstcell(); icl<m_block->ncell(); ++icl) {
+            const auto & crd = svr.cecnd()[icl];
+            const real_type rr = (crd[0]-0.5)*(crd[0]-0.5) + (crd[1]-0.5)*(crd[1]-0.5);
+            const real_type rho = 1.0 + 0.5 * exp(-rr / 0.002);
+            svr.sol().gamma(icl) = 1.4;
+            svr.sol().so0n(icl).set_by(1.0, 1.4, rho, pow(rho, 0.4));
+            svr.sol().so1n(icl) = 0.0;
+        }
+        return svr_holder;
+    }
+
+    /// Mass in the conservation elements, which only the boundary changes.
+    real_type mass(Solver<2> const & svr) const {
+        real_type val = 0;
+        for (index_type icl=0; icl<m_block->ncell(); ++icl) {
+            val += svr.sol().so0n(icl).density() * ConservationElement<2>(*m_block, icl).vol;
+        }
+        return val;
+    }
+
+    /// Time increment with which the finest cells have CFL 0.9.
+    real_type time_increment() const {
+        auto svr = make_solver(0);
+        svr->param().stop_on_cfl_overflow() = false;
+        svr->param().stop_on_cfl_adjustment() = false;
+        svr->state().time_increment = 1.0;
+        svr->calc_cfl();
+        real_type cfl = 0;
+        for (index_type icl=0; icl<m_block->ncell(); ++icl) { cfl = std::max(cfl, svr->sol().cflo(icl)); }
+        return 0.9 / cfl;
+    }
+
+    std::shared_ptr<UnstructuredBlock<2>> m_block;
+
+}; /* end class GasMultiRateTest */
+
+TEST_F(GasMultiRateTest, Classify) {
+    auto svr = make_solver(3);
+    svr->state().time_increment = 4 * time_increment();
+    svr->march(0, svr->state().time_increment, 1);
+    auto & mrate = *svr->multirate();
+    EXPECT_EQ(3, mrate.nlevel());
+    mrate.classify();
+    index_type ncell = 0;
+    for (index_type ilevel=0; ilevel<3; ++ilevel) {
+        EXPECT_LT(0, mrate.cells(ilevel).size());
+        ncell += mrate.cells(ilevel).size();
+    }
+    EXPECT_EQ(m_block->ncell(), ncell);
+    for (index_type icl=0; icl<m_block->ncell(); ++icl) {
+        // cflo is of the finest level, which takes the cells beyond.
+        if (mrate.level(icl) < 2) {
+            EXPECT_LE(svr->sol().cflo(icl) * (1 << (2 - mrate.level(icl))), svr->param().multirate_cfl());
+        }
+        const auto & tclfcs = m_block->clfcs()[icl];
+        for (index_type ifl=0; ifl<tclfcs[0]; ++ifl) {
+            const index_type jcl = m_block->fcrcl(tclfcs[ifl+1], icl);
+            EXPECT_LE(std::abs(mrate.level(icl) - mrate.level(jcl)), 1);
+        }
+    }
+}
+
+TEST_F(GasMultiRateTest, SingleLevel) {
+    const real_type dt = time_increment();
+    auto svr = make_solver(0);
+    auto mrate = make_solver(3);
+    mrate->param().multirate_cfl() = 1.e10; // all cells in the coarsest level.
+    svr->march(0, dt, 2);
+    mrate->march(0, dt, 2);
+    EXPECT_EQ(m_block->ncell() * 4, mrate->multirate()->nupdate());
+    for (index_type icl=0; icl<m_block->ncell(); ++icl) {
+        for (index_type ieq=0; ieq<Solver<2>::neq; ++ieq) {
+            EXPECT_DOUBLE_EQ(svr->sol().so0n(icl)[ieq], mrate->sol().so0n(icl)[ieq]);
+            EXPECT_DOUBLE_EQ(svr->sol().so1n(icl)[ieq][0], mrate->sol().so1n(icl)[ieq][0]);
+            EXPECT_DOUBLE_EQ(svr->sol().so1n(icl)[ieq][1], mrate->sol().so1n(icl)[ieq][1]);
+        }
+    }
+}
+
+TEST_F(GasMultiRateTest, March) {
+    const real_type dt = time_increment();
+    auto svr = make_solver(0);
+    auto mrate = make_solver(3);
+    const real_type mass0 = mass(*svr);
+    svr->march(0, dt, 4);
+    mrate->march(0, 4 * dt, 1);
+    EXPECT_LT(mrate->multirate()->nupdate(), 8 * m_block->ncell());
+    // the bump has not reached the walls.
+    EXPECT_NEAR(mass0, mass(*svr), 1.e-11);
+    EXPECT_NEAR(mass0, mass(*mrate), 1.e-13);
+    real_type diff = 0;
+    for (index_type icl=0; icl<m_block->ncell(); ++icl) {
+        diff = std::max(diff, fabs(svr->sol().so0n(icl).density() - mrate->sol().so0n(icl).density()));
+    }
+    EXPECT_LT(diff, 0.01);
+}
+
+TEST_F(GasMultiRateTest, Unsupported) {
+    auto svr = make_solver(3);
+    svr->param().local_cfl() = 0.5;
+    EXPECT_THROW(svr->march(0, time_increment(), 1), std::runtime_error);
+    EXPECT_THROW(MultiRate<2>::construct(*svr, 0), std::invalid_argument);
+    auto ens = Ensemble<2>::construct(m_block, 2);
+    ens->member(1).param().multirate_nlevel() = 2;
+    EXPECT_THROW(ens->march(0, 0, 1), std::runtime_error);
+}
+
 class GasTrimTest : public GasTestBase {
 
 protected:
@@ -161,6 +927,18 @@ TEST_F(GasTrimTest, SlipWall) {
     slipwall->apply_do1();
 }
 
+TEST_F(GasTrimTest, Single) {
+    auto svr_holder = Solver<2, float>::construct(m_triangles);
+    auto & svr = *svr_holder;
+    BoundaryData & bnd = *m_triangles_bound_0;
+    // good as long as it doesn't crash.
+    TrimNonRefl<2, float>(svr, bnd).apply_do1();
+    TrimSlipWall<2, float>(svr, bnd).apply_do0();
+    TrimSlipWall<2, float>(svr, bnd).apply_do1();
+    bnd.values() = LookupTableCore(0, bnd.nbound(), {bnd.nbound(), 6}, type_to<real_type>::id);
+    TrimInlet<2, float>(svr, bnd).apply_do0();
+}
+
 TEST_F(GasTrimTest, Inlet) {
     // inlet trimming.
     BoundaryData & bnd = *m_triangles_bound_0;
@@ -95,7 +95,8 @@ replace_method(CCompiler, 'customize', CCompiler_customize)
 
 
 def make_cython_extension(
-    name, c_subdirs, include_dirs=None, libraries=None, extra_compile_args=None
+    name, c_subdirs, include_dirs=None, libraries=None, extra_compile_args=None,
+    extra_link_args=None,
 ):
     pak_dir = os.path.join(*name.split('.')[:-1])
     files = [name.replace('.', os.sep) + '.pyx']
@@ -115,12 +116,13 @@ def make_cython_extension(
         '-Wno-cpp' if sys.platform != 'darwin' else '-Wno-#warnings',
         '-Wno-unused-function',
     ] + extra_compile_args
+    if extra_link_args is None: extra_link_args = []
     return CyExtension(
         name, files,
         include_dirs=include_dirs,
         libraries=libraries,
         extra_compile_args=extra_compile_args,
-        extra_link_args=[rpathflag],
+        extra_link_args=[rpathflag] + extra_link_args,
     )
 
 
@@ -192,6 +194,8 @@ def main():
     lapack_libraries = ['lapack', 'blas']
     if os.environ.get('LAPACK_GFORTRAN'):
         lapack_libraries.append('gfortran')
+    # the kernels run multi-threaded only when built with OpenMP.
+    openmp_args = ['-fopenmp'] if os.environ.get('SOLVCON_OPENMP') else []
     ext_modules = [
         make_cython_extension(
             'solvcon._march_bridge', [],
@@ -200,6 +204,8 @@ def main():
         make_cython_extension(
             'solvcon.mesh',
             ['src'],
+            extra_compile_args=openmp_args,
+            extra_link_args=openmp_args,
         ),
         make_cython_extension(
             'solvcon.parcel.fake._algorithm',
@@ -211,7 +217,8 @@ def main():
             libraries=lapack_libraries,
             extra_compile_args=turn_off_unused_warnings + [
                 '-Wno-unknown-pragmas',
-            ],
+            ] + openmp_args,
+            extra_link_args=openmp_args,
         ),
         make_cython_extension(
             'solvcon.parcel.bulk._algorithm',
@@ -219,23 +226,35 @@ def main():
             extra_compile_args=turn_off_unused_warnings + [
                 '-Wno-unknown-pragmas',
                 '-Wno-uninitialized',
-            ],
+            ] + openmp_args,
+            extra_link_args=openmp_args,
         ),
         make_cython_extension(
             'solvcon.parcel.gas._algorithm',
             ['src'],
             extra_compile_args=turn_off_unused_warnings + [
                 '-Wno-unknown-pragmas',
-            ],
+            ] + openmp_args,
+            extra_link_args=openmp_args,
         ),
         make_cython_extension(
             'solvcon.parcel.vewave._algorithm', ['src'],
             libraries=['lapack', 'blas'],
             extra_compile_args=turn_off_unused_warnings + [
                 '-Wno-unknown-pragmas',
-            ],
+            ] + openmp_args,
+            extra_link_args=openmp_args,
         ),
     ]
+    # the native MPI binding is built only when MPI is specified.
+    mpi_home = os.environ.get('MPI_HOME')
+    if mpi_home:
+        ext_modules.append(make_cython_extension(
+            'solvcon._mpi', [],
+            include_dirs=[os.path.join(mpi_home, 'include')],
+            libraries=['mpi'],
+        ))
+        ext_modules[-1].library_dirs.append(os.path.join(mpi_home, 'lib'))
 
     # remove files when cleaning.
     sidx = sys.argv.index('setup.py') if 'setup.py' in sys.argv else -1
@@ -0,0 +1,248 @@
+# Copyright (c) 2016, Yung-Yu Chen <yyc@solvcon.net>
+# BSD 3-Clause License, see COPYING
+
+"""
+Native MPI binding for the communication hot path.  It provides the same
+Pythonic API as :py:class:`solvcon.mpy.MPI`, but sends contiguous arrays with
+their typed MPI datatypes, and adds non-blocking array transfers and
+all-reduction of scalars.  Only built when MPI is available (set ``MPI_HOME``
+when building).
+"""
+
+from __future__ import absolute_import, division, print_function
+
+import pickle
+
+import numpy as np
+cimport numpy as np
+from libc.stdlib cimport free, realloc
+
+# Initialize NumPy.
+np.import_array()
+
+
+cdef extern from "mpi.h" nogil:
+    # The real types are opaque and implementation-defined.
+    ctypedef int MPI_Comm
+    ctypedef int MPI_Datatype
+    ctypedef int MPI_Op
+    ctypedef int MPI_Request
+    ctypedef struct MPI_Status:
+        pass
+    int MPI_SUCCESS
+    MPI_Comm MPI_COMM_WORLD
+    MPI_Datatype MPI_BYTE
+    MPI_Datatype MPI_INT
+    MPI_Datatype MPI_LONG_LONG
+    MPI_Datatype MPI_FLOAT
+    MPI_Datatype MPI_DOUBLE
+    MPI_Op MPI_SUM
+    MPI_Op MPI_MAX
+    MPI_Op MPI_MIN
+    MPI_Status *MPI_STATUS_IGNORE
+    MPI_Status *MPI_STATUSES_IGNORE
+    int MPI_Init(int *argc, char ***argv)
+    int MPI_Initialized(int *flag)
+    int MPI_Finalize()
+    int MPI_Comm_rank(MPI_Comm comm, int *rank)
+    int MPI_Comm_size(MPI_Comm comm, int *size)
+    int MPI_Send(void *buf, int count, MPI_Datatype datatype, int dest,
+                 int tag, MPI_Comm comm)
+    int MPI_Recv(void *buf, int count, MPI_Datatype datatype, int source,
+                 int tag, MPI_Comm comm, MPI_Status *status)
+    int MPI_Isend(void *buf, int count, MPI_Datatype datatype, int dest,
+                  int tag, MPI_Comm comm, MPI_Request *request)
+    int MPI_Irecv(void *buf, int count, MPI_Datatype datatype, int source,
+                  int tag, MPI_Comm comm, MPI_Request *request)
+    int MPI_Waitall(int count, MPI_Request *requests, MPI_Status *statuses)
+    int MPI_Allreduce(void *sendbuf, void *recvbuf, int count,
+                      MPI_Datatype datatype, MPI_Op op, MPI_Comm comm)
+
+
+cdef int _check(int err) except -1 nogil:
+    if err != MPI_SUCCESS:
+        with gil:
+            raise RuntimeError('MPI call failed with error code %d' % err)
+    return 0
+
+
+cdef int _typed(np.ndarray arr, MPI_Datatype *dtype) except -1:
+    """
+    Determine the MPI datatype of the array and return the count of elements.
+    Unknown types are sent as bytes.
+    """
+    if not arr.flags.c_contiguous:
+        raise ValueError('array must be C-contiguous')
+    kind = arr.dtype.kind
+    itemsize = arr.dtype.itemsize
+    if not arr.dtype.isnative:
+        dtype[0] = MPI_BYTE
+        return arr.nbytes
+    if kind == 'f' and itemsize == 8:
+        dtype[0] = MPI_DOUBLE
+    elif kind == 'f' and itemsize == 4:
+        dtype[0] = MPI_FLOAT
+    elif kind == 'i' and itemsize == 4:
+        dtype[0] = MPI_INT
+    elif kind == 'i' and itemsize == 8:
+        dtype[0] = MPI_LONG_LONG
+    else:
+        dtype[0] = MPI_BYTE
+        return arr.nbytes
+    return arr.size
+
+
+cdef MPI_Op _op(op) except *:
+    if op == 'sum':
+        return MPI_SUM
+    elif op == 'max':
+        return MPI_MAX
+    elif op == 'min':
+        return MPI_MIN
+    else:
+        raise ValueError('op can\'t be %s' % op)
+
+
+cdef class Communicator:
+    """
+    The world communicator.  Non-blocking transfers posted by
+    :py:meth:`isendarr` and :py:meth:`irecvarr` are completed together by
+    :py:meth:`waitall`; the arrays must not be touched before that.
+    """
+
+    cdef MPI_Comm _comm
+    cdef MPI_Request *_requests
+    cdef int _nrequest
+    cdef int _mrequest
+    # keep the arrays of the pending requests alive.
+    cdef list _buffers
+
+    def __cinit__(self):
+        cdef int flag = 0
+        _check(MPI_Initialized(&flag))
+        if not flag:
+            _check(MPI_Init(NULL, NULL))
+        self._comm = MPI_COMM_WORLD
+        self._requests = NULL
+        self._nrequest = 0
+        self._mrequest = 0
+        self._buffers = list()
+
+    def __dealloc__(self):
+        free(self._requests)
+
+    cdef MPI_Request *_new_request(self) except NULL:
+        cdef MPI_Request *requests
+        cdef int mrequest
+        if self._nrequest == self._mrequest:
+            mrequest = 2*self._mrequest if self._mrequest else 16
+            requests = <MPI_Request *>realloc(
+                self._requests, mrequest*sizeof(MPI_Request))
+            if requests == NULL:
+                raise MemoryError()
+            self._requests = requests
+            self._mrequest = mrequest
+        self._nrequest += 1
+        return &self._requests[self._nrequest-1]
+
+    @property
+    def initialized(self):
+        cdef int flag = 0
+        _check(MPI_Initialized(&flag))
+        return bool(flag)
+
+    @property
+    def rank(self):
+        cdef int rank = -1
+        _check(MPI_Comm_rank(self._comm, &rank))
+        return rank
+
+    @property
+    def size(self):
+        cdef int size = -1
+        _check(MPI_Comm_size(self._comm, &size))
+        return size
+
+    def Finalize(self):
+        _check(MPI_Finalize())
+
+    def send(self, obj, int dst, int tag):
+        """
+        Send a picklable object.
+        """
+        cdef bytes dat = pickle.dumps(obj, -1)
+        cdef int dlen = len(dat)
+        cdef char *pdat = dat
+        with nogil:
+            _check(MPI_Send(&dlen, 1, MPI_INT, dst, tag, self._comm))
+            _check(MPI_Send(pdat, dlen, MPI_BYTE, dst, tag, self._comm))
+
+    def recv(self, int src, int tag):
+        """
+        Receive a picklable object.
+        """
+        cdef int dlen = 0
+        with nogil:
+            _check(MPI_Recv(&dlen, 1, MPI_INT, src, tag, self._comm,
+                            MPI_STATUS_IGNORE))
+        cdef bytearray dat = bytearray(dlen)
+        cdef char *pdat = dat
+        with nogil:
+            _check(MPI_Recv(pdat, dlen, MPI_BYTE, src, tag, self._comm,
+                            MPI_STATUS_IGNORE))
+        return pickle.loads(bytes(dat))
+
+    def sendarr(self, np.ndarray arr, int dst, int tag):
+        cdef MPI_Datatype dtype
+        cdef int count = _typed(arr, &dtype)
+        cdef void *buf = np.PyArray_DATA(arr)
+        with nogil:
+            _check(MPI_Send(buf, count, dtype, dst, tag, self._comm))
+
+    def recvarr(self, np.ndarray arr, int src, int tag):
+        cdef MPI_Datatype dtype
+        cdef int count = _typed(arr, &dtype)
+        cdef void *buf = np.PyArray_DATA(arr)
+        with nogil:
+            _check(MPI_Recv(buf, count, dtype, src, tag, self._comm,
+                            MPI_STATUS_IGNORE))
+
+    def isendarr(self, np.ndarray arr, int dst, int tag):
+        cdef MPI_Datatype dtype
+        cdef int count = _typed(arr, &dtype)
+        _check(MPI_Isend(np.PyArray_DATA(arr), count, dtype, dst, tag,
+                         self._comm, self._new_request()))
+        self._buffers.append(arr)
+
+    def irecvarr(self, np.ndarray arr, int src, int tag):
+        cdef MPI_Datatype dtype
+        cdef int count = _typed(arr, &dtype)
+        _check(MPI_Irecv(np.PyArray_DATA(arr), count, dtype, src, tag,
+                         self._comm, self._new_request()))
+        self._buffers.append(arr)
+
+    def waitall(self):
+        """
+        Complete all the pending non-blocking transfers.
+        """
+        cdef int nrequest = self._nrequest
+        with nogil:
+            _check(MPI_Waitall(nrequest, self._requests,
+                               MPI_STATUSES_IGNORE))
+        self._nrequest = 0
+        self._buffers = list()
+
+    def allreduce(self, value, op='sum'):
+        """
+        Reduce a scalar over all ranks with *op* (``'sum'``, ``'max'``, or
+        ``'min'``) and return the result to every rank.
+        """
+        cdef double sval = value
+        cdef double rval = 0
+        cdef MPI_Op mop = _op(op)
+        with nogil:
+            _check(MPI_Allreduce(&sval, &rval, 1, MPI_DOUBLE, mop,
+                                 self._comm))
+        return rval
+
+# vim: set ff=unix fenc=utf8 ft=pyrex ai et sw=4 ts=4 tw=79:
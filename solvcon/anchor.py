@@ -34,6 +34,13 @@ The family of :py:class:`MeshAnchor` classes are attached to
 """
 
 
+import os
+import sys
+import time
+import threading
+
+import numpy as np
+
 # import legacy.
 from .anchor_legacy import(
     Anchor, AnchorList,
@@ -72,6 +79,17 @@ class MeshAnchor(object):
     def exhaust(self):
         pass
 
+    def carry(self, old):
+        """
+        Take over the state of *old*, the anchor at the same position of the
+        solver replaced when :py:meth:`MeshCase.rebalance
+        <solvcon.case.MeshCase.rebalance>` repartitions the domain.  It is
+        called in place of :py:meth:`preloop` after the solution is moved to
+        the new sub-block.  Anchors having no state across time steps need
+        not override it.
+        """
+        pass
+
 
 class MeshAnchorList(list):
     """
@@ -114,3 +132,237 @@ class MeshAnchorList(list):
             func = getattr(anchor, method, None)
             if func != None:
                 func()
+
+    def carry(self, old):
+        """
+        Let each anchor take over the state of the corresponding one of the
+        replaced solver (see :py:meth:`MeshAnchor.carry`).
+
+        @param old: anchors of the replaced solver.
+        @type old: MeshAnchorList
+        @return: nothing
+        """
+        if len(old) != len(self):
+            raise ValueError('%d anchors can\'t carry %d' % (
+                len(self), len(old)))
+        for anchor, oldank in zip(self, old):
+            if type(anchor) is not type(oldank):
+                raise TypeError('%s can\'t carry %s' % (
+                    type(anchor).__name__, type(oldank).__name__))
+            anchor.carry(oldank)
+
+
+class RuntimeSampler(object):
+    """
+    Sample the resource usage of the current process in a daemon thread at a
+    fixed frequency, and keep the samples in a fixed-size ring buffer.  Only
+    the sampling thread touches the operating system, so the thread being
+    sampled pays nothing for it.
+
+    >>> sampler = RuntimeSampler(frequency=1000, size=8)
+    >>> sampler.start()
+    >>> time.sleep(0.05)
+    >>> sampler.stop()
+    >>> arr, count = sampler.read()
+    >>> arr.shape[0] == min(count, 8), arr.shape[1] == len(sampler.FIELDS)
+    (True, True)
+    >>> bool((np.diff(arr[:,0]) > 0).all())
+    True
+    """
+
+    #: Fields of a sample: the time, the high-water mark of the resident set
+    #: size in bytes, the user and system CPU time in seconds, the voluntary
+    #: and involuntary context switches, and the bytes read and written.
+    FIELDS = ('time', 'maxrss', 'utime', 'stime', 'nvcsw', 'nivcsw',
+              'read_bytes', 'write_bytes')
+
+    def __init__(self, frequency=10.0, size=4096):
+        #: Seconds between two samples.
+        self.interval = 1.0 / frequency
+        #: The ring buffer.
+        self.buffer = np.zeros((size, len(self.FIELDS)), dtype='float64')
+        #: Number of samples ever taken.
+        self.count = 0
+        self._lock = threading.Lock()
+        self._halt = threading.Event()
+        self._thread = None
+        self._iofd = None
+
+    def __getstate__(self):
+        # the lock, the event, the thread and the descriptor stay in the
+        # process; the copy is not running.
+        state = self.__dict__.copy()
+        for key in ('_lock', '_halt', '_thread', '_iofd'):
+            del state[key]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+        self._halt = threading.Event()
+        self._thread = None
+        self._iofd = None
+
+    def start(self):
+        if self._thread is not None:
+            return
+        try:
+            self._iofd = os.open('/proc/self/io', os.O_RDONLY)
+        except OSError:
+            self._iofd = None
+        self._halt.clear()
+        self._thread = threading.Thread(target=self._run,
+                                        name='RuntimeSampler')
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._halt.set()
+        self._thread.join()
+        self._thread = None
+        if self._iofd is not None:
+            os.close(self._iofd)
+            self._iofd = None
+        # take the final sample.
+        self.sample()
+
+    def _run(self):
+        while not self._halt.wait(self.interval):
+            self.sample()
+
+    def _io_bytes(self, rusage):
+        if self._iofd is not None:
+            read_bytes = write_bytes = 0
+            for line in os.pread(self._iofd, 4096, 0).split(b'\n'):
+                if line.startswith(b'read_bytes:'):
+                    read_bytes = int(line.split()[1])
+                elif line.startswith(b'write_bytes:'):
+                    write_bytes = int(line.split()[1])
+            return read_bytes, write_bytes
+        # blocks of 512 bytes.
+        return rusage.ru_inblock*512, rusage.ru_oublock*512
+
+    def sample(self):
+        """
+        Take a sample into the ring buffer.
+        """
+        import resource
+        rusage = resource.getrusage(resource.RUSAGE_SELF)
+        # macOS reports in bytes while Linux in KiB.
+        maxrss = rusage.ru_maxrss * (1 if sys.platform == 'darwin' else 1024)
+        read_bytes, write_bytes = self._io_bytes(rusage)
+        with self._lock:
+            self.buffer[self.count % self.buffer.shape[0]] = (
+                time.time(), maxrss, rusage.ru_utime, rusage.ru_stime,
+                rusage.ru_nvcsw, rusage.ru_nivcsw, read_bytes, write_bytes)
+            self.count += 1
+
+    def read(self, since=0):
+        """
+        :param since: The number of samples already read.
+        :type since: int
+        :return: The samples taken after *since* that are still in the buffer
+            in chronological order, and the number of samples ever taken.
+        :rtype: numpy.ndarray, int
+        """
+        size = self.buffer.shape[0]
+        with self._lock:
+            count = self.count
+            since = max(since, count-size)
+            idx = np.arange(since, count) % size
+            return self.buffer[idx], count
+
+
+class RuntimeSampleAnchor(MeshAnchor):
+    """
+    Run a :py:class:`RuntimeSampler` during the time marching, and write the
+    samples to the solver log with the ``RT_sample`` head for the ``scg
+    log_runtime`` command to read back.  The samples are flushed when half of
+    the ring buffer is filled or the loop ends, so that marching a step costs
+    only a check.  It is the low-overhead replacement of
+    :py:class:`RuntimeStatAnchor
+    <solvcon.anchor_legacy.RuntimeStatAnchor>`.  The anchor can be pickled
+    to the workers before the loop starts the sampler.
+    """
+
+    def __init__(self, svr, frequency=10.0, size=4096, **kw):
+        super(RuntimeSampleAnchor, self).__init__(svr, **kw)
+        self.sampler = RuntimeSampler(frequency=frequency, size=size)
+        #: Number of samples written to the log.
+        self.nflushed = 0
+
+    def preloop(self):
+        self.sampler.start()
+
+    def postfull(self):
+        sampler = self.sampler
+        if sampler.count - self.nflushed >= sampler.buffer.shape[0] // 2:
+            self._flush()
+
+    def postloop(self):
+        self.sampler.stop()
+        self._flush()
+
+    def carry(self, old):
+        # keep the running sampler of the process.
+        self.sampler = old.sampler
+        self.nflushed = old.nflushed
+
+    def _flush(self):
+        arr, self.nflushed = self.sampler.read(self.nflushed)
+        mesg = self.svr.mesg
+        for row in arr:
+            mesg('RT_sample: %.20e %d %.6f %.6f %d %d %d %d\n' % tuple(row))
+
+    @staticmethod
+    def _parse(lines, xtime):
+        myhead = 'RT_sample: '
+        nmyhead = len(myhead)
+        data = list()
+        for line in lines:
+            loc = line.find(myhead)
+            if loc > -1:
+                data.append([float(val) for val in
+                             line[loc+nmyhead:].split()])
+        arr = np.array(data, dtype='float64').reshape((len(data),
+            len(RuntimeSampler.FIELDS)))
+        xval = arr[:,0]-arr[0,0] if xtime else np.arange(arr.shape[0])+1
+        xlabel = 'Time (s)' if xtime else 'Samples'
+        return arr[:,1:].copy(), xval.copy(), xlabel
+
+    @classmethod
+    def plot_rss(cls, lines, ax, xtime=False, showx=True, lloc=None):
+        arr, xval, xlabel = cls._parse(lines, xtime)
+        ax.plot(xval, arr[:,0]/1024**2, '-')
+        if showx: ax.set_xlabel(xlabel)
+        ax.set_ylabel('Max RSS (MB)')
+
+    @classmethod
+    def plot_cputime(cls, lines, ax, xtime=False, showx=True,
+            lloc='best'):
+        arr, xval, xlabel = cls._parse(lines, xtime)
+        ax.plot(xval, arr[:,1], '-', label='utime')
+        ax.plot(xval, arr[:,2], '--', label='stime')
+        if showx: ax.set_xlabel(xlabel)
+        ax.set_ylabel('CPU time (s)')
+        ax.legend(loc=lloc)
+
+    @classmethod
+    def plot_ctxsw(cls, lines, ax, xtime=False, showx=True, lloc='best'):
+        arr, xval, xlabel = cls._parse(lines, xtime)
+        ax.plot(xval, arr[:,3], '-', label='voluntary')
+        ax.plot(xval, arr[:,4], '--', label='involuntary')
+        if showx: ax.set_xlabel(xlabel)
+        ax.set_ylabel('Context switches')
+        ax.legend(loc=lloc)
+
+    @classmethod
+    def plot_io(cls, lines, ax, xtime=False, showx=True, lloc='best'):
+        arr, xval, xlabel = cls._parse(lines, xtime)
+        ax.plot(xval, arr[:,5]/1024**2, '-', label='read')
+        ax.plot(xval, arr[:,6]/1024**2, '--', label='written')
+        if showx: ax.set_xlabel(xlabel)
+        ax.set_ylabel('I/O (MB)')
+        ax.legend(loc=lloc)
@@ -0,0 +1,562 @@
+# -*- coding: UTF-8 -*-
+#
+# Copyright (c) 2016, Yung-Yu Chen <yyc@solvcon.net>
+# BSD 3-Clause License, see COPYING
+
+"""
+Standard benchmark suite.
+
+A benchmark marches a generated mesh with one of the solvers for a fixed
+number of time steps and records:
+
+- The wall time spent in marching and the throughput in Mcells/s.
+- The accumulated time of every marching method of the solver (collected from
+  :py:attr:`MeshSolver.timer <solvcon.solver.MeshSolver.timer>`; the maximum
+  over workers for parallel runs).
+- The memory high-water mark (``ru_maxrss``, in KiB) summed over all
+  processes.
+
+The meshes are structured decompositions of the unit square or cube, so that
+the suite is reproducible without a mesh generator.  Each benchmark runs in
+its own process, for the memory high-water mark not to be polluted by the
+others.  Results are written as JSON and can be compared against a stored
+baseline by :py:func:`compare`.  The ``scg bench`` command drives the suite.
+"""
+
+
+import sys
+import json
+import time
+import shutil
+import tempfile
+import platform
+import itertools
+import collections
+import multiprocessing
+
+import numpy as np
+
+from . import block
+from . import boundcond
+from . import domain
+from . import anchor
+from . import hook
+
+
+#: Element types of the generated meshes.  Each name maps to the number of
+#: dimensions, the cell type, and the number of cells per structured box.
+ELEMTYPES = collections.OrderedDict([
+    ('tri', (2, 3, 2)),
+    ('quad', (2, 2, 1)),
+    ('tet', (3, 5, 6)),
+    ('hex', (3, 4, 1)),
+    ('prism', (3, 6, 2)),
+])
+
+#: Names of the boundary conditions on the low and high side of each axis.
+BOUNDARY_NAMES = (('left', 'right'), ('lower', 'upper'), ('rear', 'front'))
+
+#: Mesh sizes (number of cells) of the standard suite.
+SIZES = (10**4, 10**5, 10**6, 10**7)
+
+
+def parse_size(token):
+    """
+    Convert the size string like "10k" or "1M" to the number of cells.
+
+    >>> parse_size('10k'), parse_size('1M'), parse_size('2500')
+    (10000, 1000000, 2500)
+    """
+    token = token.strip()
+    scale = {'k': 10**3, 'M': 10**6}.get(token[-1:], 1)
+    if scale != 1:
+        token = token[:-1]
+    return int(float(token) * scale)
+
+
+def format_size(ncell):
+    """
+    >>> format_size(10000), format_size(10**7), format_size(2500)
+    ('10k', '10M', '2500')
+    """
+    for scale, unit in ((10**6, 'M'), (10**3, 'k')):
+        if ncell >= scale and ncell % scale == 0:
+            return '%d%s' % (ncell // scale, unit)
+    return '%d' % ncell
+
+
+class BoxMesher(object):
+    """
+    Mesh the unit square (2D) or cube (3D) with a given type of element.
+
+    The domain is divided into ``nbox`` boxes along each axis, and each box is
+    decomposed into one or more elements: 2 triangles per square, 2 prisms per
+    cube, or 6 tetrahedra per cube (Kuhn decomposition).  All boundary faces
+    on a side of the domain belong to the boundary condition named in
+    :py:data:`BOUNDARY_NAMES`.
+
+    >>> mesher = BoxMesher('tet', 10000)
+    >>> mesher.ndim, mesher.nbox, mesher.ncell
+    (3, 12, 10368)
+    >>> BoxMesher('quad', 10000).ncell
+    10000
+    """
+
+    def __init__(self, elemtype, ncell):
+        if elemtype not in ELEMTYPES:
+            raise ValueError('unknown element type "%s"' % elemtype)
+        #: Name of the element type.
+        self.elemtype = elemtype
+        #: Number of spatial dimensions.
+        self.ndim, self.cltpn, self.nsub = ELEMTYPES[elemtype]
+        #: Number of boxes along each axis.
+        self.nbox = max(1, int(round((ncell / self.nsub)**(1.0/self.ndim))))
+        #: Number of cells to be generated.
+        self.ncell = self.nsub * self.nbox**self.ndim
+
+    @property
+    def edgelength(self):
+        return 1.0 / self.nbox
+
+    @property
+    def bcnames(self):
+        return [name for pair in BOUNDARY_NAMES[:self.ndim] for name in pair]
+
+    def make_nodes(self):
+        """
+        :return: Coordinates of the nodes.  The x index runs the fastest.
+        :rtype: numpy.ndarray
+        """
+        ndim = self.ndim
+        coord = np.linspace(0.0, 1.0, self.nbox+1)
+        grids = np.meshgrid(*([coord]*ndim), indexing='ij')
+        ndcrd = np.empty(((self.nbox+1)**ndim, ndim), dtype='float64')
+        for idim in range(ndim):
+            ndcrd[:,idim] = grids[ndim-1-idim].ravel()
+        return ndcrd
+
+    def make_cells(self):
+        """
+        :return: Node indices of the cells, without the leading count.
+        :rtype: numpy.ndarray
+        """
+        ndim = self.ndim
+        nbox = self.nbox
+        idx = np.arange(nbox, dtype='int32')
+        grids = np.meshgrid(*([idx]*ndim), indexing='ij')
+        strides = [(nbox+1)**idim for idim in range(ndim)]
+        base = sum(grids[ndim-1-idim].ravel() * strides[idim]
+                   for idim in range(ndim))
+        def corner(*bits):
+            return base + sum(bit*stride for bit, stride in zip(bits, strides))
+        if self.elemtype == 'quad':
+            cells = [[corner(0,0), corner(1,0), corner(1,1), corner(0,1)]]
+        elif self.elemtype == 'tri':
+            cells = [[corner(0,0), corner(1,0), corner(1,1)],
+                     [corner(0,0), corner(1,1), corner(0,1)]]
+        elif self.elemtype == 'hex':
+            cells = [[corner(0,0,0), corner(1,0,0), corner(1,1,0),
+                      corner(0,1,0), corner(0,0,1), corner(1,0,1),
+                      corner(1,1,1), corner(0,1,1)]]
+        elif self.elemtype == 'prism':
+            # the bottom triangle is clockwise seen from the top.
+            cells = [[corner(0,0,0), corner(1,1,0), corner(1,0,0),
+                      corner(0,0,1), corner(1,1,1), corner(1,0,1)],
+                     [corner(0,0,0), corner(0,1,0), corner(1,1,0),
+                      corner(0,0,1), corner(0,1,1), corner(1,1,1)]]
+        elif self.elemtype == 'tet':
+            cells = []
+            for perm in itertools.permutations(range(3)):
+                path = [np.zeros(3, dtype='int32')]
+                for axis in perm:
+                    path.append(path[-1].copy())
+                    path[-1][axis] = 1
+                # keep the volume positive.
+                if np.linalg.det(np.array(path[1:]) - path[0]) < 0:
+                    path[1], path[2] = path[2], path[1]
+                cells.append([corner(*bits) for bits in path])
+        # interleave the sub-elements of a box.
+        cells = np.array(cells, dtype='int32')
+        return cells.transpose((2, 0, 1)).reshape((self.ncell, -1))
+
+    def __call__(self, cse):
+        return self.toblock(bcname_mapper=cse.condition.bcmap)
+
+    def toblock(self, bcname_mapper=None, fpdtype=None):
+        """
+        :param bcname_mapper: Map BC names to the types and values.
+        :type bcname_mapper: dict
+        :return: The generated block.
+        :rtype: solvcon.block.Block
+        """
+        ndcrd = self.make_nodes()
+        clnds = self.make_cells()
+        blk = block.Block(ndim=self.ndim, nnode=ndcrd.shape[0],
+                          ncell=self.ncell, fpdtype=fpdtype)
+        blk.ndcrd[:,:] = ndcrd
+        blk.cltpn.fill(self.cltpn)
+        blk.clnds.fill(-1)
+        blk.clnds[:,0] = clnds.shape[1]
+        blk.clnds[:,1:clnds.shape[1]+1] = clnds
+        blk.clgrp.fill(0)
+        blk.grpnames.append('default')
+        blk.build_interior()
+        self._make_boundary(blk, bcname_mapper)
+        blk.build_boundary()
+        blk.build_ghost()
+        return blk
+
+    def _make_boundary(self, blk, bcname_mapper):
+        bfcs = np.arange(blk.nface, dtype='int32')[blk.fccls[:,1] < 0]
+        bcname_mapper = dict() if bcname_mapper is None else bcname_mapper
+        eps = self.edgelength * 1.e-6
+        for idim in range(self.ndim):
+            for loc, name in zip((0.0, 1.0), BOUNDARY_NAMES[idim]):
+                bndfcs = bfcs[abs(blk.fccnd[bfcs,idim] - loc) < eps]
+                bct, vdict = bcname_mapper.get(name, (boundcond.BC, dict()))
+                bc = bct(fpdtype=blk.fpdtype)
+                bc.name = name
+                bc.facn = np.empty((len(bndfcs), 3), dtype='int32')
+                bc.facn.fill(-1)
+                bc.facn[:,0] = bndfcs
+                bc.feedValue(vdict)
+                bc.sern = len(blk.bclist)
+                bc.blk = blk
+                blk.bclist.append(bc)
+
+
+def couple_periodic(blk, bct):
+    """
+    Turn the opposite sides of a block from :py:class:`BoxMesher` into pairs
+    of periodic boundary conditions of type *bct*.  The faces are matched by
+    translating the centroids across the box.
+    """
+    nmidx = dict((bc.name, ibc) for ibc, bc in enumerate(blk.bclist))
+    for name0, name1 in BOUNDARY_NAMES[:blk.ndim]:
+        pbcs = []
+        for name in name0, name1:
+            ibc = nmidx[name]
+            pbc = blk.bclist[ibc] = bct(bc=blk.bclist[ibc])
+            pbcs.append(pbc)
+        pbcs[0].match(pbcs[1])
+        pbcs[0].couple(pbcs[1])
+        pbcs[1].couple(pbcs[0])
+
+
+def _maxrss():
+    """
+    :return: The memory high-water mark of the current process in KiB.
+    :rtype: int
+    """
+    import resource
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports in bytes while Linux in KiB.
+    return rss // 1024 if sys.platform == 'darwin' else rss
+
+
+class BenchAnchor(anchor.MeshAnchor):
+    """
+    Report the marching timers and the memory high-water mark of the solver
+    through :py:attr:`MeshSolver.marchret
+    <solvcon.solver.MeshSolver.marchret>`.  Pair with :py:class:`BenchHook`.
+    """
+
+    def __init__(self, svr, **kw):
+        super(BenchAnchor, self).__init__(svr, **kw)
+        svr.marchret_ops['bench'] = {'timer': 'max', 'maxrss': 'sum'}
+
+    def postmarch(self):
+        self.svr.marchret['bench'] = {
+            'timer': dict(self.svr.timer), 'maxrss': _maxrss()}
+
+
+class BenchHook(hook.MeshHook):
+    """
+    Collect the benchmark record at the end of the time-marching loop.
+    """
+
+    def __init__(self, cse, record=None, **kw):
+        #: The :py:class:`dict` to be filled with the result.
+        self.record = record if record is not None else dict()
+        super(BenchHook, self).__init__(cse, **kw)
+
+    def postloop(self):
+        execution = self.cse.execution
+        marchret = execution.marchret
+        if not isinstance(marchret, list):
+            marchret = [marchret]
+        marchret = [ret.get('bench') for ret in marchret if ret]
+        marchret = [ret for ret in marchret if ret]
+        timer = dict()
+        for ret in marchret:
+            for key, val in ret['timer'].items():
+                timer[key] = max(timer.get(key, 0.0), val)
+        steps = execution.step_current - execution.step_init
+        march = self.cse.log.time['solver_march']
+        ncell = self.blk.ncell
+        # The marching returns of serial and threaded runs come from this
+        # process; only workers in other processes add to the master.
+        maxrss = _maxrss()
+        if self.cse.is_parallel and not self.cse.is_threaded:
+            maxrss += sum(ret['maxrss'] for ret in marchret)
+        self.record.update(
+            ncell=ncell,
+            steps=steps,
+            march=march,
+            mcells=steps*ncell / march * 1.e-6,
+            timer=timer,
+            maxrss=maxrss,
+        )
+
+
+class _StillGasAnchor(anchor.MeshAnchor):
+    """
+    Fill the conservation variables of :py:class:`GasSolver
+    <solvcon.parcel.gas.solver.GasSolver>` with still gas.
+    """
+
+    def __init__(self, svr, rho=1.0, p=1.0, gamma=1.4, **kw):
+        self.rho = rho
+        self.p = p
+        self.gamma = gamma
+        super(_StillGasAnchor, self).__init__(svr, **kw)
+
+    def provide(self):
+        soln = self.svr.soln
+        soln.fill(0.0)
+        soln[:,0] = self.rho
+        soln[:,-1] = self.p / (self.gamma-1)
+
+
+def _make_gas_case(mesher, **kw):
+    from .parcel import gas
+    bcmap = dict((name, (gas.GasNonrefl, {})) for name in mesher.bcnames)
+    cse = gas.GasCase(mesher=mesher, bcmap=bcmap, **kw)
+    cse.defer(gas.FillAnchor, mappers={'soln': gas.GasSolver.ALMOST_ZERO,
+                                       'dsoln': 0.0, 'amsca': 1.4})
+    cse.defer(_StillGasAnchor)
+    return cse
+
+
+def _make_gasplus_case(mesher, **kw):
+    from .march import gas as march_gas
+    from .parcel import gasplus
+    bcmap = dict((name, (boundcond.bctregy.GasPlusNonRefl, {}))
+                 for name in mesher.bcnames)
+    class _StillGasPlusAnchor(march_gas.CommonAnchor):
+        def provide(self):
+            so0n = self.solver.sol.so0n.F
+            so0n.fill(0.0)
+            so0n[:,0] = 1.0
+            so0n[:,-1] = 1.0 / (1.4-1)
+            self.solver.sol.so0c.F[:] = so0n[:]
+    cse = gasplus.GasPlusCase(mesher=mesher, bcmap=bcmap, **kw)
+    cse.defer(gasplus.FillAnchor,
+              mappers={'sol.so0n': march_gas.Solver2D.ALMOST_ZERO,
+                       'sol.so1n': 0.0, 'sol.gamma': 1.4})
+    cse.defer(_StillGasPlusAnchor)
+    return cse
+
+
+def _make_linear_case(mesher, **kw):
+    from .parcel import linear
+    from .parcel.linear import velstress
+    mtrl = velstress.mltregy['GaAs'](al=0.0, be=0.0, ga=0.0)
+    cse = velstress.VslinCase(
+        mesher=mesher, bcmap={}, mtrldict={None: mtrl},
+        bcmod=lambda blk: couple_periodic(blk, linear.LinearPeriodic), **kw)
+    cse.defer(linear.FillAnchor, mappers={'soln': 0.0, 'dsoln': 0.0})
+    return cse
+
+
+def _make_vewave_case(mesher, **kw):
+    from .parcel import vewave
+    bcmap = dict((name, (vewave.VewaveNonRefl, {}))
+                 for name in mesher.bcnames)
+    cse = vewave.VewaveCase(
+        mesher=mesher, bcmap=bcmap,
+        mtrldict={None: vewave.mltregy['SoftTissue']()}, **kw)
+    cse.defer(vewave.FillAnchor, mappers={'soln': 0.0, 'dsoln': 0.0})
+    cse.defer(vewave.AmscaAnchor)
+    return cse
+
+
+#: A benchmarked solver: the function to create the case, the characteristic
+#: wave speed for the time increment, and whether it can run in parallel.
+BenchSolver = collections.namedtuple(
+    'BenchSolver', ('make_case', 'speed', 'parallel', 'reason'))
+
+#: Solvers in the suite.
+SOLVERS = collections.OrderedDict([
+    ('gas', BenchSolver(_make_gas_case, 1.2, True, '')),
+    ('gasplus', BenchSolver(
+        _make_gasplus_case, 1.2, False,
+        'the libmarch solver does not exchange interface data')),
+    ('linear', BenchSolver(
+        _make_linear_case, 4800.0, False,
+        'periodic boundary conditions do not survive domain decomposition')),
+    ('vewave', BenchSolver(_make_vewave_case, 1600.0, True, '')),
+])
+
+
+class Benchmark(collections.namedtuple(
+        'Benchmark', ('solver', 'elemtype', 'ncell', 'npart'))):
+    """
+    One entry of the suite.  *npart* is 0 for a serial run.
+
+    >>> Benchmark('gas', 'tri', 10**5, 4).name
+    'gas-tri-100k-p4'
+    """
+
+    __slots__ = ()
+
+    @property
+    def name(self):
+        name = '%s-%s-%s' % (self.solver, self.elemtype,
+                             format_size(self.ncell))
+        if self.npart:
+            name += '-p%d' % self.npart
+        return name
+
+
+def make_suite(solvers=None, elemtypes=None, sizes=None, nparts=(0,)):
+    """
+    :return: The list of :py:class:`Benchmark` to run.  By default it
+        includes everything in the standard suite in serial.
+    :rtype: list
+    """
+    solvers = list(SOLVERS) if solvers is None else solvers
+    elemtypes = list(ELEMTYPES) if elemtypes is None else elemtypes
+    sizes = SIZES if sizes is None else sizes
+    return [Benchmark(solver, elemtype, ncell, npart)
+            for solver in solvers for elemtype in elemtypes
+            for ncell in sizes for npart in nparts]
+
+
+def run_benchmark(bench, steps=20, cfl=0.2, basedir=None):
+    """
+    Run a benchmark in the current process.
+
+    :param bench: The benchmark.
+    :type bench: Benchmark
+    :return: The record.
+    :rtype: dict
+    """
+    record = dict(bench._asdict(), name=bench.name)
+    solver = SOLVERS[bench.solver]
+    if bench.npart and not solver.parallel:
+        record['skipped'] = 'parallel run unsupported: %s' % solver.reason
+        return record
+    mesher = BoxMesher(bench.elemtype, bench.ncell)
+    kw = dict(basefn=bench.name, basedir=basedir, steps_run=steps,
+              time_increment=cfl*mesher.edgelength/solver.speed)
+    if bench.npart:
+        kw.update(domaintype=domain.Collective, npart=bench.npart)
+    cse = solver.make_case(mesher, **kw)
+    cse.info.muted = True
+    cse.defer(BenchHook, record=record,
+              ankcls=None if bench.solver == 'gasplus' else BenchAnchor)
+    cse.init()
+    cse.run()
+    record['time_increment'] = kw['time_increment']
+    return record
+
+
+def _run_in_child(conn, bench, kw):
+    try:
+        record = run_benchmark(bench, **kw)
+    except Exception as e:
+        record = dict(bench._asdict(), name=bench.name,
+                      error='%s: %s' % (type(e).__name__, e))
+    conn.send(record)
+    conn.close()
+
+
+def run_suite(suite, steps=20, cfl=0.2, info=None):
+    """
+    Run every benchmark in a separate process.  A failure is recorded rather
+    than stopping the suite.
+
+    :return: The result to be written as JSON.
+    :rtype: dict
+    """
+    from . import __version__
+    info = (lambda msg: None) if info is None else info
+    records = list()
+    for bench in suite:
+        basedir = tempfile.mkdtemp(prefix='scbench')
+        info('%s ... ' % bench.name)
+        try:
+            rconn, wconn = multiprocessing.Pipe(duplex=False)
+            proc = multiprocessing.Process(
+                target=_run_in_child, args=(wconn, bench,
+                    dict(steps=steps, cfl=cfl, basedir=basedir)))
+            proc.start()
+            wconn.close()
+            try:
+                record = rconn.recv()
+            except EOFError:
+                record = dict(bench._asdict(), name=bench.name,
+                              error='exit code %s' % proc.exitcode)
+            proc.join()
+        finally:
+            shutil.rmtree(basedir, ignore_errors=True)
+        if 'mcells' in record:
+            info('%g Mcells/s, %d KiB.\n' % (record['mcells'],
+                                             record['maxrss']))
+        else:
+            info('%s.\n' % record.get('skipped', record.get('error')))
+        records.append(record)
+    return dict(
+        solvcon=__version__,
+        python=platform.python_version(),
+        platform=platform.platform(),
+        node=platform.node(),
+        date=time.strftime('%Y-%m-%dT%H:%M:%S'),
+        records=records,
+    )
+
+
+def compare(result, baseline, tolerance=0.1):
+    """
+    Compare a result with a baseline.
+
+    :param tolerance: Allowed fraction of throughput drop or memory growth.
+    :type tolerance: float
+    :return: Tuples of (name, key, baseline value, current value) for every
+        regression.
+    :rtype: list
+
+    >>> base = {'records': [{'name': 'a', 'mcells': 10.0, 'maxrss': 100}]}
+    >>> compare({'records': [{'name': 'a', 'mcells': 8.0, 'maxrss': 105}]},
+    ...         base)
+    [('a', 'mcells', 10.0, 8.0)]
+    >>> compare({'records': [{'name': 'a', 'mcells': 9.5, 'maxrss': 120}]},
+    ...         base)
+    [('a', 'maxrss', 100, 120)]
+    """
+    baserecs = dict((rec['name'], rec) for rec in baseline['records'])
+    regressions = list()
+    for rec in result['records']:
+        base = baserecs.get(rec['name'])
+        if base is None or 'mcells' not in base or 'mcells' not in rec:
+            continue
+        if rec['mcells'] < base['mcells'] * (1-tolerance):
+            regressions.append(
+                (rec['name'], 'mcells', base['mcells'], rec['mcells']))
+        if rec['maxrss'] > base['maxrss'] * (1+tolerance):
+            regressions.append(
+                (rec['name'], 'maxrss', base['maxrss'], rec['maxrss']))
+    return regressions
+
+
+def save(result, fname):
+    with open(fname, 'w') as fobj:
+        json.dump(result, fobj, indent=2, sort_keys=True)
+
+
+def load(fname):
+    with open(fname) as fobj:
+        return json.load(fobj)
+
+# vim: set ff=unix fenc=utf8 ft=python ai et sw=4 ts=4 tw=79:
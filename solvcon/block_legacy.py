@@ -588,6 +588,6 @@ class LegacyBlock(metaclass=BlockMeta):
         # return result.
         return ngstnode, ngstface, ngstcell
 
-    def partition(self, npart):
+    def partition(self, npart, vwgt=None):
         msh = self.create_msh()
-        return msh.partition(npart)
+        return msh.partition(npart, vwgt)
@@ -38,11 +38,95 @@ defined here.
 
 import warnings
 
+import numpy as np
+
 from . import dependency
 from .gendata import TypeNameRegistry, TypeWithBinder
 dependency.import_module_may_fail('.mesh')
 dependency.import_module_may_fail('.march')
 
+def match_faces(src, dst, shift=None, rotation=None, tol=None):
+    """
+    Pair two sets of face centroids which coincide after the source set is
+    transformed by ``rotation`` then ``shift``.  The destination centroids are
+    hashed onto a grid of spacing ``tol`` and looked up by sorting, so that the
+    matching takes O(n log n) time.
+
+    >>> src = np.array([[0, 0], [0, 1], [0, 2]], dtype='float64')
+    >>> dst = np.array([[3, 2], [3, 0], [3, 1]], dtype='float64')
+    >>> match_faces(src, dst).tolist()
+    [1, 2, 0]
+    >>> match_faces(src, dst[:2])
+    Traceback (most recent call last):
+        ...
+    ValueError: cannot match 3 faces to 2 faces
+    >>> match_faces(src, dst, shift=[2, 0])
+    Traceback (most recent call last):
+        ...
+    ValueError: 3 of 3 faces unmatched, e.g., [0, 1, 2]
+
+    @param src: source centroids.
+    @type src: numpy.ndarray
+    @param dst: destination centroids.
+    @type dst: numpy.ndarray
+    @keyword shift: translation applied to the source after rotation.  If not
+        given, it is the difference between the means of the two sets.
+    @type shift: numpy.ndarray
+    @keyword rotation: rotation matrix applied to the source.
+    @type rotation: numpy.ndarray
+    @keyword tol: tolerance of distance.  Default is 1.e-6 of the extent.
+    @type tol: float
+    @return: indices of the destination faces paired with the source faces.
+    @rtype: numpy.ndarray
+    """
+    import itertools
+    src = np.asarray(src, dtype='float64')
+    dst = np.asarray(dst, dtype='float64')
+    nface, ndim = src.shape
+    if dst.shape != src.shape:
+        raise ValueError('cannot match %d faces to %d faces' % (
+            nface, dst.shape[0]))
+    if rotation is not None:
+        src = src.dot(np.asarray(rotation, dtype='float64').T)
+    if shift is None:
+        shift = dst.mean(axis=0) - src.mean(axis=0)
+    src = src + np.asarray(shift, dtype='float64')
+    if tol is None:
+        extent = np.ptp(dst, axis=0).max() if nface else 0.0
+        tol = 1.e-6 * (extent if extent > 0 else 1.0)
+    # hash the destination onto a grid and sort the rows of the hash keys.
+    rowtype = np.dtype([('f%d' % it, 'int64') for it in range(ndim)])
+    def rows(keys):
+        return np.ascontiguousarray(keys).view(rowtype).ravel()
+    dkey = np.floor(dst / tol).astype('int64')
+    skey = np.floor(src / tol).astype('int64')
+    order = rows(dkey).argsort(kind='mergesort')
+    sorted_keys = rows(dkey)[order]
+    # look up the cell of each source centroid and then the neighboring cells
+    # for the centroids falling close to a cell edge.
+    matched = np.full(nface, -1, dtype='int64')
+    for offset in itertools.product((0, -1, 1), repeat=ndim):
+        todo = np.flatnonzero(matched < 0)
+        if not len(todo):
+            break
+        query = rows(skey[todo] + np.array(offset, dtype='int64'))
+        # scan the whole run of equal keys, since a grid cell may hold more
+        # than one destination centroid.
+        first = np.searchsorted(sorted_keys, query, side='left')
+        count = np.searchsorted(sorted_keys, query, side='right') - first
+        for irun in range(count.max() if len(count) else 0):
+            hit = (count > irun) & (matched[todo] < 0)
+            cand = order[first[hit] + irun]
+            close = (abs(dst[cand] - src[todo[hit]]) <= tol).all(axis=1)
+            matched[todo[hit][close]] = cand[close]
+    unmatched = np.flatnonzero(matched < 0)
+    if len(unmatched):
+        raise ValueError('%d of %d faces unmatched, e.g., %s' % (
+            len(unmatched), nface, unmatched[:10].tolist()))
+    if len(np.unique(matched)) != nface:
+        raise ValueError('faces closer than tolerance %g are ambiguous' % tol)
+    return matched
+
 class Glue(object):
     """
     Glue two boundary conditions which are considered to be collocated.
@@ -73,8 +157,8 @@ class Glue(object):
         Glue object in the pair is the reciprocal of the other.  The
         constructor DOES NOT modify associated BC or BlockSolver objects except
         setting BC objects' glue property to self.  If no reference point is
-        given through ref keyword, a random reference point is generated for
-        sorting boundary faces to be glued.
+        given through ref keyword, the boundary faces to be glued are paired
+        by their coincident centroids with match_faces().
 
         @param sbc: source BC object.
         @type sbc: solvcon.boundcond.BC
@@ -85,24 +169,28 @@ class Glue(object):
         @keyword reciprocal: the glue object on the other side.
         @type reciprocal: Glue
         """
-        from random import random
-        from numpy import array
         svr = sbc.svr
         ngstface = svr.ngstface
         ngstcell = svr.ngstcell
         ndim = svr.ndim
-        fpdtype = svr.fpdtype
         # set source BC object and cache container.
         self.sbc = sbc
         self.cache = dict()
-        # calculate and set a reference point and use it to sort faces.
-        if ref is None:
-            ref = array([random() for it in range(ndim)], dtype=fpdtype)
-        assert len(ref) == ndim
         self.ref = ref
+        if ref is None:
+            # pair faces by their centroids.
+            sfcs = sbc.facn[:,0] + ngstface
+            dfcs = dbc.facn[:,0] + ngstface
+            dfcs = dfcs[match_faces(svr.fccnd[sfcs,:], svr.fccnd[dfcs,:],
+                                    shift=np.zeros(ndim))]
+        else:
+            # use the reference point to sort faces.
+            assert len(ref) == ndim
+            sfcs = self.__sortfcs(sbc, ref)
+            dfcs = self.__sortfcs(dbc, ref)
         # calculate and set cell lists.
-        self.scls = svr.fccls[self.__sortfcs(sbc,ref),1] + ngstcell
-        self.dcls = svr.fccls[self.__sortfcs(dbc,ref),0] + ngstcell
+        self.scls = svr.fccls[sfcs,1] + ngstcell
+        self.dcls = svr.fccls[dfcs,0] + ngstcell
         assert (self.scls<ngstcell).all()
         assert (self.dcls>=ngstcell).all()
         # set properties to source BC.
@@ -501,6 +589,35 @@ class periodic(BC):
         slct = dist.argsort()
         self.facn = self.facn[slct,:]
 
+    def match(self, rbc, shift=None, rotation=None, tol=None):
+        """
+        Reorder the faces of the related BC object to pair with the faces of
+        self, by matching the face centroids of self transformed by rotation
+        then shift to those of the related BC object.  Unmatched faces raise
+        ValueError.
+
+        @param rbc: Related BC object.
+        @type rbc: solvcon.boundcond.periodic
+        @keyword shift: translation from self to rbc.  If not given, it is
+            calculated from the mean centroids.
+        @type shift: numpy.ndarray
+        @keyword rotation: rotation matrix from self to rbc.
+        @type rotation: numpy.ndarray
+        @keyword tol: tolerance of distance.
+        @type tol: float
+        @return: nothing.
+        """
+        fccnd = self.blk.fccnd
+        try:
+            slct = match_faces(fccnd[self.facn[:,0],:],
+                               fccnd[rbc.facn[:,0],:],
+                               shift=shift, rotation=rotation, tol=tol)
+        except ValueError as e:
+            e.args = tuple(list(e.args) + [
+                'self bc \'%s\' to rbc \'%s\'' % (self.name, rbc.name)])
+            raise
+        rbc.facn = rbc.facn[slct,:]
+
     def couple(self, rbc):
         """
         Calculate self.rclp[:,:] form the information about related BC object
@@ -544,7 +661,10 @@ class periodic(BC):
     @staticmethod
     def couple_all(blk, bcmap):
         """
-        Couple all periodic boundary conditions.
+        Couple all periodic boundary conditions.  The faces of a pair are
+        matched by centroids with periodic.match() when the value dictionary
+        of the pair has 'shift' or 'rotation' (and optionally 'tol'), or are
+        sorted by distance to 'ref' otherwise.
 
         @param blk: the block having periodic BCs to be coupled.
         @type blk: solvcon.block.Block
@@ -573,8 +693,13 @@ class periodic(BC):
             ibc1 = nmidx[val]
             pbc0 = blk.bclist[ibc0] = bct(bc=blk.bclist[ibc0])
             pbc1 = blk.bclist[ibc1] = bct(bc=blk.bclist[ibc1])
-            ref = vdict.get('ref', None)
-            pbc0.sort(ref)
-            pbc1.sort(ref)
+            if 'shift' in vdict or 'rotation' in vdict:
+                pbc0.match(pbc1, shift=vdict.get('shift'),
+                           rotation=vdict.get('rotation'),
+                           tol=vdict.get('tol'))
+            else:
+                ref = vdict.get('ref', None)
+                pbc0.sort(ref)
+                pbc1.sort(ref)
             pbc0.couple(pbc1)
             pbc1.couple(pbc0)
@@ -39,6 +39,7 @@ import signal
 import pickle
 import time
 import gzip
+from numbers import Number
 
 from . import hook
 from . import anchor
@@ -236,6 +237,96 @@ class MeshHookList(list):
             hok.drop_anchor(svr)
 
 
+class WorkerPool(object):
+    """
+    Keep the workers of a parallel :py:class:`MeshCase`, with their peer
+    connections and split blocks, alive for the following cases.  Pass the
+    same pool to the cases with the *pool* keyword.  A case that finds the
+    pool holding workers for the same mesh, boundary-condition mapping,
+    partition number and domain type (see :py:meth:`make_key`) only replaces
+    the solvers in the workers, and skips loading, splitting, hiring and
+    interconnecting.  Otherwise the pooled workers are terminated and new ones
+    are hired, so that the blocks and their boundary conditions never leak
+    from one case to another.
+
+    >>> pool = WorkerPool()
+    >>> pool.dealer is None
+    True
+    >>> pool.terminate() # no-op for an empty pool.
+    """
+
+    def __init__(self):
+        #: The key of the pooled workers; see :py:meth:`make_key`.
+        self.key = None
+        #: The split domain shared by the pooled workers.
+        self.domainobj = None
+        #: The :py:class:`solvcon.rpc.Dealer` of the pooled workers.
+        self.dealer = None
+
+    @classmethod
+    def make_key(cls, cse):
+        """
+        Make the key of everything that goes into the pooled blocks: the mesh,
+        the boundary-condition mapping and modifier, the partition number and
+        the domain type.
+
+        >>> bcmap = {'left': (boundcond.BC, {'value': 1.0})}
+        >>> cse0 = MeshCase(meshfn='a.blk', bcmap=bcmap)
+        >>> cse1 = MeshCase(meshfn='a.blk',
+        ...                 bcmap={'left': (boundcond.BC, {'value': 1.0})})
+        >>> WorkerPool.make_key(cse0) == WorkerPool.make_key(cse1)
+        True
+        >>> cse1.condition.bcmap['left'][1]['value'] = 2.0
+        >>> WorkerPool.make_key(cse0) == WorkerPool.make_key(cse1)
+        False
+        """
+        return (cse.io.meshfn, cse.io.mesher,
+                cls._freeze(cse.condition.bcmap), cse.condition.bcmod,
+                cse.execution.npart, cse.solver.domaintype)
+
+    @classmethod
+    def _freeze(cls, obj):
+        """
+        Turn containers and arrays into nested tuples that compare by value.
+        """
+        if isinstance(obj, dict):
+            return tuple(sorted(((key, cls._freeze(val))
+                                 for key, val in obj.items()),
+                                key=lambda item: repr(item[0])))
+        elif isinstance(obj, (list, tuple)):
+            return tuple(cls._freeze(val) for val in obj)
+        elif hasattr(obj, 'tobytes') and hasattr(obj, 'dtype'):
+            return (obj.dtype.str, obj.shape, obj.tobytes())
+        return obj
+
+    def match(self, cse):
+        """
+        Check if the pooled workers can be reused by the case.
+        """
+        return self.dealer is not None and self.key == self.make_key(cse)
+
+    def keep(self, cse):
+        """
+        Keep the workers of the case, and terminate the previously pooled
+        workers if they are different.
+        """
+        if self.dealer is not cse.solver.dealer:
+            self.terminate()
+        self.key = self.make_key(cse)
+        self.domainobj = cse.solver.domainobj
+        self.dealer = cse.solver.dealer
+
+    def terminate(self):
+        """
+        Terminate the pooled workers.
+        """
+        if self.dealer is not None:
+            self.dealer.terminate()
+        self.key = None
+        self.domainobj = None
+        self.dealer = None
+
+
 class MeshCase(case_core.CaseInfo):
     """
     Base class for simulation cases based on :py:class:`solvcon.mesh.Mesh`.
@@ -245,6 +336,12 @@ class MeshCase(case_core.CaseInfo):
         # execution related.
         'execution.fpdtype': 'float64',
         'execution.npart': None,    # number of decomposed blocks.
+        'execution.fork': False,    # fork local workers to inherit blocks.
+        'execution.pool': None,     # WorkerPool to reuse workers.
+        'execution.rebalance': None,    # steps between rebalancing.
+        'execution.rebalance_tolerance': 0.1,   # tolerated imbalance.
+        'execution.nthread': None,  # threads per solver process.
+        'execution.threaded': False,    # march split blocks in threads.
         'execution.stop': False,
         'execution.time': 0.0,
         'execution.time_increment': 0.0,
@@ -279,6 +376,8 @@ class MeshCase(case_core.CaseInfo):
         'solver.domainobj': None,
         'solver.solvertype': None,
         'solver.solverobj': None,
+        'solver.solverobjs': None,  # solvers of the threaded blocks.
+        'solver.exchange': None,    # interface exchange of solverobjs.
         'solver.dealer': None,
         # logging.
         'log.time': dict,
@@ -370,6 +469,60 @@ class MeshCase(case_core.CaseInfo):
             raise TypeError('domaintype shouldn\'t be %s' % domaintype)
         return flag_parallel
 
+    @property
+    def is_pooled(self):
+        """
+        Determine if the self object reuses the workers kept in the
+        :py:class:`WorkerPool` given by the *pool* keyword.
+
+        >>> cse = MeshCase(domaintype=domain.Domain, pool=WorkerPool())
+        >>> cse.is_pooled
+        False
+        """
+        pool = self.execution.pool
+        # without a pool, leave the domain type to be checked by init().
+        if pool is None or self.is_threaded:
+            return False
+        return bool(self.is_parallel) and pool.match(self)
+
+    @property
+    def is_threaded(self):
+        """
+        Determine if the split blocks are marched by threads in this process,
+        instead of by workers in other processes.  Enabled by the *threaded*
+        keyword for local parallel.  The solvers exchange the interfaces
+        through memory, and the solver type needs to provide an ``Exchange``
+        type for it.
+
+        >>> cse = MeshCase(domaintype=domain.Domain, threaded=True)
+        >>> cse.is_threaded
+        False
+        """
+        return bool(self.execution.threaded) and self.is_parallel == 1
+
+    @property
+    def is_forking(self):
+        """
+        Determine if the local workers are forked after decomposition, so that
+        each of them inherits the split domain and builds its own solver,
+        instead of receiving the pickled solver from the master.  Enabled by
+        the *fork* keyword.
+
+        >>> from .testing import create_trivial_2d_blk
+        >>> blk = create_trivial_2d_blk()
+        >>> cse = MeshCase(mesher=lambda *arg: blk, domaintype=domain.Domain)
+        >>> cse.is_forking
+        False
+        """
+        if not self.execution.fork or self.is_parallel != 1:
+            return False
+        if self.is_threaded:
+            return False
+        if self.solver.domainobj is not None and \
+           self.solver.domainobj.presplit:
+            return False
+        return rpc.can_fork()
+
     ############################################################################
     ###
     ### Begin of block of case initialization logics.
@@ -443,6 +596,34 @@ class MeshCase(case_core.CaseInfo):
             >>> cse.init()
         """
         self._log_start('init', msg=' (level %d) %s' % (level, self.io.basefn))
+        # reuse pooled workers.
+        if self.is_pooled:
+            self._log_start('reuse_pool')
+            pool = self.execution.pool
+            self.solver.domainobj = pool.domainobj
+            self.solver.dealer = pool.dealer
+            self._log_end('reuse_pool')
+            if level != 1:
+                self.info('\n')
+                self._log_start('reset_solver')
+                self._reset_solver()
+                self._log_end('reset_solver')
+            else:
+                self.info('\n')
+                self._log_start('remote_load_solver')
+                self._remote_load_solver()
+                self._log_end('remote_load_solver')
+            self.info('\n')
+            self._log_start('init_interface')
+            self._init_interface()
+            self._log_end('init_interface')
+            if level != 1:
+                self.info('\n')
+                self._log_start('exchange_metric')
+                self._exchange_metric()
+                self._log_end('exchange_metric')
+            self._log_end('init', msg=' '+self.io.basefn)
+            return
         # initilize the whole solver and domain.
         if level != 1:
             self._log_start('build_domain')
@@ -469,6 +650,15 @@ class MeshCase(case_core.CaseInfo):
                     nblk=self.execution.npart,
                     interface_type=boundcond.interface)
                 self._log_end('split_domain')
+            # march the split blocks in threads of this process.
+            if self.is_threaded:
+                if level != 1:
+                    self.info('\n')
+                    self._log_start('threaded_init_solver')
+                    self._threaded_init_solver()
+                    self._log_end('threaded_init_solver')
+                self._log_end('init', msg=' '+self.io.basefn)
+                return
             # make dealer and create workers for the dealer.
             self.info('\n')
             self._log_start('build_dealer')
@@ -479,6 +669,8 @@ class MeshCase(case_core.CaseInfo):
             self._log_start('interconnect')
             self._interconnect()
             self._log_end('interconnect')
+            if self.execution.pool is not None:
+                self.execution.pool.keep(self)
             # spread out and initialize decomposed solvers.
             if level != 1:
                 self.info('\n')
@@ -542,12 +734,14 @@ class MeshCase(case_core.CaseInfo):
         elif meshfn.endswith('.g'):
             self._log_start('create_genesis_object')
             gn = iogenesis.Genesis(meshfn)
-            gn.load()
-            gn.close_file()
+            gn.load(stream=True)
             self._log_end('create_genesis_object')
             self._log_start('convert_genesis_to_block')
-            obj = gn.toblock(bcname_mapper=bcmapper,
-                use_incenter=self.solver.use_incenter)
+            try:
+                obj = gn.toblock(bcname_mapper=bcmapper,
+                    use_incenter=self.solver.use_incenter)
+            finally:
+                gn.close_file()
             self._log_end('convert_genesis_to_block')
         elif '.neu' in meshfn:
             self._log_start('read_neu_data', msg=' from %s'%meshfn)
@@ -603,10 +797,13 @@ class MeshCase(case_core.CaseInfo):
 
         Return keywords to initialize solvers.
         """
-        return dict(
+        kw = dict(
             enable_mesg=self.io.solver_output,
             debug=self.solver.debug,
         )
+        if self.execution.nthread is not None:
+            kw['nthread'] = self.execution.nthread
+        return kw
 
     # solver object initialization/loading.
     def _local_init_solver(self):
@@ -618,6 +815,43 @@ class MeshCase(case_core.CaseInfo):
         self.runhooks.drop_anchor(svr)
         svr.init()
         self.solver.solverobj = svr
+    def _threaded_init_solver(self):
+        """
+        Create the solvers of the split blocks in this process, and connect
+        their interfaces with the exchange object of the solver type.  The
+        solvers are also put in a :py:class:`solvcon.rpc.LocalDealer`, so that
+        the hooks reach them the same as the remote solvers.
+
+        @return: nothing
+        """
+        svrkw = self.make_solver_keywords() # may set solvertype
+        solvertype = self.solver.solvertype
+        exchange_type = getattr(solvertype, 'Exchange', None)
+        if exchange_type is None:
+            raise TypeError('%s does not support threaded execution' %
+                            solvertype.__name__)
+        dom = self.solver.domainobj
+        nblk = dom.nblk
+        exchange = exchange_type(nblk)
+        svrs = list()
+        for iblk in range(nblk):
+            self.info('solver #%d/(%d-1) ... ' % (iblk, nblk))
+            sbk = dom[iblk]
+            svr = solvertype(sbk, **svrkw)
+            svr.svrn = iblk
+            svr.nsvr = nblk
+            self.runhooks.drop_anchor(svr)
+            svr.init()
+            exchange.bind(iblk, svr)
+            for bc in sbk.bclist:
+                if isinstance(bc, boundcond.interface):
+                    exchange.add_interface(iblk, bc.rblkn,
+                        bc.rclp[:,0].tolist(), bc.rclp[:,1].tolist())
+            svrs.append(svr)
+            self.info('done.\n')
+        self.solver.solverobjs = svrs
+        self.solver.exchange = exchange
+        self.solver.dealer = rpc.LocalDealer(svrs)
     def _remote_init_solver(self):
         """
         @return: nothing
@@ -634,6 +868,10 @@ class MeshCase(case_core.CaseInfo):
                     self.io.meshfn, self.io.domain.splitfn[iblk],
                     iblk, nblk, solvertype, svrkw)
                 self.runhooks.drop_anchor(dealer[iblk])
+            elif self.is_forking:
+                dealer[iblk].create_solver_inherited(iblk, nblk, solvertype,
+                    svrkw)
+                self.runhooks.drop_anchor(dealer[iblk])
             else:
                 sbk = dom[iblk]
                 svr = solvertype(sbk, **svrkw)
@@ -644,8 +882,23 @@ class MeshCase(case_core.CaseInfo):
                 dealer[iblk].remote_setattr('muscle', svr)
             self.info('done.\n')
         self.info('Bind/Init ... ')
-        for sdw in dealer: sdw.cmd.init()
-        dealer.barrier()
+        dealer.call('init')
+        self.info('done.\n')
+    def _reset_solver(self):
+        """
+        Replace the solvers in the pooled workers with new ones on the kept
+        blocks.
+
+        @return: nothing
+        """
+        dealer = self.solver.dealer
+        svrkw = self.make_solver_keywords() # may set solvertype
+        solvertype = self.solver.solvertype
+        for sdw in dealer:
+            sdw.reset_solver(solvertype, svrkw)
+            self.runhooks.drop_anchor(sdw)
+        self.info('Bind/Init ... ')
+        dealer.call('init')
         self.info('done.\n')
     def _remote_load_solver(self):
         """
@@ -688,15 +941,21 @@ class MeshCase(case_core.CaseInfo):
                 )
         return None
     def _create_workers_local(self, dealer, nblk):
+        is_forking = self.is_forking
+        workers = list()
         for iblk in range(nblk):
             if self.solver.debug:
                 debug = iblk, self.io.basedir
             else:
                 debug = None
-            dealer.hire(rpc.Worker(
+            wkr = rpc.Worker(
                 None,
                 profiler_data=self._get_profiler_data(iblk),
-                debug=debug))
+                debug=debug)
+            if is_forking:
+                wkr.domain = self.solver.domainobj
+            workers.append(wkr)
+        dealer.hire_all(workers)
     def _create_workers_remote(self, dealer, nblk):
         info = self.info
         authkey = rpc.DEFAULT_AUTHKEY
@@ -758,10 +1017,16 @@ for node in $nodes; do rsh $node killall %s; done
                     self.info('.\n')
                 self.info(('%%0%dd ->' % dwidth) % iblk)
                 oblk = iblk
-            dealer.bridge((iblk, jblk))
             self.info((' %%0%dd'%dwidth) % jblk)
         self.info('.\n')
+        dealer.bridge_all(dom.ifparr)
         dealer.barrier()
+        # span a tree over the peers for reducing the returns of marching.
+        graph = dict((iblk, list()) for iblk in range(dom.nblk))
+        for iblk, jblk in dom.ifparr:
+            graph[iblk].append(jblk)
+            graph[jblk].append(iblk)
+        dealer.span(graph)
 
     # interface.
     def _init_interface(self):
@@ -784,7 +1049,7 @@ for node in $nodes; do rsh $node killall %s; done
             # print.
             self.info(('%%0%dd ->' % dwidth) % iblk)
             for pair in ifacelist:
-                if pair < 0:
+                if isinstance(pair, Number) and pair < 0:
                     stab = '-' * (2*dwidth+1)
                 else:
                     stab = '-'.join([('%%0%dd'%dwidth)%item for item in pair])
@@ -799,8 +1064,7 @@ for node in $nodes; do rsh $node killall %s; done
         """
         dealer = self.solver.dealer
         for arrname in self.solver.solvertype._interface_init_:
-            for sdw in dealer: sdw.cmd.exchangeibc(arrname,
-                with_worker=True)
+            dealer.issue('exchangeibc', arrname, with_worker=True)
 
     ############################################################################
     ###
@@ -851,8 +1115,11 @@ for node in $nodes; do rsh $node killall %s; done
         flag_parallel = self.is_parallel
         # anchor: provide.
         self._log_start('run_provide')
-        if flag_parallel:
-            for sdw in dealer: sdw.cmd.provide()
+        if self.is_threaded:
+            for svr in self.solver.solverobjs:
+                svr.provide()
+        elif flag_parallel:
+            dealer.issue('provide')
         else:
             self.solver.solverobj.provide()
         self._log_end('run_provide')
@@ -862,12 +1129,17 @@ for node in $nodes; do rsh $node killall %s; done
         # hook: preloop.
         self._log_start('run_preloop')
         self.runhooks('preloop')
-        if flag_parallel:
-            for sdw in dealer: sdw.cmd.preloop()
+        if self.is_threaded:
+            for svr in self.solver.solverobjs:
+                svr.preloop()
+            self.solver.exchange.sync()
+            for svr in self.solver.solverobjs:
+                svr.apply_bc()
+        elif flag_parallel:
+            dealer.issue('preloop')
             for arrname in self.solver.solvertype._solution_array_:
-                for sdw in dealer:
-                    sdw.cmd.exchangeibc(arrname, with_worker=True)
-            for sdw in dealer: sdw.cmd.apply_bc()
+                dealer.issue('exchangeibc', arrname, with_worker=True)
+            dealer.issue('apply_bc')
         else:
             self.solver.solverobj.preloop()
             self.solver.solverobj.apply_bc()
@@ -889,11 +1161,18 @@ for node in $nodes; do rsh $node killall %s; done
             steps_stride = self.execution.steps_stride
             time_increment = self.execution.time_increment
             time_current = self.execution.step_current*time_increment
-            if flag_parallel:
-                for sdw in dealer: sdw.cmd.march(
-                    time_current, time_increment, steps_stride,
-                    with_worker=True)
-                self.execution.marchret = [sdw.recv() for sdw in dealer]
+            if self.is_threaded:
+                self.execution.marchret = self._threaded_march(
+                    time_current, time_increment, steps_stride)
+            elif flag_parallel:
+                dealer.issue('march', time_current, time_increment,
+                    steps_stride, with_worker=True)
+                if dealer.spanhead is not None:
+                    # the workers reduced the returns to the root.
+                    self.execution.marchret = dealer[
+                        dealer.spanhead.val].recv()
+                else:
+                    self.execution.marchret = dealer.gather()
             else:
                 self.execution.marchret = self.solver.solverobj.march(
                     time_current, time_increment, steps_stride)
@@ -902,18 +1181,137 @@ for node in $nodes; do rsh $node killall %s; done
             self.execution.step_current += steps_stride
             # hook: postmarch.
             self.runhooks('postmarch')
+            # rebalance the workload of the workers.
+            rebalance = self.execution.rebalance
+            if (flag_parallel and not self.is_threaded and rebalance and
+                self.execution.step_current % rebalance == 0 and
+                self.execution.step_current < self.execution.steps_run):
+                self.rebalance()
         # end log.
         self._log_end('run_march')
         self.info('\n')
 
+    def _threaded_march(self, time_current, time_increment, steps_run):
+        """
+        March the solvers of the split blocks, each in its own thread.  The
+        solvers release the GIL while marching and meet at the exchange of the
+        interfaces.  A failed solver aborts the exchange so that the others do
+        not wait for it forever.
+
+        @return: the returns of the solvers.
+        @rtype: list
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        svrs = self.solver.solverobjs
+        exchange = self.solver.exchange
+        def march(svr):
+            try:
+                return svr.march(time_current, time_increment, steps_run)
+            except:
+                exchange.abort()
+                raise
+        with ThreadPoolExecutor(max_workers=len(svrs)) as executor:
+            futures = [executor.submit(march, svr) for svr in svrs]
+        return [future.result() for future in futures]
+
+    def _march_costs(self):
+        """
+        Measure the cost of each worker by the time it spent in the marching
+        methods and their anchors.  The time spent in the exchange of interface
+        BCs (marching methods named ``ibc*``) is excluded since it is mostly
+        waiting for the peers.
+
+        @return: the costs and the global step numbers of the solvers.
+        @rtype: tuple
+        """
+        dealer = self.solver.dealer
+        mmnames = [name for name in self.solver.solvertype._MMNAMES
+                   if not name.startswith('ibc')]
+        dealer.issue('pull', 'timer', with_worker=True)
+        timers = dealer.gather()
+        dealer.issue('pull', 'step_global', with_worker=True)
+        steps = dealer.gather()
+        costs = [sum(timer.get(name+'_a', 0.0) for name in mmnames)
+                 for timer in timers]
+        return costs, steps[0]
+
+    def rebalance(self, force=False):
+        """
+        Repartition the domain by the measured costs of the workers, and move
+        the solution to the new decomposition without restarting the case.
+        The workers are kept, while the solvers are recreated on the new
+        sub-blocks with new anchors.  After the solution is moved, the new
+        anchors take over the state of the old ones (see
+        :py:meth:`MeshAnchor.carry <solvcon.anchor.MeshAnchor.carry>`) in
+        place of running :py:meth:`~solvcon.anchor.MeshAnchor.preloop` again.
+
+        The solvers marched by threads (see :py:attr:`is_threaded`) are not
+        rebalanced.
+
+        :keyword force: Rebalance even if the imbalance is tolerated.
+        :type force: bool
+        :return: True if rebalanced.
+        :rtype: bool
+        """
+        dom = self.solver.domainobj
+        dealer = self.solver.dealer
+        if not self.is_parallel or self.is_threaded or dom.blk is None:
+            return False
+        costs, step_global = self._march_costs()
+        imbalance = max(costs) / max(sum(costs)/len(costs), 1.e-300) - 1
+        if not force and imbalance <= self.execution.rebalance_tolerance:
+            return False
+        self._log_start('rebalance', msg=' (imbalance %g)' % imbalance)
+        # collect the solution by the old decomposition.
+        arrnames = self.solver.solvertype._solution_array_
+        sols = dict()
+        for arrname in arrnames:
+            dealer.issue('pull', arrname, with_worker=True)
+            sols[arrname] = dom.collect_interior(dealer.gather())
+        # decompose again and recreate the solvers.
+        dom.repartition(costs, interface_type=boundcond.interface)
+        svrkw = self.make_solver_keywords() # may set solvertype
+        solvertype = self.solver.solvertype
+        nblk = dom.nblk
+        for iblk in range(nblk):
+            svr = solvertype(dom[iblk], **svrkw)
+            svr.svrn = iblk
+            svr.nsvr = nblk
+            svr.step_global = step_global
+            self.runhooks.drop_anchor(svr)
+            dealer[iblk].replace_solver(svr)
+        dealer.call('init')
+        for sdw in dealer:
+            sdw.drop_peers()
+        self._interconnect()
+        self._init_interface()
+        self._exchange_metric()
+        # move the solution to the new decomposition.
+        dealer.issue('provide')
+        for arrname in arrnames:
+            for iblk, arr in enumerate(dom.spread_interior(sols[arrname])):
+                dealer[iblk].cmd.push(arr, arrname, start=dom.shapes[iblk,6])
+        for arrname in arrnames:
+            dealer.issue('exchangeibc', arrname, with_worker=True)
+        dealer.issue('apply_bc')
+        # the new anchors continue the work of the old ones.
+        for sdw in dealer:
+            sdw.carry_anchors()
+        dealer.barrier()
+        self._log_end('rebalance')
+        return True
+
     # logics after exiting main loop (march).
     def _run_postloop(self):
         dealer = self.solver.dealer
         flag_parallel = self.is_parallel
         # hook: postloop.
         self._log_start('run_postloop')
-        if flag_parallel:
-            for sdw in dealer: sdw.cmd.postloop()
+        if self.is_threaded:
+            for svr in self.solver.solverobjs:
+                svr.postloop()
+        elif flag_parallel:
+            dealer.issue('postloop')
         else:
             self.solver.solverobj.postloop()
         self.runhooks('postloop')
@@ -923,8 +1321,11 @@ for node in $nodes; do rsh $node killall %s; done
         flag_parallel = self.is_parallel
         # anchor: exhaust.
         self._log_start('run_exhaust')
-        if flag_parallel:
-            for sdw in dealer: sdw.cmd.exhaust()
+        if self.is_threaded:
+            for svr in self.solver.solverobjs:
+                svr.exhaust()
+        elif flag_parallel:
+            dealer.issue('exhaust')
         else:
             self.solver.solverobj.exhaust()
         self._log_end('run_exhaust')
@@ -934,9 +1335,15 @@ for node in $nodes; do rsh $node killall %s; done
         flag_parallel = self.is_parallel
         # finalize.
         self._log_start('run_final')
-        if flag_parallel:
-            for sdw in dealer: sdw.cmd.final()
-            dealer.terminate()
+        if self.is_threaded:
+            for svr in self.solver.solverobjs:
+                svr.final()
+        elif flag_parallel:
+            dealer.issue('final')
+            # pooled workers are kept for the next case.
+            pool = self.execution.pool
+            if pool is None or pool.dealer is not dealer:
+                dealer.terminate()
         else:
             self.solver.solverobj.final()
         self._log_end('run_final')
@@ -652,6 +652,84 @@ class mesh(Command):
                 self._save_vtkxml(ops, blk, path, ops.appended, ops.binary,
                     ops.encoding, ops.compressor, ops.fpdtype)
 
+class bench(Command):
+    """
+    Run the standard benchmark suite and compare with a baseline.
+    """
+
+    min_args = 0
+
+    def __init__(self, env):
+        from optparse import OptionGroup
+        super(bench, self).__init__(env)
+        op = self.op
+
+        opg = OptionGroup(op, 'Benchmark')
+        opg.add_option('--solvers', action='store', type='string',
+            dest='solvers', default='gas,gasplus,linear,vewave',
+            help='Solvers to benchmark (default is all).',
+        )
+        opg.add_option('--meshes', action='store', type='string',
+            dest='meshes', default='tri,quad,tet,hex,prism',
+            help='Element types of the meshes (default is all).',
+        )
+        opg.add_option('--sizes', action='store', type='string',
+            dest='sizes', default='10k,100k',
+            help='Numbers of cells of the meshes.  The standard suite is '
+                 '10k,100k,1M,10M (default is 10k,100k).',
+        )
+        opg.add_option('--npart', action='store', type='string',
+            dest='npart', default='0',
+            help='Numbers of workers; 0 means serial (default is 0).',
+        )
+        opg.add_option('--steps', action='store', type='int',
+            dest='steps', default=20,
+            help='Time steps to march (default is 20).',
+        )
+        opg.add_option('--cfl', action='store', type='float',
+            dest='cfl', default=0.2,
+            help='CFL number for the time increment (default is 0.2).',
+        )
+        opg.add_option('-o', '--output', action='store', type='string',
+            dest='output', default=None,
+            help='JSON file to write the result.',
+        )
+        opg.add_option('--baseline', action='store', type='string',
+            dest='baseline', default=None,
+            help='JSON file of the baseline to compare with.',
+        )
+        opg.add_option('--tolerance', action='store', type='float',
+            dest='tolerance', default=0.1,
+            help='Allowed fraction of slow-down or memory growth '
+                 '(default is 0.1).',
+        )
+        op.add_option_group(opg)
+        self.opg_arrangement = opg
+
+    def __call__(self):
+        import sys
+        from . import bench as scbench
+        from .helper import info
+        ops, args = self.opargs
+        suite = scbench.make_suite(
+            solvers=ops.solvers.split(','),
+            elemtypes=ops.meshes.split(','),
+            sizes=[scbench.parse_size(tok) for tok in ops.sizes.split(',')],
+            nparts=[int(tok) for tok in ops.npart.split(',')])
+        result = scbench.run_suite(suite, steps=ops.steps, cfl=ops.cfl,
+                                   info=info)
+        if ops.output:
+            scbench.save(result, ops.output)
+        if ops.baseline:
+            regressions = scbench.compare(
+                result, scbench.load(ops.baseline), tolerance=ops.tolerance)
+            for name, key, base, now in regressions:
+                info('Regression in %s: %s %g -> %g\n' % (
+                    name, key, base, now))
+            if regressions:
+                sys.exit(1)
+            info('No regression against %s.\n' % ops.baseline)
+
 class SolverLog(Command):
     """
     Actions related Solver log.
@@ -701,11 +779,13 @@ class SolverLog(Command):
 
 class log_runtime(SolverLog):
     """
-    Show output from RuntimeStatAnchor.
+    Show output from RuntimeStatAnchor and RuntimeSampleAnchor.
     """
 
     min_args = 1
-    PLOTS = ['cpu', 'loadavg', 'mem']
+    PLOTS = ['cpu', 'loadavg', 'mem', 'rss', 'cputime', 'ctxsw', 'io']
+    #: Plots from the samples of RuntimeSampleAnchor.
+    SAMPLE_PLOTS = ['rss', 'cputime', 'ctxsw', 'io']
 
     def __init__(self, env):
         from optparse import OptionGroup
@@ -725,6 +805,22 @@ class log_runtime(SolverLog):
             dest='mem', default=False,
             help='Plot memory usage.',
         )
+        opg.add_option('-r', action='store_true',
+            dest='rss', default=False,
+            help='Plot sampled max RSS.',
+        )
+        opg.add_option('-u', action='store_true',
+            dest='cputime', default=False,
+            help='Plot sampled CPU time.',
+        )
+        opg.add_option('-s', action='store_true',
+            dest='ctxsw', default=False,
+            help='Plot sampled context switches.',
+        )
+        opg.add_option('-i', action='store_true',
+            dest='io', default=False,
+            help='Plot sampled I/O bytes.',
+        )
         opg.add_option('-t', action='store_true',
             dest='xtime', default=False,
             help='Use time as x-axis.',
@@ -762,7 +858,7 @@ class log_runtime(SolverLog):
 
     def __call__(self):
         import os, sys
-        from .anchor import RuntimeStatAnchor
+        from .anchor import RuntimeStatAnchor, RuntimeSampleAnchor
         ops, args = self.opargs
         # count plots.
         nplot = 0
@@ -787,7 +883,11 @@ class log_runtime(SolverLog):
                     }
                     if ops.lloc != None:
                         kws['lloc'] = ops.lloc
-                    getattr(RuntimeStatAnchor, 'plot_'+key)(lines, ax, **kws)
+                    if key in self.SAMPLE_PLOTS:
+                        ankcls = RuntimeSampleAnchor
+                    else:
+                        ankcls = RuntimeStatAnchor
+                    getattr(ankcls, 'plot_'+key)(lines, ax, **kws)
                     iplot += 1
             if nplot:
                 sys.stdout.write('%s processed' % src)
@@ -1029,6 +1129,26 @@ class run(ArrangementCommand):
 
     min_args = 0
 
+    def __init__(self, env):
+        super(run, self).__init__(env)
+        opg = self.opg_arrangement
+        opg.add_option('--fork', action='store_true',
+            dest='fork', default=False,
+            help='Fork local workers after decomposition to inherit the '
+                 'split blocks.',
+        )
+        opg.add_option('--reuse-workers', action='store_true',
+            dest='reuse_workers', default=False,
+            help='Keep parallel workers alive across the arrangements that '
+                 'share the same mesh and partition.',
+        )
+        opg.add_option('--nthread', action='store', type=int,
+            dest='nthread', default=None,
+            help='Number of threads for the kernels in each solver process.  '
+                 'With --npart set to the number of hosts or NUMA nodes it '
+                 'runs in the hybrid mode.',
+        )
+
     def __call__(self):
         import os
         import cProfile
@@ -1037,7 +1157,7 @@ class run(ArrangementCommand):
         from .conf import env
         from . import domain
         from .batch import batregy
-        from .case import arrangements
+        from .case import arrangements, WorkerPool
         from .rpc import Worker, DEFAULT_AUTHKEY
         ops, args = self.opargs
         if len(args) == 0:
@@ -1063,31 +1183,43 @@ class run(ArrangementCommand):
             'batch': batch,
             'npart': npart, 'domaintype': domaintype,
         }
-        for name in names:
-            func = arrangements[name]
-            if env.mpi and env.mpi.rank != 0:
-                pdata = (
-                    ops.profiler_dat,
-                    ops.profiler_log,
-                    ops.profiler_sort,
-                ) if ops.use_profiler else None
-                wkr = Worker(None, profiler_data=pdata)
-                wkr.run(('0.0.0.0', 0), DEFAULT_AUTHKEY)    # FIXME
-            else:
-                if ops.use_profiler:
-                    cProfile.runctx('func(submit=False, **funckw)',
-                        globals(), locals(), ops.profiler_dat)
-                    plog = open(ops.profiler_log, 'w')
-                    p = pstats.Stats(ops.profiler_dat, stream=plog)
-                    p.sort_stats(*ops.profiler_sort.split(','))
-                    p.dump_stats(ops.profiler_dat)
-                    p.print_stats()
-                    plog.close()
-                    info('*** Profiled information saved in '
-                        '%s (raw) and %s (text).\n' % (
-                        ops.profiler_dat, ops.profiler_log))
+        if ops.fork:
+            funckw['fork'] = True
+        if ops.nthread:
+            funckw['nthread'] = ops.nthread
+        pool = None
+        if ops.reuse_workers and npart != None and not env.mpi:
+            pool = funckw['pool'] = WorkerPool()
+        try:
+            for name in names:
+                func = arrangements[name]
+                if env.mpi and env.mpi.rank != 0:
+                    pdata = (
+                        ops.profiler_dat,
+                        ops.profiler_log,
+                        ops.profiler_sort,
+                    ) if ops.use_profiler else None
+                    wkr = Worker(None, profiler_data=pdata)
+                    wkr.run(('0.0.0.0', 0), DEFAULT_AUTHKEY)    # FIXME
                 else:
-                    func(submit=False, **funckw)
+                    if ops.use_profiler:
+                        cProfile.runctx('func(submit=False, **funckw)',
+                            globals(), locals(), ops.profiler_dat)
+                        plog = open(ops.profiler_log, 'w')
+                        p = pstats.Stats(ops.profiler_dat, stream=plog)
+                        p.sort_stats(*ops.profiler_sort.split(','))
+                        p.dump_stats(ops.profiler_dat)
+                        p.print_stats()
+                        plog.close()
+                        info('*** Profiled information saved in '
+                            '%s (raw) and %s (text).\n' % (
+                            ops.profiler_dat, ops.profiler_log))
+                    else:
+                        func(submit=False, **funckw)
+        finally:
+            # terminate the pooled workers even when a case fails.
+            if pool is not None:
+                pool.terminate()
 
 class submit(ArrangementCommand):
     """
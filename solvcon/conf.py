@@ -61,14 +61,15 @@ class Solvcon(object):
     :type modnames: list of str
     :ivar command: Unknown
     :ivar mpi: The MPI runtime interface.
-    :type mpi: solvcon.mpy.MPI
+    :type mpi: solvcon.mpy.MPI, solvcon.mpy.Loopback, or
+        solvcon._mpi.Communicator
     :ivar scu: The CUDA runtime interface.
     :type scu: solvcon.scuda.Scuda.
     """
     def __init__(self):
         import os, sys
         from configparser import ConfigParser
-        from .mpy import MPI
+        from .mpy import get_mpi
         from .scuda import Scuda
         # directories.
         self.pydir = os.path.abspath(os.path.dirname(__file__))
@@ -138,8 +139,7 @@ class Solvcon(object):
         # dynamic properties.
         self.command = None
         # MPI.
-        self.mpi = os.environ.get('SOLVCON_MPI', None)
-        self.mpi = MPI() if self.mpi is not None else self.mpi
+        self.mpi = get_mpi(os.environ.get('SOLVCON_MPI', None))
         # CUDA.
         self.scu = Scuda() if Scuda.has_cuda() else None
 
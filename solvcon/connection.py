@@ -149,6 +149,8 @@ class SocketConnection(object):
         return self.conn.recv(*args, **kw)
     def close(self, *args, **kw):
         return self.conn.close(*args, **kw)
+    def fileno(self):
+        return self.conn.fileno()
     def sendarr(self, arr):
         self.send(arr)
     def recvarr(self, arr):
@@ -171,6 +173,15 @@ class MPIConnection(object):
     def recvarr(self, arr):
         from .conf import env
         env.mpi.recvarr(arr, self.dst, self.TAG)
+    def isendarr(self, arr):
+        from .conf import env
+        env.mpi.isendarr(arr, self.dst, self.TAG)
+    def irecvarr(self, arr):
+        from .conf import env
+        env.mpi.irecvarr(arr, self.dst, self.TAG)
+    def waitall(self):
+        from .conf import env
+        env.mpi.waitall()
 
 CLIENT_TIMEOUT = 20.
 def Client(address, family=None, authkey=None):
@@ -214,7 +225,7 @@ class Listener(object):
     """
     Socket listener for connection.
     """
-    def __init__(self, address, family=None, authkey=None):
+    def __init__(self, address, family=None, authkey=None, backlog=1):
         """
         @param address: The address of a Unix or TCP/IP socket.
         @type address: str or tuple
@@ -222,6 +233,8 @@ class Listener(object):
         @type family: str
         @keyword authkey: Authenticating key.
         @type authkey: str
+        @keyword backlog: Number of pending connections to queue.
+        @type backlog: int
         """
         import socket
         family = family or (address and guess_family(address))
@@ -229,7 +242,7 @@ class Listener(object):
         self._socket = socket.socket(getattr(socket, family))
         self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         self._socket.bind(address)
-        self._socket.listen(1)
+        self._socket.listen(backlog)
         # store extra information.
         self.address = self._socket.getsockname()
         self._last_accepted = None
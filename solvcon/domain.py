@@ -163,19 +163,21 @@ class Collective(Domain, list):
         """
         return (len(self) == 0) and (len(self.idxinfo) != 0)
 
-    def partition(self, nblk):
+    def partition(self, nblk, vwgt=None):
         """
         Partition the whole block into sub-blocks and put information into
         self.edgecut, self.part, self.idxinfo and self.mappers.
 
         @param nblk: number of sub-blocks to be partitioned.
         @type nblk: int
+        @keyword vwgt: weights of cells for balancing the partition.
+        @type vwgt: numpy.ndarray
         """
         from numpy import empty, arange, unique, zeros
         blk = self.blk
         # call partitioner.
         #edgecut, part = Partitioner(blk)(nblk)
-        edgecut, part = blk.partition(nblk)
+        edgecut, part = blk.partition(nblk, vwgt)
         self.edgecut = edgecut
         self.part = part
         # numbering.
@@ -519,6 +521,85 @@ class Collective(Domain, list):
         # Step 5: Supplement the rest of the blocks.
         self.supplement()
 
+    def weigh(self, costs, levels=100):
+        """
+        Convert the measured costs of the sub-blocks to weights of cells for
+        partitioning.  Each cell takes the cost per cell of the sub-block it
+        belongs to, scaled into integers from 1 to levels.
+
+        @param costs: the cost (e.g., marching time) of each sub-block.
+        @type costs: sequence
+        @keyword levels: the resolution of the weights.
+        @type levels: int
+        @return: weights of cells.
+        @rtype: numpy.ndarray
+        """
+        from numpy import array, maximum, rint
+        ncells = array([len(mycls) for mynds, myfcs, mycls in self.idxinfo],
+                       dtype='float64')
+        rates = array(costs, dtype='float64') / maximum(ncells, 1)
+        rates /= max(rates.max(), 1.e-300)
+        return maximum(rint(rates[self.part]*levels), 1).astype('int32')
+
+    def repartition(self, costs, interface_type=None):
+        """
+        Partition and split the whole block again with the same number of
+        sub-blocks, to balance the measured costs of the sub-blocks.
+
+        @param costs: the cost of each sub-block.
+        @type costs: sequence
+        @keyword interface_type: BC type for the interface.
+        @type interface_type: solvcon.boundcond.interface
+        @return: nothing.
+        """
+        nblk = self.nblk
+        self.partition(nblk, vwgt=self.weigh(costs))
+        self.split(interface_type=interface_type)
+
+    def collect_interior(self, arrs):
+        """
+        Assemble the arrays of the interior cells of the sub-blocks into an
+        array of the whole block.
+
+        @param arrs: arrays of the sub-blocks, including the ghost cells.
+        @type arrs: list
+        @return: the array of the whole block.
+        @rtype: numpy.ndarray
+        """
+        from numpy import empty
+        clmaps = self.mappers[2]
+        shape = list(arrs[0].shape)
+        shape[0] = self.blk.ncell
+        arrg = empty(shape, dtype=arrs[0].dtype)
+        for iblk in range(self.nblk):
+            slctg = (clmaps[:,1] == iblk)
+            slctl = clmaps[slctg,0] + self.shapes[iblk,6]
+            arrg[slctg] = arrs[iblk][slctl]
+        return arrg
+
+    def spread_interior(self, arrg):
+        """
+        Distribute an array of the whole block to the interior cells of the
+        sub-blocks.  The ghost cells are left uninitialized.
+
+        @param arrg: the array of the whole block.
+        @type arrg: numpy.ndarray
+        @return: arrays of the sub-blocks, including the ghost cells.
+        @rtype: list
+        """
+        from numpy import empty
+        clmaps = self.mappers[2]
+        arrs = list()
+        for iblk in range(self.nblk):
+            ngstcell = self.shapes[iblk,6]
+            shape = list(arrg.shape)
+            shape[0] = ngstcell + self.shapes[iblk,2]
+            arr = empty(shape, dtype=arrg.dtype)
+            slctg = (clmaps[:,1] == iblk)
+            arr[clmaps[slctg,0]+ngstcell] = arrg[slctg]
+            arrs.append(arr)
+        return arrs
+
     def make_iflist_per_block(self):
         """
         Create the ifacelist for each block/solver object to initialize the
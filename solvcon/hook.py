@@ -85,8 +85,10 @@ class MeshHook(object):
 
         @param target: the solver or shadow object.
         @type target: solvcon.solver.Solver or solvcon.rpc.Shadow
-        @param ankcls: type of the anchor to instantiate.
-        @type ankcls: type
+        @param ankcls: type or factory of the anchor to instantiate, or the
+            anchor object.  A factory is called with the solver and the
+            keywords, and must be picklable to be sent to a remote worker.
+        @type ankcls: type or callable
         @param ankkw: keywords to instantiate anchor object.
         @type ankkw: dict
         @return: nothing
@@ -94,11 +96,13 @@ class MeshHook(object):
         if isinstance(target, rpc.Shadow):
             target.drop_anchor(ankcls, ankkw)
         else:
+            # the keywords are kept for the other solvers.
+            ankkw = dict(ankkw)
             name = ankkw.pop('name', None)
             if isinstance(name, int):
                 raise ValueError('name can\'t be integer')
             obj = ankcls
-            if isinstance(obj, type):
+            if callable(obj):
                 obj = obj(target, **ankkw)
             name = '' if not name else name
             target.runanchors.append(obj, name=name)
@@ -164,11 +168,8 @@ class MeshHook(object):
             dom = self.cse.solver.domainobj
             # collect arrays from solvers.
             dealer = self.cse.solver.dealer
-            arrs = list()
-            for iblk in range(dom.nblk):
-                dealer[iblk].cmd.pull(key, inder=inder, with_worker=True)
-                arr = dealer[iblk].recv()
-                arrs.append(arr)
+            dealer.issue('pull', key, inder=inder, with_worker=True)
+            arrs = dealer.gather()
             # create global array.
             shape = [it for it in arrs[0].shape]
             shape[0] = ncell
@@ -35,7 +35,7 @@ I/O facilities.
 
 __all__ = [
     # modules.
-    'core', 'block', 'domain', 'gambit', 'netcdf', 'vtk', 'vtkxml',
+    'core', 'block', 'domain', 'gambit', 'netcdf', 'series', 'vtk', 'vtkxml',
     'html',
     # module: core.
     'fioregy',
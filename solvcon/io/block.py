@@ -405,9 +405,14 @@ class BlockFormat(Format, metaclass=BlockFormatMeta):
             ibc1 = nmidx[val]
             pbc0 = blk.bclist[ibc0] = bct(blk.bclist[ibc0])
             pbc1 = blk.bclist[ibc1] = bct(blk.bclist[ibc1])
-            ref = vdict['ref']
-            pbc0.sort(ref)
-            pbc1.sort(ref)
+            if 'shift' in vdict or 'rotation' in vdict:
+                pbc0.match(pbc1, shift=vdict.get('shift'),
+                           rotation=vdict.get('rotation'),
+                           tol=vdict.get('tol'))
+            else:
+                ref = vdict['ref']
+                pbc0.sort(ref)
+                pbc1.sort(ref)
             pbc0.couple(pbc1)
             pbc1.couple(pbc0)
         # process non-periodic BCs.
@@ -50,14 +50,22 @@ class Genesis(NetCDF):
     @ivar ncell: number of cells/elements.
     @itype ncell: int
     @ivar blks: list of tuples of (name, type_name, clnds) for each Genesis
-        block.
+        block.  clnds is None when loaded for streaming.
     @itype blks: list
+    @ivar blkdims: list of tuples of (ncell, clnnd) for each Genesis block.
+    @itype blkdims: list
     @ivar bcs: list of tuples of (name, elem, side) for each BC (Genesis
         sideset).
     @itype bcs: list
-    @ivar ndcrd: coordiate array.
+    @ivar ndcrd: coordiate array.  None when loaded for streaming.
     @itype ndcrd: numpy.ndarray
+    @cvar CHUNK: default number of cells or nodes read at a time when
+        streaming.
+    @ctype CHUNK: int
     """
+
+    CHUNK = 1 << 18
+
     def __init__(self, *arg, **kw):
         super(Genesis, self).__init__(*arg, **kw)
         # shape data.
@@ -66,19 +74,24 @@ class Genesis(NetCDF):
         self.ncell = None
         # blocks and BCs.
         self.blks = None
+        self.blkdims = None
         self.bcs = None
         # coordinate.
         self.ndcrd = None
         # mapper.
         self.emap = None
 
-    def load(self):
+    def load(self, stream=False):
         """
-        Load mesh data.
+        Load mesh data.  With stream set, only the meta data and the BCs are
+        loaded, and the connectivities and the coordinates are left in the
+        file for toblock() to read in chunks.  The file must then be kept open
+        until the conversion is done.
 
+        @keyword stream: leave the bulk arrays in the file.
+        @type stream: bool
         @return: nothing
         """
-        from ctypes import c_int, byref
         from numpy import hstack
         # meta data.
         self.ndim = ndim = self.get_dim('num_dim')
@@ -88,11 +101,16 @@ class Genesis(NetCDF):
         nblk = self.get_dim('num_el_blk')
         slen = self.get_dim('len_string')
         self.blks = self.get_lines('eb_names', (nblk, slen))
+        self.blkdims = list()
         for iblk in range(nblk):
             ncell = self.get_dim('num_el_in_blk%d' % (iblk+1))
             clnnd = self.get_dim('num_nod_per_el%d' % (iblk+1))
-            clnds = self.get_array('connect%d' % (iblk+1),
-                (ncell, clnnd), 'int32')
+            self.blkdims.append((ncell, clnnd))
+            if stream:
+                clnds = None
+            else:
+                clnds = self.get_array('connect%d' % (iblk+1),
+                    (ncell, clnnd), 'int32')
             type_name = self.get_attr_text('elem_type', 'connect%d' % (iblk+1))
             self.blks[iblk] = (self.blks[iblk], type_name, clnds)
         # BCs.
@@ -103,6 +121,8 @@ class Genesis(NetCDF):
             elem = self.get_array('elem_ss%d'%(ibc+1), (nface,), 'int32')
             side = self.get_array('side_ss%d'%(ibc+1), (nface,), 'int32')
             self.bcs[ibc] = (self.bcs[ibc], elem, side)
+        if stream:
+            return
         # coordinate.
         large = self.get_attr_int('file_size', None)
         if large:
@@ -116,9 +136,10 @@ class Genesis(NetCDF):
         self.emap = self.get_array('elem_map', (self.ncell,), 'int32')
 
     def toblock(self, onlybcnames=None, bcname_mapper=None, fpdtype=None,
-            use_incenter=False):
+            use_incenter=False, chunk=None, nthread=None):
         """
-        Convert Cubit/Genesis/ExodusII object to Block object.
+        Convert Cubit/Genesis/ExodusII object to Block object.  See
+        _convert_interior_to() for chunk and nthread.
 
         @keyword onlybcnames: positively list wanted names of BCs.
         @type onlybcnames: list
@@ -128,13 +149,17 @@ class Genesis(NetCDF):
         @type fpdtype: str
         @keyword use_incenter: use incenter when creating block.
         @type use_incenter: bool
+        @keyword chunk: number of cells or nodes read at a time.
+        @type chunk: int
+        @keyword nthread: number of threads converting the chunks.
+        @type nthread: int
         @return: Block object.
         @rtype: solvcon.block.Block
         """
         from ..block import Block
         blk = Block(ndim=self.ndim, nnode=self.nnode, ncell=self.ncell,
             fpdtype=fpdtype, use_incenter=use_incenter)
-        self._convert_interior_to(blk)
+        self._convert_interior_to(blk, chunk=chunk, nthread=nthread)
         blk.build_interior()
         self._convert_bc_to(blk,
             onlynames=onlybcnames, name_mapper=bcname_mapper)
@@ -152,46 +177,98 @@ class Genesis(NetCDF):
         ## From Pointwise
         'TRIANGLE': 3,
     }
-    def _convert_interior_to(self, blk):
+    def _convert_interior_to(self, blk, chunk=None, nthread=None):
         """
-        Convert interior connectivities to Block object.
+        Convert interior connectivities to Block object.  The arrays not
+        loaded (see load()) are read from the file chunk by chunk and written
+        directly into the Block object.  The netCDF library is not
+        thread-safe, so the reading is serial, but the chunks are converted by
+        a pool of threads while the next ones are read.
 
         @param blk: to-be-written Block object.
         @type blk: solvcon.block.Block
+        @keyword chunk: number of cells or nodes read at a time.  Default is
+            CHUNK.
+        @type chunk: int
+        @keyword nthread: number of threads converting the chunks.  Default
+            is the number of CPUs.
+        @type nthread: int
         @return: nothing
         """
-        from ..block import elemtype
+        import os
+        import collections
+        from concurrent.futures import ThreadPoolExecutor
+        chunk = self.CHUNK if chunk is None else chunk
+        nthread = (os.cpu_count() or 1) if nthread is None else nthread
         # coordinate.
-        blk.ndcrd[:] = self.ndcrd[:]
+        ndcrd = blk.ndcrd
+        if self.ndcrd is not None:
+            ndcrd[:] = self.ndcrd[:]
+        elif self.get_attr_int('file_size', None):
+            for idm in range(self.ndim):
+                for ist, crd in self.get_chunks(
+                        'coord%s' % ('xyz'[idm]), chunk):
+                    ndcrd[ist:ist+crd.shape[0],idm] = crd
+        else:
+            for ist, crd in self.get_chunks('coord', chunk, axis=1):
+                ndcrd[ist:ist+crd.shape[1],:] = crd.T
         # node definition.
-        ien = 0
-        for name, tname, clnds in self.blks:
-            ist = ien
-            ien += clnds.shape[0]
-            # type.
-            blk.cltpn[ist:ien] = self.CLTPN_MAP[tname]
-            # nodes.
-            nnd = elemtype[self.CLTPN_MAP[tname],2]
-            sclnds = blk.clnds[ist:ien]
-            sclnds[:,0] = nnd
-            sclnds[:,1:nnd+1] = clnds
-            sclnds[:,1:nnd+1] -= 1
-            if tname == 'PRISM':
-                arr = sclnds[:,2].copy()
-                sclnds[:,2] = sclnds[:,3]
-                sclnds[:,3] = arr
-                arr[:] = sclnds[:,5]
-                sclnds[:,5] = sclnds[:,6]
-                sclnds[:,6] = arr
-        # groups.
+        cltpn = blk.cltpn
+        clnds = blk.clnds
+        clgrp = blk.clgrp
+        pending = collections.deque()
+        with ThreadPoolExecutor(max_workers=nthread) as executor:
+            def submit(ist, tname, conn):
+                # bound the read-ahead to keep only a few chunks in memory.
+                if len(pending) >= 2*nthread:
+                    pending.popleft().result()
+                ien = ist + conn.shape[0]
+                pending.append(executor.submit(self._fill_cells,
+                    cltpn[ist:ien], clnds[ist:ien], tname, conn))
+            ien = 0
+            for iblk, (name, tname, conn) in enumerate(self.blks):
+                ist = ien
+                ien += self.blkdims[iblk][0]
+                # groups.
+                clgrp[ist:ien] = iblk
+                # connectivities.
+                if conn is not None:
+                    submit(ist, tname, conn)
+                    continue
+                for jst, conn in self.get_chunks('connect%d' % (iblk+1),
+                                                 chunk):
+                    submit(ist+jst, tname, conn)
+            while pending:
+                pending.popleft().result()
         blk.grpnames = [it[0] for it in self.blks]
-        iblk = 0
-        ien = 0
-        for name, tname, clnds in self.blks:
-            ist = ien
-            ien += clnds.shape[0]
-            blk.clgrp[ist:ien] = iblk
-            iblk += 1
+
+    @classmethod
+    def _fill_cells(cls, cltpn, clnds, tname, conn):
+        """
+        Fill the type and the node definition of the cells from the
+        connectivities of a Genesis block.
+
+        @param cltpn: to-be-written slice of the cell types.
+        @type cltpn: numpy.ndarray
+        @param clnds: to-be-written slice of the node definition.
+        @type clnds: numpy.ndarray
+        @param tname: Genesis element type name.
+        @type tname: str
+        @param conn: the 1-based connectivities.
+        @type conn: numpy.ndarray
+        @return: nothing
+        """
+        from ..block import elemtype
+        # type.
+        tpn = cls.CLTPN_MAP[tname]
+        cltpn[:] = tpn
+        # nodes.
+        nnd = elemtype[tpn,2]
+        clnds[:,0] = nnd
+        clnds[:,1:nnd+1] = conn
+        clnds[:,1:nnd+1] -= 1
+        if tname == 'PRISM':
+            clnds[:,[2,3,5,6]] = clnds[:,[3,2,6,5]]
 
     def _convert_bc_to(self, blk, onlynames=None, name_mapper=None):
         """
@@ -262,21 +339,21 @@ class Genesis(NetCDF):
         """
         from numpy import empty
         from ..boundcond import BC
-        clfcs_map = self.CLFCS_MAP
-        cltpn = blk.cltpn
-        clfcs = blk.clfcs
+        # tabulate the map for clfcs.
+        clfcs_map = empty((max(self.CLFCS_MAP)+1,
+                           max(len(it) for it in self.CLFCS_MAP.values())),
+                          dtype='int32')
+        clfcs_map.fill(-1)
+        for tpn, ifls in self.CLFCS_MAP.items():
+            clfcs_map[tpn,:len(ifls)] = ifls
         name, elem, side = self.bcs[ibc]
         nbnd = elem.shape[0]
         # extrace boundary face list.
         facn = empty((nbnd,3), dtype='int32')
         facn.fill(-1)
-        ibnd = 0
-        while ibnd < nbnd:
-            icl = elem[ibnd] - 1
-            tpn = cltpn[icl]
-            ifl = clfcs_map[tpn][side[ibnd]-1]
-            facn[ibnd,0] = clfcs[icl,ifl]
-            ibnd += 1
+        icl = elem - 1
+        ifl = clfcs_map[blk.cltpn[icl],side-1]
+        facn[:,0] = blk.clfcs[icl,ifl]
         # craft BC object.
         bc = BC(fpdtype=blk.fpdtype)
         bc.name = name
@@ -303,8 +380,7 @@ class GenesisIO(FormatIO):
         # load file into memory.
         assert isinstance(stream, (bytes, str))
         gn = Genesis(stream)
-        gn.load()
-        gn.close_file()
+        gn.load(stream=True)
         # convert loaded neutral object into block object.
         if bcrej:
             onlybcnames = list()
@@ -313,5 +389,8 @@ class GenesisIO(FormatIO):
                     onlybcnames.append(name)
         else:
             onlybcnames = None
-        blk = gn.toblock(onlybcnames=onlybcnames)
+        try:
+            blk = gn.toblock(onlybcnames=onlybcnames)
+        finally:
+            gn.close_file()
         return blk
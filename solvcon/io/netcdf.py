@@ -118,6 +118,29 @@ class NetCDF(object):
         assert str(arr.dtype) == str(dtype)
         return arr
 
+    def get_chunks(self, name, chunk, axis=0):
+        """
+        Iterate over a variable in the netCDF file by reading at most *chunk*
+        entries along *axis* at a time, so that the whole variable is never
+        held in memory.
+
+        :param name: the data to be loaded.
+        :type name: str
+        :param chunk: the number of entries in a chunk.
+        :type chunk: int
+        :keyword axis: the axis to be chunked.
+        :type axis: int
+        :return: Generator of the starting index and the loaded ndarray of
+            each chunk.
+        """
+        var = self.root_group[name]
+        var.set_auto_mask(False)
+        nentry = var.shape[axis]
+        slct = [slice(None)] * len(var.shape)
+        for start in range(0, nentry, chunk):
+            slct[axis] = slice(start, min(start+chunk, nentry))
+            yield start, var[tuple(slct)]
+
     def get_lines(self, name, shape):
         """
         Load string from netCDF file.
@@ -0,0 +1,508 @@
+# -*- coding: UTF-8 -*-
+#
+# Copyright (c) 2016, Yung-Yu Chen <yyc@solvcon.net>
+# BSD 3-Clause License, see COPYING
+
+"""
+Single-file time-series container for solution output.
+
+A series file holds the mesh of one block and the cell data of every saved
+time step, so that a long run produces one file per block instead of one VTK
+file per block per step.  The layout is:
+
+1. A 16-byte magic string :py:attr:`SeriesFile.MAGIC`.
+2. An 8-byte little-endian offset pointing to the latest record.
+3. Data chunks and records.  Each array is stored as one chunk, optionally
+   compressed with zlib.  After the chunks of a step (or of the mesh) are
+   written, a record describing them is appended.  A record is an 8-byte
+   length followed by a JSON object, which contains the offset of the
+   previous record.
+
+The offset in the header is rewritten only after a record is completely on
+disk, so that an interrupted run leaves a readable file containing every step
+that finished.  Appending a step costs O(1) regardless of how many steps are
+already in the file.
+
+:py:meth:`SeriesReader.write_xdmf` (or :py:func:`write_xdmf` for multiple
+blocks) generates an XDMF descriptor referring to the chunks by byte offset,
+for loading the series in ParaView or VisIt.
+"""
+
+
+import os
+import json
+import struct
+import zlib
+
+import numpy as np
+
+
+__all__ = ['SeriesWriter', 'SeriesReader', 'write_xdmf']
+
+
+class SeriesFile(object):
+    """
+    Constants shared by :py:class:`SeriesWriter` and :py:class:`SeriesReader`.
+    """
+
+    #: Magic string at the beginning of a series file.
+    MAGIC = b'SOLVCON-SERIES\x00\x01'
+    #: Format of the header pointer and record lengths.
+    OFFSET_FORMAT = '<Q'
+    OFFSET_SIZE = struct.calcsize(OFFSET_FORMAT)
+    #: Size of the file header.
+    HEADER_SIZE = len(MAGIC) + OFFSET_SIZE
+
+    #: Mapping from solvcon cell type to XDMF topology type.  Points and lines
+    #: need the number of nodes in the mixed topology array.
+    XDMF_CELLTYPE = np.array([1, 2, 5, 4, 9, 6, 8, 7], dtype='int32')
+    #: Mapping from NumPy type name to XDMF number type and precision.
+    XDMF_NUMBER = dict(
+        float32=('Float', 4),
+        float64=('Float', 8),
+        int32=('Int', 4),
+        int64=('Int', 8),
+    )
+
+
+class SeriesWriter(SeriesFile):
+    """
+    Write the mesh of a :py:class:`solvcon.block.Block` once and append cell
+    data arrays per time step into a single file.
+
+    >>> import tempfile, shutil
+    >>> from solvcon.testing import create_trivial_2d_blk
+    >>> blk = create_trivial_2d_blk()
+    >>> tdir = tempfile.mkdtemp()
+    >>> fname = os.path.join(tdir, 'trivial.scts')
+    >>> wtr = SeriesWriter(blk, fname, fpdtype='float64')
+    >>> for istep in range(3):
+    ...     wtr.append(istep, istep*0.1,
+    ...                scalars={'rho': np.arange(3)+istep},
+    ...                vectors={'v': np.ones((3, 2))*istep})
+    >>> wtr.close()
+    >>> rdr = SeriesReader(fname)
+    >>> rdr.steps
+    [0, 1, 2]
+    >>> rdr.read(2, 'rho')
+    array([2., 3., 4.])
+    >>> rdr.read(1, 'v').shape # 2D vectors are padded to 3 components.
+    (3, 3)
+    >>> shutil.rmtree(tdir)
+    """
+
+    def __init__(self, blk, fname, fpdtype=None, compressor='gz'):
+        """
+        :param blk: The block to be saved.
+        :type blk: solvcon.block.Block
+        :param fname: Path of the series file; it will be truncated.
+        :type fname: str
+        :keyword fpdtype: Floating-point type for the data.  Default is the
+            type of the block.
+        :type fpdtype: str
+        :keyword compressor: ``'gz'`` for zlib-compressed chunks or ``''`` for
+            raw chunks.
+        :type compressor: str
+        """
+        if compressor not in ('gz', ''):
+            raise ValueError('compressor must be "gz" or "", not %r' %
+                             compressor)
+        #: The block object.
+        self.blk = blk
+        #: Path of the output file.
+        self.fname = fname
+        #: String for floating point data type (NumPy convention).
+        self.fpdtype = str(np.dtype(fpdtype if fpdtype else blk.fpdtype))
+        #: Compressor for the chunks.
+        self.compressor = compressor
+        self.stream = open(fname, 'wb+')
+        self.stream.write(self.MAGIC)
+        self.stream.write(struct.pack(self.OFFSET_FORMAT, 0))
+        self._last_record = 0
+        self._write_mesh()
+
+    def remesh(self, blk):
+        """
+        Write the mesh of another block, which the steps appended afterward
+        refer to.  It is used when the domain is repartitioned during the
+        time marching.
+
+        :param blk: The new block to be saved.
+        :type blk: solvcon.block.Block
+        :return: Nothing.
+        """
+        if self.stream is None:
+            raise IOError('%s is closed' % self.fname)
+        self.blk = blk
+        self._write_mesh()
+
+    def close(self):
+        """
+        Close the underlying file.  Further appending is not allowed.
+        """
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _write_chunk(self, arr):
+        """
+        :param arr: Array to be written.
+        :type arr: numpy.ndarray
+        :return: Description of the written chunk.
+        :rtype: dict
+        """
+        arr = np.ascontiguousarray(arr)
+        data = arr.tobytes()
+        if self.compressor == 'gz':
+            data = zlib.compress(data)
+        offset = self.stream.tell()
+        self.stream.write(data)
+        return dict(offset=offset, nbytes=len(data),
+                    dtype=str(arr.dtype), shape=list(arr.shape))
+
+    def _write_record(self, record):
+        """
+        Append a record and point the file header to it.
+
+        :param record: Content of the record.
+        :type record: dict
+        :return: Nothing.
+        """
+        record['prev'] = self._last_record
+        data = json.dumps(record, sort_keys=True).encode()
+        offset = self.stream.tell()
+        self.stream.write(struct.pack(self.OFFSET_FORMAT, len(data)))
+        self.stream.write(data)
+        self.stream.flush()
+        # update the header only after the record is completely written.
+        self.stream.seek(len(self.MAGIC))
+        self.stream.write(struct.pack(self.OFFSET_FORMAT, offset))
+        self.stream.seek(0, os.SEEK_END)
+        self.stream.flush()
+        self._last_record = offset
+
+    def _pad_vector(self, arr):
+        """
+        Pad 2D vectors to 3 components, which is required by visualization
+        tools.
+
+        :param arr: Vector array of shape (n, ndim).
+        :type arr: numpy.ndarray
+        :return: Vector array of shape (n, 3).
+        :rtype: numpy.ndarray
+        """
+        if arr.shape[1] == 3:
+            return arr
+        arrn = np.zeros((arr.shape[0], 3), dtype=arr.dtype)
+        arrn[:,:arr.shape[1]] = arr
+        return arrn
+
+    @classmethod
+    def make_xdmf_topology(cls, clnds, cltpn):
+        """
+        Convert cell definition to XDMF mixed topology array.
+
+        :param clnds: Nodes of cells; first column is the number of nodes.
+        :type clnds: numpy.ndarray
+        :param cltpn: Cell types.
+        :type cltpn: numpy.ndarray
+        :return: XDMF mixed topology array.
+        :rtype: numpy.ndarray
+
+        >>> clnds = np.array([[3, 0, 1, 2, -1], [4, 0, 2, 3, 4], [2, 5, 6, -1,
+        ...                   -1]], dtype='int32')
+        >>> cltpn = np.array([3, 2, 1], dtype='int32')
+        >>> SeriesWriter.make_xdmf_topology(clnds, cltpn).tolist()
+        [4, 0, 1, 2, 5, 0, 2, 3, 4, 2, 2, 5, 6]
+        """
+        ncell = clnds.shape[0]
+        counts = clnds[:,0].astype('int64')
+        # points and lines need explicit number of nodes.
+        haslen = cltpn <= 1
+        lead = 1 + haslen.astype('int64')
+        nodes = clnds[:,1:]
+        nmax = nodes.shape[1]
+        table = np.full((ncell, nmax+2), -1, dtype='int32')
+        table[:,0] = cls.XDMF_CELLTYPE[cltpn]
+        table[haslen,1] = counts[haslen]
+        # shift node lists right by one column for cells having the length.
+        table[~haslen,1:nmax+1] = nodes[~haslen]
+        table[haslen,2:nmax+2] = nodes[haslen]
+        mask = np.arange(nmax+2)[None,:] < (lead + counts)[:,None]
+        return table[mask]
+
+    def _write_mesh(self):
+        blk = self.blk
+        ndcrd = self._pad_vector(blk.ndcrd.astype(self.fpdtype))
+        clnds = blk.clnds.astype('int32')
+        cltpn = blk.cltpn.astype('int32')
+        topology = self.make_xdmf_topology(clnds, cltpn)
+        arrays = dict(
+            ndcrd=self._write_chunk(ndcrd),
+            clnds=self._write_chunk(clnds),
+            cltpn=self._write_chunk(cltpn),
+            topology=self._write_chunk(topology),
+        )
+        self._write_record(dict(
+            kind='mesh', ndim=blk.ndim, nnode=blk.nnode, ncell=blk.ncell,
+            compressor=self.compressor, fpdtype=self.fpdtype, arrays=arrays,
+        ))
+
+    def append(self, istep, time, scalars=None, vectors=None):
+        """
+        Append cell data of a time step.
+
+        :param istep: Index of the step.
+        :type istep: int
+        :param time: Physical time of the step.
+        :type time: float
+        :keyword scalars: Scalar arrays of shape (ncell,).
+        :type scalars: dict
+        :keyword vectors: Vector arrays of shape (ncell, ndim).
+        :type vectors: dict
+        :return: Nothing.
+        """
+        if self.stream is None:
+            raise IOError('%s is closed' % self.fname)
+        scalars = scalars if scalars else dict()
+        vectors = vectors if vectors else dict()
+        arrays = dict()
+        for key in sorted(scalars.keys()):
+            arr = scalars[key].astype(self.fpdtype)
+            arrays[key] = self._write_chunk(arr)
+            arrays[key]['center'] = 'Cell'
+            arrays[key]['type'] = 'Scalar'
+        for key in sorted(vectors.keys()):
+            arr = self._pad_vector(vectors[key].astype(self.fpdtype))
+            arrays[key] = self._write_chunk(arr)
+            arrays[key]['center'] = 'Cell'
+            arrays[key]['type'] = 'Vector'
+        self._write_record(dict(
+            kind='step', istep=int(istep), time=float(time), arrays=arrays))
+
+
+class SeriesReader(SeriesFile):
+    """
+    Random-access reader of a series file written by :py:class:`SeriesWriter`.
+    """
+
+    def __init__(self, fname):
+        """
+        :param fname: Path of the series file.
+        :type fname: str
+        """
+        #: Path of the input file.
+        self.fname = fname
+        #: Meta-data of the first mesh.
+        self.mesh = None
+        #: Meta-data of all the meshes; more than one if the domain is
+        #: repartitioned during the time marching.
+        self.meshes = list()
+        #: Ordered list of records of time steps.
+        self.records = list()
+        self._load_index()
+
+    def _load_index(self):
+        with open(self.fname, 'rb') as stream:
+            magic = stream.read(len(self.MAGIC))
+            if magic != self.MAGIC:
+                raise IOError('%s is not a series file' % self.fname)
+            offset = struct.unpack(self.OFFSET_FORMAT,
+                                   stream.read(self.OFFSET_SIZE))[0]
+            records = list()
+            while offset:
+                stream.seek(offset)
+                length = struct.unpack(self.OFFSET_FORMAT,
+                                       stream.read(self.OFFSET_SIZE))[0]
+                record = json.loads(stream.read(length).decode())
+                records.append(record)
+                offset = record['prev']
+        records.reverse()
+        if not records or records[0]['kind'] != 'mesh':
+            raise IOError('%s has no mesh record' % self.fname)
+        # a step refers to the latest mesh written before it.
+        self._imesh = list()
+        for record in records:
+            if record['kind'] == 'mesh':
+                self.meshes.append(record)
+            else:
+                self.records.append(record)
+                self._imesh.append(len(self.meshes)-1)
+        self.mesh = self.meshes[0]
+        self._position = dict(
+            (rec['istep'], it) for it, rec in enumerate(self.records))
+
+    @property
+    def compressor(self):
+        return self.mesh['compressor']
+
+    @property
+    def steps(self):
+        """
+        List of saved step indices.
+        """
+        return [rec['istep'] for rec in self.records]
+
+    @property
+    def times(self):
+        """
+        List of physical time of the saved steps.
+        """
+        return [rec['time'] for rec in self.records]
+
+    def names(self, istep):
+        """
+        :param istep: Index of the step.
+        :type istep: int
+        :return: Names of the arrays saved in the step.
+        :rtype: list
+        """
+        return sorted(self._get_record(istep)['arrays'].keys())
+
+    def _get_record(self, istep):
+        try:
+            return self.records[self._position[istep]]
+        except KeyError:
+            raise KeyError('step %d not in %s' % (istep, self.fname))
+
+    def mesh_of(self, istep):
+        """
+        :param istep: Index of the step.
+        :type istep: int
+        :return: Meta-data of the mesh that the step refers to.
+        :rtype: dict
+        """
+        self._get_record(istep)
+        return self.meshes[self._imesh[self._position[istep]]]
+
+    def _read_chunk(self, desc):
+        with open(self.fname, 'rb') as stream:
+            stream.seek(desc['offset'])
+            data = stream.read(desc['nbytes'])
+        if self.compressor == 'gz':
+            data = zlib.decompress(data)
+        arr = np.frombuffer(data, dtype=desc['dtype'])
+        return arr.reshape(desc['shape']).copy()
+
+    def read_mesh(self, name, istep=None):
+        """
+        :param name: One of ``'ndcrd'``, ``'clnds'``, ``'cltpn'``, or
+            ``'topology'``.
+        :type name: str
+        :keyword istep: Index of the step to read the mesh for.  Default is
+            the first mesh.
+        :type istep: int
+        :return: The mesh array.
+        :rtype: numpy.ndarray
+        """
+        mesh = self.mesh if istep is None else self.mesh_of(istep)
+        return self._read_chunk(mesh['arrays'][name])
+
+    def read(self, istep, name):
+        """
+        :param istep: Index of the step.
+        :type istep: int
+        :param name: Name of the array.
+        :type name: str
+        :return: The cell data array.
+        :rtype: numpy.ndarray
+        """
+        return self._read_chunk(self._get_record(istep)['arrays'][name])
+
+    def write_xdmf(self, outf):
+        """
+        Write an XDMF descriptor for this series.
+
+        :param outf: Output file name; the series file is referred to relative
+            to it.
+        :type outf: str
+        :return: Nothing.
+        """
+        write_xdmf(outf, [self.fname])
+
+
+def _xdmf_dataitem(desc, path, compressor):
+    ntype, prec = SeriesFile.XDMF_NUMBER[desc['dtype']]
+    attrs = [
+        'Format="Binary"', 'Endian="Little"',
+        'NumberType="%s"' % ntype, 'Precision="%d"' % prec,
+        'Dimensions="%s"' % ' '.join(str(it) for it in desc['shape']),
+        'Seek="%d"' % desc['offset'],
+    ]
+    if compressor == 'gz':
+        attrs.append('Compression="Zlib"')
+    return '<DataItem %s>%s</DataItem>' % (' '.join(attrs), path)
+
+
+def write_xdmf(outf, fnames):
+    """
+    Write an XDMF descriptor for one or more series files.  Multiple files
+    (one per decomposed block) are combined into a spatial collection per
+    time step.  Only steps present in all files are described.
+
+    :param outf: Output file name.
+    :type outf: str
+    :param fnames: Paths of the series files.
+    :type fnames: list
+    :return: Nothing.
+    """
+    readers = [SeriesReader(fname) for fname in fnames]
+    steps = set(readers[0].steps)
+    for rdr in readers[1:]:
+        steps &= set(rdr.steps)
+    steps = sorted(steps)
+    outdir = os.path.dirname(os.path.abspath(outf))
+    lines = [
+        '<?xml version="1.0" ?>',
+        '<Xdmf Version="2.0">',
+        '  <Domain>',
+        '    <Grid Name="series" GridType="Collection" '
+            'CollectionType="Temporal">',
+    ]
+    for istep in steps:
+        rec = readers[0]._get_record(istep)
+        lines.append('      <Grid Name="step%d" GridType="Collection" '
+                     'CollectionType="Spatial">' % istep)
+        lines.append('        <Time Value="%.17g" />' % rec['time'])
+        for iblk, rdr in enumerate(readers):
+            path = os.path.relpath(os.path.abspath(rdr.fname), outdir)
+            mesh = rdr.mesh_of(istep)
+            marrs = mesh['arrays']
+            lines.append('        <Grid Name="block%d" GridType="Uniform">'
+                         % iblk)
+            lines.append('          <Topology TopologyType="Mixed" '
+                         'NumberOfElements="%d">' % mesh['ncell'])
+            lines.append('            ' + _xdmf_dataitem(
+                marrs['topology'], path, rdr.compressor))
+            lines.append('          </Topology>')
+            lines.append('          <Geometry GeometryType="XYZ">')
+            lines.append('            ' + _xdmf_dataitem(
+                marrs['ndcrd'], path, rdr.compressor))
+            lines.append('          </Geometry>')
+            arrays = rdr._get_record(istep)['arrays']
+            for key in sorted(arrays.keys()):
+                desc = arrays[key]
+                lines.append('          <Attribute Name="%s" Center="%s" '
+                             'AttributeType="%s">' % (
+                                 key, desc['center'], desc['type']))
+                lines.append('            ' + _xdmf_dataitem(
+                    desc, path, rdr.compressor))
+                lines.append('          </Attribute>')
+            lines.append('        </Grid>')
+        lines.append('      </Grid>')
+    lines.extend([
+        '    </Grid>',
+        '  </Domain>',
+        '</Xdmf>',
+        '',
+    ])
+    with open(outf, 'w') as fobj:
+        fobj.write('\n'.join(lines))
+
+# vim: set ff=unix fenc=utf8 ft=python nobomb et sw=4 ts=4 tw=79:
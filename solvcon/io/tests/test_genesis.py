@@ -714,3 +714,33 @@ class TestLarge(TestCase):
         gn2.load()
         gn2.close_file()
         self.assertTrue((gn1.ndcrd == gn2.ndcrd).all())
+
+class TestStream(TestCase):
+    def _compare(self, fname):
+        import os
+        from ...conf import env
+        from ..genesis import Genesis
+        gn = Genesis(os.path.join(env.datadir, fname))
+        gn.load()
+        blk1 = gn.toblock()
+        gn.close_file()
+        gn = Genesis(os.path.join(env.datadir, fname))
+        gn.load(stream=True)
+        self.assertTrue(gn.ndcrd is None)
+        self.assertTrue(all(it[2] is None for it in gn.blks))
+        # use small chunks to have them spread across blocks and threads.
+        blk2 = gn.toblock(chunk=100, nthread=3)
+        gn.close_file()
+        self.assertTrue((blk1.ndcrd == blk2.ndcrd).all())
+        self.assertTrue((blk1.cltpn == blk2.cltpn).all())
+        self.assertTrue((blk1.clnds == blk2.clnds).all())
+        self.assertTrue((blk1.clgrp == blk2.clgrp).all())
+        self.assertEqual(blk1.grpnames, blk2.grpnames)
+        self.assertEqual([(bc.name, bc.facn.tolist()) for bc in blk1.bclist],
+                         [(bc.name, bc.facn.tolist()) for bc in blk2.bclist])
+
+    def test_small(self):
+        self._compare('cubic_t200mm.g')
+
+    def test_large(self):
+        self._compare('cubic_t200mm_large.g')
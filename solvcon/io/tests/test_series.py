@@ -0,0 +1,117 @@
+# -*- coding: UTF-8 -*-
+
+
+import os
+import shutil
+import tempfile
+from unittest import TestCase
+
+import numpy as np
+
+from ...testing import create_trivial_2d_blk
+from .. import series
+
+
+class SeriesTest(TestCase):
+    compressor = 'gz'
+
+    def setUp(self):
+        self.tdir = tempfile.mkdtemp()
+        self.blk = create_trivial_2d_blk()
+
+    def tearDown(self):
+        shutil.rmtree(self.tdir)
+
+    def _write(self, fname, nstep=4):
+        wtr = series.SeriesWriter(self.blk, fname, fpdtype='float64',
+                                  compressor=self.compressor)
+        for istep in range(nstep):
+            wtr.append(istep*10, istep*0.5,
+                       scalars={'p': np.arange(3, dtype='float64')*istep},
+                       vectors={'v': np.ones((3, 2))*istep})
+        wtr.close()
+
+    def test_mesh(self):
+        fname = os.path.join(self.tdir, 'mesh.scts')
+        self._write(fname, nstep=0)
+        rdr = series.SeriesReader(fname)
+        self.assertEqual([], rdr.steps)
+        self.assertEqual(2, rdr.mesh['ndim'])
+        self.assertEqual(3, rdr.mesh['ncell'])
+        ndcrd = rdr.read_mesh('ndcrd')
+        self.assertEqual((4, 3), ndcrd.shape)
+        self.assertTrue((ndcrd[:,:2] == self.blk.ndcrd).all())
+        self.assertTrue((rdr.read_mesh('clnds') == self.blk.clnds).all())
+        self.assertEqual([4, 0, 1, 2, 4, 0, 2, 3, 4, 0, 3, 1],
+                         rdr.read_mesh('topology').tolist())
+
+    def test_random_access(self):
+        fname = os.path.join(self.tdir, 'random.scts')
+        self._write(fname)
+        rdr = series.SeriesReader(fname)
+        self.assertEqual([0, 10, 20, 30], rdr.steps)
+        self.assertEqual([0.0, 0.5, 1.0, 1.5], rdr.times)
+        self.assertEqual(['p', 'v'], rdr.names(20))
+        self.assertEqual([0.0, 2.0, 4.0], rdr.read(20, 'p').tolist())
+        self.assertEqual([3.0, 3.0, 0.0], rdr.read(30, 'v')[1].tolist())
+        self.assertRaises(KeyError, rdr.read, 5, 'p')
+
+    def test_remesh(self):
+        fname = os.path.join(self.tdir, 'remesh.scts')
+        wtr = series.SeriesWriter(self.blk, fname, fpdtype='float64',
+                                  compressor=self.compressor)
+        wtr.append(0, 0.0, scalars={'p': np.zeros(3)})
+        blk = create_trivial_2d_blk()
+        blk.ndcrd[:] += 1.0
+        wtr.remesh(blk)
+        wtr.append(10, 0.5, scalars={'p': np.ones(3)})
+        wtr.close()
+        rdr = series.SeriesReader(fname)
+        self.assertEqual([0, 10], rdr.steps)
+        self.assertEqual(2, len(rdr.meshes))
+        self.assertIs(rdr.mesh, rdr.mesh_of(0))
+        self.assertIs(rdr.meshes[1], rdr.mesh_of(10))
+        self.assertTrue(
+            (rdr.read_mesh('ndcrd', 10)[:,:2] == blk.ndcrd).all())
+        self.assertTrue(
+            (rdr.read_mesh('ndcrd')[:,:2] == self.blk.ndcrd).all())
+        self.assertEqual([1.0, 1.0, 1.0], rdr.read(10, 'p').tolist())
+        self.assertRaises(KeyError, rdr.mesh_of, 5)
+        xdmffn = os.path.join(self.tdir, 'remesh.xmf')
+        series.write_xdmf(xdmffn, [fname])
+        with open(xdmffn) as fobj:
+            data = fobj.read()
+        seeks = [rdr.meshes[it]['arrays']['ndcrd']['offset']
+                 for it in range(2)]
+        for seek in seeks:
+            self.assertNotEqual(-1, data.find('Seek="%d"' % seek))
+
+    def test_truncated(self):
+        fname = os.path.join(self.tdir, 'truncated.scts')
+        self._write(fname)
+        # simulate a crash in the middle of writing a step.
+        with open(fname, 'ab') as fobj:
+            fobj.write(b'\0'*100)
+        rdr = series.SeriesReader(fname)
+        self.assertEqual([0, 10, 20, 30], rdr.steps)
+
+    def test_xdmf(self):
+        fnames = [os.path.join(self.tdir, 'xdmf.p%d.scts' % it)
+                  for it in range(2)]
+        for fname in fnames:
+            self._write(fname)
+        xdmffn = os.path.join(self.tdir, 'xdmf.xmf')
+        series.write_xdmf(xdmffn, fnames)
+        with open(xdmffn) as fobj:
+            data = fobj.read()
+        self.assertEqual(4, data.count('CollectionType="Spatial"'))
+        self.assertEqual(8, data.count('TopologyType="Mixed"'))
+        self.assertNotEqual(-1, data.find('xdmf.p1.scts'))
+        self.assertEqual(self.compressor == 'gz',
+                         -1 != data.find('Compression="Zlib"'))
+
+
+class SeriesRawTest(SeriesTest):
+    compressor = ''
+
+# vim: set ff=unix fenc=utf8 ft=python ai et sw=4 ts=4 tw=79:
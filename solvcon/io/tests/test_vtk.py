@@ -40,6 +40,23 @@ class WriteTest(TestCase):
         # compare new result with old result line by line.
         self.assertLines(self.str_neu_vtk, str_blk_vtk)
 
+    def test_legacy_binary(self):
+        from io import BytesIO
+        import numpy as np
+        from .. import vtk
+        outf = BytesIO()
+        writer = vtk.VtkLegacyUstGridWriter(self.blk, binary=True)
+        writer.CHUNK = 7
+        writer.write(outf)
+        data = outf.getvalue()
+        # compare the packed node definition of cells.
+        ist = data.index(b'CELLS')
+        ist = data.index(b'\n', ist) + 1
+        clnds = self.blk.clnds
+        packed = np.concatenate([nds[:nds[0]+1] for nds in clnds])
+        self.assertEqual(packed.tolist(), np.frombuffer(
+            data[ist:ist+packed.size*4], dtype='>i4').tolist())
+
 """class TestWriteSingle(WriteTest):
     __test__ = True
     blk = gambit.GambitNeutral(loadfile('sample.neu')).toblock(
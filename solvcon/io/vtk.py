@@ -64,13 +64,14 @@ class VtkLegacyWriter(object):
     def _ensure_endian(arr):
         """
         Ensure the endianness for array.  VTK legacy format require BIG ENDIAN
-        for binary data set.  WILL CHANGE the byte order of the array passed
-        in.  Currently only work for Intel architecture.
+        for binary data set.  The array passed in is not changed.
 
-        @param arr: array to be modified to be BIG ENDIAN.
+        @param arr: array to be converted to be BIG ENDIAN.
         @type arr: numpy.ndarray
+        @return: BIG ENDIAN array; a copy only if arr is not.
+        @rtype: numpy.ndarray
         """
-        arr.byteswap(True)
+        return arr.astype(arr.dtype.newbyteorder('>'), copy=False)
 
     @staticmethod
     def _get_dtypestr(arr):
@@ -118,9 +119,14 @@ class VtkLegacyUstGridWriter(VtkLegacyWriter):
     @itype scalars: dict
     @ivar vectors: dictionary holding vector data.
     @itype vectors: dict
-    @ivar griddata: cached grid data.
-    @itype griddata: str
+    @ivar griddata: cached grid data pieces.
+    @itype griddata: list
+    @cvar CHUNK: number of rows converted at a time.
+    @ctype CHUNK: int
     """
+
+    CHUNK = 1 << 16
+
     def __init__(self, blk, *args, **kw):
         self.cache_grid = kw.pop('cache_grid', True)
         self.scalars = kw.pop('scalars', dict())
@@ -130,9 +136,11 @@ class VtkLegacyUstGridWriter(VtkLegacyWriter):
 
     def write(self, outf, close_on_finish=False):
         """
-        Output to VTK file.
+        Output to VTK file.  The data are converted and written chunk by
+        chunk.
 
-        @param outf: output file object or file name.
+        @param outf: output file object or file name.  The file object has to
+            be opened in binary mode for BINARY.
         @type outf: file str
         @keyword close_on_finish: flag close on finishing (True).  Default
             False.  If outf is file name, the output file will be close no
@@ -145,66 +153,119 @@ class VtkLegacyUstGridWriter(VtkLegacyWriter):
             outf = open(outf, mode)
             close_on_finish = True
         # generate grid data.
-        if not self.griddata:
-            self.griddata = '\n'.join([
-                self._make_file_header(),
-                self._make_data_header(),
-                self._make_nodes(),
-                self._make_cells(),
-            ])
+        griddata = self.griddata
+        if griddata is None:
+            griddata = self._iter_grid()
+            if self.cache_grid:
+                griddata = self.griddata = list(griddata)
         # write.
-        outf.write(self.griddata)
-        outf.write('\n')
-        outf.write(self._make_value())
-        outf.write('\n')
+        for piece in griddata:
+            self._write_piece(outf, piece)
+        empty = True
+        for piece in self._iter_value():
+            self._write_piece(outf, piece)
+            empty = False
+        if empty:
+            self._write_piece(outf, '\n')
         if close_on_finish:
             outf.close()
-        # discard griddata if not cached.
-        if not self.cache_grid:
-            self.griddata = None
 
-    def _convert_scalar_data(self, arr):
+    def _write_piece(self, outf, piece):
         """
-        Helper to convert scalar data array from a block.
+        Write a piece of text or binary data to the output file.
 
-        @param arr: array to be converted.  It will be copied and remain
-            untouched.
+        @param outf: output file object.
+        @type outf: file
+        @param piece: data to be written.
+        @type piece: str bytes
+        @return: nothing
+        """
+        if self.binary and isinstance(piece, str):
+            piece = piece.encode('ascii')
+        outf.write(piece)
+
+    def _iter_array(self, arr, fmt):
+        """
+        Helper to convert a data array chunk by chunk.  For ASCII, each row is
+        formatted into a line with the given template in one go for a chunk.
+
+        @param arr: array to be converted.  It remains untouched.
         @type arr: numpy.ndarray
-        @return: converted data string.
-        @rtype: str
+        @param fmt: template for a row in ASCII.
+        @type fmt: str
+        @return: generator of the converted data pieces, the last of which is
+            ended with a newline.
         """
-        arr = arr.copy()
+        chunk = self.CHUNK
+        nit = arr.shape[0]
+        if not self.binary:
+            tmpl = '\n'.join([fmt]*chunk) + '\n'
+        for ist in range(0, nit, chunk):
+            sarr = arr[ist:ist+chunk]
+            if self.binary:
+                yield self._ensure_endian(sarr).tobytes()
+            else:
+                if sarr.shape[0] != chunk:
+                    tmpl = '\n'.join([fmt]*sarr.shape[0]) + '\n'
+                yield tmpl % tuple(sarr.ravel().tolist())
         if self.binary:
-            self._ensure_endian(arr)
-            return arr.tostring()
+            yield '\n'
+
+    def _iter_scalar_data(self, arr):
+        """
+        Helper to convert scalar data array from a block.
+
+        @param arr: array to be converted.  It remains untouched.
+        @type arr: numpy.ndarray
+        @return: generator of the converted data pieces.
+        """
+        return self._iter_array(arr, '%e')
+
+    def _iter_vector_data(self, arr):
+        """
+        Helper to convert vector data array from a block.  2D vectors are
+        padded with zero to be 3D.
+
+        @param arr: array to be converted.  It remains untouched.
+        @type arr: numpy.ndarray
+        @return: generator of the converted data pieces.
+        """
+        if self.blk.ndim == 3:
+            return self._iter_array(arr, '%e %e %e')
+        elif self.binary:
+            return self._iter_padded(arr)
         else:
-            return '\n'.join(['%e'%val for val in arr])
+            return self._iter_array(arr, '%e %e ' + '%e' % 0.0)
 
-    def _convert_vector_data(self, arr):
+    def _iter_padded(self, arr):
         """
-        Helper to convert vector data array from a block.
+        Helper to convert 2D vector data array to be 3D chunk by chunk in
+        BINARY.
 
-        @param arr: array to be converted.  It will be copied and remain
-            untouched.
+        @param arr: array to be converted.  It remains untouched.
         @type arr: numpy.ndarray
-        @return: converted data string.
-        @rtype: str
+        @return: generator of the converted data pieces.
         """
-        from numpy import empty
-        arr = arr.copy()
-        ndim = self.blk.ndim
+        from numpy import zeros
+        chunk = self.CHUNK
         nit = arr.shape[0]
-        if ndim == 2:
-            arrn = empty((nit, ndim+1), dtype=arr.dtype)
-            arrn[:,2] = 0.0
-            arrn[:,:2] = arr[:,:]
-            arr = arrn
-        if self.binary:
-            self._ensure_endian(arr)
-            return arr.tostring()
-        else:
-            tmpl = '%e %e %e'
-            return '\n'.join([tmpl%tuple(vec) for vec in arr])
+        for ist in range(0, nit, chunk):
+            sarr = arr[ist:ist+chunk]
+            arrn = zeros((sarr.shape[0], 3), dtype=arr.dtype)
+            arrn[:,:2] = sarr
+            yield self._ensure_endian(arrn).tobytes()
+        yield '\n'
+
+    def _iter_grid(self):
+        """
+        @return: generator of the grid data pieces.
+        """
+        yield self._make_file_header() + '\n'
+        yield self._make_data_header() + '\n'
+        for piece in self._iter_nodes():
+            yield piece
+        for piece in self._iter_cells():
+            yield piece
 
     def _make_data_header(self):
         """
@@ -213,115 +274,91 @@ class VtkLegacyUstGridWriter(VtkLegacyWriter):
         """
         return 'DATASET UNSTRUCTURED_GRID'
 
-    def _make_nodes(self):
+    def _iter_nodes(self):
         """
-        @return: made up node coordinates.
-        @rtype: str
+        @return: generator of the node coordinates pieces.
         """
         nnode = self.blk.nnode
-        ndcrd = self.blk.ndcrd.astype(self.fpdtype)
-        ret = []
-        ret.append('POINTS %d %s' % (nnode, self._get_dtypestr(ndcrd)))
-        ret.append(self._convert_vector_data(ndcrd))
-        return '\n'.join(ret)
+        ndcrd = self.blk.ndcrd.astype(self.fpdtype, copy=False)
+        yield 'POINTS %d %s\n' % (nnode, self._get_dtypestr(ndcrd))
+        for piece in self._iter_vector_data(ndcrd):
+            yield piece
 
-    def _make_cells(self):
+    def _iter_cells(self):
         """
-        @return: made up cell definition.
-        @rtype: str
+        The node lists of cells are packed out of clnds by masking it with its
+        count column.
+
+        @return: generator of the cell definition pieces.
         """
-        from numpy import empty
+        from numpy import arange, array
+        chunk = self.CHUNK
         blk = self.blk
         ncell = blk.ncell
         clnds = blk.clnds
-        ret = []
         # node definitions.
         size = clnds[:,0].sum() + ncell
-        ret.append('CELLS %d %d' % (ncell, size))
+        yield 'CELLS %d %d\n' % (ncell, size)
+        mcl = clnds.shape[1]
+        icols = arange(mcl)
+        tmpls = array([' '.join(['%d']*(ncl+1)) for ncl in range(mcl)],
+                      dtype=object)
+        for ist in range(0, ncell, chunk):
+            sclnds = clnds[ist:ist+chunk]
+            counts = sclnds[:,0]
+            packed = sclnds[icols <= counts[:,None]]
+            if self.binary:
+                yield self._ensure_endian(packed.astype('int32')).tobytes()
+            else:
+                tmpl = '\n'.join(tmpls[counts].tolist()) + '\n'
+                yield tmpl % tuple(packed.tolist())
         if self.binary:
-            # make data.
-            arr = empty(size, dtype='int32')
-            icl = 0
-            it = 0
-            while icl < ncell:
-                ncl = clnds[icl,0]
-                arr[it] = ncl
-                arr[it+1:it+1+ncl] = clnds[icl,1:ncl+1]
-                it += 1+ncl
-                icl += 1
-            # write.
-            self._ensure_endian(arr)
-            ret.append(arr.tostring())
-        else:
-            for nds in clnds:
-                ncl = nds[0]
-                cltmpl = ' '.join(['%d']*(ncl+1))
-                ret.append(cltmpl%tuple(nds[:ncl+1]))
+            yield '\n'
         # node types.
-        ret.append('CELL_TYPES %d' % ncell)
-        cltpn = self.cltpn_map[blk.cltpn]
-        if self.binary:
-            self._ensure_endian(cltpn)
-            ret.append(cltpn.tostring())
-        else:
-            ret.extend(['%d'%val for val in cltpn])
-        return '\n'.join(ret)
+        yield 'CELL_TYPES %d\n' % ncell
+        for piece in self._iter_array(self.cltpn_map[blk.cltpn], '%d'):
+            yield piece
 
-    def _make_value(self):
+    def _iter_value(self):
         """
-        @return: made up field value.
-        @rtype: str
+        @return: generator of the field value pieces.
         """
         ncell = self.blk.ncell
-        ret = []
-        ret.append(self._make_value_scalar())
-        ret.append(self._make_value_vector())
-        ret = '\n'.join(ret).strip()
-        if not ret:
-            return ret
-        else:
-            return '\n'.join(['CELL_DATA %d'%ncell, ret])
+        if self.scalars or self.vectors:
+            yield 'CELL_DATA %d\n' % ncell
+        for piece in self._iter_value_scalar():
+            yield piece
+        for piece in self._iter_value_vector():
+            yield piece
 
-    def _make_value_scalar(self):
+    def _iter_value_scalar(self):
         """
-        @return: made up scalar value.
-        @rtype: str
+        @return: generator of the scalar value pieces.
         """
         import sys
-        blk = self.blk
-        sca = dict()
-        sca.update(self.scalars)
-        for key in sca:
-            sca[key] = sca[key].astype(self.fpdtype)
-        ret = []
-        for key in sorted(sca.keys()):
-            ret.append('SCALARS %s %s' % (key, self._get_dtypestr(sca[key])))
-            ret.append('LOOKUP_TABLE default')
+        for key in sorted(self.scalars.keys()):
+            arr = self.scalars[key].astype(self.fpdtype, copy=False)
+            yield 'SCALARS %s %s\n' % (key, self._get_dtypestr(arr))
+            yield 'LOOKUP_TABLE default\n'
             try:
-                ret.append(self._convert_scalar_data(sca[key]))
+                for piece in self._iter_scalar_data(arr):
+                    yield piece
             except:
                 sys.stderr.write('Error on key = %s\n' % key)
                 raise
-        return '\n'.join(ret)
 
-    def _make_value_vector(self):
+    def _iter_value_vector(self):
         """
-        @return: made up vector value.
-        @rtype: str
+        @return: generator of the vector value pieces.
         """
         from numpy import sqrt
-        blk = self.blk
-        ncell = blk.ncell
-        vec = dict()
-        vec.update(self.vectors)
-        for key in vec:
-            vec[key] = vec[key].astype(self.fpdtype)
-        ret = []
-        for key in sorted(vec.keys()):
-            ret.append('VECTORS %s %s' % (key, self._get_dtypestr(vec[key])))
-            ret.append(self._convert_vector_data(vec[key]))
-            norm = sqrt((vec[key]**2).sum(axis=1))
-            ret.append('SCALARS |%s| %s' % (key, self._get_dtypestr(norm)))
-            ret.append('LOOKUP_TABLE default')
-            ret.append(self._convert_scalar_data(norm))
-        return '\n'.join(ret)
+        for key in sorted(self.vectors.keys()):
+            arr = self.vectors[key].astype(self.fpdtype, copy=False)
+            yield 'VECTORS %s %s\n' % (key, self._get_dtypestr(arr))
+            for piece in self._iter_vector_data(arr):
+                yield piece
+            norm = sqrt((arr**2).sum(axis=1))
+            yield 'SCALARS |%s| %s\n' % (key, self._get_dtypestr(norm))
+            yield 'LOOKUP_TABLE default\n'
+            for piece in self._iter_scalar_data(norm):
+                yield piece
@@ -55,6 +55,38 @@ cdef extern:
         int *adjwgt, int *wgtflag, int *numflag, int *nparts, int *options,
         int *edgecut, int *part)
 
+cdef extern from *:
+    """
+    #ifdef _OPENMP
+    #include <omp.h>
+    static int sc_mesh_get_nthread(void) { return omp_get_max_threads(); }
+    static void sc_mesh_set_nthread(int n) { omp_set_num_threads(n); }
+    #else
+    static int sc_mesh_get_nthread(void) { return 1; }
+    static void sc_mesh_set_nthread(int n) { (void)n; }
+    #endif
+    """
+    int sc_mesh_get_nthread()
+    void sc_mesh_set_nthread(int n)
+
+
+def get_nthread():
+    """
+    Return the number of threads the kernels run with in this process.  It is
+    always 1 if the extensions are built without OpenMP (see setup.py).
+    """
+    return sc_mesh_get_nthread()
+
+
+def set_nthread(int nthread):
+    """
+    Set the number of threads the kernels run with in this process.  It has
+    no effect if the extensions are built without OpenMP.
+    """
+    if nthread < 1:
+        raise ValueError('nthread must be positive')
+    sc_mesh_set_nthread(nthread)
+
 
 cdef class Mesh:
     """
@@ -351,6 +351,7 @@ class MPI(object):
 
     def __init__(self, initlib=True):
         self.lib = get_lib('libmpich.so')
+        self._requests = list()
         if initlib:
             self.Init(None, None)
     def __getattr__(self, key):
@@ -437,6 +438,118 @@ class MPI(object):
             c_int(arr.nbytes), c_int(self.BYTE),
             c_int(src), c_int(tag), c_int(comm), byref(status))
 
+    def isendarr(self, arr, dst, tag, comm=None):
+        from ctypes import c_int, c_void_p, byref
+        comm = self.COMM_WORLD if comm is None else comm
+        req = c_int(self.REQUEST_NULL)
+        self.Isend(arr.ctypes.data_as(c_void_p),
+            c_int(arr.nbytes), c_int(self.BYTE),
+            c_int(dst), c_int(tag), c_int(comm), byref(req))
+        self._requests.append((req, arr))
+    def irecvarr(self, arr, src, tag, comm=None):
+        from ctypes import c_int, c_void_p, byref
+        comm = self.COMM_WORLD if comm is None else comm
+        req = c_int(self.REQUEST_NULL)
+        self.Irecv(arr.ctypes.data_as(c_void_p),
+            c_int(arr.nbytes), c_int(self.BYTE),
+            c_int(src), c_int(tag), c_int(comm), byref(req))
+        self._requests.append((req, arr))
+    def waitall(self):
+        from ctypes import c_int, c_void_p
+        nreq = len(self._requests)
+        reqs = (c_int*nreq)(*[req.value for req, arr in self._requests])
+        self.Waitall(c_int(nreq), reqs, c_void_p(self.STATUSES_IGNORE))
+        self._requests = list()
+    def allreduce(self, value, op='sum', comm=None):
+        from ctypes import c_int, c_double, byref
+        comm = self.COMM_WORLD if comm is None else comm
+        mop = {'sum': self.SUM, 'max': self.MAX, 'min': self.MIN}[op]
+        sval = c_double(value)
+        rval = c_double(0)
+        self.Allreduce(byref(sval), byref(rval), c_int(1), c_int(self.DOUBLE),
+            c_int(mop), c_int(comm))
+        return rval.value
+
+class Loopback(object):
+    """
+    Single-rank stand-in with the Pythonic API of :py:class:`MPI`, for testing
+    without an MPI installation.  Whatever is sent is queued by tag and
+    received by the same process, regardless of the ranks.
+
+    >>> import numpy as np
+    >>> mpi = Loopback()
+    >>> mpi.rank, mpi.size
+    (0, 1)
+    >>> mpi.send({'cfl': 0.5}, 0, 1)
+    >>> mpi.recv(0, 1)
+    {'cfl': 0.5}
+    >>> rarr = np.zeros(3)
+    >>> mpi.irecvarr(rarr, 0, 2)
+    >>> mpi.isendarr(np.arange(3, dtype='float64'), 0, 2)
+    >>> mpi.waitall()
+    >>> rarr.tolist()
+    [0.0, 1.0, 2.0]
+    >>> mpi.allreduce(0.8, 'max')
+    0.8
+    """
+    rank = 0
+    size = 1
+    initialized = True
+    def __init__(self):
+        import collections
+        self._queues = collections.defaultdict(collections.deque)
+        self._pending = list()
+    def Finalize(self):
+        pass
+    def send(self, obj, dst, tag, comm=None):
+        from pickle import dumps
+        self._queues[tag].append(dumps(obj, -1))
+    def recv(self, src, tag, comm=None):
+        from pickle import loads
+        return loads(self._queues[tag].popleft())
+    def sendarr(self, arr, dst, tag, comm=None):
+        self._queues[tag].append(arr.tobytes())
+    def recvarr(self, arr, src, tag, comm=None):
+        import numpy as np
+        dat = self._queues[tag].popleft()
+        arr[...] = np.frombuffer(dat, dtype=arr.dtype).reshape(arr.shape)
+    def isendarr(self, arr, dst, tag, comm=None):
+        self.sendarr(arr, dst, tag, comm=comm)
+    def irecvarr(self, arr, src, tag, comm=None):
+        self._pending.append((arr, src, tag))
+    def waitall(self):
+        for arr, src, tag in self._pending:
+            self.recvarr(arr, src, tag)
+        self._pending = list()
+    def allreduce(self, value, op='sum', comm=None):
+        if op not in ('sum', 'max', 'min'):
+            raise ValueError('op can\'t be %s' % op)
+        return value
+
+def get_mpi(name):
+    """
+    Create the MPI runtime interface according to *name*, usually from the
+    environment variable ``SOLVCON_MPI``.  ``None`` means no MPI,
+    ``'loopback'`` gives a :py:class:`Loopback`, ``'ctypes'`` gives a
+    :py:class:`MPI`, and anything else prefers the native
+    :py:class:`solvcon._mpi.Communicator` and falls back to :py:class:`MPI`.
+
+    >>> get_mpi(None)
+    >>> get_mpi('loopback').size
+    1
+    """
+    if name is None:
+        return None
+    elif name == 'loopback':
+        return Loopback()
+    elif name == 'ctypes':
+        return MPI()
+    try:
+        from ._mpi import Communicator
+    except ImportError:
+        return MPI()
+    return Communicator()
+
 def main():
     import os, sys
     from random import choice, randint
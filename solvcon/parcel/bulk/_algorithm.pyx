@@ -34,7 +34,7 @@ cimport numpy as cnp
 # initialize NumPy.
 cnp.import_array()
 
-cdef extern:
+cdef extern nogil:
     # metrics.
     void sc_bulk_prepare_ce_3d(sc_mesh_t *msd, sc_bulk_algorithm_t *alg)
     void sc_bulk_prepare_ce_2d(sc_mesh_t *msd, sc_bulk_algorithm_t *alg)
@@ -174,28 +174,32 @@ cdef class BulkAlgorithm(Mesh):
         self._alg.time_increment = time_increment
 
     def calc_cfl(self):
-        if self._msd.ndim == 3:
-            sc_bulk_calc_cfl_3d(self._msd, self._alg)
-        else:
-            sc_bulk_calc_cfl_2d(self._msd, self._alg)
+        with nogil:
+            if self._msd.ndim == 3:
+                sc_bulk_calc_cfl_3d(self._msd, self._alg)
+            else:
+                sc_bulk_calc_cfl_2d(self._msd, self._alg)
 
     def calc_solt(self):
-        if self._msd.ndim == 3:
-            sc_bulk_calc_solt_3d(self._msd, self._alg)
-        else:
-            sc_bulk_calc_solt_2d(self._msd, self._alg)
+        with nogil:
+            if self._msd.ndim == 3:
+                sc_bulk_calc_solt_3d(self._msd, self._alg)
+            else:
+                sc_bulk_calc_solt_2d(self._msd, self._alg)
 
     def calc_soln(self):
-        if self._msd.ndim == 3:
-            sc_bulk_calc_soln_3d(self._msd, self._alg)
-        else:
-            sc_bulk_calc_soln_2d(self._msd, self._alg)
+        with nogil:
+            if self._msd.ndim == 3:
+                sc_bulk_calc_soln_3d(self._msd, self._alg)
+            else:
+                sc_bulk_calc_soln_2d(self._msd, self._alg)
 
     def calc_dsoln(self):
-        if self._msd.ndim == 3:
-            sc_bulk_calc_dsoln_3d(self._msd, self._alg)
-        else:
-            sc_bulk_calc_dsoln_2d(self._msd, self._alg)
+        with nogil:
+            if self._msd.ndim == 3:
+                sc_bulk_calc_dsoln_3d(self._msd, self._alg)
+            else:
+                sc_bulk_calc_dsoln_2d(self._msd, self._alg)
 
     def ghostgeom_mirror(self, Bound bcd):
         if self._msd.ndim == 3:
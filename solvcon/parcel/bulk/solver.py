@@ -48,7 +48,7 @@ class BulkSolver(solver.MeshSolver):
     <._algorithm.BulkAlgorithm>`.
     """
 
-    _interface_init_ = ['cecnd', 'cevol', 'sfmrc']
+    _interface_init_ = ['cecnd', 'cevol']
     _solution_array_ = ['solt', 'sol', 'soln', 'dsol', 'dsoln']
 
     def __init__(self, blk, **kw):
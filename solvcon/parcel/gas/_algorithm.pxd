@@ -49,18 +49,21 @@ cdef public:
         ## vector parameters.
         int nvec
         double *amvec
-        # solution array.
-        double *sol
-        double *dsol
-        double *solt
-        double *soln
-        double *dsoln
-        double *stm
+        # solution array; double or float, see GasAlgorithm.float32.
+        void *sol
+        void *dsol
+        void *solt
+        void *soln
+        void *dsoln
+        void *stm
         double *cfl
         double *ocfl
+        # local time increment; NULL for the global one.
+        double *ldt
 
 from solvcon.mesh cimport Mesh
 cdef class GasAlgorithm(Mesh):
     cdef sc_gas_algorithm_t *_alg
+    cdef readonly bint float32
 
 # vim: set fenc=utf8 ft=pyrex ff=unix ai et sw=4 ts=4 tw=79:
@@ -35,7 +35,7 @@ cimport numpy as cnp
 # initialize NumPy.
 cnp.import_array()
 
-cdef extern:
+cdef extern nogil:
     # metrics.
     void sc_gas_prepare_ce_3d(sc_mesh_t *msd, sc_gas_algorithm_t *alg)
     void sc_gas_prepare_ce_2d(sc_mesh_t *msd, sc_gas_algorithm_t *alg)
@@ -48,11 +48,11 @@ cdef extern:
         double *crd, int *picl, int *pifl, int *pjcl, int *pjfl)
     ## physics processing.
     void sc_gas_process_physics_2d(sc_mesh_t *msd, sc_gas_algorithm_t *alg,
-        double gasconst,
+        double gasconst, int flags,
         double *vel, double *vor, double *vorm, double *rho, double *pre,
         double *tem, double *ken, double *sos, double *mac)
     void sc_gas_process_physics_3d(sc_mesh_t *msd, sc_gas_algorithm_t *alg,
-        double gasconst,
+        double gasconst, int flags,
         double *vel, double *vor, double *vorm, double *rho, double *pre,
         double *tem, double *ken, double *sos, double *mac)
     ## Schlieren data processing.
@@ -110,6 +110,55 @@ cdef extern:
         sc_mesh_t *msd, sc_bound_t *bcd, sc_gas_algorithm_t *alg)
 
 
+# the kernels above on float32 solution arrays.
+cdef extern nogil:
+    void sc_gas_process_physics_2d_float32(
+        sc_mesh_t *msd, sc_gas_algorithm_t *alg,
+        double gasconst, int flags,
+        double *vel, double *vor, double *vorm, double *rho, double *pre,
+        double *tem, double *ken, double *sos, double *mac)
+    void sc_gas_process_physics_3d_float32(
+        sc_mesh_t *msd, sc_gas_algorithm_t *alg,
+        double gasconst, int flags,
+        double *vel, double *vor, double *vorm, double *rho, double *pre,
+        double *tem, double *ken, double *sos, double *mac)
+    void sc_gas_process_schlieren_rhog_2d_float32(
+        sc_mesh_t *msd, sc_gas_algorithm_t *alg, double *rhog)
+    void sc_gas_process_schlieren_rhog_3d_float32(
+        sc_mesh_t *msd, sc_gas_algorithm_t *alg, double *rhog)
+    void sc_gas_calc_cfl_2d_float32(sc_mesh_t *msd, sc_gas_algorithm_t *alg)
+    void sc_gas_calc_cfl_3d_float32(sc_mesh_t *msd, sc_gas_algorithm_t *alg)
+    void sc_gas_calc_solt_2d_float32(sc_mesh_t *msd, sc_gas_algorithm_t *alg)
+    void sc_gas_calc_solt_3d_float32(sc_mesh_t *msd, sc_gas_algorithm_t *alg)
+    void sc_gas_calc_soln_2d_float32(sc_mesh_t *msd, sc_gas_algorithm_t *alg)
+    void sc_gas_calc_soln_3d_float32(sc_mesh_t *msd, sc_gas_algorithm_t *alg)
+    void sc_gas_calc_dsoln_2d_float32(sc_mesh_t *msd, sc_gas_algorithm_t *alg)
+    void sc_gas_calc_dsoln_3d_float32(sc_mesh_t *msd, sc_gas_algorithm_t *alg)
+    void sc_gas_bound_nonrefl_soln_2d_float32(
+        sc_mesh_t *msd, sc_bound_t *bcd, sc_gas_algorithm_t *alg)
+    void sc_gas_bound_nonrefl_soln_3d_float32(
+        sc_mesh_t *msd, sc_bound_t *bcd, sc_gas_algorithm_t *alg)
+    void sc_gas_bound_nonrefl_dsoln_2d_float32(
+        sc_mesh_t *msd, sc_bound_t *bcd, sc_gas_algorithm_t *alg)
+    void sc_gas_bound_nonrefl_dsoln_3d_float32(
+        sc_mesh_t *msd, sc_bound_t *bcd, sc_gas_algorithm_t *alg)
+    void sc_gas_bound_wall_soln_2d_float32(
+        sc_mesh_t *msd, sc_bound_t *bcd, sc_gas_algorithm_t *alg)
+    void sc_gas_bound_wall_soln_3d_float32(
+        sc_mesh_t *msd, sc_bound_t *bcd, sc_gas_algorithm_t *alg)
+    void sc_gas_bound_wall_dsoln_2d_float32(
+        sc_mesh_t *msd, sc_bound_t *bcd, sc_gas_algorithm_t *alg)
+    void sc_gas_bound_wall_dsoln_3d_float32(
+        sc_mesh_t *msd, sc_bound_t *bcd, sc_gas_algorithm_t *alg)
+    void sc_gas_bound_inlet_soln_2d_float32(
+        sc_mesh_t *msd, sc_bound_t *bcd, sc_gas_algorithm_t *alg)
+    void sc_gas_bound_inlet_soln_3d_float32(
+        sc_mesh_t *msd, sc_bound_t *bcd, sc_gas_algorithm_t *alg)
+    void sc_gas_bound_inlet_dsoln_2d_float32(
+        sc_mesh_t *msd, sc_bound_t *bcd, sc_gas_algorithm_t *alg)
+    void sc_gas_bound_inlet_dsoln_3d_float32(
+        sc_mesh_t *msd, sc_bound_t *bcd, sc_gas_algorithm_t *alg)
+
 cdef class GasAlgorithm(Mesh):
     """
     An algorithm class that does trivial calculation.
@@ -160,14 +209,20 @@ cdef class GasAlgorithm(Mesh):
         self._alg.amvec = <double*>self._get_table_bodyaddr(svr.tbamvec)
 
     def _setup_solutions(self, svr):
-        self._alg.sol = <double*>self._get_table_bodyaddr(svr.tbsol)
-        self._alg.soln = <double*>self._get_table_bodyaddr(svr.tbsoln)
-        self._alg.solt = <double*>self._get_table_bodyaddr(svr.tbsolt)
-        self._alg.dsol = <double*>self._get_table_bodyaddr(svr.tbdsol)
-        self._alg.dsoln = <double*>self._get_table_bodyaddr(svr.tbdsoln)
-        self._alg.stm = <double*>self._get_table_bodyaddr(svr.tbstm)
+        # the solution arrays are in svr.fpdtype; the rest stays in double.
+        self.float32 = 'float32' == svr.fpdtype
+        self._alg.sol = self._get_table_bodyaddr(svr.tbsol)
+        self._alg.soln = self._get_table_bodyaddr(svr.tbsoln)
+        self._alg.solt = self._get_table_bodyaddr(svr.tbsolt)
+        self._alg.dsol = self._get_table_bodyaddr(svr.tbdsol)
+        self._alg.dsoln = self._get_table_bodyaddr(svr.tbdsoln)
+        self._alg.stm = self._get_table_bodyaddr(svr.tbstm)
         self._alg.cfl = <double*>self._get_table_bodyaddr(svr.tbcfl)
         self._alg.ocfl = <double*>self._get_table_bodyaddr(svr.tbocfl)
+        if svr.local_cfl > 0:
+            self._alg.ldt = <double*>self._get_table_bodyaddr(svr.tbldt)
+        else:
+            self._alg.ldt = NULL
 
     def locate_point(self, crd):
         # FIXME: Blindly taking an ndarray object is dangerous.  Use a local C
@@ -184,10 +239,12 @@ cdef class GasAlgorithm(Mesh):
                 &icl, &ifl, &jcl, &jfl)
         return icl, ifl, jcl, jfl
 
-    def process_physics(self, gasconst, v, w, wm, rho, p, T, ke, a, M):
+    def process_physics(self, gasconst, v, w, wm, rho, p, T, ke, a, M,
+                        flags=-1):
         # FIXME: Refactor this block of tedious and error-prone array address
         # manipulations.
         cdef double _gasconst = gasconst
+        cdef int _flags = flags
         cdef cnp.ndarray[double, ndim=2, mode="c"] _v = v
         assert self._msd.ncell + self._msd.ngstcell == _v.shape[0]
         cdef cnp.ndarray[double, ndim=2, mode="c"] _w = w
@@ -209,24 +266,48 @@ cdef class GasAlgorithm(Mesh):
         if self._msd.ndim == 3:
             assert 3 == _v.shape[1]
             assert 3 == _w.shape[1]
-            sc_gas_process_physics_3d(
-                self._msd, self._alg, _gasconst, &_v[0,0], &_w[0,0], &_wm[0],
-                &_rho[0], &_p[0], &_T[0], &_ke[0], &_a[0], &_M[0])
+            if self.float32:
+                sc_gas_process_physics_3d_float32(
+                    self._msd, self._alg, _gasconst, _flags,
+                    &_v[0,0], &_w[0,0], &_wm[0],
+                    &_rho[0], &_p[0], &_T[0], &_ke[0], &_a[0], &_M[0])
+            else:
+                sc_gas_process_physics_3d(
+                    self._msd, self._alg, _gasconst, _flags,
+                    &_v[0,0], &_w[0,0], &_wm[0],
+                    &_rho[0], &_p[0], &_T[0], &_ke[0], &_a[0], &_M[0])
         else:
             assert 2 == _v.shape[1]
             assert 2 == _w.shape[1]
-            sc_gas_process_physics_2d(
-                self._msd, self._alg, _gasconst, &_v[0,0], &_w[0,0], &_wm[0],
-                &_rho[0], &_p[0], &_T[0], &_ke[0], &_a[0], &_M[0])
+            if self.float32:
+                sc_gas_process_physics_2d_float32(
+                    self._msd, self._alg, _gasconst, _flags,
+                    &_v[0,0], &_w[0,0], &_wm[0],
+                    &_rho[0], &_p[0], &_T[0], &_ke[0], &_a[0], &_M[0])
+            else:
+                sc_gas_process_physics_2d(
+                    self._msd, self._alg, _gasconst, _flags,
+                    &_v[0,0], &_w[0,0], &_wm[0],
+                    &_rho[0], &_p[0], &_T[0], &_ke[0], &_a[0], &_M[0])
 
     def process_schlieren_rhog(self, sch):
         # FIXME: Refactor this error-prone array address manipulation.
         cdef cnp.ndarray[double, ndim=1, mode="c"] _sch = sch
         assert self._msd.ncell + self._msd.ngstcell == _sch.shape[0]
         if self._msd.ndim == 3:
-            sc_gas_process_schlieren_rhog_3d(self._msd, self._alg, &_sch[0])
+            if self.float32:
+                sc_gas_process_schlieren_rhog_3d_float32(
+                    self._msd, self._alg, &_sch[0])
+            else:
+                sc_gas_process_schlieren_rhog_3d(
+                    self._msd, self._alg, &_sch[0])
         else:
-            sc_gas_process_schlieren_rhog_2d(self._msd, self._alg, &_sch[0])
+            if self.float32:
+                sc_gas_process_schlieren_rhog_2d_float32(
+                    self._msd, self._alg, &_sch[0])
+            else:
+                sc_gas_process_schlieren_rhog_2d(
+                    self._msd, self._alg, &_sch[0])
 
     def process_schlieren_sch(self, schk, schk0, schk1, sch):
         # FIXME: Refactor this error-prone array address manipulation.
@@ -260,28 +341,56 @@ cdef class GasAlgorithm(Mesh):
         self._alg.time_increment = time_increment
 
     def calc_cfl(self):
-        if self._msd.ndim == 3:
-            sc_gas_calc_cfl_3d(self._msd, self._alg)
-        else:
-            sc_gas_calc_cfl_2d(self._msd, self._alg)
+        with nogil:
+            if self._msd.ndim == 3:
+                if self.float32:
+                    sc_gas_calc_cfl_3d_float32(self._msd, self._alg)
+                else:
+                    sc_gas_calc_cfl_3d(self._msd, self._alg)
+            else:
+                if self.float32:
+                    sc_gas_calc_cfl_2d_float32(self._msd, self._alg)
+                else:
+                    sc_gas_calc_cfl_2d(self._msd, self._alg)
 
     def calc_solt(self):
-        if self._msd.ndim == 3:
-            sc_gas_calc_solt_3d(self._msd, self._alg)
-        else:
-            sc_gas_calc_solt_2d(self._msd, self._alg)
+        with nogil:
+            if self._msd.ndim == 3:
+                if self.float32:
+                    sc_gas_calc_solt_3d_float32(self._msd, self._alg)
+                else:
+                    sc_gas_calc_solt_3d(self._msd, self._alg)
+            else:
+                if self.float32:
+                    sc_gas_calc_solt_2d_float32(self._msd, self._alg)
+                else:
+                    sc_gas_calc_solt_2d(self._msd, self._alg)
 
     def calc_soln(self):
-        if self._msd.ndim == 3:
-            sc_gas_calc_soln_3d(self._msd, self._alg)
-        else:
-            sc_gas_calc_soln_2d(self._msd, self._alg)
+        with nogil:
+            if self._msd.ndim == 3:
+                if self.float32:
+                    sc_gas_calc_soln_3d_float32(self._msd, self._alg)
+                else:
+                    sc_gas_calc_soln_3d(self._msd, self._alg)
+            else:
+                if self.float32:
+                    sc_gas_calc_soln_2d_float32(self._msd, self._alg)
+                else:
+                    sc_gas_calc_soln_2d(self._msd, self._alg)
 
     def calc_dsoln(self):
-        if self._msd.ndim == 3:
-            sc_gas_calc_dsoln_3d(self._msd, self._alg)
-        else:
-            sc_gas_calc_dsoln_2d(self._msd, self._alg)
+        with nogil:
+            if self._msd.ndim == 3:
+                if self.float32:
+                    sc_gas_calc_dsoln_3d_float32(self._msd, self._alg)
+                else:
+                    sc_gas_calc_dsoln_3d(self._msd, self._alg)
+            else:
+                if self.float32:
+                    sc_gas_calc_dsoln_2d_float32(self._msd, self._alg)
+                else:
+                    sc_gas_calc_dsoln_2d(self._msd, self._alg)
 
     def ghostgeom_mirror(self, Bound bcd):
         if self._msd.ndim == 3:
@@ -291,38 +400,86 @@ cdef class GasAlgorithm(Mesh):
 
     def bound_nonrefl_soln(self, Bound bcd):
         if self._msd.ndim == 3:
-            sc_gas_bound_nonrefl_soln_3d(self._msd, bcd._bcd, self._alg)
+            if self.float32:
+                sc_gas_bound_nonrefl_soln_3d_float32(
+                    self._msd, bcd._bcd, self._alg)
+            else:
+                sc_gas_bound_nonrefl_soln_3d(self._msd, bcd._bcd, self._alg)
         else:
-            sc_gas_bound_nonrefl_soln_2d(self._msd, bcd._bcd, self._alg)
+            if self.float32:
+                sc_gas_bound_nonrefl_soln_2d_float32(
+                    self._msd, bcd._bcd, self._alg)
+            else:
+                sc_gas_bound_nonrefl_soln_2d(self._msd, bcd._bcd, self._alg)
 
     def bound_nonrefl_dsoln(self, Bound bcd):
         if self._msd.ndim == 3:
-            sc_gas_bound_nonrefl_dsoln_3d(self._msd, bcd._bcd, self._alg)
+            if self.float32:
+                sc_gas_bound_nonrefl_dsoln_3d_float32(
+                    self._msd, bcd._bcd, self._alg)
+            else:
+                sc_gas_bound_nonrefl_dsoln_3d(self._msd, bcd._bcd, self._alg)
         else:
-            sc_gas_bound_nonrefl_dsoln_2d(self._msd, bcd._bcd, self._alg)
+            if self.float32:
+                sc_gas_bound_nonrefl_dsoln_2d_float32(
+                    self._msd, bcd._bcd, self._alg)
+            else:
+                sc_gas_bound_nonrefl_dsoln_2d(self._msd, bcd._bcd, self._alg)
 
     def bound_wall_soln(self, Bound bcd):
         if self._msd.ndim == 3:
-            sc_gas_bound_wall_soln_3d(self._msd, bcd._bcd, self._alg)
+            if self.float32:
+                sc_gas_bound_wall_soln_3d_float32(
+                    self._msd, bcd._bcd, self._alg)
+            else:
+                sc_gas_bound_wall_soln_3d(self._msd, bcd._bcd, self._alg)
         else:
-            sc_gas_bound_wall_soln_2d(self._msd, bcd._bcd, self._alg)
+            if self.float32:
+                sc_gas_bound_wall_soln_2d_float32(
+                    self._msd, bcd._bcd, self._alg)
+            else:
+                sc_gas_bound_wall_soln_2d(self._msd, bcd._bcd, self._alg)
 
     def bound_wall_dsoln(self, Bound bcd):
         if self._msd.ndim == 3:
-            sc_gas_bound_wall_dsoln_3d(self._msd, bcd._bcd, self._alg)
+            if self.float32:
+                sc_gas_bound_wall_dsoln_3d_float32(
+                    self._msd, bcd._bcd, self._alg)
+            else:
+                sc_gas_bound_wall_dsoln_3d(self._msd, bcd._bcd, self._alg)
         else:
-            sc_gas_bound_wall_dsoln_2d(self._msd, bcd._bcd, self._alg)
+            if self.float32:
+                sc_gas_bound_wall_dsoln_2d_float32(
+                    self._msd, bcd._bcd, self._alg)
+            else:
+                sc_gas_bound_wall_dsoln_2d(self._msd, bcd._bcd, self._alg)
 
     def bound_inlet_soln(self, Bound bcd):
         if self._msd.ndim == 3:
-            sc_gas_bound_inlet_soln_3d(self._msd, bcd._bcd, self._alg)
+            if self.float32:
+                sc_gas_bound_inlet_soln_3d_float32(
+                    self._msd, bcd._bcd, self._alg)
+            else:
+                sc_gas_bound_inlet_soln_3d(self._msd, bcd._bcd, self._alg)
         else:
-            sc_gas_bound_inlet_soln_2d(self._msd, bcd._bcd, self._alg)
+            if self.float32:
+                sc_gas_bound_inlet_soln_2d_float32(
+                    self._msd, bcd._bcd, self._alg)
+            else:
+                sc_gas_bound_inlet_soln_2d(self._msd, bcd._bcd, self._alg)
 
     def bound_inlet_dsoln(self, Bound bcd):
         if self._msd.ndim == 3:
-            sc_gas_bound_inlet_dsoln_3d(self._msd, bcd._bcd, self._alg)
+            if self.float32:
+                sc_gas_bound_inlet_dsoln_3d_float32(
+                    self._msd, bcd._bcd, self._alg)
+            else:
+                sc_gas_bound_inlet_dsoln_3d(self._msd, bcd._bcd, self._alg)
         else:
-            sc_gas_bound_inlet_dsoln_2d(self._msd, bcd._bcd, self._alg)
+            if self.float32:
+                sc_gas_bound_inlet_dsoln_2d_float32(
+                    self._msd, bcd._bcd, self._alg)
+            else:
+                sc_gas_bound_inlet_dsoln_2d(self._msd, bcd._bcd, self._alg)
 
 # vim: set fenc=utf8 ft=pyrex ff=unix ai et sw=4 ts=4 tw=79:
@@ -43,6 +43,7 @@ import numpy as np
 import solvcon as sc
 
 from solvcon.io import vtkxml
+from solvcon.io import series
 
 
 class MeshInfoHook(sc.MeshHook):
@@ -198,6 +199,7 @@ class CflAnchor(sc.MeshAnchor):
         #: Steps to run (:py:class:`int`).
         self.rsteps = int(rsteps)
         super(CflAnchor, self).__init__(svr, **kw)
+        svr.marchret_ops['cfl'] = ['min', 'max', 'sum', 'sum']
 
     def postmarch(self):
         svr = self.svr
@@ -274,12 +276,13 @@ class CflHook(sc.MeshHook):
         info = self.info
         istep = self.cse.execution.step_current
         mr = self.cse.execution.marchret
-        isp = self.cse.is_parallel
+        # a list when every worker reports individually.
+        isp = isinstance(mr, list)
         rsteps = self.rsteps
         psteps = self.psteps
         # collect CFL.
         if istep > 0 and istep%rsteps == 0:
-            nCFL = max([m['cfl'][0] for m in mr]) if isp else mr['cfl'][0]
+            nCFL = min([m['cfl'][0] for m in mr]) if isp else mr['cfl'][0]
             xCFL = max([m['cfl'][1] for m in mr]) if isp else mr['cfl'][1]
             nadj = sum([m['cfl'][2] for m in mr]) if isp else mr['cfl'][2]
             aadj = sum([m['cfl'][3] for m in mr]) if isp else mr['cfl'][3]
@@ -311,6 +314,107 @@ class CflHook(sc.MeshHook):
 ################################################################################
 
 
+################################################################################
+# Begin residual monitor.
+class ResidualAnchor(sc.MeshAnchor):
+    """
+    Calculating the residual, the L2 norm of the time rate of density over the
+    cells, in the last sub-step with the time increment of each cell.  Use
+    :py:attr:`MeshSolver.marchret <solvcon.solver.MeshSolver.marchret>` to
+    return the sum of squares and the number of cells, which are summed over
+    the workers for the global norm.  Overrides
+    :py:meth:`~solvcon.anchor.MeshAnchor.postmarch` method.
+
+    Pair with :py:class:`ResidualHook`.
+    """
+
+    def __init__(self, svr, rsteps=None, **kw):
+        """
+        >>> from solvcon.testing import create_trivial_2d_blk
+        >>> from solvcon.solver import MeshSolver
+        >>> svr = MeshSolver(create_trivial_2d_blk())
+        >>> ank = ResidualAnchor(svr, 1)
+        >>> ank.rsteps
+        1
+        >>> svr.marchret_ops['residual']
+        ['sum', 'sum']
+        """
+        #: Steps to run (:py:class:`int`).
+        self.rsteps = int(rsteps)
+        super(ResidualAnchor, self).__init__(svr, **kw)
+        svr.marchret_ops['residual'] = ['sum', 'sum']
+
+    def postmarch(self):
+        svr = self.svr
+        istep = svr.step_global
+        rsteps = self.rsteps
+        if istep > 0 and istep%rsteps == 0:
+            ngstcell = svr.ngstcell
+            dt = (svr.ldt[ngstcell:] if svr.local_cfl > 0
+                  else svr.time_increment)
+            rate = (svr.soln[ngstcell:,0] - svr.sol[ngstcell:,0]) / dt
+            svr.marchret['residual'] = [(rate**2).sum(), rate.size]
+
+
+class ResidualHook(sc.MeshHook):
+    """
+    Reports the residual and stops the case when it drops below
+    :py:attr:`tolerance` times the first one.  Overrides
+    :py:meth:`~solvcon.hook.MeshHook.postmarch` method.
+
+    Pair with :py:class:`ResidualAnchor`.
+    """
+
+    def __init__(self, cse, name='residual', tolerance=None, rsteps=None,
+                 **kw):
+        #: Name of the residual tool.
+        self.name = name
+        #: Tolerance relative to the first residual; ``None`` does not stop.
+        self.tolerance = tolerance
+        #: The first residual.
+        self.initial = None
+        #: The latest residual.
+        self.residual = None
+        super(ResidualHook, self).__init__(cse, **kw)
+        #: Steps to run.
+        self.rsteps = rsteps if rsteps else self.psteps
+        self.ankkw = kw
+
+    def drop_anchor(self, svr):
+        ankkw = self.ankkw.copy()
+        ankkw['name'] = self.name
+        ankkw['rsteps'] = self.rsteps
+        self._deliver_anchor(svr, ResidualAnchor, ankkw)
+
+    def postmarch(self):
+        istep = self.cse.execution.step_current
+        mr = self.cse.execution.marchret
+        # a list when every worker reports individually.
+        isp = isinstance(mr, list)
+        if istep > 0 and istep%self.rsteps == 0:
+            # the global L2 norm from the sums of squares and the numbers of
+            # cells of the blocks.
+            if isp:
+                sumsq = sum(m['residual'][0] for m in mr)
+                ncell = sum(m['residual'][1] for m in mr)
+            else:
+                sumsq, ncell = mr['residual'][:2]
+            residual = np.sqrt(sumsq/ncell)
+            self.residual = residual
+            if self.initial is None:
+                self.initial = residual
+            if istep%self.psteps == 0:
+                self.info("Residual = %.3e (%.3e relative)\n" % (
+                    residual, residual/self.initial if self.initial else 0.0))
+            if (self.tolerance is not None and self.initial
+                    and residual <= self.tolerance*self.initial):
+                self.info("Residual %.3e converged after step: %d\n" % (
+                    residual, istep))
+                self.cse.execution.stop = True
+# End residual monitor.
+################################################################################
+
+
 ################################################################################
 # Begin solution output.
 class MarchSaveAnchor(sc.MeshAnchor):
@@ -337,12 +441,18 @@ class MarchSaveAnchor(sc.MeshAnchor):
         #: The template string for the VTK file.
         self.vtkfn_tmpl = vtkfn_tmpl
         super(MarchSaveAnchor, self).__init__(svr, **kw)
+        svr.demand([key for key in self.anames if self.anames[key]], psteps)
 
-    def _write(self, istep):
+    def _collect(self):
+        """
+        Collect the arrays to be saved into scalars and vectors.
+
+        :return: Dictionaries of scalar and vector arrays.
+        :rtype: tuple
+        """
         ngstcell = self.svr.ngstcell
         sarrs = dict()
         varrs = dict()
-        # collect data.
         for key in self.anames:
             # get the array.
             if self.anames[key]:
@@ -357,6 +467,10 @@ class MarchSaveAnchor(sc.MeshAnchor):
             else:
                 for it in range(arr.shape[1]):
                     sarrs['%s[%d]' % (key, it)] = arr[:,it]
+        return sarrs, varrs
+
+    def _write(self, istep):
+        sarrs, varrs = self._collect()
         # write.
         wtr = vtkxml.VtkXmlUstGridWriter(self.svr.blk, fpdtype=self.fpdtype,
             compressor=self.compressor, scalars=sarrs, vectors=varrs)
@@ -379,6 +493,72 @@ class MarchSaveAnchor(sc.MeshAnchor):
             self._write(istep)
 
 
+class MarchSeriesAnchor(sc.MeshAnchor):
+    """
+    Save solution data of a solver into a single time-series file (see
+    :py:mod:`solvcon.io.series`).  The mesh is written once on
+    :py:meth:`preloop`, and again when the domain is repartitioned, and the
+    arrays are appended every *psteps*.
+    """
+
+    def __init__(self, svr, anames=None, compressor=None, fpdtype=None,
+                 psteps=None, seriesfn_tmpl=None, **kw):
+        assert None is not compressor
+        assert None is not fpdtype
+        assert None is not psteps
+        assert None is not seriesfn_tmpl
+        #: The arrays in :py:class:`GasSolver <.solver.GasSolver>` or
+        #: :py:attr:`MeshSolver.der <solvcon.solver.MeshSolver.der>` to be
+        #: saved.
+        self.anames = anames if anames else dict()
+        #: Compressor for binary data.  Can be either ``'gz'`` or ``''``.
+        self.compressor = compressor
+        #: String for floating point data type (NumPy convention).
+        self.fpdtype = fpdtype
+        #: The interval in step to save data.
+        self.psteps = psteps
+        #: The template string for the series file; formatted with the serial
+        #: number of the solver in parallel runs.
+        self.seriesfn_tmpl = seriesfn_tmpl
+        #: The :py:class:`solvcon.io.series.SeriesWriter` object.
+        self.writer = None
+        super(MarchSeriesAnchor, self).__init__(svr, **kw)
+        svr.demand([key for key in self.anames if self.anames[key]], psteps)
+
+    _collect = MarchSaveAnchor._collect
+
+    def _write(self, istep):
+        sarrs, varrs = self._collect()
+        self.writer.append(istep, self.svr.time, scalars=sarrs, vectors=varrs)
+
+    def preloop(self):
+        svrn = self.svr.svrn
+        seriesfn = self.seriesfn_tmpl
+        if svrn is not None:
+            seriesfn = seriesfn % svrn
+        self.writer = series.SeriesWriter(self.svr.blk, seriesfn,
+            fpdtype=self.fpdtype, compressor=self.compressor)
+        self._write(0)
+
+    def postmarch(self):
+        psteps = self.psteps
+        istep = self.svr.step_global
+        if istep%psteps == 0:
+            self._write(istep)
+
+    def postloop(self):
+        psteps = self.psteps
+        istep = self.svr.step_global
+        if istep%psteps != 0:
+            self._write(istep)
+        self.writer.close()
+
+    def carry(self, old):
+        # keep appending to the same file with the new sub-block.
+        self.writer = old.writer
+        self.writer.remesh(self.svr.blk)
+
+
 class PMarchSave(sc.MeshHook):
     """
     Save the geometry and variables in a case when time marching in parallel
@@ -475,6 +655,72 @@ class PMarchSave(sc.MeshHook):
         istep = self.cse.execution.step_current
         if istep%psteps != 0:
             self._write(istep)
+
+
+class PMarchSeries(sc.MeshHook):
+    """
+    Save the geometry and variables in a case into one time-series file per
+    block, instead of one VTK XML file per block per step as
+    :py:class:`PMarchSave` does.  An XDMF descriptor of all blocks and steps
+    is generated after the time-marching loop.
+    """
+
+    def __init__(self, cse, anames=None, compressor='gz', fpdtype=None,
+                 altdir='', altsym='', seriesfn_tmpl=None, **kw):
+        #: The arrays in :py:class:`GasSolver <.solver.GasSolver>` or
+        #: :py:attr:`MeshSolver.der <solvcon.solver.MeshSolver.der>` to be
+        #: saved.  Format is (name, inder, ndim), (name, inder, ndim) ...
+        self.anames = anames if anames else list()
+        #: Compressor for binary data.  Can be either ``'gz'`` or ``''``.
+        self.compressor = compressor
+        #: String for floating point data type (NumPy convention).
+        self.fpdtype = fpdtype if fpdtype else str(cse.execution.fpdtype)
+        #: The alternate directory to save the series files.
+        self.altdir = altdir
+        #: The symbolic link in basedir pointing to the alternate directory to
+        #: save the series files.
+        self.altsym = altsym
+        super(PMarchSeries, self).__init__(cse, **kw)
+        basefn = cse.io.basefn
+        if self.altdir:
+            vdir = self.altdir
+            if self.altsym:
+                altsym = os.path.join(cse.io.basedir, self.altsym)
+                if not os.path.exists(altsym):
+                    os.symlink(vdir, altsym)
+        else:
+            vdir = cse.io.basedir
+        if not os.path.exists(vdir):
+            os.makedirs(vdir)
+        if None is seriesfn_tmpl:
+            seriesfn_tmpl = basefn
+            npart = cse.execution.npart
+            if npart:
+                seriesfn_tmpl += '.p%%0%dd'%int(math.ceil(math.log10(npart))+1)
+            seriesfn_tmpl += '.scts'
+        #: The template string for the series files.
+        self.seriesfn_tmpl = os.path.join(vdir, seriesfn_tmpl)
+        #: The XDMF descriptor file.
+        self.xdmffn = os.path.join(vdir, basefn + '.xmf')
+
+    def drop_anchor(self, svr):
+        anames = dict([(ent[0], ent[1]) for ent in self.anames])
+        ankkw = dict(anames=anames, compressor=self.compressor,
+            fpdtype=self.fpdtype, psteps=self.psteps,
+            seriesfn_tmpl=self.seriesfn_tmpl)
+        self._deliver_anchor(svr, MarchSeriesAnchor, ankkw)
+
+    def postloop(self):
+        npart = self.cse.execution.npart
+        if npart:
+            # make sure all the workers closed their files.
+            self.cse.solver.dealer.barrier()
+            fns = [self.seriesfn_tmpl % iblk for iblk in range(npart)]
+        else:
+            fns = [self.seriesfn_tmpl]
+        self.info('Writing \n  %s\n... ' % self.xdmffn)
+        series.write_xdmf(self.xdmffn, fns)
+        self.info('done.\n')
 # End solution output.
 ################################################################################
 
@@ -37,6 +37,16 @@ __all__ = [
 ]
 
 
+def _broadcast(*args):
+    """
+    Broadcast the arguments against one another as :py:class:`numpy.ndarray`
+    of float64, so that the in-place arithmetic of the calculators works for
+    any combination of scalars and arrays.
+    """
+    return np.broadcast_arrays(*[np.asarray(arg, dtype='float64')
+                                 for arg in args])
+
+
 class ObliqueShockRelation(object):
     r"""
     Calculators of oblique shock relations.
@@ -68,13 +78,23 @@ class ObliqueShockRelation(object):
     >>> np.around(ob.calc_density_ratio(mach1=3, beta=37.8/180*np.pi),
     ...           10).tolist()
     2.7793244902
+
+    The Mach numbers, the angles, and :py:attr:`gamma` can all be
+    :py:class:`numpy.ndarray`.  They are broadcast against one another, so that
+    a sweep of configurations is calculated at once:
+
+    >>> ob.gamma = np.array([[1.2], [1.4]])
+    >>> np.around(ob.calc_density_ratio(mach1=np.array([2, 3]),
+    ...                                 beta=37.8/180*np.pi), 10).tolist()
+    [[1.436961506, 2.7793244902], [1.3864751502, 2.4204302545]]
     """
 
     def __init__(self, gamma):
         """
         :param gamma: Ratio of specific heat :math:`\gamma`, dimensionless.
         """
-        #: Ratio of specific heat :math:`\gamma`, dimensionless.
+        #: Ratio of specific heat :math:`\gamma`, dimensionless.  It can be a
+        #: :py:class:`numpy.ndarray` for sweeping configurations.
         self.gamma = gamma
         super(ObliqueShockRelation, self).__init__()
 
@@ -110,7 +130,7 @@ class ObliqueShockRelation(object):
                      upstream flow, in radian.
         """
         # Pull data from self.
-        gamma = self.gamma
+        gamma, mach1, beta = _broadcast(self.gamma, mach1, beta)
         # Calculate in the way to minimize buffers if arrays are input.
         mach_n1_sq = mach1 * np.sin(beta)
         mach_n1_sq **= 2
@@ -147,7 +167,7 @@ class ObliqueShockRelation(object):
                      upstream flow, in radian.
         """
         # Pull data from self.
-        gamma = self.gamma
+        gamma, mach1, beta = _broadcast(self.gamma, mach1, beta)
         # Calculate in the way to minimize buffers if arrays are input.
         result = mach1 * np.sin(beta)
         result **= 2
@@ -280,7 +300,7 @@ class ObliqueShockRelation(object):
                         wave, dimensionless.
         """
         # Pull data from self.
-        gamma = self.gamma
+        gamma, mach_n1 = _broadcast(self.gamma, mach_n1)
         # Calculate.
         mach_n1_sq = mach_n1*mach_n1
         result = (gamma - 1) * mach_n1_sq + 2
@@ -349,7 +369,7 @@ class ObliqueShockRelation(object):
                      upstream flow, in radian.
         """
         # Pull data from self.
-        gamma = self.gamma
+        gamma, mach1, beta = _broadcast(self.gamma, mach1, beta)
         # Calculate.
         mach1_sq = mach1 * mach1
         result = np.sin(beta)
@@ -361,11 +381,18 @@ class ObliqueShockRelation(object):
         result *= 2
         return result
 
-    def calc_shock_angle(self, mach1, theta, delta=1):
+    def calc_shock_angle(self, mach1, theta, delta=1, maxiter=60):
         r"""
         Calculate the downstream shock angle :math:`\beta` deflected from the
-        upstream flow by using :py:meth:`calc_shock_tangent`, in radian.
-        
+        upstream flow, in radian.  The :math:`\theta`\ -:math:`\beta`\
+        -:math:`M` relation (see :py:meth:`calc_flow_tangent`) is solved by
+        Newton iteration for all the elements of the input arrays at once.
+        The initial guess is obtained from :py:meth:`calc_shock_tangent`, and
+        the iteration is safeguarded with bisection in the bracket
+        :math:`[\sin^{-1}(1/M_1), \beta_{\max}]` for weak shock or
+        :math:`[\beta_{\max}, \pi/2]` for strong shock, where
+        :math:`\beta_{\max}` is from :py:meth:`calc_max_shock_angle`.
+
         This method accepts scalar:
 
         >>> ob = ObliqueShockRelation(gamma=1.4)
@@ -381,6 +408,18 @@ class ObliqueShockRelation(object):
         ...                         10).tolist()
         [48.2584798722, 48.2584798722]
 
+        The iteration keeps the accuracy for vanishing deflection, where the
+        weak shock degenerates to the Mach wave, and gives NaN for the
+        detached shock, where :math:`\theta` exceeds
+        :py:meth:`calc_max_flow_angle`:
+
+        >>> angle = np.array([0, 1.e-8, 45./180*np.pi])
+        >>> beta = ob.calc_shock_angle(mach1=4, theta=angle)
+        >>> np.around(beta[:2] - np.arcsin(1./4), 8).tolist()
+        [0.0, 1e-08]
+        >>> np.isnan(beta[2])
+        True
+
         See Example 4.6 in [Anderson03]_ for the analysis.
 
         :param mach1: Upstream Mach number :math:`M_1`, dimensionless.
@@ -390,8 +429,116 @@ class ObliqueShockRelation(object):
                       0`, the function gives the solution of strong shock,
                       while for :math:`\delta = 1`, it gives the solution of
                       weak shock.  The default value is 1.
+        :keyword maxiter: Maximum number of iterations.  The default value is
+                          60, with which the bisection alone reaches the
+                          machine precision.
+        """
+        # Pull data from self.
+        gamma, mach1, theta, delta = _broadcast(
+            self.gamma, mach1, theta, delta)
+        # Bracket the solution.  NaN is left for subsonic upstream.
+        weak = delta != 0
+        with np.errstate(invalid='ignore'):
+            beta_max = self.calc_max_shock_angle(mach1)
+            lower = np.where(weak, np.arcsin(1/mach1), beta_max)
+        upper = np.where(weak, beta_max, np.pi/2)
+        tant = np.tan(theta)
+        # No attached shock.
+        detached = ~(tant <= self.calc_flow_tangent(mach1, beta_max))
+        detached |= theta < 0
+        # Initial guess from the analytical solution of the cubic equation,
+        # which loses accuracy (or fails) for small deflection.
+        with np.errstate(all='ignore'):
+            beta = np.arctan(self.calc_shock_tangent(mach1, theta, delta))
+        outside = ~((beta > lower) & (beta < upper))
+        beta = np.where(outside, (lower + upper) / 2, beta)
+        # Without deflection, the solutions are the Mach wave and the normal
+        # shock at the ends of the brackets.
+        settled = theta == 0
+        beta = np.where(settled, np.where(weak, lower, upper), beta)
+        settled |= detached
+        # Safeguarded Newton iteration.
+        mach1_sq = mach1 * mach1
+        for it in range(maxiter):
+            sinb = np.sin(beta)
+            numer = mach1_sq * sinb * sinb - 1
+            denom = mach1_sq * (gamma + np.cos(beta*2)) + 2
+            resid = 2 * numer / (denom * np.tan(beta)) - tant
+            slope = (denom + 2 * numer) * mach1_sq * np.sin(beta*2)
+            slope /= denom * denom * np.tan(beta)
+            slope -= numer / (sinb * sinb * denom)
+            slope *= 2
+            # The flow angle increases with the shock angle on the weak branch
+            # and decreases on the strong branch.
+            below = (resid < 0) == weak
+            lower = np.where(below, beta, lower)
+            upper = np.where(below, upper, beta)
+            with np.errstate(all='ignore'):
+                step = beta - resid / slope
+            outside = ~((step >= lower) & (step <= upper))
+            step = np.where(outside, (lower + upper) / 2, step)
+            step = np.where(settled, beta, step)
+            # Near the maximum deflection the flow angle is insensitive to
+            # the shock angle, and the residual decides.
+            converged = np.abs(step - beta) <= 1.e-14
+            converged |= np.abs(resid) <= 1.e-15 * (1 + tant)
+            converged |= settled
+            beta = step
+            if converged.all():
+                break
+        beta = np.where(detached, np.nan, beta)
+        return beta[()]
+
+    def calc_max_shock_angle(self, mach1):
+        r"""
+        Calculate the shock angle :math:`\beta_{\max}` at which the downstream
+        flow angle reaches the maximum, in radian:
+
+        .. math::
+
+          \sin^2\beta_{\max} = \frac{1}{\gamma M_1^2}\left[
+            \frac{\gamma+1}{4}M_1^2 - 1
+          + \sqrt{(\gamma+1)\left(1 + \frac{\gamma-1}{2}M_1^2
+                                    + \frac{\gamma+1}{16}M_1^4\right)}
+          \right]
+
+        It separates the weak and the strong shock solutions.
+
+        >>> ob = ObliqueShockRelation(gamma=1.4)
+        >>> angle = ob.calc_max_shock_angle(mach1=np.array([2, 4]))
+        >>> np.around(angle/np.pi*180, 10).tolist()
+        [64.6689798306, 66.0589698682]
+
+        :param mach1: Upstream Mach number :math:`M_1`, dimensionless.
+        """
+        # Pull data from self.
+        gamma, mach1 = _broadcast(self.gamma, mach1)
+        # Calculate.
+        mach1_sq = mach1 * mach1
+        result = (gamma+1)/16*mach1_sq
+        result += (gamma-1)/2
+        result *= mach1_sq
+        result += 1
+        result *= gamma + 1
+        result = np.sqrt(result)
+        result += (gamma+1)/4*mach1_sq - 1
+        result /= gamma * mach1_sq
+        return np.arcsin(np.sqrt(result))
+
+    def calc_max_flow_angle(self, mach1):
+        r"""
+        Calculate the maximum downstream flow angle :math:`\theta_{\max}` for
+        which an attached oblique shock exists, in radian, by using
+        :py:meth:`calc_max_shock_angle` and :py:meth:`calc_flow_angle`.
+
+        >>> ob = ObliqueShockRelation(gamma=1.4)
+        >>> angle = ob.calc_max_flow_angle(mach1=np.array([2, 4]))
+        >>> np.around(angle/np.pi*180, 10).tolist()
+        [22.9735317609, 38.7738608454]
+
+        :param mach1: Upstream Mach number :math:`M_1`, dimensionless.
         """
-        return np.arctan(self.calc_shock_tangent(mach1, theta, delta))
+        return self.calc_flow_angle(mach1, self.calc_max_shock_angle(mach1))
 
     def calc_shock_tangent(self, mach1, theta, delta):
         r"""
@@ -435,7 +582,8 @@ class ObliqueShockRelation(object):
                       weak shock.
         """
         # Pull data from self.
-        gamma = self.gamma
+        gamma, mach1, theta, delta = _broadcast(
+            self.gamma, mach1, theta, delta)
         # Calculate.
         mach1_sq = mach1 * mach1
         lmbd, chi = self.calc_shock_tangent_aux(mach1, theta)
@@ -494,7 +642,7 @@ class ObliqueShockRelation(object):
                       upstream flow, in radian.
         """
         # Pull data from self.
-        gamma = self.gamma
+        gamma, mach1, theta = _broadcast(self.gamma, mach1, theta)
         # Calculate common values.
         mach1_sq = mach1 * mach1
         tant_sq = np.tan(theta)
@@ -34,6 +34,77 @@ import numpy as np
 import solvcon as sc
 
 
+# Flags of the derived quantities calculated by PhysicsAnchor.  Keep them in
+# sync with src/sc_gas_process_physics.c_body.
+DENSITY = 0x001
+VELOCITY = 0x002
+VORTICITY = 0x004
+KE = 0x008
+PRESSURE = 0x010
+TEMPERATURE = 0x020
+SOUNDSPEED = 0x040
+MACH = 0x080
+SCHLIEREN = 0x100
+ALL = 0x1ff
+
+#: Mapping from the keys in :py:attr:`MeshSolver.der
+#: <solvcon.solver.MeshSolver.der>` to the flags.
+DERIVED_FLAGS = {
+    'rho': DENSITY,
+    'v': VELOCITY,
+    'w': VORTICITY,
+    'wm': VORTICITY,
+    'ke': KE,
+    'p': PRESSURE,
+    'T': TEMPERATURE,
+    'a': SOUNDSPEED,
+    'M': MACH,
+    'sch': SCHLIEREN,
+}
+
+
+def flags_of(names):
+    """
+    Convert the keys of derived quantities to flags.  Keys not calculated by
+    :py:class:`PhysicsAnchor` are ignored.
+
+    >>> flags_of(['p', 'sch']) == PRESSURE | SCHLIEREN
+    True
+    >>> flags_of(['soln'])
+    0
+    """
+    flags = 0
+    for name in names:
+        flags |= DERIVED_FLAGS.get(name, 0)
+    return flags
+
+
+def closure(flags):
+    """
+    Add the prerequisites of the flagged quantities.
+
+    >>> closure(PRESSURE) == DENSITY | VELOCITY | KE | PRESSURE
+    True
+    >>> closure(SCHLIEREN) == SCHLIEREN
+    True
+    """
+    if flags & MACH:
+        flags |= KE | SOUNDSPEED
+    if flags & SOUNDSPEED:
+        flags |= PRESSURE
+    if flags & TEMPERATURE:
+        flags |= PRESSURE
+    if flags & PRESSURE:
+        flags |= KE
+    if flags & KE:
+        flags |= VELOCITY
+    if flags & VORTICITY:
+        flags |= VELOCITY
+    if flags & VELOCITY:
+        flags |= DENSITY
+    return flags
+
+
 class DensityInitAnchor(sc.MeshAnchor):
     """
     Initialize only density.
@@ -52,8 +123,12 @@ class DensityInitAnchor(sc.MeshAnchor):
 
 class PhysicsAnchor(sc.MeshAnchor):
     """
-    Calculates physical quantities for output.  Implements (i) provide() and
-    (ii) postfull() methods.
+    Calculates physical quantities for output.  Implements (i) provide(),
+    (ii) postfull(), and (iii) postloop() methods.
+
+    Only the quantities declared by :py:meth:`.solver.GasSolver.demand` are
+    calculated, at the steps they are due.  When nothing is declared,
+    everything is calculated every :py:attr:`rsteps` steps.
 
     FIXME: I should be more integrated with :py:class:`~.solver.GasSolver`.
 
@@ -69,17 +144,40 @@ class PhysicsAnchor(sc.MeshAnchor):
         self.schk = kw.pop('schk', 1.0)
         self.schk0 = kw.pop('schk0', 0.0)
         self.schk1 = kw.pop('schk1', 1.0)
+        #: The last step the quantities were calculated.
+        self.computed_step = None
         super(PhysicsAnchor, self).__init__(svr, **kw)
 
-    def _calculate_physics(self):
+    def _due(self, istep, final=False):
+        """
+        Get the flags of the quantities to be calculated at the step.
+        """
+        demands = getattr(self.svr, 'demands', None)
+        if not demands:
+            return ALL if final or istep%self.rsteps == 0 else 0
+        flags = 0
+        for dflags, interval in demands:
+            interval = interval if interval else self.rsteps
+            if final or istep%interval == 0:
+                flags |= dflags
+        return closure(flags)
+
+    def _calculate(self, flags):
+        if flags & ~SCHLIEREN:
+            self._calculate_physics(flags)
+        if flags & SCHLIEREN:
+            self._calculate_schlieren()
+        self.computed_step = self.svr.step_global
+
+    def _calculate_physics(self, flags=ALL):
         svr = self.svr
         der = svr.der
         svr.alg.process_physics(
             self.gasconst, der['v'], der['w'], der['wm'],
-            der['rho'], der['p'], der['T'], der['ke'], der['a'], der['M'])
+            der['rho'], der['p'], der['T'], der['ke'], der['a'], der['M'],
+            flags=flags)
 
     def _calculate_schlieren(self):
-        from ctypes import byref, c_double
         svr = self.svr
         sch = svr.der['sch']
         svr.alg.process_schlieren_rhog(sch)
@@ -99,15 +197,21 @@ class PhysicsAnchor(sc.MeshAnchor):
         der['a'] = np.zeros(nelm, dtype='float64')
         der['M'] = np.zeros(nelm, dtype='float64')
         der['sch'] = np.zeros(nelm, dtype='float64')
-        self._calculate_physics()
-        self._calculate_schlieren()
+        self._calculate(self._due(0))
 
     def postfull(self):
-        svr = self.svr
         istep = self.svr.step_global
-        rsteps = self.rsteps
-        if istep > 0 and istep%rsteps == 0:
-            self._calculate_physics()
-            self._calculate_schlieren()
+        if istep > 0:
+            flags = self._due(istep)
+            if flags:
+                self._calculate(flags)
+
+    def postloop(self):
+        # the final step may not be on any interval but is usually output.
+        istep = self.svr.step_global
+        if istep != self.computed_step:
+            flags = self._due(istep, final=True)
+            if flags:
+                self._calculate(flags)
 
 # vim: set ff=unix fenc=utf8 ft=python ai et sw=4 ts=4 tw=79:
@@ -57,6 +57,9 @@ class Probe(object):
         self.pcl = icl
 
     def __call__(self, svr, time):
+        # the point is not in the block.
+        if self.pcl < 0:
+            return
         ngstcell = svr.ngstcell
         vlist = [time]
         for spec in self.speclst:
@@ -90,6 +93,7 @@ class ProbeAnchor(sc.MeshAnchor):
             pkw = {'speclst': speclst, 'name': data[0]}
             self.points.append(Probe(*data[1:], **pkw))
         super(ProbeAnchor, self).__init__(svr, **kw)
+        svr.demand([spec for spec in speclst if isinstance(spec, str)])
 
     def preloop(self):
         for point in self.points: point.locate_cell(self.svr)
@@ -98,6 +102,11 @@ class ProbeAnchor(sc.MeshAnchor):
     def postfull(self):
         for point in self.points: point(self.svr, self.svr.time)
 
+    def carry(self, old):
+        # keep the recorded values and locate the points in the new block.
+        self.points = old.points
+        for point in self.points: point.locate_cell(self.svr)
+
 
 class ProbeHook(sc.MeshHook):
     """
@@ -118,20 +127,25 @@ class ProbeHook(sc.MeshHook):
     def _collect(self):
         cse = self.cse
         if cse.is_parallel:
-            dom = cse.solver.domainobj
             dealer = cse.solver.dealer
-            allpoints = list()
-            for iblk in range(dom.nblk):
-                dealer[iblk].cmd.pullank(self.name, 'points', with_worker=True)
-                allpoints.append(dealer[iblk].recv())
+            dealer.issue('pullank', self.name, 'points', with_worker=True)
+            allpoints = dealer.gather()
             npt = len(allpoints[0])
-            points = [None]*npt
-            for rpoints in allpoints:
-                ipt = 0
-                while ipt < npt:
-                    if points[ipt] == None and rpoints[ipt].pcl >=0:
-                        points[ipt] = rpoints[ipt]
-                    ipt += 1
+            points = list()
+            for ipt in range(npt):
+                # a point may move to another block when the domain is
+                # repartitioned; merge the values recorded by the blocks.
+                owners = [rpoints[ipt] for rpoints in allpoints
+                          if rpoints[ipt].vals]
+                if not owners:
+                    continue
+                vals = dict()
+                for owner in owners:
+                    for vlist in owner.vals:
+                        vals.setdefault(vlist[0], vlist)
+                point = owners[0]
+                point.vals = [vals[time] for time in sorted(vals)]
+                points.append(point)
         else:
             svr = self.cse.solver.solverobj
             points = [pt for pt in svr.runanchors[self.name].points
@@ -37,6 +37,8 @@ import numpy as np
 
 import solvcon as sc
 
+from . import physics
+
 # for readthedocs to work.
 sc.import_module_may_fail('._algorithm')
 
@@ -46,7 +48,7 @@ class GasSolver(sc.MeshSolver):
     Spatial loops for the gas-dynamics solver.
     """
 
-    _interface_init_ = ('cecnd', 'cevol', 'sfmrc')
+    _interface_init_ = ('cecnd', 'cevol')
     _solution_array_ = ('solt', 'sol', 'soln', 'dsol', 'dsoln')
 
     def __init__(self, blk, **kw):
@@ -67,6 +69,14 @@ class GasSolver(sc.MeshSolver):
         >>> # valid GasAlgorithm.
         >>> svr.alg is not None
         True
+        >>> # the solution arrays may be stored in float32.
+        >>> svr = SubSolver(blk, fpdtype='float32')
+        >>> svr.sol.dtype, svr.cecnd.dtype, svr.alg.float32
+        (dtype('float32'), dtype('float64'), True)
+        >>> SubSolver(blk, fpdtype='float16')
+        Traceback (most recent call last):
+            ...
+        ValueError: fpdtype float16 is not one of float32, float64
         """
         self.neq = blk.ndim + 2
         super(GasSolver, self).__init__(blk, **kw)
@@ -75,6 +85,13 @@ class GasSolver(sc.MeshSolver):
         ncell = blk.ncell
         ngstcell = blk.ngstcell
         fpdtype = 'float64'
+        #: Storage type of the solution arrays, ``'float64'`` or
+        #: ``'float32'``.  The metrics, the parameters, the CFL numbers and
+        #: the arithmetic of the kernels stay in float64.
+        self.fpdtype = str(kw.pop('fpdtype', fpdtype))
+        if self.fpdtype not in ('float32', 'float64'):
+            raise ValueError('fpdtype %s is not one of float32, float64' % (
+                self.fpdtype))
         # scheme parameters.
         self.alpha = int(kw.pop('alpha', 0))
         self.sigma0 = int(kw.pop('sigma0', 3.0))
@@ -83,6 +100,12 @@ class GasSolver(sc.MeshSolver):
         self.sftfac = float(kw.pop('sftfac', 1.0))  # dirty hack.
         self.taumin = float(kw.pop('taumin', 0.0))
         self.tauscale = float(kw.pop('tauscale', 1.0))
+        #: Target CFL number of local time stepping; disabled when not
+        #: positive.  A value around 0.5 is advised.
+        self.local_cfl = float(kw.pop('local_cfl', 0.0))
+        #: Flags and intervals of the derived quantities declared by
+        #: :py:meth:`demand`.
+        self.demands = list()
         # dual mesh.
         self.tbcecnd = sc.Table(ngstcell, ncell, blk.CLMFC+1, ndim,
                                 dtype=fpdtype)
@@ -97,27 +120,77 @@ class GasSolver(sc.MeshSolver):
         self.tbamvec = sc.Table(ngstcell, ncell, nvec, ndim, dtype=fpdtype)
         # solutions.
         neq = self.neq
-        self.tbsol = sc.Table(ngstcell, ncell, neq, dtype=fpdtype)
-        self.tbsoln = sc.Table(ngstcell, ncell, neq, dtype=fpdtype)
-        self.tbsolt = sc.Table(ngstcell, ncell, neq, dtype=fpdtype)
-        self.tbdsol = sc.Table(ngstcell, ncell, neq, ndim, dtype=fpdtype)
-        self.tbdsoln = sc.Table(ngstcell, ncell, neq, ndim, dtype=fpdtype)
-        self.tbstm = sc.Table(ngstcell, ncell, neq, dtype=fpdtype)
+        soldtype = self.fpdtype
+        self.tbsol = sc.Table(ngstcell, ncell, neq, dtype=soldtype)
+        self.tbsoln = sc.Table(ngstcell, ncell, neq, dtype=soldtype)
+        self.tbsolt = sc.Table(ngstcell, ncell, neq, dtype=soldtype)
+        self.tbdsol = sc.Table(ngstcell, ncell, neq, ndim, dtype=soldtype)
+        self.tbdsoln = sc.Table(ngstcell, ncell, neq, ndim, dtype=soldtype)
+        self.tbstm = sc.Table(ngstcell, ncell, neq, dtype=soldtype)
         self.tbcfl = sc.Table(ngstcell, ncell, dtype=fpdtype)
         self.tbocfl = sc.Table(ngstcell, ncell, dtype=fpdtype)
-        for name in (self._interface_init_ + ('amsca', 'amvec')
-                   + self._solution_array_ + ('stm', 'cfl', 'ocfl')):
+        self.tbldt = sc.Table(ngstcell, ncell, dtype=fpdtype)
+        self.tbldt.F.fill(0.0)
+        # pairs of the interior cells sharing a face, for limiting ldt.
+        fccls = blk.fccls
+        inner = fccls[:,1] >= 0
+        self._ldt_pairs = (fccls[inner,0], fccls[inner,1])
+        self._setup_alg()
+
+    @property
+    def _table_views(self):
+        """
+        The names of the arrays viewing the full tables of the same names
+        prefixed by ``tb``.
+        """
+        return (self._interface_init_ + ('sfmrc', 'amsca', 'amvec')
+                + self._solution_array_ + ('stm', 'cfl', 'ocfl', 'ldt'))
+
+    def _setup_alg(self):
+        for name in self._table_views:
             setattr(self, name, getattr(self, 'tb'+name).F)
         # algorithm object.
         alg = _algorithm.GasAlgorithm()
-        alg.setup_mesh(blk)
+        alg.setup_mesh(self.blk)
         alg.setup_algorithm(self)
         self.alg = alg
 
+    def __getstate__(self):
+        # the algorithm object and the views are made again on the tables
+        # when unpickled, e.g., in the workers of a parallel case.
+        state = self.__dict__.copy()
+        for name in ('alg',) + self._table_views:
+            del state[name]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._setup_alg()
+
     @property
     def gdlen(self):
         return self.grpda.shape[1]
 
+    def demand(self, names, interval=0):
+        """
+        Declare the derived quantities (keys in :py:attr:`der`) needed every
+        *interval* steps, so that :py:class:`~.physics.PhysicsAnchor` only
+        calculates what is used.  An *interval* of 0 means every time the
+        anchor runs.  Keys not calculated by the anchor are ignored.
+
+        >>> from solvcon.testing import create_trivial_2d_blk
+        >>> blk = create_trivial_2d_blk()
+        >>> blk.clgrp.fill(0)
+        >>> blk.grpnames.append('blank')
+        >>> svr = GasSolver(blk)
+        >>> svr.demand(['p', 'soln'], 10)
+        >>> svr.demands == [(physics.PRESSURE, 10)]
+        True
+        """
+        flags = physics.flags_of(names)
+        if flags:
+            self.demands.append((flags, interval))
+
     def init(self, **kw):
         # prepare ce metric data.
         self.cevol.fill(0.0)
@@ -156,6 +229,28 @@ class GasSolver(sc.MeshSolver):
         self.dsol[:,:,:] = self.dsoln[:,:,:]
         self._debug_check_array('sol', 'dsol')
 
+    @sc.MeshSolver.register_marcher
+    def calcldt(self, worker=None):
+        """
+        Scale the local time increment of each cell by the CFL number of the
+        previous sub-step for it to approach :py:attr:`local_cfl`.  The
+        increment grows at most twice per sub-step, starts from the global
+        one, and does not exceed those of the neighboring cells.
+        """
+        if self.local_cfl > 0:
+            ngstcell = self.ngstcell
+            ldt = self.ldt[ngstcell:]
+            ocfl = np.maximum(self.ocfl[ngstcell:], self.ALMOST_ZERO)
+            # the CFL number is unknown before the first sub-step.
+            target = np.where(
+                ldt > 0, ldt*np.minimum(self.local_cfl/ocfl, 2.0),
+                self.time_increment)
+            ldt[:] = target
+            lcl, rcl = self._ldt_pairs
+            np.minimum.at(ldt, lcl, target[rcl])
+            np.minimum.at(ldt, rcl, target[lcl])
+            self._debug_check_array('ldt')
+
     @sc.MeshSolver.register_marcher
     def calcsolt(self, worker=None):
         self._debug_check_array('sol', 'dsol')
@@ -0,0 +1,81 @@
+# -*- coding: UTF-8 -*-
+#
+# Copyright (c) 2014, Yung-Yu Chen <yyc@solvcon.net>
+#
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# - Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+# - Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# - Neither the name of the copyright holder nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+
+import unittest
+
+from solvcon import testing
+
+from .. import case
+from .. import inout
+
+
+class TestResidualHook(unittest.TestCase):
+    def setUp(self):
+        def mesher(*args, **kw):
+            blk = testing.create_trivial_2d_blk()
+            blk.clgrp.fill(0)
+            blk.grpnames.append('blank')
+            return blk
+        self.cse = case.GasCase(mesher=mesher)
+        self.hook = inout.ResidualHook(self.cse, tolerance=1.e-3, rsteps=1,
+                                       psteps=1)
+
+    def postmarch(self, istep, marchret):
+        self.cse.execution.step_current = istep
+        self.cse.execution.marchret = marchret
+        self.hook.postmarch()
+
+    def test_serial(self):
+        self.postmarch(1, {'residual': [16.0, 4]})
+        self.assertEqual(2.0, self.hook.residual)
+        self.assertFalse(self.cse.execution.stop)
+        self.postmarch(2, {'residual': [6.4e-5, 4]})
+        self.assertAlmostEqual(4.e-3, self.hook.residual)
+        self.assertFalse(self.cse.execution.stop)
+        self.postmarch(3, {'residual': [1.6e-7, 4]})
+        self.assertTrue(self.cse.execution.stop)
+
+    def test_parallel(self):
+        # the norm is over all the cells, not the maximum of the blocks.
+        self.postmarch(1, [{'residual': [4.0, 1]}, {'residual': [0.0, 3]}])
+        self.assertEqual(1.0, self.hook.residual)
+        self.assertFalse(self.cse.execution.stop)
+        self.postmarch(2, [{'residual': [4.e-6, 1]}, {'residual': [0.0, 3]}])
+        self.assertTrue(self.cse.execution.stop)
+
+    def test_no_tolerance(self):
+        self.hook.tolerance = None
+        self.postmarch(1, {'residual': [1.0, 1]})
+        self.postmarch(2, {'residual': [0.0, 1]})
+        self.assertFalse(self.cse.execution.stop)
+
+# vim: set ff=unix fenc=utf8 nobomb et sw=4 ts=4 tw=79:
@@ -0,0 +1,71 @@
+# -*- coding: UTF-8 -*-
+#
+# Copyright (c) 2014, Yung-Yu Chen <yyc@solvcon.net>
+#
+# All rights reserved.
+#
+# Redistribution and use in source and binary forms, with or without
+# modification, are permitted provided that the following conditions are met:
+#
+# - Redistributions of source code must retain the above copyright notice, this
+#   list of conditions and the following disclaimer.
+# - Redistributions in binary form must reproduce the above copyright notice,
+#   this list of conditions and the following disclaimer in the documentation
+#   and/or other materials provided with the distribution.
+# - Neither the name of the copyright holder nor the names of its contributors
+#   may be used to endorse or promote products derived from this software
+#   without specific prior written permission.
+#
+# THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+# AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+# IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+# ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+# LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+# CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+# SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+# INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+# CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+# ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+# POSSIBILITY OF SUCH DAMAGE.
+
+
+import unittest
+
+from .. import physics
+
+
+class FakeSolver(object):
+    def __init__(self):
+        self.demands = list()
+        self.step_global = 0
+
+
+class TestPhysicsAnchor(unittest.TestCase):
+    def setUp(self):
+        self.svr = FakeSolver()
+        self.ank = physics.PhysicsAnchor(self.svr, rsteps=2)
+
+    def test_closure(self):
+        self.assertEqual(physics.ALL & ~(physics.VORTICITY|physics.TEMPERATURE
+                                         |physics.SCHLIEREN),
+                         physics.closure(physics.MACH))
+        self.assertEqual(physics.DENSITY|physics.VELOCITY|physics.VORTICITY,
+                         physics.closure(physics.flags_of(['wm'])))
+
+    def test_due_legacy(self):
+        self.assertEqual(physics.ALL, self.ank._due(4))
+        self.assertEqual(0, self.ank._due(3))
+        self.assertEqual(physics.ALL, self.ank._due(3, final=True))
+
+    def test_due_demand(self):
+        self.svr.demands.append((physics.DENSITY, 0))
+        self.svr.demands.append((physics.SCHLIEREN, 5))
+        self.assertEqual(physics.DENSITY, self.ank._due(4))
+        self.assertEqual(0, self.ank._due(3))
+        self.assertEqual(physics.SCHLIEREN, self.ank._due(5))
+        self.assertEqual(physics.DENSITY|physics.SCHLIEREN,
+                         self.ank._due(10))
+        self.assertEqual(physics.DENSITY|physics.SCHLIEREN,
+                         self.ank._due(7, final=True))
+
+# vim: set ff=unix fenc=utf8 nobomb et sw=4 ts=4 tw=79:
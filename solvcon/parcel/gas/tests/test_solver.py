@@ -1,5 +1,7 @@
 import unittest
 
+import numpy as np
+
 from solvcon import testing
 
 from .. import solver
@@ -18,4 +20,48 @@ class TestGasSolver(unittest.TestCase):
         svr = solver.GasSolver(blk)
         self.assertEqual(4, svr.neq)
 
+class TestGasSolverCalcldt(unittest.TestCase):
+    def setUp(self):
+        blk = testing.create_trivial_2d_blk()
+        blk.clgrp.fill(0)
+        blk.grpnames.append('blank')
+        self.svr = solver.GasSolver(blk, local_cfl=0.5)
+        self.svr.time_increment = 0.01
+        self.ngstcell = blk.ngstcell
+        self.fccls = blk.fccls[blk.fccls[:,1] >= 0]
+
+    def calcldt(self, ocfl):
+        svr = self.svr
+        svr.ocfl[self.ngstcell:] = ocfl
+        svr.calcldt()
+        return svr.ldt[self.ngstcell:].copy()
+
+    def test_start(self):
+        ldt = self.calcldt(0.0)
+        self.assertTrue((ldt == 0.01).all())
+
+    def test_growth_limit(self):
+        self.calcldt(0.0)
+        # the CFL number asks for 5 times the increment.
+        ldt = self.calcldt(0.1)
+        self.assertTrue(np.allclose(ldt, 0.02))
+        ldt = self.calcldt(0.1)
+        self.assertTrue(np.allclose(ldt, 0.04))
+
+    def test_neighbor_cap(self):
+        self.calcldt(0.0)
+        ocfl = np.empty_like(self.svr.ocfl[self.ngstcell:])
+        ocfl.fill(0.5)
+        ocfl[0] = 1.0
+        ldt = self.calcldt(ocfl)
+        neighbors = set(self.fccls[self.fccls[:,0] == 0, 1])
+        neighbors.update(self.fccls[self.fccls[:,1] == 0, 0])
+        self.assertTrue(neighbors)
+        self.assertAlmostEqual(0.005, ldt[0])
+        for icl in range(1, len(ldt)):
+            if icl in neighbors:
+                self.assertAlmostEqual(0.005, ldt[icl])
+            else:
+                self.assertAlmostEqual(0.01, ldt[icl])
+
 # vim: set ff=unix fenc=utf8 nobomb et sw=4 ts=4 tw=79:
@@ -45,7 +45,8 @@ _include(names=['GasPlusBC', 'GasPlusNonRefl', 'GasPlusSlipWall', 'GasPlusInlet'
          frommod='.boundcond')
 _include(names=['ProbeHook'], frommod='.probe')
 _include(names=['MeshInfoHook', 'ProgressHook', 'FillAnchor', 'CflHook',
-                'PMarchSave'], frommod='.inout')
+                'BoundCheckHook', 'ResidualHook', 'SnapshotHook', 'PMarchSave',
+                'PMarchSeries'], frommod='.inout')
 _include(names=['ObliqueShockRelation'], frommod='.oblique_shock')
 
 # vim: set ff=unix fenc=utf8 ft=python nobomb et sw=4 ts=4 tw=79:
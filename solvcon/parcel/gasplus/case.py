@@ -23,13 +23,44 @@ class GasPlusCase(sc.MeshCase):
         'solver.sigma0': 3.0,
         'solver.report_interval': 0,
         # End of c-taw parameters.
+        # Storage of the solution arrays: 'aos' or 'soa'.
+        'solver.layout': 'aos',
+        # Target CFL number of local time stepping; 0 disables it.
+        'solver.local_cfl': 0.0,
+        # Number of time levels of multi-rate marching; 0 disables it.
+        'solver.multirate_nlevel': 0,
+        # Largest CFL number of a cell in a time level.
+        'solver.multirate_cfl': 0.9,
+        # Dictionaries of the members of an ensemble marching on the block;
+        # None for a single solver.  See _local_init_solver.
+        'solver.members': None,
         'io.rootdir': sc.env.projdir, # Different default to MeshCase.
     }
 
     def make_solver_keywords(self):
         kw = super(GasPlusCase, self).make_solver_keywords()
-        self.solver.solvertype = getattr(
-            sc.march.gas, "Solver%dD" % self.blk.ndim)
+        # the libmarch solver doesn't run threads.
+        kw.pop('nthread', None)
+        # float32 stores the solution in single precision; the metrics and
+        # the arithmetic stay in float64.
+        suffixes = {'float64': '', 'float32': 'Float32'}
+        fpdtype = str(self.execution.fpdtype)
+        if fpdtype not in suffixes:
+            raise ValueError('fpdtype %s is not one of %s' % (
+                fpdtype, ', '.join(sorted(suffixes))))
+        suffix = suffixes[fpdtype]
+        members = self.solver.members
+        if members:
+            if self.is_parallel:
+                raise ValueError('an ensemble runs on a single block')
+            self.solver.solvertype = getattr(
+                sc.march.gas, "Ensemble%dD%s" % (self.blk.ndim, suffix))
+            kw['nmember'] = len(members)
+            kw['bclists'] = [self._make_member_bclist(member.get('bcmap', {}))
+                             for member in members]
+        else:
+            self.solver.solvertype = getattr(
+                sc.march.gas, "Solver%dD%s" % (self.blk.ndim, suffix))
         # time.
         self.execution.neq = self.blk.ndim + 2
         kw['time'] = self.execution.time
@@ -37,6 +68,71 @@ class GasPlusCase(sc.MeshCase):
         # c-tau scheme parameters.
         kw['sigma0'] = int(self.solver.sigma0)
         kw['report_interval'] = self.solver.report_interval
+        kw['layout'] = self.solver.layout
+        kw['local_cfl'] = float(self.solver.local_cfl)
+        kw['multirate_nlevel'] = int(self.solver.multirate_nlevel)
+        kw['multirate_cfl'] = float(self.solver.multirate_cfl)
         return kw
 
+    def _make_member_bclist(self, bcmap):
+        """
+        Copy the boundary conditions of the block for a member of an ensemble,
+        with the values in *bcmap*, a dictionary from the names of the boundary
+        conditions to the dictionaries of the values, replacing those of the
+        case.
+        """
+        bcmap = dict(((key.decode() if isinstance(key, bytes) else key), vdict)
+                     for key, vdict in bcmap.items())
+        bclist = list()
+        for bc in self.blk.bclist:
+            vdict = bcmap.pop(bc.name, None)
+            if vdict:
+                bc = type(bc)(bc=bc)
+                value = bc.value.copy()
+                for vname, val in vdict.items():
+                    if vname not in bc.vnames:
+                        raise ValueError('%s is not a value of %s' % (
+                            vname, bc))
+                    value[:,bc.vnames.index(vname)] = val
+                bc.value = value
+            bclist.append(bc)
+        if bcmap:
+            raise ValueError('no boundary condition named %s' % (
+                ', '.join(sorted(bcmap))))
+        return bclist
+
+    def _local_init_solver(self):
+        """
+        Create the :py:class:`solvcon.march.gas.Ensemble2D` (or 3D) for the
+        members when :py:attr:`solver.members` is given, or the solver.
+
+        The members march together over the block, each with its own
+        boundary values, anchors, and outputs.  A member is a dictionary of
+        the optional keys:
+
+        - ``'bcmap'``: a dictionary from the names of the boundary conditions
+          to the dictionaries of the values, replacing those of the case for
+          the member, e.g., ``{'left': {'rho': 2.0}}``.
+        - ``'anchors'``: a list of pairs of the anchor type and the keywords,
+          dropped on the member after the anchors of the hooks, e.g.,
+          ``[(FillAnchor, {'mappers': {'sol.gamma': 1.2}})]``.
+
+        The anchors of the hooks are dropped on every member.  The hooks
+        reduce the CFL and the residual over the members, and write the
+        outputs of each member into the files suffixed by ``_m`` and the
+        index of the member.
+
+        @return: nothing
+        """
+        if not self.solver.members:
+            return super(GasPlusCase, self)._local_init_solver()
+        svrkw = self.make_solver_keywords() # sets solvertype
+        ens = self.solver.solvertype(self.solver.domainobj.blk, **svrkw)
+        for svr, member in zip(ens.members, self.solver.members):
+            self.runhooks.drop_anchor(svr)
+            for ankcls, ankkw in member.get('anchors', []):
+                svr.runanchors.append(ankcls(svr, **ankkw))
+        ens.init()
+        self.solver.solverobj = ens
+
 # vim: set ff=unix fenc=utf8 ft=python nobomb et sw=4 ts=4 tw=79:
@@ -18,6 +18,56 @@ import numpy as np
 import solvcon as sc
 
 from solvcon.io import vtkxml
+from solvcon.io import series
+
+
+class NativeAnchor(object):
+    """
+    Factory of the compiled anchor *name* (e.g., ``'CflAnchor'``) in
+    :py:mod:`solvcon.march.gas`.  The compiled anchors run entirely in C++ and
+    do not take the GIL in the marching loop.
+
+    The type is resolved from the dimension and the floating-point type of the
+    solver when the factory is called.  Hooks pass the factory rather than the
+    type to :py:meth:`~solvcon.hook.Hook._deliver_anchor`, so that it is
+    pickled to the remote workers and resolved against the real solver there.
+
+    >>> NativeAnchor('CflAnchor')
+    NativeAnchor('CflAnchor')
+    """
+
+    def __init__(self, name):
+        self.name = name
+
+    def __repr__(self):
+        return '%s(%r)' % (self.__class__.__name__, self.name)
+
+    def resolve(self, svr):
+        """
+        :return: The compiled anchor type for the solver *svr*.
+        """
+        suffix = '' if 'float64' == svr.fpdtype else 'Float32'
+        return getattr(sc.march.gas,
+                       '%s%dD%s' % (self.name, svr.block.ndim, suffix))
+
+    def __call__(self, svr, **kw):
+        return self.resolve(svr)(svr, **kw)
+
+
+def member_filename(fn, imember, nmember):
+    """
+    Insert the index of the member of an ensemble before the extension of the
+    output file name *fn*.  The name is unchanged without ensemble.
+
+    >>> member_filename('case_0010.vtu', 1, 3)
+    'case_0010_m1.vtu'
+    >>> member_filename('case_0010.vtu', 0, 1)
+    'case_0010.vtu'
+    """
+    if nmember <= 1:
+        return fn
+    root, ext = os.path.splitext(fn)
+    return '%s_m%d%s' % (root, imember, ext)
 
 
 class MeshInfoHook(sc.MeshHook):
@@ -145,40 +195,6 @@ class FillAnchor(sc.march.gas.CommonAnchor):
 
 ################################################################################
 # Begin CFL evaluation.
-class CflAnchor(sc.march.gas.CommonAnchor):
-    """
-    Counting CFL numbers.
-
-    Pair with :py:class:`CflHook`.
-    """
-
-    def __init__(self, svr, rsteps=None, **kw):
-        sc.march.gas.CommonAnchor.__init__(self, svr)
-        #: Steps to run (:py:class:`int`).
-        self.rsteps = int(rsteps)
-
-    def postmarch(self):
-        svr = self.solver
-        istep = svr.state.step_global
-        rsteps = self.rsteps
-        if istep > 0 and istep%rsteps == 0:
-            # download data.
-            cflo = svr.sol.cflo.B
-            cflc = svr.sol.cflc.B
-            # determine extremum.
-            mincfl = cflo.min()
-            maxcfl = cflo.max()
-            nadj = (cflc==1).sum()
-            # store.
-            svr.state.cfl_min = mincfl
-            svr.state.cfl_max = maxcfl
-            svr.state.cfl_nadjusted = nadj
-            if svr.state.cfl_nadjusted_accumulated < 0:
-                svr.state.cfl_nadjusted_accumulated = nadj
-            else:
-                svr.state.cfl_nadjusted_accumulated += nadj
-
-
 class CflHook(sc.MeshHook):
     """
     Makes sure CFL number is bounded and print averaged CFL number over time.
@@ -186,7 +202,7 @@ class CflHook(sc.MeshHook):
     :py:meth:`~solvcon.hook.MeshHook.postmarch` and (ii)
     :py:meth:`~solvocn.hook.MeshHook.postloop` methods.
 
-    Pair with :py:class:`CflAnchor`.
+    Pair with the compiled ``CflAnchor`` in :py:mod:`solvcon.march.gas`.
     """
 
     def __init__(self, cse,
@@ -216,13 +232,10 @@ class CflHook(sc.MeshHook):
         super(CflHook, self).__init__(cse, **kw)
         #: Steps to run.
         self.rsteps = rsteps if rsteps else self.psteps
-        self.ankkw = kw
 
     def drop_anchor(self, svr):
-        ankkw = self.ankkw.copy()
-        ankkw['name'] = self.name
-        ankkw['rsteps'] = self.rsteps
-        self._deliver_anchor(svr, CflAnchor, ankkw)
+        self._deliver_anchor(svr, NativeAnchor('CflAnchor'),
+                             {'name': self.name, 'rsteps': self.rsteps})
 
     def _notify(self, msg):
         if self.fullstop:
@@ -234,12 +247,13 @@ class CflHook(sc.MeshHook):
         info = self.info
         istep = self.cse.execution.step_current
         mr = self.cse.execution.marchret
-        isp = self.cse.is_parallel
+        # a list when every worker reports individually.
+        isp = isinstance(mr, list)
         rsteps = self.rsteps
         psteps = self.psteps
         # collect CFL.
         if istep > 0 and istep%rsteps == 0:
-            nCFL = max([m['cfl'][0] for m in mr]) if isp else mr['cfl'][0]
+            nCFL = min([m['cfl'][0] for m in mr]) if isp else mr['cfl'][0]
             xCFL = max([m['cfl'][1] for m in mr]) if isp else mr['cfl'][1]
             nadj = sum([m['cfl'][2] for m in mr]) if isp else mr['cfl'][2]
             aadj = sum([m['cfl'][3] for m in mr]) if isp else mr['cfl'][3]
@@ -267,10 +281,95 @@ class CflHook(sc.MeshHook):
 
     def postloop(self):
         self.info("Averaged maximum CFL = %g.\n" % self.mCFL)
+
+
+class BoundCheckHook(sc.MeshHook):
+    """
+    Stops the time marching when a cell has non-finite solution, or density
+    or pressure not above the minimum.  The check runs in the compiled
+    ``BoundCheckAnchor`` of :py:mod:`solvcon.march.gas` every *rsteps* steps.
+    """
+
+    def __init__(self, cse, name='boundcheck', rsteps=1, density_min=0.0,
+                 pressure_min=-np.inf, **kw):
+        #: Name of the anchor.
+        self.name = name
+        #: Steps between the checks.
+        self.rsteps = rsteps
+        #: Minimum density.
+        self.density_min = density_min
+        #: Minimum pressure.  Default is no check.
+        self.pressure_min = pressure_min
+        super(BoundCheckHook, self).__init__(cse, **kw)
+
+    def drop_anchor(self, svr):
+        self._deliver_anchor(svr, NativeAnchor('BoundCheckAnchor'),
+                             {'name': self.name, 'rsteps': self.rsteps,
+                              'density_min': self.density_min,
+                              'pressure_min': self.pressure_min})
 # End CFL evaluation.
 ################################################################################
 
 
+################################################################################
+# Begin residual monitor.
+class ResidualHook(sc.MeshHook):
+    """
+    Reports the residual, the L2 norm of the time rate of density over the
+    cells, and stops the case when it drops below :py:attr:`tolerance` times
+    the first one.  Overrides :py:meth:`~solvcon.hook.MeshHook.postmarch`
+    method.
+
+    Pair with the compiled ``ResidualAnchor`` in :py:mod:`solvcon.march.gas`.
+    """
+
+    def __init__(self, cse, name='residual', tolerance=None, rsteps=None,
+                 **kw):
+        #: Name of the residual tool.
+        self.name = name
+        #: Tolerance relative to the first residual; ``None`` does not stop.
+        self.tolerance = tolerance
+        #: The first residual.
+        self.initial = None
+        #: The latest residual.
+        self.residual = None
+        super(ResidualHook, self).__init__(cse, **kw)
+        #: Steps to run.
+        self.rsteps = rsteps if rsteps else self.psteps
+
+    def drop_anchor(self, svr):
+        self._deliver_anchor(svr, NativeAnchor('ResidualAnchor'),
+                             {'name': self.name, 'rsteps': self.rsteps})
+
+    def postmarch(self):
+        istep = self.cse.execution.step_current
+        mr = self.cse.execution.marchret
+        # a list when every worker reports individually.
+        isp = isinstance(mr, list)
+        if istep > 0 and istep%self.rsteps == 0:
+            # the global L2 norm from the sums of squares and the numbers of
+            # cells of the blocks.
+            if isp:
+                sumsq = sum(m['residual'][0] for m in mr)
+                ncell = sum(m['residual'][1] for m in mr)
+            else:
+                sumsq, ncell = mr['residual'][:2]
+            residual = np.sqrt(sumsq/ncell)
+            self.residual = residual
+            if self.initial is None:
+                self.initial = residual
+            if istep%self.psteps == 0:
+                self.info("Residual = %.3e (%.3e relative)\n" % (
+                    residual, residual/self.initial if self.initial else 0.0))
+            if (self.tolerance is not None and self.initial
+                    and residual <= self.tolerance*self.initial):
+                self.info("Residual %.3e converged after step: %d\n" % (
+                    residual, istep))
+                self.cse.execution.stop = True
+# End residual monitor.
+################################################################################
+
+
 ################################################################################
 # Begin solution output.
 class MarchSaveAnchor(sc.march.gas.CommonAnchor):
@@ -297,13 +396,23 @@ class MarchSaveAnchor(sc.march.gas.CommonAnchor):
         self.psteps = psteps
         #: The template string for the VTK file.
         self.vtkfn_tmpl = vtkfn_tmpl
+        if self.solver.qty is not None:
+            self.solver.qty.demand(
+                [key for key in self.anames if self.anames[key]], psteps)
         self.svrn = svr.svrn
+        self.imember = svr.sol.imember
+        self.nmember = svr.sol.nmember
 
-    def _write(self, istep):
+    def _collect(self):
+        """
+        Collect the arrays to be saved into scalars and vectors.
+
+        :return: Dictionaries of scalar and vector arrays.
+        :rtype: tuple
+        """
         ngstcell = self.solver.block.ngstcell
         sarrs = dict()
         varrs = dict()
-        # collect data.
         for key in self.anames:
             # get the array.
             if self.anames[key]:
@@ -318,11 +427,16 @@ class MarchSaveAnchor(sc.march.gas.CommonAnchor):
             else:
                 for it in range(arr.shape[1]):
                     sarrs['%s[%d]' % (key, it)] = arr[:,it]
+        return sarrs, varrs
+
+    def _write(self, istep):
+        sarrs, varrs = self._collect()
         # write.
         wtr = vtkxml.VtkXmlUstGridWriter(self.solver.block, fpdtype=self.fpdtype,
             compressor=self.compressor, scalars=sarrs, vectors=varrs)
         svrn = self.svrn
-        wtr.write(self.vtkfn_tmpl % (istep if svrn is None else (istep, svrn)))
+        vtkfn = self.vtkfn_tmpl % (istep if svrn is None else (istep, svrn))
+        wtr.write(member_filename(vtkfn, self.imember, self.nmember))
 
     def preloop(self):
         self._write(0)
@@ -340,6 +454,72 @@ class MarchSaveAnchor(sc.march.gas.CommonAnchor):
             self._write(istep)
 
 
+class MarchSeriesAnchor(sc.march.gas.CommonAnchor):
+    """
+    Save solution data of a solver into a single time-series file (see
+    :py:mod:`solvcon.io.series`).  The mesh is written once on
+    :py:meth:`preloop`, and the arrays are appended every *psteps*.
+    """
+
+    def __init__(self, svr, anames=None, compressor=None, fpdtype=None,
+                 psteps=None, seriesfn_tmpl=None, **kw):
+        assert None is not compressor
+        assert None is not fpdtype
+        assert None is not psteps
+        assert None is not seriesfn_tmpl
+        sc.march.gas.CommonAnchor.__init__(self, svr)
+        #: The arrays in :py:class:`GasSolver <.solver.GasSolver>` or
+        #: :py:attr:`MeshSolver.der <solvcon.solver.MeshSolver.der>` to be
+        #: saved.
+        self.anames = anames if anames else dict()
+        #: Compressor for binary data.  Can be either ``'gz'`` or ``''``.
+        self.compressor = compressor
+        #: String for floating point data type (NumPy convention).
+        self.fpdtype = fpdtype
+        #: The interval in step to save data.
+        self.psteps = psteps
+        #: The template string for the series file; formatted with the serial
+        #: number of the solver in parallel runs.
+        self.seriesfn_tmpl = seriesfn_tmpl
+        #: The :py:class:`solvcon.io.series.SeriesWriter` object.
+        self.writer = None
+        if self.solver.qty is not None:
+            self.solver.qty.demand(
+                [key for key in self.anames if self.anames[key]], psteps)
+        self.svrn = svr.svrn
+        self.imember = svr.sol.imember
+        self.nmember = svr.sol.nmember
+
+    _collect = MarchSaveAnchor._collect
+
+    def _write(self, istep):
+        sarrs, varrs = self._collect()
+        self.writer.append(istep, self.solver.state.time,
+                           scalars=sarrs, vectors=varrs)
+
+    def preloop(self):
+        seriesfn = self.seriesfn_tmpl
+        if self.svrn is not None:
+            seriesfn = seriesfn % self.svrn
+        seriesfn = member_filename(seriesfn, self.imember, self.nmember)
+        self.writer = series.SeriesWriter(self.solver.block, seriesfn,
+            fpdtype=self.fpdtype, compressor=self.compressor)
+        self._write(0)
+
+    def postmarch(self):
+        psteps = self.psteps
+        istep = self.solver.state.step_global
+        if istep%psteps == 0:
+            self._write(istep)
+
+    def postloop(self):
+        psteps = self.psteps
+        istep = self.solver.state.step_global
+        if istep%psteps != 0:
+            self._write(istep)
+        self.writer.close()
+
+
 class PMarchSave(sc.MeshHook):
     """
     Save the geometry and variables in a case when time marching in parallel
@@ -436,6 +616,135 @@ class PMarchSave(sc.MeshHook):
         istep = self.cse.execution.step_current
         if istep%psteps != 0:
             self._write(istep)
+
+
+class PMarchSeries(sc.MeshHook):
+    """
+    Save the geometry and variables in a case into one time-series file per
+    block, instead of one VTK XML file per block per step as
+    :py:class:`PMarchSave` does.  An XDMF descriptor of all blocks and steps
+    is generated after the time-marching loop.
+    """
+
+    def __init__(self, cse, anames=None, compressor='gz', fpdtype=None,
+                 altdir='', altsym='', seriesfn_tmpl=None, **kw):
+        #: The arrays in :py:class:`GasSolver <.solver.GasSolver>` or
+        #: :py:attr:`MeshSolver.der <solvcon.solver.MeshSolver.der>` to be
+        #: saved.  Format is (name, inder, ndim), (name, inder, ndim) ...
+        self.anames = anames if anames else list()
+        #: Compressor for binary data.  Can be either ``'gz'`` or ``''``.
+        self.compressor = compressor
+        #: String for floating point data type (NumPy convention).
+        self.fpdtype = fpdtype if fpdtype else str(cse.execution.fpdtype)
+        #: The alternate directory to save the series files.
+        self.altdir = altdir
+        #: The symbolic link in basedir pointing to the alternate directory to
+        #: save the series files.
+        self.altsym = altsym
+        super(PMarchSeries, self).__init__(cse, **kw)
+        basefn = cse.io.basefn
+        if self.altdir:
+            vdir = self.altdir
+            if self.altsym:
+                altsym = os.path.join(cse.io.basedir, self.altsym)
+                if not os.path.exists(altsym):
+                    os.symlink(vdir, altsym)
+        else:
+            vdir = cse.io.basedir
+        if not os.path.exists(vdir):
+            os.makedirs(vdir)
+        if None is seriesfn_tmpl:
+            seriesfn_tmpl = basefn
+            npart = cse.execution.npart
+            if npart:
+                seriesfn_tmpl += '.p%%0%dd'%int(math.ceil(math.log10(npart))+1)
+            seriesfn_tmpl += '.scts'
+        #: The template string for the series files.
+        self.seriesfn_tmpl = os.path.join(vdir, seriesfn_tmpl)
+        #: The XDMF descriptor file.
+        self.xdmffn = os.path.join(vdir, basefn + '.xmf')
+
+    def drop_anchor(self, svr):
+        anames = dict([(ent[0], ent[1]) for ent in self.anames])
+        ankkw = dict(anames=anames, compressor=self.compressor,
+            fpdtype=self.fpdtype, psteps=self.psteps,
+            seriesfn_tmpl=self.seriesfn_tmpl)
+        self._deliver_anchor(svr, MarchSeriesAnchor, ankkw)
+
+    def postloop(self):
+        npart = self.cse.execution.npart
+        if npart:
+            # make sure all the workers closed their files.
+            self.cse.solver.dealer.barrier()
+            fns = [self.seriesfn_tmpl % iblk for iblk in range(npart)]
+        else:
+            fns = [self.seriesfn_tmpl]
+        # one descriptor for each member of an ensemble.
+        members = self.cse.solver.members
+        nmember = len(members) if members else 1
+        for imember in range(nmember):
+            xdmffn = member_filename(self.xdmffn, imember, nmember)
+            self.info('Writing \n  %s\n... ' % xdmffn)
+            series.write_xdmf(xdmffn, [member_filename(fn, imember, nmember)
+                                       for fn in fns])
+            self.info('done.\n')
+
+
+class SnapshotHook(sc.MeshHook):
+    """
+    Keep the last *nslot* snapshots of a solution array (``'so0c'``,
+    ``'so0n'``, ``'so1c'``, ``'so1n'``, ``'cflo'``, ``'cflc'``, or
+    ``'gamma'``) taken every *psteps* steps in memory, and save them into a
+    ``.npz`` file (one for each block in parallel, or each member of an
+    ensemble) after the time-marching loop.  The copies are made by the
+    compiled ``SnapshotAnchor`` of :py:mod:`solvcon.march.gas` into a
+    preallocated ring buffer.
+    """
+
+    def __init__(self, cse, name='snapshot', aname='so0c', nslot=1, **kw):
+        #: Name of the anchor.
+        self.name = name
+        #: Name of the solution array.
+        self.aname = aname
+        #: Number of the snapshots to keep.
+        self.nslot = nslot
+        super(SnapshotHook, self).__init__(cse, **kw)
+
+    def drop_anchor(self, svr):
+        self._deliver_anchor(svr, NativeAnchor('SnapshotAnchor'),
+                             {'name': self.name, 'aname': self.aname,
+                              'psteps': self.psteps or 1,
+                              'nslot': self.nslot})
+
+    @property
+    def snapshots(self):
+        """
+        The times and the snapshots in chronological order of each block, or
+        of each member of an ensemble.
+        """
+        cse = self.cse
+        if cse.is_parallel:
+            dom = cse.solver.domainobj
+            dealer = cse.solver.dealer
+            snapshots = list()
+            for iblk in range(dom.nblk):
+                dealer[iblk].cmd.pullank(self.name, 'snapshots',
+                                         with_worker=True)
+                snapshots.append(dealer[iblk].recv())
+        else:
+            svr = cse.solver.solverobj
+            snapshots = [member.runanchors[self.name].snapshots
+                         for member in getattr(svr, 'members', [svr])]
+        return snapshots
+
+    def postloop(self):
+        snapshots = self.snapshots
+        for iblk, (times, data) in enumerate(snapshots):
+            fn = '%s_%s_%s' % (self.cse.io.basefn, self.name, self.aname)
+            if len(snapshots) > 1:
+                fn += ('_m%d' if self.cse.solver.members else '_%d') % iblk
+            fn = os.path.join(self.cse.io.basedir, fn + '.npz')
+            np.savez(fn, times=times, data=data)
 # End solution output.
 ################################################################################
 
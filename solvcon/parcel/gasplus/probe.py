@@ -5,11 +5,14 @@
 
 
 import os
+import copy
 
 import numpy as np
 
 import solvcon as sc
 
+from .inout import NativeAnchor, member_filename
+
 
 class Probe(object):
     """
@@ -27,17 +30,50 @@ class Probe(object):
         crds = ','.join(['%g'%val for val in self.crd])
         return 'Pt/%s#%d(%s)%d' % (self.name, self.pcl, crds, len(self.vals))
 
+    @property
+    def native(self):
+        """
+        True if all the specs are the columns of ``so0n``, which the compiled
+        probe anchor samples.
+        """
+        return all(isinstance(spec, int) and spec >= 0
+                   for spec in self.speclst)
+
     def locate_cell(self, svr):
-        icl, ifl, jcl, jfl = svr.alg.locate_point(self.crd)
-        self.pcl = icl
+        """
+        Locate the cell containing the point, which is on the inner side of
+        all the faces of the cell.  The cell nearest to the point is taken if
+        it is on a face shared by cells.  :py:attr:`pcl` is set to -1 if the
+        point is not in the block.
+        """
+        blk = svr.block
+        clfcs = blk.clfcs
+        fccnd = blk.fccnd
+        fcnml = blk.fcnml
+        fccls = blk.fccls
+        # the faces of the cells; the unused slots are masked out.
+        mask = np.arange(clfcs.shape[1]-1) < clfcs[:,:1]
+        ifcs = np.where(mask, clfcs[:,1:], 0)
+        # the normal vectors point outward from the first cell of the faces.
+        sign = np.where(fccls[ifcs,0] == np.arange(blk.ncell)[:,None], 1, -1)
+        dist = ((self.crd - fccnd[ifcs]) * fcnml[ifcs]).sum(axis=-1) * sign
+        tol = np.abs(dist).max() * 1.e-12
+        icls = np.nonzero(((dist <= tol) | ~mask).all(axis=1))[0]
+        if len(icls):
+            dsq = ((blk.clcnd[icls] - self.crd)**2).sum(axis=1)
+            self.pcl = int(icls[np.argmin(dsq)])
+        else:
+            self.pcl = -1
 
     def __call__(self, svr, time):
-        ngstcell = svr.ngstcell
+        if self.pcl < 0:
+            return
+        ngstcell = svr.block.ngstcell
         vlist = [time]
         for spec in self.speclst:
             arr = None
             if isinstance(spec, str):
-                arr = svr.der[spec] # FIXME: translate to qty
+                arr = getattr(svr.qty, spec)
             elif isinstance(spec, int):
                 if spec >= 0 and spec < svr.neq:
                     arr = svr.sol.so0n.F[:,spec]
@@ -49,66 +85,147 @@ class Probe(object):
             vlist.append(arr[ngstcell+self.pcl])
         self.vals.append(vlist)
 
+    def extract(self, data, ipt, neq):
+        """
+        Take the values of the specs from the rows of the compiled probe
+        anchor, where the point is the *ipt*-th one.
+        """
+        cols = [0]
+        for spec in self.speclst:
+            if not isinstance(spec, int) or spec < 0 or spec >= neq:
+                raise IndexError('spec %s incorrect'%str(spec))
+            cols.append(1 + ipt*neq + spec)
+        self.vals = data[:,cols].tolist()
+
 
-class ProbeAnchor(sc.MeshAnchor):
+class ProbeAnchor(sc.march.gas.CommonAnchor):
     """
-    Anchor for probe.
+    Anchor for probe sampling the specs in Python.  Used when a spec is not
+    taken by the compiled ``ProbeAnchor`` of :py:mod:`solvcon.march.gas`.
     """
 
-    def __init__(self, svr, **kw):
-        speclst = kw.pop('speclst')
-        self.points = list()
-        for data in kw.pop('coords'):
-            pkw = {'speclst': speclst, 'name': data[0]}
-            self.points.append(Probe(*data[1:], **pkw))
-        super(ProbeAnchor, self).__init__(svr, **kw)
+    def __init__(self, svr, points=None, psteps=None, **kw):
+        assert None is not points
+        assert None is not psteps
+        sc.march.gas.CommonAnchor.__init__(self, svr)
+        self.points = points
+        self.psteps = psteps
+        qnames = [spec for point in self.points for spec in point.speclst
+                  if isinstance(spec, str)]
+        if qnames and self.solver.qty is not None:
+            self.solver.qty.demand(sorted(set(qnames)), psteps)
+
+    def _sample(self):
+        svr = self.solver
+        for point in self.points: point(svr, svr.state.time)
 
     def preloop(self):
-        for point in self.points: point.locate_cell(self.svr)
-        for point in self.points: point(self.svr, self.svr.time)
+        self._sample()
 
     def postfull(self):
-        for point in self.points: point(self.svr, self.svr.time)
+        if self.solver.state.step_global % self.psteps == 0:
+            self._sample()
+
+
+def make_probe_anchor(svr, points=None, psteps=None, capacity=None, **kw):
+    """
+    Locate the points in the solver *svr* and create the probe anchor for
+    them.  The compiled ``ProbeAnchor`` is used if all the points are
+    :py:attr:`Probe.native`; otherwise :py:class:`ProbeAnchor`.  The points
+    not in the block are sampled as NaN by the compiled anchor, and are not
+    sampled by :py:class:`ProbeAnchor`.  The points are copied, since the
+    solvers of the blocks may share the process.
+    """
+    points = copy.deepcopy(points)
+    for point in points: point.locate_cell(svr)
+    if all(point.native for point in points):
+        return NativeAnchor('ProbeAnchor')(
+            svr, cells=[point.pcl for point in points], psteps=psteps,
+            capacity=capacity)
+    else:
+        return ProbeAnchor(svr, points=points, psteps=psteps, **kw)
 
 
 class ProbeHook(sc.MeshHook):
     """
-    Point probe.
+    Point probe.  The specs of the points are sampled every *psteps* steps by
+    the compiled ``ProbeAnchor`` of :py:mod:`solvcon.march.gas` when they are
+    all the columns of ``so0n``, or by :py:class:`ProbeAnchor`.  In the
+    latter, a negative spec ``-1-i`` is the *i*-th column of ``so0c`` and a
+    string spec is the quantity of the name.  Each member of an ensemble has
+    its own points in :py:attr:`member_points`.
     """
 
     def __init__(self, cse, **kw):
         self.name = kw.pop('name', 'ppank')
+        speclst = kw.pop('speclst')
+        self.points = list()
+        for data in kw.pop('coords'):
+            pkw = {'speclst': speclst, 'name': data[0]}
+            self.points.append(Probe(*data[1:], **pkw))
+        self.member_points = list()
         super(ProbeHook, self).__init__(cse, **kw)
-        self.ankkw = kw
-        self.points = None
+        if not self.psteps:
+            self.psteps = 1
 
     def drop_anchor(self, svr):
-        ankkw = self.ankkw.copy()
-        ankkw['name'] = self.name
-        self._deliver_anchor(svr, ProbeAnchor, ankkw)
-
-    def _collect(self):
+        # room for the initial sample and one every psteps steps.
+        capacity = self.cse.execution.steps_run // self.psteps + 1
+        self._deliver_anchor(svr, make_probe_anchor, {
+            'name': self.name, 'points': self.points, 'psteps': self.psteps,
+            'capacity': capacity})
+
+    def _pull(self, objname):
+        """
+        :return: The objects of the anchor of each block, or of each member
+            of an ensemble.
+        :rtype: list
+        """
         cse = self.cse
         if cse.is_parallel:
             dom = cse.solver.domainobj
             dealer = cse.solver.dealer
-            allpoints = list()
+            objs = list()
             for iblk in range(dom.nblk):
-                dealer[iblk].cmd.pullank(self.name, 'points', with_worker=True)
-                allpoints.append(dealer[iblk].recv())
-            npt = len(allpoints[0])
-            points = [None]*npt
-            for rpoints in allpoints:
-                ipt = 0
-                while ipt < npt:
-                    if points[ipt] == None and rpoints[ipt].pcl >=0:
+                dealer[iblk].cmd.pullank(self.name, objname, with_worker=True)
+                objs.append(dealer[iblk].recv())
+        else:
+            svr = cse.solver.solverobj
+            objs = [getattr(member.runanchors[self.name], objname)
+                    for member in getattr(svr, 'members', [svr])]
+        return objs
+
+    @staticmethod
+    def _take(points, pulled):
+        """
+        Take each of the *points* from the block containing it.
+        """
+        npt = len(points)
+        if all(point.native for point in points):
+            for cells, data in pulled:
+                neq = (data.shape[1] - 1) // npt
+                for ipt, point in enumerate(points):
+                    if cells[ipt] >= 0:
+                        point.pcl = cells[ipt]
+                        point.extract(data, ipt, neq)
+        else:
+            for rpoints in pulled:
+                for ipt in range(npt):
+                    if rpoints[ipt].pcl >= 0:
                         points[ipt] = rpoints[ipt]
-                    ipt += 1
+        return points
+
+    def _collect(self):
+        if all(point.native for point in self.points):
+            pulled = list(zip(self._pull('cells'), self._pull('samples')))
         else:
-            svr = self.cse.solver.solverobj
-            points = [pt for pt in svr.runanchors[self.name].points
-                if pt.pcl >= 0]
-        self.points = points
+            pulled = self._pull('points')
+        if self.cse.solver.members:
+            # the members share the mesh; each of them is a whole block.
+            self.member_points = [self._take(copy.deepcopy(self.points), [obj])
+                                  for obj in pulled]
+        else:
+            self._take(self.points, pulled)
 
     def postmarch(self):
         psteps = self.psteps
@@ -118,10 +235,16 @@ class ProbeHook(sc.MeshHook):
         return True
 
     def postloop(self):
-        for point in self.points:
-            ptfn = '%s_pt_%s_%s.npy' % (
-                self.cse.io.basefn, self.name, point.name)
-            ptfn = os.path.join(self.cse.io.basedir, ptfn)
-            np.save(ptfn, np.array(point.vals, dtype='float64'))
+        self._collect()
+        groups = self.member_points or [self.points]
+        for imember, points in enumerate(groups):
+            for point in points:
+                if point.pcl < 0:
+                    continue
+                ptfn = '%s_pt_%s_%s.npy' % (
+                    self.cse.io.basefn, self.name, point.name)
+                ptfn = member_filename(ptfn, imember, len(groups))
+                ptfn = os.path.join(self.cse.io.basedir, ptfn)
+                np.save(ptfn, np.array(point.vals, dtype='float64'))
 
 # vim: set ff=unix fenc=utf8 ft=python nobomb et sw=4 ts=4 tw=79:
@@ -52,7 +52,7 @@ class LinearSolver(solver.MeshSolver):
     <._algorithm.LinearAlgorithm>`.
     """
 
-    _interface_init_ = ['cecnd', 'cevol', 'sfmrc']
+    _interface_init_ = ['cecnd', 'cevol']
     _solution_array_ = ['solt', 'sol', 'soln', 'dsol', 'dsoln']
 
     def __init__(self, blk, **kw):
@@ -80,6 +80,16 @@ class LinearSolver(solver.MeshSolver):
         ...     def gdlen(self):
         ...         return 1
         >>> svr = SubSolver(blk, neq=1)
+
+        The solution arrays may be stored in float32:
+
+        >>> svr = SubSolver(blk, neq=1, fpdtype='float32')
+        >>> svr.sol.dtype, svr.cecnd.dtype, svr.create_alg().float32
+        (dtype('float32'), dtype('float64'), True)
+        >>> SubSolver(blk, neq=1, fpdtype='float16')
+        Traceback (most recent call last):
+            ...
+        ValueError: fpdtype float16 is not one of float32, float64
         """
         # meta data.
         self.neq = kw.pop('neq')
@@ -89,6 +99,13 @@ class LinearSolver(solver.MeshSolver):
         ncell = blk.ncell
         ngstcell = blk.ngstcell
         fpdtype = 'float64'
+        #: Storage type of the solution arrays, ``'float64'`` or
+        #: ``'float32'``.  The metrics, the parameters, the CFL numbers and
+        #: the arithmetic of the kernels stay in float64.
+        self.fpdtype = str(kw.pop('fpdtype', fpdtype))
+        if self.fpdtype not in ('float32', 'float64'):
+            raise ValueError('fpdtype %s is not one of float32, float64' % (
+                self.fpdtype))
         # scheme parameters.
         self.alpha = int(kw.pop('alpha', 0))
         self.sigma0 = int(kw.pop('sigma0', 3.0))
@@ -112,12 +129,13 @@ class LinearSolver(solver.MeshSolver):
         self.amvec = np.empty((ngstcell+ncell, nvec, ndim), dtype=fpdtype)
         # solutions.
         neq = self.neq
-        self.sol = np.empty((ngstcell+ncell, neq), dtype=fpdtype)
-        self.soln = np.empty((ngstcell+ncell, neq), dtype=fpdtype)
-        self.solt = np.empty((ngstcell+ncell, neq), dtype=fpdtype)
-        self.dsol = np.empty((ngstcell+ncell, neq, ndim), dtype=fpdtype)
-        self.dsoln = np.empty((ngstcell+ncell, neq, ndim), dtype=fpdtype)
-        self.stm = np.empty((ngstcell+ncell, neq), dtype=fpdtype)
+        soldtype = self.fpdtype
+        self.sol = np.empty((ngstcell+ncell, neq), dtype=soldtype)
+        self.soln = np.empty((ngstcell+ncell, neq), dtype=soldtype)
+        self.solt = np.empty((ngstcell+ncell, neq), dtype=soldtype)
+        self.dsol = np.empty((ngstcell+ncell, neq, ndim), dtype=soldtype)
+        self.dsoln = np.empty((ngstcell+ncell, neq, ndim), dtype=soldtype)
+        self.stm = np.empty((ngstcell+ncell, neq), dtype=soldtype)
         self.cfl = np.empty(ngstcell+ncell, dtype=fpdtype)
         self.ocfl = np.empty(ngstcell+ncell, dtype=fpdtype)
 
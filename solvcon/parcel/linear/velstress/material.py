@@ -91,7 +91,7 @@ class Material(metaclass=MaterialMeta):
         # set stiffness matrix.
         origstiff = np.empty((6,6), dtype='float64')
         origstiff.fill(0.0)
-        for key in kw.keys():   # becaues I pop out the key.
+        for key in list(kw.keys()):   # becaues I pop out the key.
             if len(key) == 4 and key[:2] == 'co':
                 try:
                     i = int(key[2])-1
@@ -239,7 +239,7 @@ class Triclinic(Material):
     """
     _zeropoints_ = []
     def __init__(self, *args, **kw):
-        for key in kw.keys():   # becaues I modify the key.
+        for key in list(kw.keys()):   # becaues I modify the key.
             if len(key) == 4 and key[:2] == 'co':
                 try:
                     i = int(key[2])
@@ -49,18 +49,19 @@ cdef public:
         ## vector parameters.
         int nvec
         double *amvec
-        # solution array.
-        double *sol
-        double *dsol
-        double *solt
-        double *soln
-        double *dsoln
-        double *stm
+        # solution array; double or float, see VewaveAlgorithm.float32.
+        void *sol
+        void *dsol
+        void *solt
+        void *soln
+        void *dsoln
+        void *stm
         double *cfl
         double *ocfl
 
 from solvcon.mesh cimport Mesh
 cdef class VewaveAlgorithm(Mesh):
     cdef sc_vewave_algorithm_t *_alg
+    cdef readonly bint float32
 
 # vim: set fenc=utf8 ft=pyrex ff=unix ai et sw=4 ts=4 tw=79:
@@ -34,7 +34,7 @@ cimport numpy as cnp
 # initialize NumPy.
 cnp.import_array()
 
-cdef extern:
+cdef extern nogil:
     # metrics.
     void sc_vewave_prepare_ce_3d(sc_mesh_t *msd, sc_vewave_algorithm_t *alg)
     void sc_vewave_prepare_ce_2d(sc_mesh_t *msd, sc_vewave_algorithm_t *alg)
@@ -86,10 +86,56 @@ cdef extern:
     void sc_vewave_bound_longsinex_dsoln_3d(
         sc_mesh_t *msd, sc_vewave_algorithm_t *alg, int nbnd, int *facn)
 
+
+# the kernels above on float32 solution arrays.
+cdef extern nogil:
+    void sc_vewave_calc_physics_float32(
+        sc_mesh_t *msd, sc_vewave_algorithm_t *alg,
+        double *s11, double *s22, double *s33, double *s23, double *s13,
+        double *s12)
+    void sc_vewave_calc_cfl_2d_float32(
+        sc_mesh_t *msd, sc_vewave_algorithm_t *alg)
+    void sc_vewave_calc_cfl_3d_float32(
+        sc_mesh_t *msd, sc_vewave_algorithm_t *alg)
+    void sc_vewave_calc_solt_2d_float32(
+        sc_mesh_t *msd, sc_vewave_algorithm_t *alg)
+    void sc_vewave_calc_solt_3d_float32(
+        sc_mesh_t *msd, sc_vewave_algorithm_t *alg)
+    void sc_vewave_calc_soln_2d_float32(
+        sc_mesh_t *msd, sc_vewave_algorithm_t *alg)
+    void sc_vewave_calc_soln_3d_float32(
+        sc_mesh_t *msd, sc_vewave_algorithm_t *alg)
+    void sc_vewave_calc_dsoln_2d_float32(
+        sc_mesh_t *msd, sc_vewave_algorithm_t *alg)
+    void sc_vewave_calc_dsoln_3d_float32(
+        sc_mesh_t *msd, sc_vewave_algorithm_t *alg)
+    void sc_vewave_bound_nonrefl_soln_2d_float32(
+        sc_mesh_t *msd, sc_vewave_algorithm_t *alg, int nbnd, int *facn)
+    void sc_vewave_bound_nonrefl_soln_3d_float32(
+        sc_mesh_t *msd, sc_vewave_algorithm_t *alg, int nbnd, int *facn)
+    void sc_vewave_bound_nonrefl_dsoln_2d_float32(
+        sc_mesh_t *msd, sc_vewave_algorithm_t *alg, int nbnd, int *facn)
+    void sc_vewave_bound_nonrefl_dsoln_3d_float32(
+        sc_mesh_t *msd, sc_vewave_algorithm_t *alg, int nbnd, int *facn)
+    void sc_vewave_bound_longsinex_soln_2d_float32(
+        sc_mesh_t *msd, sc_vewave_algorithm_t *alg, int nbnd, int *facn)
+    void sc_vewave_bound_longsinex_soln_3d_float32(
+        sc_mesh_t *msd, sc_vewave_algorithm_t *alg, int nbnd, int *facn)
+    void sc_vewave_bound_longsinex_dsoln_2d_float32(
+        sc_mesh_t *msd, sc_vewave_algorithm_t *alg, int nbnd, int *facn)
+    void sc_vewave_bound_longsinex_dsoln_3d_float32(
+        sc_mesh_t *msd, sc_vewave_algorithm_t *alg, int nbnd, int *facn)
+
 cdef extern from "stdlib.h":
     void* malloc(size_t size)
     void free(void *ptr)
 
+cdef void *_get_body_address(cnp.ndarray arr, int ngstcell,
+                             fpdtype) except NULL:
+    if arr.dtype != fpdtype or not arr.flags.c_contiguous:
+        raise ValueError("solution array is not C-contiguous %s" % fpdtype)
+    return arr.data + ngstcell * arr.strides[0]
+
 cdef class VewaveAlgorithm(Mesh):
     """
     An algorithm class that does trivial calculation.
@@ -155,18 +201,15 @@ cdef class VewaveAlgorithm(Mesh):
             self._alg.amvec = NULL
 
     def _setup_solutions(self, svr):
-        cdef cnp.ndarray[double, ndim=2, mode="c"] sol = svr.sol
-        self._alg.sol = &sol[self._msd.ngstcell,0]
-        cdef cnp.ndarray[double, ndim=2, mode="c"] soln = svr.soln
-        self._alg.soln = &soln[self._msd.ngstcell,0]
-        cdef cnp.ndarray[double, ndim=2, mode="c"] solt = svr.solt
-        self._alg.solt = &solt[self._msd.ngstcell,0]
-        cdef cnp.ndarray[double, ndim=3, mode="c"] dsol = svr.dsol
-        self._alg.dsol = &dsol[self._msd.ngstcell,0,0]
-        cdef cnp.ndarray[double, ndim=3, mode="c"] dsoln = svr.dsoln
-        self._alg.dsoln = &dsoln[self._msd.ngstcell,0,0]
-        cdef cnp.ndarray[double, ndim=2, mode="c"] stm = svr.stm
-        self._alg.stm = &stm[self._msd.ngstcell,0]
+        # the solution arrays are in svr.fpdtype; the rest stays in double.
+        self.float32 = 'float32' == svr.fpdtype
+        cdef int ngstcell = self._msd.ngstcell
+        self._alg.sol = _get_body_address(svr.sol, ngstcell, svr.fpdtype)
+        self._alg.soln = _get_body_address(svr.soln, ngstcell, svr.fpdtype)
+        self._alg.solt = _get_body_address(svr.solt, ngstcell, svr.fpdtype)
+        self._alg.dsol = _get_body_address(svr.dsol, ngstcell, svr.fpdtype)
+        self._alg.dsoln = _get_body_address(svr.dsoln, ngstcell, svr.fpdtype)
+        self._alg.stm = _get_body_address(svr.stm, ngstcell, svr.fpdtype)
         cdef cnp.ndarray[double, ndim=1, mode="c"] cfl = svr.cfl
         self._alg.cfl = &cfl[self._msd.ngstcell]
         cdef cnp.ndarray[double, ndim=1, mode="c"] ocfl = svr.ocfl
@@ -211,32 +254,64 @@ cdef class VewaveAlgorithm(Mesh):
             cnp.ndarray[double, ndim=1, mode="c"] s23,
             cnp.ndarray[double, ndim=1, mode="c"] s13,
             cnp.ndarray[double, ndim=1, mode="c"] s12):
-        sc_vewave_calc_physics(self._msd, self._alg, 
-            &s11[0], &s22[0], &s33[0], &s23[0], &s13[0], &s12[0])
+        if self.float32:
+            sc_vewave_calc_physics_float32(self._msd, self._alg,
+                &s11[0], &s22[0], &s33[0], &s23[0], &s13[0], &s12[0])
+        else:
+            sc_vewave_calc_physics(self._msd, self._alg,
+                &s11[0], &s22[0], &s33[0], &s23[0], &s13[0], &s12[0])
 
     def calc_cfl(self):
-        if self._msd.ndim == 3:
-            sc_vewave_calc_cfl_3d(self._msd, self._alg)
-        else:
-            sc_vewave_calc_cfl_2d(self._msd, self._alg)
+        with nogil:
+            if self._msd.ndim == 3:
+                if self.float32:
+                    sc_vewave_calc_cfl_3d_float32(self._msd, self._alg)
+                else:
+                    sc_vewave_calc_cfl_3d(self._msd, self._alg)
+            else:
+                if self.float32:
+                    sc_vewave_calc_cfl_2d_float32(self._msd, self._alg)
+                else:
+                    sc_vewave_calc_cfl_2d(self._msd, self._alg)
 
     def calc_solt(self):
-        if self._msd.ndim == 3:
-            sc_vewave_calc_solt_3d(self._msd, self._alg)
-        else:
-            sc_vewave_calc_solt_2d(self._msd, self._alg)
+        with nogil:
+            if self._msd.ndim == 3:
+                if self.float32:
+                    sc_vewave_calc_solt_3d_float32(self._msd, self._alg)
+                else:
+                    sc_vewave_calc_solt_3d(self._msd, self._alg)
+            else:
+                if self.float32:
+                    sc_vewave_calc_solt_2d_float32(self._msd, self._alg)
+                else:
+                    sc_vewave_calc_solt_2d(self._msd, self._alg)
 
     def calc_soln(self):
-        if self._msd.ndim == 3:
-            sc_vewave_calc_soln_3d(self._msd, self._alg)
-        else:
-            sc_vewave_calc_soln_2d(self._msd, self._alg)
+        with nogil:
+            if self._msd.ndim == 3:
+                if self.float32:
+                    sc_vewave_calc_soln_3d_float32(self._msd, self._alg)
+                else:
+                    sc_vewave_calc_soln_3d(self._msd, self._alg)
+            else:
+                if self.float32:
+                    sc_vewave_calc_soln_2d_float32(self._msd, self._alg)
+                else:
+                    sc_vewave_calc_soln_2d(self._msd, self._alg)
 
     def calc_dsoln(self):
-        if self._msd.ndim == 3:
-            sc_vewave_calc_dsoln_3d(self._msd, self._alg)
-        else:
-            sc_vewave_calc_dsoln_2d(self._msd, self._alg)
+        with nogil:
+            if self._msd.ndim == 3:
+                if self.float32:
+                    sc_vewave_calc_dsoln_3d_float32(self._msd, self._alg)
+                else:
+                    sc_vewave_calc_dsoln_3d(self._msd, self._alg)
+            else:
+                if self.float32:
+                    sc_vewave_calc_dsoln_2d_float32(self._msd, self._alg)
+                else:
+                    sc_vewave_calc_dsoln_2d(self._msd, self._alg)
 
     def ghostgeom_mirror(self, cnp.ndarray[int, ndim=2, mode="c"] facn):
         if self._msd.ndim == 3:
@@ -248,34 +323,66 @@ cdef class VewaveAlgorithm(Mesh):
 
     def bound_nonrefl_soln(self, cnp.ndarray[int, ndim=2, mode="c"] facn):
         if self._msd.ndim == 3:
-            sc_vewave_bound_nonrefl_soln_3d(self._msd, self._alg,
-                facn.shape[0], &facn[0,0])
+            if self.float32:
+                sc_vewave_bound_nonrefl_soln_3d_float32(self._msd, self._alg,
+                    facn.shape[0], &facn[0,0])
+            else:
+                sc_vewave_bound_nonrefl_soln_3d(self._msd, self._alg,
+                    facn.shape[0], &facn[0,0])
         else:
-            sc_vewave_bound_nonrefl_soln_2d(self._msd, self._alg,
-                facn.shape[0], &facn[0,0])
+            if self.float32:
+                sc_vewave_bound_nonrefl_soln_2d_float32(self._msd, self._alg,
+                    facn.shape[0], &facn[0,0])
+            else:
+                sc_vewave_bound_nonrefl_soln_2d(self._msd, self._alg,
+                    facn.shape[0], &facn[0,0])
 
     def bound_nonrefl_dsoln(self, cnp.ndarray[int, ndim=2, mode="c"] facn):
         if self._msd.ndim == 3:
-            sc_vewave_bound_nonrefl_dsoln_3d(self._msd, self._alg,
-                facn.shape[0], &facn[0,0])
+            if self.float32:
+                sc_vewave_bound_nonrefl_dsoln_3d_float32(self._msd, self._alg,
+                    facn.shape[0], &facn[0,0])
+            else:
+                sc_vewave_bound_nonrefl_dsoln_3d(self._msd, self._alg,
+                    facn.shape[0], &facn[0,0])
         else:
-            sc_vewave_bound_nonrefl_dsoln_2d(self._msd, self._alg,
-                facn.shape[0], &facn[0,0])
+            if self.float32:
+                sc_vewave_bound_nonrefl_dsoln_2d_float32(self._msd, self._alg,
+                    facn.shape[0], &facn[0,0])
+            else:
+                sc_vewave_bound_nonrefl_dsoln_2d(self._msd, self._alg,
+                    facn.shape[0], &facn[0,0])
     
     def bound_longsinex_soln(self, cnp.ndarray[int, ndim=2, mode="c"] facn):
         if self._msd.ndim == 3:
-            sc_vewave_bound_longsinex_soln_3d(self._msd, self._alg,
-                facn.shape[0], &facn[0,0])
+            if self.float32:
+                sc_vewave_bound_longsinex_soln_3d_float32(self._msd, self._alg,
+                    facn.shape[0], &facn[0,0])
+            else:
+                sc_vewave_bound_longsinex_soln_3d(self._msd, self._alg,
+                    facn.shape[0], &facn[0,0])
         else:
-            sc_vewave_bound_longsinex_soln_2d(self._msd, self._alg,
-                facn.shape[0], &facn[0,0])
+            if self.float32:
+                sc_vewave_bound_longsinex_soln_2d_float32(self._msd, self._alg,
+                    facn.shape[0], &facn[0,0])
+            else:
+                sc_vewave_bound_longsinex_soln_2d(self._msd, self._alg,
+                    facn.shape[0], &facn[0,0])
 
     def bound_longsinex_dsoln(self, cnp.ndarray[int, ndim=2, mode="c"] facn):
         if self._msd.ndim == 3:
-            sc_vewave_bound_longsinex_dsoln_3d(self._msd, self._alg,
-                facn.shape[0], &facn[0,0])
+            if self.float32:
+                sc_vewave_bound_longsinex_dsoln_3d_float32(
+                    self._msd, self._alg, facn.shape[0], &facn[0,0])
+            else:
+                sc_vewave_bound_longsinex_dsoln_3d(self._msd, self._alg,
+                    facn.shape[0], &facn[0,0])
         else:
-            sc_vewave_bound_longsinex_dsoln_2d(self._msd, self._alg,
-                facn.shape[0], &facn[0,0])
+            if self.float32:
+                sc_vewave_bound_longsinex_dsoln_2d_float32(
+                    self._msd, self._alg, facn.shape[0], &facn[0,0])
+            else:
+                sc_vewave_bound_longsinex_dsoln_2d(self._msd, self._alg,
+                    facn.shape[0], &facn[0,0])
 
 # vim: set fenc=utf8 ft=pyrex ff=unix ai et sw=4 ts=4 tw=79:
@@ -71,6 +71,8 @@ class VewaveCase(case.MeshCase):
         # time.
         kw['time'] = self.execution.time
         kw['time_increment'] = self.execution.time_increment
+        # storage type of the solution arrays.
+        kw['fpdtype'] = str(self.execution.fpdtype)
         # c-tau scheme parameters.
         kw['alpha'] = int(self.solver.alpha)
         for key in ('sigma0', 'taylor', 'cnbfac', 'sftfac',
@@ -181,7 +181,7 @@ class FillAnchor(anchor.MeshAnchor):
         super(FillAnchor, self).__init__(svr, **kw)
 
     def provide(self):
-        for key, value in self.mappers.iteritems():
+        for key, value in self.mappers.items():
             getattr(self.svr, key).fill(value)
 
 
@@ -209,6 +209,7 @@ class CflAnchor(anchor.MeshAnchor):
         #: Steps to run (:py:class:`int`).
         self.rsteps = int(rsteps)
         super(CflAnchor, self).__init__(svr, **kw)
+        svr.marchret_ops['cfl'] = ['min', 'max', 'sum', 'sum']
 
     def postmarch(self):
         svr = self.svr
@@ -282,12 +283,13 @@ class CflHook(hook.MeshHook):
         info = self.info
         istep = self.cse.execution.step_current
         mr = self.cse.execution.marchret
-        isp = self.cse.is_parallel
+        # a list when every worker reports individually.
+        isp = isinstance(mr, list)
         rsteps = self.rsteps
         psteps = self.psteps
         # collect CFL.
         if istep > 0 and istep%rsteps == 0:
-            nCFL = max([m['cfl'][0] for m in mr]) if isp else mr['cfl'][0]
+            nCFL = min([m['cfl'][0] for m in mr]) if isp else mr['cfl'][0]
             xCFL = max([m['cfl'][1] for m in mr]) if isp else mr['cfl'][1]
             nadj = sum([m['cfl'][2] for m in mr]) if isp else mr['cfl'][2]
             aadj = sum([m['cfl'][3] for m in mr]) if isp else mr['cfl'][3]
@@ -144,25 +144,19 @@ class PlaneWaveHook(hook.MeshHook):
         super(PlaneWaveHook, self).__init__(svr, **kw)
 
     def drop_anchor(self, svr):
-        svr.runanchors.append(
-            PlaneWaveAnchor(svr, planewaves=self.planewaves)
-        )
+        self._deliver_anchor(svr, PlaneWaveAnchor,
+                             dict(planewaves=self.planewaves))
 
     def _calculate(self):
-        neq = self.cse.execution.neq
         var = self.cse.execution.var
         asol = self._collect_interior(
             'analytical', inder=True, consider_ghost=True)
         diff = self._collect_interior(
             'difference', inder=True, consider_ghost=True)
-        norm_Linf = np.empty(neq, dtype='float64')
-        norm_L2 = np.empty(neq, dtype='float64')
         clvol = self.blk.clvol
-        for it in range(neq):
-            norm_Linf[it] = np.abs(diff[:,it]).max()
-            norm_L2[it] = np.sqrt((diff[:,it]**2*clvol).sum())
-        self.norm['Linf'] = norm_Linf
-        self.norm['L2'] = norm_L2
+        # all equations at once.
+        self.norm['Linf'] = np.abs(diff).max(axis=0)
+        self.norm['L2'] = np.sqrt((diff**2*clvol[:,np.newaxis]).sum(axis=0))
 
     def preloop(self):
         self.postmarch()
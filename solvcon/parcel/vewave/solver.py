@@ -71,6 +71,16 @@ class VewaveSolver(solver.MeshSolver):
         >>> blk.clgrp.fill(0)
         >>> blk.grpnames.append('blank')
         >>> svr = VewaveSolver(blk, {}) # doctest: +ELLIPSIS
+
+        The solution arrays may be stored in float32:
+
+        >>> svr = VewaveSolver(blk, {}, fpdtype='float32')
+        >>> svr.sol.dtype, svr.cecnd.dtype, svr.alg.float32
+        (dtype('float32'), dtype('float64'), True)
+        >>> VewaveSolver(blk, {}, fpdtype='float16')
+        Traceback (most recent call last):
+            ...
+        ValueError: fpdtype float16 is not one of float32, float64
         """
         super(VewaveSolver, self).__init__(blk, **kw)
         # meta data.
@@ -79,6 +89,13 @@ class VewaveSolver(solver.MeshSolver):
         ngstcell = blk.ngstcell
         self.clcnd = blk.clcnd
         fpdtype = 'float64'
+        #: Storage type of the solution arrays, ``'float64'`` or
+        #: ``'float32'``.  The metrics, the parameters, the CFL numbers and
+        #: the arithmetic of the kernels stay in float64.
+        self.fpdtype = str(kw.pop('fpdtype', fpdtype))
+        if self.fpdtype not in ('float32', 'float64'):
+            raise ValueError('fpdtype %s is not one of float32, float64' % (
+                self.fpdtype))
         self.neq = self.determine_neq(ndim)
         #: A :py:class:`dict` that maps names to :py:class:`Material
         #: <.material.Material>` object.
@@ -110,12 +127,13 @@ class VewaveSolver(solver.MeshSolver):
         self.amvec = np.empty((ngstcell+ncell, nvec, ndim), dtype=fpdtype)
         # solutions.
         neq = self.neq
-        self.sol = np.empty((ngstcell+ncell, neq), dtype=fpdtype)
-        self.soln = np.empty((ngstcell+ncell, neq), dtype=fpdtype)
-        self.solt = np.empty((ngstcell+ncell, neq), dtype=fpdtype)
-        self.dsol = np.empty((ngstcell+ncell, neq, ndim), dtype=fpdtype)
-        self.dsoln = np.empty((ngstcell+ncell, neq, ndim), dtype=fpdtype)
-        self.stm = np.empty((ngstcell+ncell, neq), dtype=fpdtype)
+        soldtype = self.fpdtype
+        self.sol = np.empty((ngstcell+ncell, neq), dtype=soldtype)
+        self.soln = np.empty((ngstcell+ncell, neq), dtype=soldtype)
+        self.solt = np.empty((ngstcell+ncell, neq), dtype=soldtype)
+        self.dsol = np.empty((ngstcell+ncell, neq, ndim), dtype=soldtype)
+        self.dsoln = np.empty((ngstcell+ncell, neq, ndim), dtype=soldtype)
+        self.stm = np.empty((ngstcell+ncell, neq), dtype=soldtype)
         self.cfl = np.empty(ngstcell+ncell, dtype=fpdtype)
         self.ocfl = np.empty(ngstcell+ncell, dtype=fpdtype)
         alg = _algorithm.VewaveAlgorithm()
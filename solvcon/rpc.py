@@ -59,6 +59,7 @@ class Command(Notice):
     """
     def __init__(self, methodname, *args, **kw):
         self.with_worker = kw.pop('with_worker', False)
+        self.with_barrier = kw.pop('with_barrier', False)
         self.methodname = methodname
         self.args = args
         self.kw = kw
@@ -68,6 +69,51 @@ class Control(Command):
     """
     pass
 
+def can_fork():
+    """
+    Check if worker processes can be forked to inherit the memory of the
+    master.
+
+    >>> can_fork() == (not sys.platform.startswith('win'))
+    True
+    """
+    import multiprocessing
+    return 'fork' in multiprocessing.get_all_start_methods()
+
+def reduce_value(op, lhs, rhs):
+    """
+    Combine two values reported by workers.  *op* is ``'sum'``, ``'max'``,
+    ``'min'``, a list of them applied element-wise to lists, or a
+    :py:class:`dict` of them applied key-wise to dictionaries.  A string *op*
+    applied to dictionaries combines the values of the same key.
+
+    >>> reduce_value('max', 1.0, 2.0)
+    2.0
+    >>> reduce_value(['min', 'max', 'sum'], [1, 4, 2], [3, 2, 2])
+    [1, 4, 4]
+    >>> sorted(reduce_value({'a': 'sum', 'b': 'max'},
+    ...     {'a': 1, 'b': {'x': 1}}, {'a': 2, 'b': {'x': 3, 'y': 0}}).items())
+    [('a', 3), ('b', {'x': 3, 'y': 0})]
+    """
+    if isinstance(op, (list, tuple)):
+        return [reduce_value(*args) for args in zip(op, lhs, rhs)]
+    elif isinstance(op, dict) or isinstance(lhs, dict):
+        ret = dict(lhs)
+        for key, val in rhs.items():
+            if key in ret:
+                kop = op[key] if isinstance(op, dict) else op
+                val = reduce_value(kop, ret[key], val)
+            ret[key] = val
+        return ret
+    elif op == 'sum':
+        return lhs + rhs
+    elif op == 'max':
+        return max(lhs, rhs)
+    elif op == 'min':
+        return min(lhs, rhs)
+    else:
+        raise ValueError('op can\'t be %s' % op)
+
 class Worker(object):
     """
     The whole worker object will run remotely (means in separated process).
@@ -117,6 +163,19 @@ class Worker(object):
         #: Dictionary of :py:class:`multiprocessing.Connection` objects to
         #: peers.
         self.pconns = dict()
+        #: The muscle replaced by :py:meth:`replace_solver` and kept for
+        #: :py:meth:`carry_anchors`.
+        self.displaced = None
+        #: The split domain inherited from the master when the worker process
+        #: is forked (see :py:meth:`Dealer.hire`); it never goes through the
+        #: connection.
+        self.domain = None
+        #: Serial number of the parent worker in the spanning tree for
+        #: reduction (see :py:meth:`Dealer.span`); ``None`` for the root.
+        self.tree_parent = None
+        #: Serial numbers of the children workers in the spanning tree;
+        #: ``None`` when no tree is spanned.
+        self.tree_children = None
         self.do_profile = True if profiler_data else False
         self.profiler_dat = profiler_data[0] if profiler_data else None
         self.profiler_log = profiler_data[1] if profiler_data else None
@@ -130,16 +189,29 @@ class Worker(object):
             ntc = self.conn.recv()
             try:
                 if isinstance(ntc, Command):
-                    obj = self.muscle
-                    if isinstance(ntc, Control):
-                        obj = self
-                    method = getattr(obj, ntc.methodname)
-                    if ntc.with_worker:
-                        ntc.kw.update(worker=self)
-                    ret = method(*ntc.args, **ntc.kw)
+                    self.dispatch(ntc)
             except Terminate:
                 break
 
+    def dispatch(self, ntc):
+        """
+        Run a command on the muscle, or on the worker itself for a control.
+
+        @param ntc: the command.
+        @type ntc: Command
+        @return: nothing
+        """
+        obj = self.muscle
+        if isinstance(ntc, Control):
+            obj = self
+        method = getattr(obj, ntc.methodname)
+        if ntc.with_worker:
+            ntc.kw.update(worker=self)
+        ret = method(*ntc.args, **ntc.kw)
+        # acknowledge the completion in the same round trip.
+        if getattr(ntc, 'with_barrier', False):
+            self.conn.send(Barrier)
+
     def eventloop(self):
         import cProfile
         import pstats
@@ -192,14 +264,24 @@ class Worker(object):
         :type address: str or tuple
         :param authkey: authentication key for connection.
         :type authkey: str
+        :keyword ready: connection to notify the dealer that the listener is
+            ready.
+        :type ready: multiprocessing.Connection
         :return: Nothing.
         """
+        import socket
         from .conf import env
         from .connection import Listener
-        # listen on the given address and accept connection.
-        self.lsnr = Listener(address=address, authkey=authkey)
+        ready = kw.pop('ready', None)
+        # listen on the given address and accept connection.  The backlog
+        # allows all peers to connect at once (see bridge_peers).
+        self.lsnr = Listener(address=address, authkey=authkey,
+                             backlog=socket.SOMAXCONN)
         if address[1] == 0 and env.mpi:
             env.mpi.send(self.lsnr.address[1], 0, 1)
+        if ready is not None:
+            ready.send(self.lsnr.address)
+            ready.close()
         self.conn = self.lsnr.accept()
         # start eventloop.
         if self.debug: self._set_debug_output()
@@ -312,6 +394,45 @@ class Worker(object):
         conn = Client(address=address, authkey=authkey)
         self.pconns[peern] = conn
 
+    def bridge_peers(self, accepts, connects, authkey):
+        """
+        Connect to many peers at once.  Connections from the peers with
+        serial numbers in *accepts* are accepted in a separate thread, while
+        this worker connects to the peers in *connects*, so that the peers
+        don't wait for each other.  A barrier is sent to the dealer when all
+        connections are made.
+
+        @param accepts: serial numbers of the peers to accept.
+        @type accepts: list
+        @param connects: pairs of the serial numbers and addresses of the peers
+            to connect to.
+        @type connects: list
+        @param authkey: authentication key for connection.
+        @type authkey: str
+        """
+        import threading
+        from .connection import Client
+        lsnr = self.lsnr
+        accepted = dict()
+        def accept():
+            for it in range(len(accepts)):
+                conn = lsnr.accept()
+                # the connecting peer tells who it is.
+                accepted[conn.recv()] = conn
+        thread = threading.Thread(target=accept)
+        thread.start()
+        for peern, address in connects:
+            conn = Client(address=address, authkey=authkey)
+            conn.send(self.serial)
+            self.pconns[peern] = conn
+        thread.join()
+        if sorted(accepted) != sorted(accepts):
+            raise ValueError('%s != %s' % (sorted(accepted), sorted(accepts)))
+        for peern in accepted:
+            self.plsnrs[peern] = lsnr
+            self.pconns[peern] = accepted[peern]
+        self.barrier()
+
     def set_peer(self, src, dst):
         """
         Create MPI proxy for a pair of p2p connection.
@@ -324,6 +445,80 @@ class Worker(object):
         from .connection import MPIConnection
         self.pconns[dst] = MPIConnection(src+1, dst+1)
 
+    def drop_peers(self):
+        """
+        Close and forget all the connections to peers, so that the peers can
+        be bridged again for a new decomposition of the domain.  The listener
+        is shared with the master and kept open.
+        """
+        for pconn in self.pconns.values():
+            if hasattr(pconn, 'close'):
+                pconn.close()
+        self.pconns.clear()
+        self.plsnrs.clear()
+        self.tree_parent = None
+        self.tree_children = None
+
+    def set_tree(self, parent, children):
+        """
+        Set the position of the worker in the spanning tree for reduction.
+
+        @param parent: serial number of the parent worker; None for the root.
+        @type parent: int
+        @param children: serial numbers of the children workers.
+        @type children: list
+        """
+        self.tree_parent = parent
+        self.tree_children = list(children)
+
+    def reduce(self, value, op):
+        """
+        Reduce a value over all workers along the spanning tree through the
+        peer connections.  Each worker combines the values of its children
+        with its own and passes the result to its parent.
+
+        @param value: the value of this worker.
+        @param op: the reduction (see :py:func:`reduce_value`).
+        @return: the reduced value on the root worker; None elsewhere.
+        """
+        for child in self.tree_children:
+            value = reduce_value(op, value, self.pconns[child].recv())
+        if self.tree_parent is None:
+            return value
+        self.pconns[self.tree_parent].send(value)
+
+    def report(self, marchret, ops):
+        """
+        Send the return of marching to the master.  Without a spanning tree
+        every worker sends its own.  With the tree the entries having a
+        reduction in *ops* are reduced over the workers, others are collected
+        into lists ordered by the serial numbers of workers, and only the root
+        sends the result.
+
+        @param marchret: the return of marching of this worker.
+        @type marchret: dict
+        @param ops: the reductions of the entries.
+        @type ops: dict
+        """
+        if self.tree_children is None:
+            self.conn.send(marchret)
+            return
+        if not isinstance(marchret, dict):
+            value = self.reduce({self.serial: marchret}, 'sum')
+            if value is not None:
+                self.conn.send([value[it] for it in sorted(value)])
+            return
+        value = dict()
+        for key, val in marchret.items():
+            value[key] = val if key in ops else {self.serial: val}
+        value = self.reduce(value, dict((key, ops.get(key, 'sum'))
+                                        for key in marchret))
+        if value is not None:
+            for key, val in value.items():
+                if key not in ops:
+                    value[key] = [val[it] for it in sorted(val)]
+            self.conn.send(value)
+
     def get_port_by_mpi(self, dst, tag):
         port = self.mpi.recv(dst, tag)
         self.conn.send(port)
@@ -363,17 +558,86 @@ class Worker(object):
             svr.unbind()
         self.muscle = svr
 
+    def create_solver_inherited(self, iblk, nblk, solvertype, svrkw):
+        """
+        Create a solver object from the sub-block in the inherited
+        :py:attr:`domain`, and set it to muscle.  The block is shared with the
+        master through fork() rather than pickled and sent.
+
+        @param iblk: index of the sub-block.
+        @type iblk: int
+        @param nblk: number of total blocks (sub-domains).
+        @type nblk: int
+        @param solvertype: the type of solver to be created.
+        @type solvertype: type
+        @param svrkw: keywords passed to the constructor of solver.
+        @type svrkw: dict
+        @return: nothing
+        """
+        svr = solvertype(self.domain[iblk], **svrkw)
+        svr.svrn = iblk
+        svr.nsvr = nblk
+        self.muscle = svr
+        # release the other sub-blocks.
+        self.domain = None
+
+    def reset_solver(self, solvertype, svrkw):
+        """
+        Replace the muscle with a new solver object on the same block, so that
+        the worker, its peer connections, and the block can be reused.
+
+        @param solvertype: the type of solver to be created.
+        @type solvertype: type
+        @param svrkw: keywords passed to the constructor of solver.
+        @type svrkw: dict
+        @return: nothing
+        """
+        old = self.muscle
+        svr = solvertype(old.blk, **svrkw)
+        svr.svrn = old.svrn
+        svr.nsvr = old.nsvr
+        self.muscle = svr
+
+    def replace_solver(self, svr):
+        """
+        Replace the muscle with a solver on a new sub-block of the
+        repartitioned domain.  The old muscle is kept for
+        :py:meth:`carry_anchors`.
+
+        @param svr: the new solver object.
+        @type svr: solvcon.solver.MeshSolver
+        @return: nothing
+        """
+        self.displaced = self.muscle
+        self.muscle = svr
+
+    def carry_anchors(self):
+        """
+        Let the anchors of the muscle take over the state of those of the
+        muscle replaced by :py:meth:`replace_solver`, and release the latter.
+
+        @return: nothing
+        """
+        self.muscle.runanchors.carry(self.displaced.runanchors)
+        self.displaced = None
+
     def drop_anchor(self, ankcls, ankkw):
         """
-        Create an anchor object and append it to the solver muscle.
+        Create an anchor object and append it to the solver muscle.  The same
+        as solvcon.hook.Hook._deliver_anchor on the master.
 
-        @param ankcls: anchor type.
-        @type ankcls: type
+        @param ankcls: anchor type or factory.
+        @type ankcls: type or callable
         @param ankkw: keywords to the constructor of the anchor.
         @type ankkw: dict
         @return: nothing
         """
-        self.muscle.runanchors.append(ankcls, **ankkw)
+        ankkw = dict(ankkw)
+        name = ankkw.pop('name', None)
+        obj = ankcls
+        if callable(obj):
+            obj = obj(self.muscle, **ankkw)
+        self.muscle.runanchors.append(obj, name='' if not name else name)
 
 class Agent(object):
     """
@@ -471,26 +735,55 @@ class Dealer(list):
 
         @param worker: worker object.
         @type worker: Worker
-        @keyword wait_for_accept: seconds to wait after accepting.  If None use
-            DEFAULT.
+        @keyword wait_for_accept: unused; the dealer waits for the worker to
+            be ready (see :py:meth:`hire_all`).
         @type wait_for_accept: float
         """
-        from time import sleep
-        from multiprocessing import Process
+        self.hire_all([worker])
+
+    def hire_all(self, workers):
+        """
+        Create processes for all the worker objects at once.  Each worker
+        reports through a pipe when it is listening, and the dealer connects
+        to the workers once they are ready, so that the startup of the
+        workers overlaps.
+
+        @param workers: worker objects.
+        @type workers: list
+
+        A worker carrying a :py:attr:`Worker.domain` is always forked, so that
+        the domain is inherited instead of pickled.
+        """
+        import multiprocessing
         from .connection import guess_address, Client
-        # create and start the process.
-        address = guess_address(self.family)
-        proc = Process(
-            target=worker.run,
-            args=(address, self.authkey),
-        )
-        proc.start()
-        sleep(wait_for_accept if wait_for_accept!=None else self.WAIT_FOR_ACCEPT)
-        # connect to the created process and make its shadow.
-        conn = Client(address=address, authkey=self.authkey)
-        shadow = Shadow(conn=conn, address=address)
-        shadow.remote_setattr('serial', len(self))
-        self.append(shadow)
+        # create and start all the processes.
+        pending = list()
+        for worker in workers:
+            address = guess_address(self.family)
+            if worker.domain is not None:
+                ctx = multiprocessing.get_context('fork')
+            else:
+                ctx = multiprocessing.get_context()
+            rconn, wconn = ctx.Pipe(duplex=False)
+            proc = ctx.Process(
+                target=worker.run,
+                args=(address, self.authkey),
+                kwargs=dict(ready=wconn),
+            )
+            proc.start()
+            wconn.close()
+            pending.append((rconn, address))
+        # wait for the listeners and connect to the created processes.
+        for rconn, address in pending:
+            try:
+                rconn.recv()
+            except EOFError:
+                raise IOError('worker at %s failed to start' % str(address))
+            rconn.close()
+            conn = Client(address=address, authkey=self.authkey)
+            shadow = Shadow(conn=conn, address=address)
+            shadow.remote_setattr('serial', len(self))
+            self.append(shadow)
 
     def appoint(self, inetaddr, port, authkey):
         """
@@ -545,12 +838,74 @@ class Dealer(list):
                 if wait_for_accept!=None else self.WAIT_FOR_ACCEPT)
             self[plow].connect_peer(phigh, address, self.authkey)
 
+    def bridge_all(self, pairs):
+        """
+        Tell all the pairs of peering workers to establish connections at
+        once.  For each pair the higher worker accepts the connection from the
+        lower one.  Every worker accepts and connects concurrently (see
+        :py:meth:`Worker.bridge_peers`), so that the time to bridge doesn't
+        grow with the number of workers.
+
+        @param pairs: pairs of the serial numbers of peering workers.
+        @type pairs: list
+        """
+        from .conf import env
+        if env.mpi:
+            for peers in pairs:
+                self.bridge(peers)
+            return
+        accepts = [list() for it in range(len(self))]
+        connects = [list() for it in range(len(self))]
+        for plow, phigh in pairs:
+            assert plow != phigh    # makes no sense.
+            if plow > phigh:
+                plow, phigh = phigh, plow
+            if plow in accepts[phigh]:
+                continue
+            accepts[phigh].append(plow)
+            connects[plow].append((phigh, self[phigh].address))
+        for sdw, accs, cons in zip(self, accepts, connects):
+            if accs or cons:
+                sdw.bridge_peers(accs, cons, self.authkey)
+        for sdw, accs, cons in zip(self, accepts, connects):
+            if accs or cons:
+                assert issubclass(sdw.recv(), Barrier)
+
     def span(self, graph):
+        """
+        Span a tree over the graph of peering workers and tell each worker its
+        parent and children, so that the workers can reduce values without the
+        master (see :py:meth:`Worker.reduce`).  The edges of the graph must
+        have been bridged.  The tree is spanned breadth-first to keep it
+        shallow.
+
+        @param graph: the neighboring workers of each worker.
+        @type graph: dict
+        @return: False if the graph isn't connected and no tree is spanned.
+        @rtype: bool
+        """
+        from collections import deque
         from .connection import SpanningTreeNode
-        self.spanhead = SpanningTreeNode(val=0, level=0)
-        visited = dict()
-        self.spanhead.traverse(graph, visited)
-        assert len(graph) == len(visited)
+        head = SpanningTreeNode(val=0, level=0)
+        visited = {0: head}
+        pending = deque([head])
+        while pending:
+            node = pending.popleft()
+            for it in graph[node.val]:
+                if it not in visited:
+                    node[it] = visited[it] = SpanningTreeNode(
+                        val=it, level=node.level+1)
+                    pending.append(node[it])
+        if len(visited) != len(graph):
+            self.spanhead = None
+            return False
+        self.spanhead = head
+        pending = [(None, head)]
+        while pending:
+            parent, node = pending.pop()
+            self[node.val].set_tree(parent, sorted(node.keys()))
+            pending.extend((node.val, child) for child in node.values())
+        return True
 
     def terminate(self, idx=slice(None,None,None), msg=None):
         """
@@ -579,11 +934,174 @@ class Dealer(list):
         import sys
         for sdw in self[idx]:
             sdw.barrier()
-        for sdw in self[idx]:
-            assert issubclass(sdw.recv(), Barrier)
+        for ret in self.gather(idx):
+            assert issubclass(ret, Barrier)
+        if msg:
+            sys.stdout.write(msg)
+
+    def issue(self, methodname, *args, **kw):
+        """
+        Send the same command to the muscles of all workers.  The command is
+        pickled only once.
+
+        @param methodname: name of the method of the muscle to call.
+        @type methodname: str
+        @return: nothing
+        """
+        from multiprocessing.reduction import ForkingPickler
+        buf = ForkingPickler.dumps(Command(methodname, *args, **kw))
+        for sdw in self:
+            sdw.conn.send_bytes(buf)
+
+    def gather(self, idx=slice(None,None,None)):
+        """
+        Receive one reply from each of the workers, in the order the replies
+        arrive, so that a slow worker doesn't hold the others' replies.
+
+        @param idx: what to receive from.
+        @type idx: slice
+        @return: the replies in the order of the workers.
+        @rtype: list
+        """
+        import selectors
+        sdws = self[idx]
+        rets = [None] * len(sdws)
+        sel = selectors.DefaultSelector()
+        for it, sdw in enumerate(sdws):
+            sel.register(sdw.conn, selectors.EVENT_READ, it)
+        nleft = len(sdws)
+        while nleft:
+            for key, events in sel.select():
+                rets[key.data] = sdws[key.data].recv()
+                sel.unregister(key.fileobj)
+                nleft -= 1
+        sel.close()
+        return rets
+
+    def call(self, methodname, *args, **kw):
+        """
+        Send the same command to the muscles of all workers and wait for all
+        of them to finish.  The acknowledgement replaces a separate barrier.
+
+        @param methodname: name of the method of the muscle to call.
+        @type methodname: str
+        @return: nothing
+        """
+        kw['with_barrier'] = True
+        self.issue(methodname, *args, **kw)
+        for ret in self.gather():
+            assert issubclass(ret, Barrier)
+
+class LocalConnection(object):
+    """
+    Connection between a shadow and a worker in the same process.  What is
+    sent is received in order from the other end.
+
+    >>> conn = LocalConnection()
+    >>> conn.send(1); conn.send('two')
+    >>> conn.recv(), conn.recv()
+    (1, 'two')
+    """
+    def __init__(self):
+        from collections import deque
+        self.buffer = deque()
+
+    def send(self, obj):
+        self.buffer.append(obj)
+
+    def recv(self):
+        return self.buffer.popleft()
+
+class LocalAgent(Agent):
+    """
+    Agent running the notices on a worker in the same process right away,
+    instead of sending them.
+
+    @ivar worker: the worker to run the notices.
+    @itype worker: Worker
+    """
+    def __init__(self, worker, noticetype=Command):
+        super(LocalAgent, self).__init__(conn=worker.conn,
+                                         noticetype=noticetype)
+        self.worker = worker
+
+    def __getattr__(self, name):
+        worker = self.worker
+        ntype = self.noticetype
+        def func(*arg, **kw):
+            worker.dispatch(ntype(name, *arg, **kw))
+        return func
+
+class LocalShadow(Shadow):
+    """
+    Shadow to a worker in the same process.  The worker shares the
+    :py:class:`LocalConnection` with the shadow.
+
+    @ivar worker: the worker.
+    @itype worker: Worker
+    """
+    def __init__(self, worker):
+        worker.conn = LocalConnection()
+        super(LocalShadow, self).__init__(conn=worker.conn)
+        self.worker = worker
+        self.cmd = LocalAgent(worker, noticetype=Command)
+        self.ctl = LocalAgent(worker, noticetype=Control)
+
+class LocalDealer(Dealer):
+    """
+    Contains shadows to the workers of the solvers in the same process, which
+    are marched by threads (see :py:attr:`solvcon.case.MeshCase.is_threaded`)
+    rather than by worker processes.  The commands run in the calling thread,
+    so that the hooks work with the local solvers the same as with the remote
+    ones.
+
+    >>> class Muscle(object):
+    ...     def __init__(self, val): self.val = val
+    ...     def pull(self, worker=None): worker.conn.send(self.val)
+    >>> dealer = LocalDealer([Muscle(1), Muscle(2)])
+    >>> dealer.issue('pull', with_worker=True)
+    >>> dealer.gather()
+    [1, 2]
+    >>> dealer.barrier()
+    >>> dealer.terminate()
+    """
+    def __init__(self, muscles, **kw):
+        super(LocalDealer, self).__init__(**kw)
+        for muscle in muscles:
+            worker = Worker(muscle)
+            worker.serial = len(self)
+            self.append(LocalShadow(worker))
+
+    def terminate(self, idx=slice(None,None,None), msg=None):
+        """
+        Nothing to terminate for the workers in the same process.
+        """
+        import sys
         if msg:
             sys.stdout.write(msg)
 
+    def issue(self, methodname, *args, **kw):
+        """
+        Run the same command on the muscles of all workers.
+
+        @param methodname: name of the method of the muscle to call.
+        @type methodname: str
+        @return: nothing
+        """
+        for sdw in self:
+            sdw.worker.dispatch(Command(methodname, *args, **kw))
+
+    def gather(self, idx=slice(None,None,None)):
+        """
+        Receive one reply from each of the workers.
+
+        @param idx: what to receive from.
+        @type idx: slice
+        @return: the replies in the order of the workers.
+        @rtype: list
+        """
+        return [sdw.recv() for sdw in self[idx]]
+
 ###############################################################################
 # Remote invocation.
 ###############################################################################
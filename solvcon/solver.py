@@ -36,6 +36,7 @@ Definition of the structure of solvers.
 import os
 import time
 import itertools
+from numbers import Number
 
 import numpy as np
 
@@ -100,7 +101,7 @@ class MeshSolver(metaclass=MeshSolverMeta):
     ALMOST_ZERO = solver_core.ALMOST_ZERO
 
     def __init__(self, blk, time=0.0, time_increment=0.0, enable_mesg=False,
-            debug=False, **kw):
+            debug=False, nthread=None, **kw):
         """
         A :py:class:`solvcon.block.Block` object must be provided to set the
         :py:attr:`blk` attribute.  The attribute holds the mesh data.
@@ -154,6 +155,10 @@ class MeshSolver(metaclass=MeshSolverMeta):
         # marching facilities.
         self.runanchors = anchor.MeshAnchorList(self)
         self.marchret = None
+        #: Reductions of the entries of :py:attr:`marchret` over the parallel
+        #: solvers (see :py:func:`solvcon.rpc.reduce_value`).  Entries without
+        #: a reduction are collected into lists.
+        self.marchret_ops = dict()
         self.der = dict()
         # reporting facility.
         self.timer = gendata.Timer(vtype=float)
@@ -161,6 +166,9 @@ class MeshSolver(metaclass=MeshSolverMeta):
         self._mesg = None
         #: Debugging flag.
         self.debug = debug
+        #: Number of threads to run the kernels with in the process of the
+        #: solver.  ``None`` leaves the default of OpenMP.
+        self.nthread = nthread
 
     ############################################################################
     # Meta data.
@@ -330,8 +338,10 @@ class MeshSolver(metaclass=MeshSolverMeta):
         :py:meth:`march` will return the dictionary at the end of execution.
         The dictionary is reset to empty at the begninning of the execution.
         """
+        from .mesh import get_nthread
         self.marchret = dict()
         self.step_current = 0
+        self.timer['nthread'] = float(get_nthread())
         self.runanchors('premarch')
         while self.step_current < steps_run:
             self.substep_current = 0
@@ -370,7 +380,7 @@ class MeshSolver(metaclass=MeshSolverMeta):
             self.runanchors('postfull')
         self.runanchors('postmarch')
         if worker:
-            worker.conn.send(self.marchret)
+            worker.report(self.marchret, self.marchret_ops)
         return self.marchret
 
     def init(self, **kw):
@@ -379,6 +389,9 @@ class MeshSolver(metaclass=MeshSolverMeta):
 
         Check and initialize BCs.
         """
+        if self.nthread is not None:
+            from .mesh import set_nthread
+            set_nthread(self.nthread)
         for arrname in self._solution_array_:
             arr = getattr(self, arrname)
             arr.fill(self.ALMOST_ZERO) # prevent initializer forgets to set!
@@ -481,7 +494,7 @@ class MeshSolver(metaclass=MeshSolverMeta):
         # grab peer index.
         ibclist = list()
         for pair in ifacelist:
-            if pair < 0:
+            if isinstance(pair, Number) and pair < 0:
                 ibclist.append(pair)
             else:
                 assert len(pair) == 2
@@ -497,11 +510,12 @@ class MeshSolver(metaclass=MeshSolverMeta):
         self.ibclist = ibclist
 
     def exchangeibc(self, arrname, worker=None):
-        threads = list()
-        for ibc in self.ibclist:
-            # check if sleep or not.
-            if ibc < 0:
-                continue 
+        ibcs = [ibc for ibc in self.ibclist if not isinstance(ibc, int)]
+        conns = [worker.pconns[bc.rblkn] for bc, sendn, recvn in ibcs]
+        if conns and all(hasattr(conn, 'irecvarr') for conn in conns):
+            self._exchangeibc_nonblocking(arrname, ibcs, conns)
+            return
+        for ibc in ibcs:
             bc, sendn, recvn = ibc
             # determine callable and arguments.
             if self.svrn == sendn:
@@ -517,6 +531,30 @@ class MeshSolver(metaclass=MeshSolverMeta):
             # call to data transfer.
             target(*args, **kwargs)
 
+    def _exchangeibc_nonblocking(self, arrname, ibcs, conns):
+        """
+        Post the transfers of all interfaces at once and wait for them
+        together, instead of exchanging interface by interface.  Every side
+        sends the cells the peer needs and receives its ghost cells, so that
+        the order doesn't matter.
+        """
+        ngstcell = self.ngstcell
+        arr = getattr(self, arrname)
+        rarrs = list()
+        for (bc, sendn, recvn), conn in zip(ibcs, conns):
+            shape = list(arr.shape)
+            shape[0] = bc.rclp.shape[0]
+            rarr = np.empty(shape, dtype=arr.dtype)
+            conn.irecvarr(rarr)  # comm.
+            rarrs.append(rarr)
+        for (bc, sendn, recvn), conn in zip(ibcs, conns):
+            slct = bc.rclp[:,2] + ngstcell
+            conn.isendarr(arr[slct]) # comm.
+        conns[0].waitall()
+        for (bc, sendn, recvn), rarr in zip(ibcs, rarrs):
+            slct = bc.rclp[:,0] + ngstcell
+            arr[slct] = rarr[:]
+
     def pushibc(self, arrname, bc, recvn, worker=None):
         """
         :param arrname: The name of the array in the object to exchange.
@@ -5,6 +5,7 @@ import os
 from unittest import TestCase
 
 from ..solver import BlockSolver
+from ..anchor import MeshAnchor, MeshAnchorList
 
 class CustomBlockSolver(BlockSolver):
     DEBUG_FILENAME_DEFAULT = os.devnull
@@ -206,3 +207,100 @@ class TestAnchor(TestCase):
         # run.
         svr.march(self.time, self.time_increment, self.nsteps)
         svr.final()
+
+class TestRuntimeSample(TestCase):
+    class FakeSolver(object):
+        def __init__(self):
+            self.lines = list()
+        def mesg(self, line):
+            self.lines.append(line)
+
+    def test_ring(self):
+        from ..anchor import RuntimeSampler
+        sampler = RuntimeSampler(size=4)
+        for it in range(6):
+            sampler.sample()
+        arr, count = sampler.read()
+        self.assertEqual(6, count)
+        self.assertEqual((4, len(sampler.FIELDS)), arr.shape)
+        self.assertTrue((arr[1:,0] >= arr[:-1,0]).all())
+        arr, count = sampler.read(5)
+        self.assertEqual(1, arr.shape[0])
+
+    def test_anchor(self):
+        import time
+        from ..anchor import RuntimeSampleAnchor
+        svr = self.FakeSolver()
+        ank = RuntimeSampleAnchor(svr, frequency=200, size=8)
+        ank.preloop()
+        for it in range(10):
+            time.sleep(0.01)
+            ank.postfull()
+        ank.postloop()
+        self.assertEqual(ank.sampler.count, ank.nflushed)
+        self.assertTrue(len(svr.lines) > 0)
+        arr, xval, xlabel = RuntimeSampleAnchor._parse(svr.lines, True)
+        self.assertEqual(len(svr.lines), arr.shape[0])
+        self.assertTrue((arr[:,0] > 0).all())
+
+    def test_carry(self):
+        import time
+        from ..anchor import RuntimeSampleAnchor
+        old = RuntimeSampleAnchor(self.FakeSolver(), frequency=200, size=8)
+        old.preloop()
+        time.sleep(0.02)
+        old.postfull()
+        svr = self.FakeSolver()
+        ank = RuntimeSampleAnchor(svr, frequency=200, size=8)
+        ank.carry(old)
+        self.assertIs(old.sampler, ank.sampler)
+        time.sleep(0.02)
+        ank.postloop()
+        self.assertEqual(ank.sampler.count, ank.nflushed)
+        self.assertEqual(ank.nflushed - old.nflushed, len(svr.lines))
+
+    def test_pickle(self):
+        import time
+        import pickle
+        from ..anchor import RuntimeSampleAnchor
+        ank = RuntimeSampleAnchor(self.FakeSolver(), frequency=200, size=8)
+        ank.sampler.sample()
+        ank = pickle.loads(pickle.dumps(ank))
+        self.assertEqual(1, ank.sampler.count)
+        ank.preloop()
+        time.sleep(0.02)
+        ank.postloop()
+        self.assertEqual(ank.sampler.count, ank.nflushed)
+        self.assertEqual(ank.nflushed, len(ank.svr.lines))
+
+class CountAnchor(MeshAnchor):
+    def __init__(self, svr, **kw):
+        super(CountAnchor, self).__init__(svr, **kw)
+        self.count = 0
+    def postmarch(self):
+        self.count += 1
+    def carry(self, old):
+        self.count = old.count
+
+class TestMeshAnchorListCarry(TestCase):
+    class FakeSolver(object):
+        def __init__(self, *ankclss):
+            self.runanchors = MeshAnchorList(self)
+            for ankcls in ankclss:
+                self.runanchors.append(ankcls)
+
+    def test_carry(self):
+        old = self.FakeSolver(CountAnchor, MeshAnchor)
+        old.runanchors('postmarch')
+        old.runanchors('postmarch')
+        new = self.FakeSolver(CountAnchor, MeshAnchor)
+        new.runanchors.carry(old.runanchors)
+        self.assertEqual(2, new.runanchors[0].count)
+        self.assertIs(new, new.runanchors[0].svr)
+
+    def test_mismatch(self):
+        old = self.FakeSolver(CountAnchor, MeshAnchor)
+        new = self.FakeSolver(CountAnchor)
+        self.assertRaises(ValueError, new.runanchors.carry, old.runanchors)
+        new = self.FakeSolver(MeshAnchor, CountAnchor)
+        self.assertRaises(TypeError, new.runanchors.carry, old.runanchors)
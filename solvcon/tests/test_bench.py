@@ -0,0 +1,80 @@
+# -*- coding: UTF-8 -*-
+
+
+from unittest import TestCase
+
+import numpy as np
+
+from .. import bench
+
+
+class BoxMesherTest(TestCase):
+    def test_sizes(self):
+        for elemtype, ncell in (('tri', 5000), ('quad', 10000),
+                                ('tet', 6000), ('hex', 1000),
+                                ('prism', 2000)):
+            mesher = bench.BoxMesher(elemtype, ncell)
+            self.assertEqual(ncell, mesher.ncell)
+            self.assertEqual(ncell, mesher.make_cells().shape[0])
+
+    def test_cells_cover_nodes(self):
+        for elemtype in bench.ELEMTYPES:
+            mesher = bench.BoxMesher(elemtype, 100)
+            ndcrd = mesher.make_nodes()
+            clnds = mesher.make_cells()
+            self.assertEqual(list(range(ndcrd.shape[0])),
+                             np.unique(clnds).tolist())
+
+    def test_tet_volume(self):
+        mesher = bench.BoxMesher('tet', 48)
+        ndcrd = mesher.make_nodes()
+        clnds = mesher.make_cells()
+        vecs = ndcrd[clnds[:,1:]] - ndcrd[clnds[:,:1]]
+        vols = np.linalg.det(vecs) / 6
+        self.assertTrue((vols > 0).all())
+        self.assertAlmostEqual(1.0, vols.sum())
+
+    def test_block(self):
+        blk = bench.BoxMesher('hex', 64).toblock()
+        self.assertEqual(64, blk.ncell)
+        self.assertEqual(['left', 'right', 'lower', 'upper', 'rear', 'front'],
+                         [bc.name for bc in blk.bclist])
+        self.assertEqual([16]*6, [len(bc) for bc in blk.bclist])
+        self.assertAlmostEqual(1.0, blk.clvol.sum())
+
+
+class CompareTest(TestCase):
+    def test_regression(self):
+        baseline = {'records': [
+            {'name': 'a', 'mcells': 10.0, 'maxrss': 1000},
+            {'name': 'b', 'mcells': 10.0, 'maxrss': 1000},
+            {'name': 'c', 'skipped': 'unsupported'},
+        ]}
+        result = {'records': [
+            {'name': 'a', 'mcells': 9.5, 'maxrss': 1050},
+            {'name': 'b', 'mcells': 5.0, 'maxrss': 2000},
+            {'name': 'c', 'skipped': 'unsupported'},
+            {'name': 'd', 'mcells': 1.0, 'maxrss': 1000},
+        ]}
+        self.assertEqual(
+            [('b', 'mcells', 10.0, 5.0), ('b', 'maxrss', 1000, 2000)],
+            bench.compare(result, baseline, tolerance=0.1))
+
+
+class RunTest(TestCase):
+    def test_gas(self):
+        record = bench.run_benchmark(
+            bench.Benchmark('gas', 'tri', 200, 0), steps=2)
+        self.assertEqual('gas-tri-200', record['name'])
+        self.assertEqual(2, record['steps'])
+        self.assertTrue(record['mcells'] > 0)
+        self.assertTrue('calcsoln' in record['timer'])
+        # the serial run counts this process once.
+        self.assertTrue(record['maxrss'] <= bench._maxrss())
+
+    def test_skip_parallel(self):
+        record = bench.run_benchmark(
+            bench.Benchmark('linear', 'tri', 200, 2), steps=2)
+        self.assertTrue('skipped' in record)
+
+# vim: set ff=unix fenc=utf8 ft=python ai et sw=4 ts=4 tw=79:
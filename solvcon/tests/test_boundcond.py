@@ -135,3 +135,43 @@ class PickleTC(TestCase):
         data = pickle.dumps(self.bc, 2)
         bc = pickle.loads(data)
         self._check_content(bc)
+
+
+class MatchFacesTC(TestCase):
+
+    def setUp(self):
+        rng = np.random.RandomState(0)
+        self.src = rng.rand(1000, 3)
+        self.src[:,0] = 0
+        self.perm = rng.permutation(1000)
+
+    def test_translation(self):
+        from ..boundcond import match_faces
+        dst = self.src[self.perm] + [2, 0, 0]
+        matched = match_faces(self.src, dst)
+        self.assertEqual(list(range(1000)), self.perm[matched].tolist())
+
+    def test_rotation(self):
+        from ..boundcond import match_faces
+        cos, sin = np.cos(0.3), np.sin(0.3)
+        rotation = np.array([[cos, -sin, 0], [sin, cos, 0], [0, 0, 1]])
+        dst = self.src.dot(rotation.T)[self.perm]
+        matched = match_faces(self.src, dst, shift=[0, 0, 0],
+                              rotation=rotation)
+        self.assertEqual(list(range(1000)), self.perm[matched].tolist())
+
+    def test_shared_hash_cell(self):
+        from ..boundcond import match_faces
+        # both destination centroids hash into the cell [0, 1) of the unit
+        # tolerance, and each source is close to only one of them.
+        src = np.array([[-0.9, 0], [1.9, 0], [5, 0]], dtype='float64')
+        dst = np.array([[5, 0], [0.95, 0], [0.05, 0]], dtype='float64')
+        matched = match_faces(src, dst, shift=[0, 0], tol=1.0)
+        self.assertEqual([2, 1, 0], matched.tolist())
+
+    def test_unmatched(self):
+        from ..boundcond import match_faces
+        dst = self.src[self.perm] + [2, 0, 0]
+        dst[self.perm[:3],1] += 0.5
+        with self.assertRaisesRegex(ValueError, '3 of 1000 faces unmatched'):
+            match_faces(self.src, dst, shift=[2, 0, 0])
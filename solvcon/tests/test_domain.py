@@ -271,6 +271,48 @@ class TestCollective(TestCase):
             writers[-1].write('test%d.vtk'%iblk)
             iblk += 1
 
+class TestRepartition(TestCase):
+    def _make(self):
+        from ..domain import Collective
+        dom = Collective(blk=get_sample_neu())
+        dom.split(2)
+        return dom
+
+    def test_weigh(self):
+        dom = self._make()
+        vwgt = dom.weigh([1.0, 3.0], levels=10)
+        self.assertEqual(dom.blk.ncell, len(vwgt))
+        self.assertTrue((vwgt >= 1).all())
+        ncells = [len(info[2]) for info in dom.idxinfo]
+        rates = [1.0/ncells[0], 3.0/ncells[1]]
+        iblk = rates.index(max(rates))
+        self.assertTrue((vwgt[dom.part==iblk] == 10).all())
+
+    def test_repartition(self):
+        from ..boundcond import bctregy
+        dom = self._make()
+        ncell0 = len(dom.idxinfo[0][2])
+        # make the first block expensive to shrink it.
+        dom.repartition([10.0, 1.0])
+        self.assertEqual(2, dom.nblk)
+        self.assertEqual(2, len(dom))
+        self.assertTrue(len(dom.idxinfo[0][2]) < ncell0)
+        self.assertEqual(dom.blk.ncell, sum(blk.ncell for blk in dom))
+        for blk in dom:
+            ifs = [bc for bc in blk.bclist
+                   if isinstance(bc, bctregy.interface)]
+            self.assertEqual(1, len(ifs))
+
+    def test_collect_spread(self):
+        import numpy as np
+        dom = self._make()
+        arrg = np.arange(dom.blk.ncell*2, dtype='float64').reshape(
+            (dom.blk.ncell, 2))
+        arrs = dom.spread_interior(arrg)
+        for blk, arr in zip(dom, arrs):
+            self.assertEqual(blk.ngstcell+blk.ncell, arr.shape[0])
+        self.assertTrue((arrg == dom.collect_interior(arrs)).all())
+
 class TestInterface(TestCase):
     def test_oblique2(self):
         from ..domain import Collective
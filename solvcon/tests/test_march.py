@@ -2,6 +2,7 @@
 # Copyright (C) 2016 by Yung-Yu Chen.  See LICENSE.txt for terms of usage.
 
 
+import gc
 import unittest
 from unittest import TestCase
 
@@ -33,3 +34,73 @@ class TestGasSolver(TestCase):
         for cls in (march.gas.Solver2D, march.gas.Solver3D):
             self.assertEqual(getattr(cls, '_interface_init_'), ('cecnd',))
             self.assertEqual(getattr(cls, '_solution_array_'), tuple())
+
+    def test_fpdtype(self):
+        for cls in (march.gas.Solver2D, march.gas.Solver3D):
+            self.assertEqual(cls.fpdtype, 'float64')
+        for cls in (march.gas.Solver2DFloat32, march.gas.Solver3DFloat32):
+            self.assertEqual(cls.fpdtype, 'float32')
+            self.assertEqual(getattr(cls, '_interface_init_'), ('cecnd',))
+            self.assertEqual(getattr(cls, '_solution_array_'), tuple())
+
+    def test_local_cfl(self):
+        svr = march.gas.Solver2D(
+            get_blk_from_oblique_neu(),
+            sigma0=3,
+            time=0,
+            time_increment=0.1,
+            report_interval=0,
+            local_cfl=0.8,
+        )
+        self.assertEqual(0.8, svr.param.local_cfl)
+        self.assertTrue((svr.sol.ldt.F == 0).all())
+        self.assertTrue(np.isnan(svr.state.residual))
+
+    def test_multirate(self):
+        svr = march.gas.Solver2D(
+            get_blk_from_oblique_neu(),
+            sigma0=3,
+            time=0,
+            time_increment=0.1,
+            report_interval=0,
+            multirate_nlevel=3,
+        )
+        self.assertEqual(3, svr.param.multirate_nlevel)
+        self.assertEqual(0.9, svr.param.multirate_cfl)
+
+
+class TestGasEnsemble(TestCase):
+
+    def test_members(self):
+        ens = march.gas.Ensemble2D(
+            get_blk_from_oblique_neu(),
+            nmember=3,
+            sigma0=3,
+            time=0,
+            time_increment=0.1,
+            report_interval=0,
+        )
+        self.assertEqual(3, ens.nmember)
+        self.assertEqual(3, len(ens.members))
+        for imember, svr in enumerate(ens.members):
+            self.assertEqual(imember, svr.sol.imember)
+            self.assertEqual(3, svr.sol.nmember)
+        # the arrays of a member are strided views into the shared table.
+        ens.member(0).sol.so0c.F.fill(0)
+        ens.member(1).sol.so0c.F.fill(1)
+        self.assertTrue((ens.member(1).sol.so0c.F == 1).all())
+        self.assertFalse((ens.member(0).sol.so0c.F == 1).any())
+
+    def test_anchor_solver(self):
+        ens = march.gas.Ensemble2D(
+            get_blk_from_oblique_neu(),
+            nmember=2,
+            sigma0=3,
+            time=0,
+            time_increment=0.1,
+            report_interval=0,
+        )
+        ank = march.gas.CommonAnchor(ens.member(1))
+        # no wrapper of the member is alive.
+        gc.collect()
+        self.assertEqual(1, ank.solver.sol.imember)
@@ -0,0 +1,53 @@
+# -*- coding: UTF-8 -*-
+
+
+from unittest import TestCase
+
+import numpy as np
+
+from .. import mpy
+from .. import connection
+
+
+class TestLoopback(TestCase):
+    def setUp(self):
+        self.mpi = mpy.Loopback()
+
+    def test_sendrecv_arr(self):
+        sarr = np.arange(6, dtype='int32').reshape((3, 2))
+        rarr = np.empty_like(sarr)
+        self.mpi.sendarr(sarr, 0, 1)
+        self.mpi.recvarr(rarr, 0, 1)
+        self.assertEqual(sarr.tolist(), rarr.tolist())
+
+    def test_nonblocking_by_tag(self):
+        rarrs = [np.zeros(2), np.zeros(2)]
+        self.mpi.irecvarr(rarrs[0], 0, 1)
+        self.mpi.irecvarr(rarrs[1], 0, 2)
+        self.mpi.isendarr(np.array([2.0, 3.0]), 0, 2)
+        self.mpi.isendarr(np.array([0.0, 1.0]), 0, 1)
+        self.mpi.waitall()
+        self.assertEqual([[0.0, 1.0], [2.0, 3.0]],
+                         [rarr.tolist() for rarr in rarrs])
+
+    def test_allreduce(self):
+        self.assertEqual(3.0, self.mpi.allreduce(3.0))
+        self.assertRaises(ValueError, self.mpi.allreduce, 3.0, 'prod')
+
+    def test_mpiconnection(self):
+        from ..conf import env
+        saved = env.mpi
+        env.mpi = self.mpi
+        try:
+            conn = connection.MPIConnection(0, 1)
+            rarr = np.zeros(3)
+            conn.irecvarr(rarr)
+            conn.isendarr(np.ones(3))
+            conn.waitall()
+            self.assertEqual([1.0]*3, rarr.tolist())
+            conn.send('msg')
+            self.assertEqual('msg', conn.recv())
+        finally:
+            env.mpi = saved
+
+# vim: set ff=unix fenc=utf8 ft=python ai et sw=4 ts=4 tw=79:
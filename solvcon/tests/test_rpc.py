@@ -19,6 +19,8 @@
 
 from unittest import TestCase
 
+from ..anchor import MeshAnchor, MeshAnchorList
+
 class Solver(object):
     def __init__(self, msg, msg_other):
         self.msg = msg
@@ -41,6 +43,33 @@ class Solver(object):
         pconn = worker.pconns[peern]
         pconn.send(self.msg)
 
+    def assert_peers(self, worker=None):
+        serial = worker.serial
+        peers = sorted([(serial-1)%4, (serial+1)%4])
+        assert peers == sorted(worker.pconns), worker.pconns
+        for peern in peers:
+            worker.pconns[peern].send(serial)
+        for peern in peers:
+            assert peern == worker.pconns[peern].recv()
+
+    def reply_late(self, worker=None):
+        from time import sleep
+        # the first worker replies last.
+        sleep(0.1 * (3 - worker.serial))
+        worker.conn.send(self.msg)
+
+    def assert_peer_set(self, peers, worker=None):
+        assert sorted(peers) == sorted(worker.pconns), worker.pconns
+        for peern in peers:
+            worker.pconns[peern].send(worker.serial)
+        for peern in peers:
+            assert peern == worker.pconns[peern].recv()
+
+    def report_march(self, worker=None):
+        serial = worker.serial
+        worker.report({'cfl': [serial, serial, 1, 1], 'name': self.msg},
+                      {'cfl': ['min', 'max', 'sum', 'sum']})
+
     def recv_msg(self, worker=None):
         serial = worker.serial
         for peern in worker.pconns.keys():
@@ -50,6 +79,52 @@ class Solver(object):
         msg = pconn.recv()
         assert msg == self.msg_other
 
+class InheritedSolver(object):
+    def __init__(self, blk, msg_other=None):
+        self.msg = blk
+        self.msg_other = msg_other
+
+    def assert_msg(self, msg):
+        assert self.msg == msg
+
+    def assert_domain_released(self, worker=None):
+        assert worker.domain is None
+
+class BlockSolver(InheritedSolver):
+    def __init__(self, blk, msg_other=None):
+        super(BlockSolver, self).__init__(blk, msg_other=msg_other)
+        self.blk = blk
+        self.svrn = None
+        self.nsvr = None
+
+    def assert_serial(self, svrn, nsvr):
+        assert (svrn, nsvr) == (self.svrn, self.nsvr)
+
+class CountAnchor(MeshAnchor):
+    def __init__(self, svr, **kw):
+        super(CountAnchor, self).__init__(svr, **kw)
+        self.count = 0
+
+    def postmarch(self):
+        self.count += 1
+
+    def carry(self, old):
+        self.count = old.count
+
+class AnchoredSolver(object):
+    def __init__(self, msg):
+        self.msg = msg
+        self.runanchors = MeshAnchorList(self)
+        self.runanchors.append(CountAnchor, name='count')
+
+    def postmarch(self):
+        self.runanchors('postmarch')
+
+    def assert_count(self, msg, count):
+        ank = self.runanchors['count']
+        assert (msg, count) == (self.msg, ank.count), (self.msg, ank.count)
+        assert ank.svr is self
+
 class TestWorker(TestCase):
     def test_hire(self):
         import sys
@@ -106,4 +181,162 @@ class TestWorker(TestCase):
         dealer.barrier()
         dealer.terminate()
 
+    def test_create_solver_inherited(self):
+        from ..rpc import Worker, Dealer, can_fork
+        from nose.plugins.skip import SkipTest
+        if not can_fork(): raise SkipTest
+        dealer = Dealer()
+        domain = ["solver0", "solver1"]
+        for iproc in range(2):
+            wkr = Worker(None)
+            wkr.domain = domain
+            dealer.hire(wkr)
+        for iproc in range(2):
+            dealer[iproc].create_solver_inherited(iproc, 2, InheritedSolver,
+                dict(msg_other=domain[1-iproc]))
+        dealer[0].cmd.assert_msg('solver0')
+        dealer[1].cmd.assert_msg('solver1')
+        dealer[1].cmd.assert_domain_released(with_worker=True)
+        dealer.barrier()
+        dealer.terminate()
+
+    def test_reset_solver(self):
+        import sys
+        from nose.plugins.skip import SkipTest
+        if sys.platform.startswith('win'): raise SkipTest
+        from ..rpc import Worker, Dealer
+        dealer = Dealer()
+        muscle = BlockSolver("solver0")
+        muscle.svrn, muscle.nsvr = 0, 1
+        dealer.hire(Worker(muscle))
+        dealer[0].reset_solver(BlockSolver, dict(msg_other="new"))
+        dealer[0].cmd.assert_msg('solver0')
+        dealer[0].cmd.assert_serial(0, 1)
+        dealer.barrier()
+        dealer.terminate()
+
+    def test_replace_solver(self):
+        import sys
+        from nose.plugins.skip import SkipTest
+        if sys.platform.startswith('win'): raise SkipTest
+        from ..rpc import Worker, Dealer
+        dealer = Dealer()
+        dealer.hire(Worker(AnchoredSolver("old")))
+        dealer[0].cmd.postmarch()
+        dealer[0].cmd.postmarch()
+        dealer[0].replace_solver(AnchoredSolver("new"))
+        dealer[0].cmd.assert_count("new", 0)
+        dealer[0].carry_anchors()
+        dealer[0].cmd.assert_count("new", 2)
+        dealer.barrier()
+        dealer.terminate()
+
+    def test_hire_all_and_bridge_all(self):
+        import sys
+        from nose.plugins.skip import SkipTest
+        if sys.platform.startswith('win'): raise SkipTest
+        from ..rpc import Worker, Dealer
+        dealer = Dealer()
+        muscles = [Solver("solver%d" % it, None) for it in range(4)]
+        dealer.hire_all([Worker(muscle) for muscle in muscles])
+        self.assertEqual(4, len(dealer))
+        # a ring; the duplicated pair should be ignored.
+        dealer.bridge_all([(0,1), (1,2), (2,3), (3,0), (1,0)])
+        dealer.barrier()
+        for iproc in range(4):
+            dealer[iproc].cmd.assert_msg("solver%d" % iproc)
+            dealer[iproc].cmd.assert_peers(with_worker=True)
+        dealer.barrier()
+        dealer.terminate()
+
+    def test_issue_gather_call(self):
+        import sys
+        from nose.plugins.skip import SkipTest
+        if sys.platform.startswith('win'): raise SkipTest
+        from ..rpc import Worker, Dealer
+        dealer = Dealer()
+        muscles = [Solver("solver%d" % it, None) for it in range(4)]
+        dealer.hire_all([Worker(muscle) for muscle in muscles])
+        dealer.issue('reply_late', with_worker=True)
+        self.assertEqual(["solver%d" % it for it in range(4)],
+                         dealer.gather())
+        dealer.call('task')
+        dealer.barrier()
+        dealer.terminate()
+
+    def test_drop_peers(self):
+        import sys
+        from nose.plugins.skip import SkipTest
+        if sys.platform.startswith('win'): raise SkipTest
+        from ..rpc import Worker, Dealer
+        dealer = Dealer()
+        muscles = [Solver("solver%d" % it, None) for it in range(4)]
+        dealer.hire_all([Worker(muscle) for muscle in muscles])
+        dealer.bridge_all([(0,1), (1,2), (2,3), (3,0)])
+        dealer.barrier()
+        # bridge again in another topology.
+        for sdw in dealer:
+            sdw.drop_peers()
+        dealer.bridge_all([(0,2), (1,3)])
+        dealer.barrier()
+        for iproc in range(4):
+            dealer[iproc].cmd.assert_peer_set([(iproc+2)%4], with_worker=True)
+        dealer.barrier()
+        dealer.terminate()
+
+    def test_span_and_report(self):
+        import sys
+        from nose.plugins.skip import SkipTest
+        if sys.platform.startswith('win'): raise SkipTest
+        from ..rpc import Worker, Dealer
+        dealer = Dealer()
+        muscles = [Solver("solver%d" % it, None) for it in range(4)]
+        dealer.hire_all([Worker(muscle) for muscle in muscles])
+        pairs = [(0,1), (1,2), (2,3), (3,0)]
+        dealer.bridge_all(pairs)
+        dealer.barrier()
+        # not connected.
+        self.assertFalse(dealer.span({0: [1], 1: [0], 2: [3], 3: [2]}))
+        self.assertEqual(None, dealer.spanhead)
+        self.assertTrue(dealer.span({0: [1, 3], 1: [0, 2], 2: [1, 3],
+                                     3: [2, 0]}))
+        self.assertEqual([1, 3], sorted(dealer.spanhead.keys()))
+        for it in range(3):
+            dealer.issue('report_march', with_worker=True)
+            self.assertEqual(
+                {'cfl': [0, 3, 4, 4],
+                 'name': ["solver%d" % it for it in range(4)]},
+                dealer[0].recv())
+        dealer.barrier()
+        dealer.terminate()
+
+class TestLocalDealer(TestCase):
+    def test_issue_gather_call(self):
+        from ..rpc import LocalDealer
+        muscles = [Solver("solver%d" % it, None) for it in range(4)]
+        dealer = LocalDealer(muscles)
+        self.assertEqual(list(range(4)), [sdw.worker.serial for sdw in dealer])
+        dealer.issue('reply_late', with_worker=True)
+        self.assertEqual(["solver%d" % it for it in range(4)],
+                         dealer.gather())
+        dealer[2].cmd.reply_late(with_worker=True)
+        self.assertEqual("solver2", dealer[2].recv())
+        dealer.call('task')
+        dealer.barrier()
+        dealer.terminate()
+
+    def test_anchor(self):
+        from ..hook import Hook
+        from ..rpc import LocalDealer
+        muscles = [AnchoredSolver("solver%d" % it) for it in range(2)]
+        dealer = LocalDealer(muscles)
+        for sdw in dealer:
+            Hook._deliver_anchor(sdw, CountAnchor, {'name': 'more'})
+        for muscle in muscles:
+            self.assertTrue(muscle.runanchors['more'].svr is muscle)
+        dealer.call('postmarch')
+        for it, sdw in enumerate(dealer):
+            sdw.cmd.assert_count("solver%d" % it, 1)
+        self.assertEqual(1, muscles[1].runanchors['more'].count)
+
 # vim: set ff=unix fenc=utf8 ft=python ai et sw=4 ts=4 tw=79:
@@ -260,3 +260,17 @@ class TestMeshSolverBlock(TestCase):
             ('update', 'calcsoln', 'ibcsoln', 'calccfl', 'calcdsoln',
              'ibcdsoln'),
             tuple(svr.mmnames))
+
+class NthreadSolver(solver.MeshSolver):
+    @solver.MeshSolver.register_marcher
+    def calcsomething(self, worker=None):
+        pass
+
+class TestMeshSolverThread(TestCase):
+    def test_nthread(self):
+        from ..mesh import get_nthread
+        svr = NthreadSolver(testing.create_trivial_2d_blk(), nthread=1)
+        svr.init()
+        self.assertEqual(1, get_nthread())
+        svr.march(0.0, 0.1, 1)
+        self.assertEqual(1.0, svr.timer['nthread'])